@@ -11,3 +11,6 @@ class NetworkConnectivityLevel(Enum):
     FULLY_CONNECTED = 1
     PARTIALLY_CONNECTED = 2
     CENTRALIZED = 3
+    K_REGULAR = 4
+    SMALL_WORLD = 5
+    EXPANDER = 6
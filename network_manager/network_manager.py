@@ -3,6 +3,10 @@ from random import choice
 from network_manager.network_connectivity_level import NetworkConnectivityLevel
 from network_manager.network_node.network_node import NetworkNode
 from network_manager.network_node.network_node_idle_listener_interface import NetworkNodeIdleListenerInterface
+from network_manager.topology.connectivity_index import ConnectivityIndex
+from network_manager.topology.k_regular_topology import KRegularTopology
+from network_manager.topology.small_world_topology import SmallWorldTopology
+from network_manager.topology.expander_topology import ExpanderTopology
 
 
 """
@@ -11,18 +15,33 @@ NetworkManager
 Helper class for managing networks. Provides helpers
 for adding and removing nodes to a network and ensures
 the nodes are connected according to the specified connectivity level.
-Also provides protection against orphaned nodes.
+Also provides protection against orphaned nodes and against
+removals that would split the network, using a connectivity index
+kept up to date as the manager connects and removes nodes.
+
+The K_REGULAR, SMALL_WORLD, and EXPANDER connectivity levels are
+generated overlays. Their topology generator decides which connections
+to make and drop as nodes join and leave, then rebalances the overlay
+to keep it within the configured degree and diameter targets.
 """
 
+TOPOLOGY_GENERATORS = {
+    NetworkConnectivityLevel.K_REGULAR: KRegularTopology,
+    NetworkConnectivityLevel.SMALL_WORLD: SmallWorldTopology,
+    NetworkConnectivityLevel.EXPANDER: ExpanderTopology
+}
+
 
 class NetworkManager(NetworkNodeIdleListenerInterface):
-    def __init__(self, network_connectivity_level: NetworkConnectivityLevel):
+    def __init__(self, network_connectivity_level: NetworkConnectivityLevel, topology_config: dict = None):
         """
         __init__
 
         Creates a new NetworkManager.
 
         @param network_connectivity_level [NetworkConnectivityLevel] The connectivity level to use for the network
+        @param topology_config [dict] The settings of the topology generator, for generated connectivity levels.
+            See TopologyGenerator for the supported keys.
 
         @return [NetworkManager] The newly created NetworkManager
         """
@@ -34,6 +53,12 @@ class NetworkManager(NetworkNodeIdleListenerInterface):
 
         self.network_nodes = {}
 
+        self.connectivity_index = ConnectivityIndex()
+
+        self.topology_generator = None
+        if network_connectivity_level in TOPOLOGY_GENERATORS:
+            self.topology_generator = TOPOLOGY_GENERATORS[network_connectivity_level](topology_config)
+
     def start_network_manager(self):
         """
         start_network_manager
@@ -70,27 +95,80 @@ class NetworkManager(NetworkNodeIdleListenerInterface):
 
         @return None
         """
+        new_id = new_node.get_id()
         if self.network_connectivity_level == NetworkConnectivityLevel.FULLY_CONNECTED:
             for node_id, node in self.network_nodes.items():
                 node.connect_to_network_node(new_node)
+                self.connectivity_index.add_connection(node_id, new_id)
         elif self.network_connectivity_level == NetworkConnectivityLevel.PARTIALLY_CONNECTED:
             if len(self.network_nodes.keys()) > 0:
                 connected_node_id, connected_node = choice(list(self.network_nodes.items()))
                 connected_node.connect_to_network_node(new_node)
+                self.connectivity_index.add_connection(connected_node_id, new_id)
         elif self.network_connectivity_level == NetworkConnectivityLevel.CENTRALIZED:
             if len(self.network_nodes.keys()) == 0:
                 self.central_network_node = new_node
             else:
                 self.central_network_node.connect_to_network_node(new_node)
+                self.connectivity_index.add_connection(self.central_network_node.get_id(), new_id)
+        elif self.topology_generator is not None:
+            nodes_by_id = dict(self.network_nodes)
+            nodes_by_id[new_id] = new_node
+            self._apply_topology_changes(
+                self._merge_topology_changes([self.topology_generator.join(new_id), self.topology_generator.rebalance()]),
+                nodes_by_id
+            )
         else:
             raise Exception("ERROR: unknown connectivity level: " + str(self.network_connectivity_level))
 
-        new_id = new_node.get_id()
         if new_id not in self.network_nodes:
             self.network_nodes[new_id] = new_node
+        self.connectivity_index.add_node(new_id)
 
         new_node.add_idle_listener(self)
 
+    def add_network_nodes(self, new_nodes: list, topology: NetworkConnectivityLevel = None) -> None:
+        """
+        add_network_nodes
+
+        Adds the given network nodes to the network controlled by the manager.
+        Every connection needed to join the nodes according to the connectivity
+        level is worked out up front. Each node then installs all of its new
+        connections at once with add_connections, instead of running one
+        connection handshake through the message loops per connection.
+
+        @param new_nodes [list] The nodes to add to the network
+        @param topology [NetworkConnectivityLevel] The connectivity level used to connect the new nodes.
+            None to use the connectivity level of the manager.
+
+        @return None
+        """
+        if topology is None:
+            topology = self.network_connectivity_level
+
+        unique_new_nodes = {}
+        for new_node in new_nodes:
+            if new_node.get_id() not in self.network_nodes:
+                unique_new_nodes[new_node.get_id()] = new_node
+        new_nodes = list(unique_new_nodes.values())
+
+        if topology in TOPOLOGY_GENERATORS:
+            if topology != self.network_connectivity_level:
+                raise Exception("ERROR: Generated connectivity levels can only be used as the manager's connectivity level")
+
+            nodes_by_id = dict(self.network_nodes)
+            nodes_by_id.update(unique_new_nodes)
+            topology_changes = [self.topology_generator.join(new_node.get_id()) for new_node in new_nodes]
+            topology_changes.append(self.topology_generator.rebalance())
+            self._apply_topology_changes(self._merge_topology_changes(topology_changes), nodes_by_id, bulk=True)
+        else:
+            self._add_connections(self._plan_new_connections(new_nodes, topology))
+
+        for new_node in new_nodes:
+            self.network_nodes[new_node.get_id()] = new_node
+            self.connectivity_index.add_node(new_node.get_id())
+            new_node.add_idle_listener(self)
+
     def get_central_network_node(self) -> NetworkNode:
         """
         get_central_network_node
@@ -117,14 +195,74 @@ class NetworkManager(NetworkNodeIdleListenerInterface):
         """
         return self.network_nodes
 
+    def get_connectivity_index(self) -> ConnectivityIndex:
+        """
+        get_connectivity_index
+
+        Returns the index of the connections between the nodes in the
+        manager's network, which can be used to check which nodes and
+        connections the network depends on before changing it
+
+        @param None
+
+        @return [ConnectivityIndex] The connectivity index of the network
+        """
+        return self.connectivity_index
+
+    def rebuild_connectivity_index(self) -> None:
+        """
+        rebuild_connectivity_index
+
+        Rebuilds the connectivity index from the current connections of the
+        nodes in the manager's network. Only needed if nodes were connected
+        or disconnected without going through the manager.
+
+        @param None
+
+        @return None
+        """
+        self.connectivity_index = ConnectivityIndex()
+        for node_id, node in self.network_nodes.items():
+            self.connectivity_index.add_node(node_id)
+            for connected_node_id in node.get_connections():
+                self.connectivity_index.add_connection(node_id, connected_node_id)
+
+    def is_removal_safe(self, id_to_check: int) -> bool:
+        """
+        is_removal_safe
+
+        Checks whether or not the node with the given ID can be removed from
+        the manager's network without orphaning a node or splitting the network
+
+        @param id_to_check [int] The ID of the node to check
+
+        @return [bool] True if the node can be removed safely. False otherwise.
+        """
+        return self.connectivity_index.is_removal_safe(id_to_check)
+
+    def get_removal_split(self, id_to_check: int) -> list:
+        """
+        get_removal_split
+
+        Returns the components the network would be split into if the node
+        with the given ID was removed
+
+        @param id_to_check [int] The ID of the node to check
+
+        @return [list] The resulting components, as sets of node IDs. A single component if the network would not split.
+        """
+        return self.connectivity_index.get_split_components(id_to_check)
+
     def remove_network_node(self, id_to_remove: int) -> bool:
         """
         remove_network_node
 
         Removes the node with the given ID from the manager's network.
-        If removing the node would result in orphaned nodes, then an
-        exception is raised. If no nodes will be orphaned, then the
-        node will be removed from the network.
+        If the manager has a topology generator, then the generator heals
+        the network around the node before it is removed, so no check is
+        needed. Otherwise, if removing the node would result in orphaned
+        nodes or would split the network into separate components, then
+        an exception is raised.
 
         @param id_to_remove [int] The ID of the node to remove
 
@@ -133,10 +271,23 @@ class NetworkManager(NetworkNodeIdleListenerInterface):
         if id_to_remove not in self.network_nodes:
             return True
 
-        for node_id, node in self.network_nodes.items():
-            connections = node.get_connections()
-            if ((len(connections) == 1) and (connections[0] == id_to_remove)):
-                raise Exception("ERROR: Removing node from network would leave an orphaned node: " + str(node_id))
+        if self.topology_generator is not None:
+            self._apply_topology_changes(
+                self._merge_topology_changes([
+                    self.topology_generator.leave(id_to_remove),
+                    self.topology_generator.rebalance()
+                ]),
+                self.network_nodes
+            )
+        else:
+            orphaned_nodes = self.connectivity_index.get_orphaned_nodes(id_to_remove)
+            if len(orphaned_nodes) > 0:
+                raise Exception("ERROR: Removing node from network would leave an orphaned node: " + str(orphaned_nodes[0]))
+
+            if self.connectivity_index.is_articulation_point(id_to_remove):
+                raise Exception("ERROR: Removing node from network would split it into {} components".format(
+                    len(self.connectivity_index.get_split_components(id_to_remove))
+                ))
 
         for node_id, node in self.network_nodes.items():
             connections = node.get_connections()
@@ -147,4 +298,149 @@ class NetworkManager(NetworkNodeIdleListenerInterface):
         for node_id in node_to_remove.get_connections():
             node_to_remove.disconnect_from_network_node(node_id)
 
+        self.connectivity_index.remove_node(id_to_remove)
+
         return True
+
+    def get_topology_generator(self):
+        """
+        get_topology_generator
+
+        Returns the topology generator of the manager's network
+
+        @param None
+
+        @return [TopologyGenerator] The topology generator. None if the connectivity level is not generated.
+        """
+        return self.topology_generator
+
+    def rebalance_topology(self) -> None:
+        """
+        rebalance_topology
+
+        Rebalances the generated overlay of the manager's network to bring
+        it back within its degree and diameter targets. Does nothing if the
+        connectivity level is not generated.
+
+        @param None
+
+        @return None
+        """
+        if self.topology_generator is not None:
+            self._apply_topology_changes(self.topology_generator.rebalance(), self.network_nodes)
+
+    def _add_connections(self, connections: list) -> None:
+        """
+        _add_connections
+
+        Connects each of the given pairs of nodes with add_connections,
+        grouping the connections by the first node of each pair
+
+        @param connections [list] The pairs of nodes to connect
+
+        @return None
+        """
+        new_connections = {}
+        for node_1, node_2 in connections:
+            if node_1.get_id() not in new_connections:
+                new_connections[node_1.get_id()] = (node_1, [])
+            new_connections[node_1.get_id()][1].append(node_2)
+
+        for node, nodes_to_connect in new_connections.values():
+            node.add_connections(nodes_to_connect)
+            for node_to_connect in nodes_to_connect:
+                self.connectivity_index.add_connection(node.get_id(), node_to_connect.get_id())
+
+    def _merge_topology_changes(self, topology_changes: list) -> tuple:
+        """
+        _merge_topology_changes
+
+        Merges the given changes made by the topology generator, in order,
+        into their net changes. A connection added by one change and removed
+        by a later one (or the other way around) is left out.
+
+        @param topology_changes [list] The changes, as tuples of the connections to add and to remove
+
+        @return [tuple] The net connections to add and to remove, as lists of node ID pairs
+        """
+        added_connections = set()
+        removed_connections = set()
+        for connections_to_add, connections_to_remove in topology_changes:
+            for connection in map(frozenset, connections_to_add):
+                if connection in removed_connections:
+                    removed_connections.discard(connection)
+                else:
+                    added_connections.add(connection)
+            for connection in map(frozenset, connections_to_remove):
+                if connection in added_connections:
+                    added_connections.discard(connection)
+                else:
+                    removed_connections.add(connection)
+
+        return (
+            [tuple(connection) for connection in added_connections],
+            [tuple(connection) for connection in removed_connections]
+        )
+
+    def _apply_topology_changes(self, topology_changes: tuple, nodes_by_id: dict, bulk: bool = False) -> None:
+        """
+        _apply_topology_changes
+
+        Applies the given changes made by the topology generator to the
+        nodes. The new connections are made before any connections are
+        dropped in both directions, so the live network is never split while
+        the changes are applied.
+
+        @param topology_changes [tuple] The connections to add and to remove, as lists of node ID pairs
+        @param nodes_by_id [dict] The nodes that can be changed, by ID
+        @param bulk [bool] True to make the new connections with add_connections. False to use the connection handshake.
+
+        @return None
+        """
+        connections_to_add, connections_to_remove = topology_changes
+
+        if bulk:
+            self._add_connections([
+                (nodes_by_id[node_id_1], nodes_by_id[node_id_2]) for node_id_1, node_id_2 in connections_to_add
+            ])
+        else:
+            for node_id_1, node_id_2 in connections_to_add:
+                nodes_by_id[node_id_1].connect_to_network_node(nodes_by_id[node_id_2])
+                self.connectivity_index.add_connection(node_id_1, node_id_2)
+
+        for node_id_1, node_id_2 in connections_to_remove:
+            for node_id, other_node_id in ((node_id_1, node_id_2), (node_id_2, node_id_1)):
+                if node_id in nodes_by_id:
+                    nodes_by_id[node_id].disconnect_from_network_node(other_node_id)
+            self.connectivity_index.remove_connection(node_id_1, node_id_2)
+
+    def _plan_new_connections(self, new_nodes: list, topology: NetworkConnectivityLevel) -> list:
+        """
+        _plan_new_connections
+
+        Works out the connections needed to add the given nodes to the network
+        one after the other, the same way add_network_node would connect them
+
+        @param new_nodes [list] The nodes to add to the network, in order
+        @param topology [NetworkConnectivityLevel] The connectivity level used to connect the new nodes
+
+        @return [list] The pairs of nodes to connect
+        """
+        connections = []
+        placed_nodes = list(self.network_nodes.values())
+        for new_node in new_nodes:
+            if topology == NetworkConnectivityLevel.FULLY_CONNECTED:
+                connections.extend((node, new_node) for node in placed_nodes)
+            elif topology == NetworkConnectivityLevel.PARTIALLY_CONNECTED:
+                if len(placed_nodes) > 0:
+                    connections.append((choice(placed_nodes), new_node))
+            elif topology == NetworkConnectivityLevel.CENTRALIZED:
+                if self.central_network_node is None:
+                    self.central_network_node = new_node
+                else:
+                    connections.append((self.central_network_node, new_node))
+            else:
+                raise Exception("ERROR: unknown connectivity level: " + str(topology))
+
+            placed_nodes.append(new_node)
+        return connections
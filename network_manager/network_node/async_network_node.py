@@ -0,0 +1,167 @@
+import asyncio
+import functools
+
+from network_manager.network_node.message_queue.queue_full_policy import QueueFullPolicy
+from network_manager.network_node.message_subscription import MessageSubscription
+from network_manager.network_node.network_node import NetworkNode
+
+"""
+AsyncNetworkNode
+
+asyncio front end for a NetworkNode. The wrapped node keeps running
+its own sender, receiver and handler threads. The front end lets
+coroutines send messages and iterate over received messages without
+dedicating a thread to each waiting caller.
+"""
+
+
+class AsyncNetworkNode(object):
+    def __init__(self, network_node: NetworkNode):
+        """
+        __init__
+
+        Creates a new AsyncNetworkNode object
+
+        @param network_node [NetworkNode] The node to wrap
+
+        @return [AsyncNetworkNode] The created AsyncNetworkNode
+        """
+        if not isinstance(network_node, NetworkNode):
+            raise Exception("ERROR: AsyncNetworkNode can only wrap NetworkNode objects.")
+
+        self.network_node = network_node
+
+    def get_network_node(self) -> NetworkNode:
+        """
+        get_network_node
+
+        Returns the wrapped node
+
+        @param None
+
+        @return [NetworkNode] The wrapped node
+        """
+        return self.network_node
+
+    def get_id(self) -> int:
+        """
+        get_id
+
+        Returns the ID of the wrapped node
+
+        @param None
+
+        @return [int] The ID of the wrapped node
+        """
+        return self.network_node.get_id()
+
+    async def send_directed(self, target_node_id: int, message_type: str, message_payload: dict) -> tuple:
+        """
+        send_directed
+
+        Sends a message directly to the given node
+
+        @param target_node_id [int] The ID of the node to send the message to
+        @param message_type [str] The type of message to send
+        @param message_payload [dict] The payload of the message
+
+        @return [tuple] The ID of the sent message
+        """
+        return await self._call_node_method(
+            self.network_node.send_directed_message,
+            target_node_id,
+            message_type,
+            message_payload
+        )
+
+    async def send_propagation(self, message_type: str, message_payload: dict) -> tuple:
+        """
+        send_propagation
+
+        Sends a message to propagate accross the network
+
+        @param message_type [str] The type of message to send
+        @param message_payload [dict] The payload of the message
+
+        @return [tuple] The ID of the sent message
+        """
+        return await self._call_node_method(
+            self.network_node.send_propagation_message,
+            message_type,
+            message_payload
+        )
+
+    async def publish(self, message_type: str, message_payload: dict) -> tuple:
+        """
+        publish
+
+        Sends a message to propagate toward the nodes that subscribe to its type
+
+        @param message_type [str] The type of message to send
+        @param message_payload [dict] The payload of the message
+
+        @return [tuple] The ID of the sent message
+        """
+        return await self._call_node_method(
+            self.network_node.publish_message,
+            message_type,
+            message_payload
+        )
+
+    def subscribe(self, message_type: str) -> MessageSubscription:
+        """
+        subscribe
+
+        Subscribes to the messages of the given type received by the node.
+        Must be called from a coroutine running on the event loop that
+        will consume the messages.
+
+        @param message_type [str] The type of message to subscribe to
+
+        @return [MessageSubscription] The subscription. Use with async for, and close it when done.
+        """
+        return MessageSubscription(self.network_node, message_type, asyncio.get_running_loop())
+
+    async def _call_node_method(self, method: object, *args) -> object:
+        """
+        _call_node_method
+
+        Calls the given method of the wrapped node. Adding to the outbox
+        can only block when the outbox is bounded and uses the BLOCK
+        policy, so only then is the call moved off the event loop.
+
+        @param method [Method] The node method to call
+        @param args [list] The arguments to call the method with
+
+        @return [object] The return value of the method
+        """
+        outbox = self.network_node.msg_outbox
+        if (outbox.capacity is None) or (outbox.full_policy != QueueFullPolicy.BLOCK):
+            return method(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(method, *args))
+
+    def _create_future_callback(self, future: asyncio.Future) -> object:
+        """
+        _create_future_callback
+
+        Creates a callback that can be called from any thread to set the
+        result of the given future on the future's event loop
+
+        @param future [asyncio.Future] The future the callback completes
+
+        @return [Method] The callback. Takes the result as its only argument.
+        """
+        loop = future.get_loop()
+
+        def set_result(result):
+            if not future.done():
+                future.set_result(result)
+
+        def callback(result):
+            try:
+                loop.call_soon_threadsafe(set_result, result)
+            except RuntimeError:
+                # The event loop was closed, so nobody is waiting for the result
+                pass
+
+        return callback
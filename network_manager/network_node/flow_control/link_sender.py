@@ -0,0 +1,276 @@
+import threading
+import logging
+import time
+
+from collections import deque
+
+from network_manager.network_node.message_queue.message_queue import MessageQueue
+from network_manager.network_node.message_queue.message_priority import MessagePriority
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+
+"""
+LinkSender
+
+Send queue and worker thread for the link from a node to one of its
+targets. Every target gets its own LinkSender, so a target whose channel
+is slow or congested only delays the messages sent to it, instead of
+every message waiting behind it in the node's outbox.
+
+Sends over the link are limited with credit based flow control. The
+sender starts with a window of credits and spends one for every message
+it sends. The receiver returns credits as it takes messages off the link,
+so at most one window of messages is ever in flight. Once the credits run
+out, messages wait in the link's queue and the link reports itself as
+congested until the receiver catches up. Link control messages (e.g.
+credit grants and termination acknowledgements) do not spend credits,
+since the receiver must always be able to free the link in both directions.
+"""
+
+
+class LinkSender(object):
+    def __init__(
+            self,
+            target_id: int,
+            send_method: object,
+            credit_window: int = None,
+            batch_max_size: int = 32,
+            starvation_limit: int = 8
+            ):
+        """
+        __init__
+
+        Creates a new LinkSender object
+
+        @param target_id [int] The ID of the node the link sends to
+        @param send_method [Method] The method called with the target ID and a list of messages to send.
+            Returns False if the messages could not be sent.
+        @param credit_window [int] The maximum number of messages in flight without credits returned. None if unlimited.
+        @param batch_max_size [int] The maximum number of messages sent at once
+        @param starvation_limit [int] The number of messages taken from other lanes before a waiting lane is served
+
+        @return [LinkSender] The created LinkSender
+        """
+        if (credit_window is not None) and (credit_window <= 0):
+            raise Exception("ERROR: Link credit window must be a positive integer or None. Given: {}".format(credit_window))
+
+        self.logger = logging.getLogger('NetworkNode')
+
+        self.target_id = target_id
+        self.send_method = send_method
+        self.credit_window = credit_window
+        self.batch_max_size = batch_max_size
+
+        self.msg_queue = MessageQueue(starvation_limit=starvation_limit)
+        self.control_msgs = deque()
+        self.credits = credit_window
+        self.link_condition = threading.Condition()
+
+        self.num_sent = 0
+        self.num_credit_stalls = 0
+        self.stall_start_time = None
+        self.total_stall_time = 0.0
+
+        self.stop_worker = None
+
+    def start(self) -> None:
+        """
+        start
+
+        Starts the worker thread sending the queued messages
+
+        @param None
+
+        @return None
+        """
+        with self.link_condition:
+            if self.stop_worker is not None:
+                raise Exception("ERROR: Link sender is already running. Must call stop before calling start.")
+            self.stop_worker = threading.Event()
+            stop_event = self.stop_worker
+
+        thread = threading.Thread(target=self._worker_loop, args=(stop_event,))
+        thread.start()
+
+    def stop(self) -> None:
+        """
+        stop
+
+        Stops the worker thread. A send that is currently running is
+        allowed to finish. Messages that have not been sent yet are kept
+        and will be sent once the link sender is started again.
+
+        @param None
+
+        @return None
+        """
+        with self.link_condition:
+            if self.stop_worker is None:
+                return
+            self.stop_worker.set()
+            self.stop_worker = None
+            self.link_condition.notify_all()
+
+    def clear(self) -> int:
+        """
+        clear
+
+        Removes every message waiting to be sent
+
+        @param None
+
+        @return [int] The number of removed messages
+        """
+        with self.link_condition:
+            num_removed = len(self.control_msgs)
+            self.control_msgs.clear()
+            while self.msg_queue.get(timeout=0) is not None:
+                num_removed += 1
+            return num_removed
+
+    def add_message(self, message: MessageWrapper, priority: MessagePriority, is_control_msg: bool = False) -> None:
+        """
+        add_message
+
+        Adds the given message to the messages waiting to be sent over the link
+
+        @param message [MessageWrapper] The message to send
+        @param priority [MessagePriority] The priority class of the message
+        @param is_control_msg [bool] True if the message is sent without spending a credit. False otherwise.
+
+        @return None
+        """
+        with self.link_condition:
+            if is_control_msg:
+                self.control_msgs.append(message)
+            else:
+                self.msg_queue.put(message, low_priority=False, priority=priority)
+            self.link_condition.notify_all()
+
+    def grant_credits(self, num_credits: int) -> None:
+        """
+        grant_credits
+
+        Returns credits to the link after the receiver took messages off it
+
+        @param num_credits [int] The number of credits returned
+
+        @return None
+        """
+        with self.link_condition:
+            if self.credit_window is None:
+                return
+            self.credits = min(self.credit_window, self.credits + num_credits)
+            if (self.stall_start_time is not None) and (self.credits > 0):
+                self.total_stall_time += time.time() - self.stall_start_time
+                self.stall_start_time = None
+            self.link_condition.notify_all()
+
+    def is_congested(self) -> bool:
+        """
+        is_congested
+
+        Checks whether or not messages are waiting for credits to be sent over the link
+
+        @param None
+
+        @return [bool] True if the link has no credits left and messages are waiting. False otherwise.
+        """
+        return (self.credits is not None) and (self.credits <= 0) and (len(self.msg_queue) > 0)
+
+    def get_stats(self) -> dict:
+        """
+        get_stats
+
+        Returns a dictionary containing the current statistics of the link
+
+        @param None
+
+        @return [dict] The link statistics
+        """
+        with self.link_condition:
+            total_stall_time = self.total_stall_time
+            if self.stall_start_time is not None:
+                total_stall_time += time.time() - self.stall_start_time
+
+            return {
+                "DEPTH": len(self.msg_queue) + len(self.control_msgs),
+                "CREDITS": self.credits,
+                "CREDIT_WINDOW": self.credit_window,
+                "IN_FLIGHT": None if self.credit_window is None else self.credit_window - self.credits,
+                "NUM_SENT": self.num_sent,
+                "NUM_CREDIT_STALLS": self.num_credit_stalls,
+                "STALL_TIME_SEC": total_stall_time,
+                "CONGESTED": self.is_congested()
+            }
+
+    def _take_messages(self, stop_event: threading.Event) -> tuple:
+        """
+        _take_messages
+
+        Waits until messages can be sent over the link, then removes them
+        from the queue. Control messages are taken first, followed by as
+        many queued messages as the credits and the batch size allow.
+
+        @param stop_event [threading.Event] The event used to stop the worker
+
+        @return [tuple] The taken messages and the number of credits spent on them. None if the worker was stopped.
+        """
+        with self.link_condition:
+            while True:
+                if stop_event.is_set():
+                    return None
+
+                has_credits = (self.credits is None) or (self.credits > 0)
+                if (len(self.control_msgs) > 0) or (has_credits and (len(self.msg_queue) > 0)):
+                    break
+
+                if (not has_credits) and (len(self.msg_queue) > 0) and (self.stall_start_time is None):
+                    self.num_credit_stalls += 1
+                    self.stall_start_time = time.time()
+                self.link_condition.wait()
+
+            messages = []
+            while (len(self.control_msgs) > 0) and (len(messages) < self.batch_max_size):
+                messages.append(self.control_msgs.popleft())
+
+            num_credited = 0
+            while (len(messages) < self.batch_max_size) and ((self.credits is None) or (num_credited < self.credits)):
+                message = self.msg_queue.get(timeout=0)
+                if message is None:
+                    break
+                messages.append(message)
+                num_credited += 1
+
+            if self.credits is not None:
+                self.credits -= num_credited
+            return messages, num_credited
+
+    def _worker_loop(self, stop_event: threading.Event) -> None:
+        """
+        _worker_loop
+
+        Sends the queued messages until the given stop event is set. If
+        the messages could not be sent, then the credits spent on them
+        are returned to the link.
+
+        @param stop_event [threading.Event] The event used to stop this worker
+
+        @return None
+        """
+        while True:
+            taken = self._take_messages(stop_event)
+            if taken is None:
+                return
+
+            messages, num_credited = taken
+            msg_sent = False
+            try:
+                msg_sent = self.send_method(self.target_id, messages)
+            except Exception:
+                self.logger.exception("ERROR: Failed to send messages to node: {}".format(self.target_id))
+
+            if msg_sent is False:
+                self.grant_credits(num_credited)
+            else:
+                with self.link_condition:
+                    self.num_sent += len(messages)
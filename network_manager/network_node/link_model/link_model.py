@@ -0,0 +1,165 @@
+import random
+import threading
+
+"""
+LinkModel
+
+Model of the physical conditions of a link between two nodes. For every
+message sent over the link, the model decides whether the message is
+lost and, if not, how long it takes to arrive.
+
+A message first waits for the link to be free, then takes its size
+divided by the link's bandwidth to be put on the link, then travels for
+the link's latency. The latency is drawn from the configured
+distribution, so messages can arrive out of order when the distribution
+has jitter. Unless reordering is allowed, a message never arrives before
+a message sent over the link ahead of it, like on an ordered transport.
+Lost messages still take up the link for their serialization time.
+"""
+
+LATENCY_DISTRIBUTIONS = ["CONSTANT", "UNIFORM", "NORMAL", "EXPONENTIAL"]
+
+
+class LinkModel(object):
+    def __init__(self, link_model_config: dict = None, link_random: random.Random = None):
+        """
+        __init__
+
+        Creates a new LinkModel object
+
+        @param link_model_config [dict] The link settings. Supported keys:
+            LATENCY_SEC [float] The base latency of the link. Default is 0.
+            JITTER_SEC [float] The spread of the latency around the base latency. Default is 0.
+            LATENCY_DISTRIBUTION [str] How the latency is drawn. One of:
+                CONSTANT: always the base latency. The default.
+                UNIFORM: the base latency plus a uniform delay of up to the jitter.
+                NORMAL: normally distributed around the base latency, with the jitter as the standard deviation.
+                EXPONENTIAL: the base latency plus an exponential delay with the jitter as its mean.
+            BANDWIDTH_BYTES_PER_SEC [float] The bandwidth of the link. Default is None, for no limit.
+            LOSS_RATE [float] The probability that a message is lost, from 0 to 1. Default is 0.
+            REORDERING [bool] Whether or not messages can overtake each other on the link. Default is False.
+        @param link_random [random.Random] The random number generator of the link. None to create a new one.
+
+        @return [LinkModel] The created LinkModel
+        """
+        link_model_config = {} if link_model_config is None else link_model_config
+
+        self.latency = link_model_config.get("LATENCY_SEC", 0.0)
+        self.jitter = link_model_config.get("JITTER_SEC", 0.0)
+        self.latency_distribution = link_model_config.get("LATENCY_DISTRIBUTION", "CONSTANT")
+        self.bandwidth = link_model_config.get("BANDWIDTH_BYTES_PER_SEC", None)
+        self.loss_rate = link_model_config.get("LOSS_RATE", 0.0)
+        self.reordering = link_model_config.get("REORDERING", False)
+
+        if (self.latency < 0) or (self.jitter < 0):
+            raise Exception("ERROR: Link latency and jitter can not be negative. Given: {}, {}".format(
+                self.latency,
+                self.jitter
+            ))
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise Exception("ERROR: Unknown link latency distribution: {}. Supported distributions: {}".format(
+                self.latency_distribution,
+                LATENCY_DISTRIBUTIONS
+            ))
+        if (self.bandwidth is not None) and (self.bandwidth <= 0):
+            raise Exception("ERROR: Link bandwidth must be positive or None. Given: {}".format(self.bandwidth))
+        if not (0 <= self.loss_rate <= 1):
+            raise Exception("ERROR: Link loss rate must be between 0 and 1. Given: {}".format(self.loss_rate))
+
+        self.random = random.Random() if link_random is None else link_random
+        self.link_lock = threading.Lock()
+
+        self.link_free_time = None
+        self.last_arrival_time = None
+
+        self.num_sent = 0
+        self.num_lost = 0
+        self.num_bytes = 0
+        self.total_delay = 0.0
+
+    def needs_message_size(self) -> bool:
+        """
+        needs_message_size
+
+        Checks whether or not the model needs the size of each message, which is only the case if the bandwidth is limited
+
+        @param None
+
+        @return [bool] True if message sizes are needed. False otherwise.
+        """
+        return self.bandwidth is not None
+
+    def get_delivery_delay(self, send_time: float, message_size: int = 0, can_be_lost: bool = True) -> float:
+        """
+        get_delivery_delay
+
+        Decides the fate of a message sent over the link at the given time
+
+        @param send_time [float] The time the message is sent at
+        @param message_size [int] The size of the message in bytes. Only used if the bandwidth is limited.
+        @param can_be_lost [bool] Whether or not the message can be lost
+
+        @return [float] The time the message takes to arrive. None if the message is lost.
+        """
+        with self.link_lock:
+            start_time = send_time
+            if (self.link_free_time is not None) and (self.link_free_time > start_time):
+                start_time = self.link_free_time
+
+            if self.bandwidth is not None:
+                self.link_free_time = start_time + message_size / self.bandwidth
+                start_time = self.link_free_time
+
+            self.num_sent += 1
+            self.num_bytes += message_size
+
+            if can_be_lost and (self.loss_rate > 0) and (self.random.random() < self.loss_rate):
+                self.num_lost += 1
+                return None
+
+            arrival_time = start_time + self._draw_latency()
+            if not self.reordering:
+                if (self.last_arrival_time is not None) and (self.last_arrival_time > arrival_time):
+                    arrival_time = self.last_arrival_time
+                self.last_arrival_time = arrival_time
+
+            self.total_delay += arrival_time - send_time
+            return arrival_time - send_time
+
+    def get_stats(self) -> dict:
+        """
+        get_stats
+
+        Returns a dictionary containing the statistics of the messages sent over the link
+
+        @param None
+
+        @return [dict] The link statistics
+        """
+        with self.link_lock:
+            num_delivered = self.num_sent - self.num_lost
+            return {
+                "NUM_SENT": self.num_sent,
+                "NUM_LOST": self.num_lost,
+                "NUM_BYTES": self.num_bytes,
+                "AVERAGE_DELAY_SEC": self.total_delay / num_delivered if num_delivered > 0 else None
+            }
+
+    def _draw_latency(self) -> float:
+        """
+        _draw_latency
+
+        Draws the latency of a message from the link's latency distribution.
+        Must be called while holding the link lock.
+
+        @param None
+
+        @return [float] The latency in seconds
+        """
+        if (self.jitter == 0) or (self.latency_distribution == "CONSTANT"):
+            return self.latency
+        elif self.latency_distribution == "UNIFORM":
+            return self.latency + self.random.uniform(0, self.jitter)
+        elif self.latency_distribution == "NORMAL":
+            return max(0.0, self.random.gauss(self.latency, self.jitter))
+        return self.latency + self.random.expovariate(1 / self.jitter)
@@ -12,6 +12,8 @@ the nodes are in the same execution environment.
 
 
 class LocalMessageChannel(MessageChannel):
+    delivers_synchronously = True
+
     def __init__(self, source_node: MessageChannelUser, target_node: MessageChannelUser):
         """
         __init__
@@ -4,11 +4,20 @@ from network_manager.network_node.message_wrapper.message_wrapper import Message
 """
 MessageChannel
 
-The abstract class for defining message channel classes
+The abstract class for defining message channel classes. Channel
+types that hand messages to the target node before send_message
+returns must set delivers_synchronously, which lets nodes skip
+termination acknowledgements for messages sent through them. Channel
+types that connect nodes in different processes must set
+connects_processes, so the nodes using them are given IDs that are
+unique across processes and hosts.
 """
 
 
 class MessageChannel(ABC):
+    delivers_synchronously = False
+    connects_processes = False
+
     def __init__(self):
         """
         init
@@ -33,3 +42,32 @@ class MessageChannel(ABC):
         @return None
         """
         pass
+
+    @classmethod
+    def setup_channel_endpoint(cls, owner_node) -> None:
+        """
+        setup_channel_endpoint
+
+        Called when a node using this channel type is started. Channel
+        types that need per node resources (e.g. a listening socket)
+        should create them here.
+
+        @param owner_node [NetworkNode] The node being started
+
+        @return None
+        """
+        pass
+
+    @classmethod
+    def teardown_channel_endpoint(cls, owner_node) -> None:
+        """
+        teardown_channel_endpoint
+
+        Called when a node using this channel type is torn down. Releases
+        any resources created in setup_channel_endpoint.
+
+        @param owner_node [NetworkNode] The node being torn down
+
+        @return None
+        """
+        pass
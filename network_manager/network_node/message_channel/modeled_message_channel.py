@@ -0,0 +1,122 @@
+from network_manager.network_node.link_model.link_model import LinkModel
+from network_manager.network_node.message_channel.local_message_channel import LocalMessageChannel
+from network_manager.network_node.message_channel.message_channel_user import MessageChannelUser
+from network_manager.network_node.message_serializer.binary_message_serializer import BinaryMessageSerializer
+from network_manager.network_node.message_wrapper.message_batch_wrapper import MessageBatchWrapper
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+from network_manager.network_node.network_node_message_types import NetworkNodeMessageTypes
+
+"""
+ModeledMessageChannel
+
+A message channel between nodes in the same execution environment that
+delivers messages under the conditions of a LinkModel, so nodes can be
+run over slow, constrained or lossy links. The link settings come from
+the source node's link_model config value, or from the override set for
+the target node with set_link_model.
+
+Delayed messages are handed to the target node by the source node's
+runtime once their delay has passed, on the runtime's clock. If the
+bandwidth is limited, then the size of each message is measured by
+serializing it with the BinaryMessageSerializer, like a transport
+channel would. Messages that set up or control the link are never
+lost, since nothing would resend them.
+"""
+
+LOSSLESS_MSG_TYPES = [NetworkNodeMessageTypes.REQUEST_CONNECTION, NetworkNodeMessageTypes.ACCEPT_CONNECTION_REQUEST]
+
+
+class ModeledMessageChannel(LocalMessageChannel):
+    delivers_synchronously = False
+
+    def __init__(self, source_node: MessageChannelUser, target_node: MessageChannelUser):
+        """
+        __init__
+
+        Creates a new ModeledMessageChannel object
+
+        @param source_node [MessageChannelUser] The MessageChannelUser sending the message
+        @param target_node [MessageChannelUser] The MessageChannelUser receiving the message
+
+        @return [ModeledMessageChannel] The created ModeledMessageChannel
+        """
+        super().__init__(source_node, target_node)
+
+        self.node_runtime_type = source_node.node_runtime_type
+        self.link_model = LinkModel(
+            source_node.get_link_model_config(target_node.get_id()),
+            self.node_runtime_type.create_random(source_node)
+        )
+
+    def send_message(self, message: MessageWrapper) -> bool:
+        """
+        send_message
+
+        Send the given message accross the ModeledMessageChannel. The
+        message is handed to the target node once its delay on the link
+        has passed.
+
+        @param message [MessageWrapper] The message to send
+
+        @return [bool] True if the message was sent. False if it was lost on the link.
+        """
+        message_size = 0
+        if self.link_model.needs_message_size():
+            encoded_message = BinaryMessageSerializer.encode_message(message, type(self))
+            message_size = sum(memoryview(buffer).nbytes for buffer in encoded_message)
+
+        # Link setup and control messages (e.g. termination acknowledgements) are never resent, so they are never lost
+        batched_msgs = message.get_messages() if isinstance(message, MessageBatchWrapper) else [message]
+        can_be_lost = not any(
+            (batched_msg.get_message_type() in LOSSLESS_MSG_TYPES) or self.source_node._is_link_control_message(batched_msg)
+            for batched_msg in batched_msgs
+        )
+
+        delay = self.link_model.get_delivery_delay(self.node_runtime_type.get_time(), message_size, can_be_lost)
+        if delay is None:
+            return False
+
+        if delay > 0:
+            self.node_runtime_type.schedule_callback(delay, self.target_node.receive_message, message)
+        else:
+            self.target_node.receive_message(message)
+        return True
+
+    def set_link_model(self, link_model_config: dict) -> None:
+        """
+        set_link_model
+
+        Replaces the link model of the channel. Messages already on the link keep their delays.
+
+        @param link_model_config [dict] The link settings, as described in LinkModel
+
+        @return None
+        """
+        self.link_model = LinkModel(link_model_config, self.node_runtime_type.create_random(self.source_node))
+
+    def get_link_model_stats(self) -> dict:
+        """
+        get_link_model_stats
+
+        Returns the statistics of the messages sent through the channel
+
+        @param None
+
+        @return [dict] The statistics of the channel's link model
+        """
+        return self.link_model.get_stats()
+
+    @classmethod
+    def get_node_address(cls, node: MessageChannelUser) -> object:
+        """
+        get_node_address
+
+        Returns the address of the given node. Used when node references
+        are serialized to measure message sizes. Nodes reached through this
+        channel type have no address.
+
+        @param node [MessageChannelUser] The node to get the address of
+
+        @return [object] None
+        """
+        return None
@@ -0,0 +1,39 @@
+import threading
+
+from network_manager.network_node.message_channel.shared_memory_transport import SharedMemoryTransport
+from network_manager.network_node.message_channel.transport_message_channel import TransportMessageChannel
+
+"""
+SharedMemoryMessageChannel
+
+A message channel that sends messages between nodes in different
+processes on the same host through shared memory ring buffers. This
+avoids the system calls and copies of a TCP loopback connection on
+busy links. Messages are serialized as described in
+TransportMessageChannel, so this channel must only be used between
+trusted nodes.
+"""
+
+
+class SharedMemoryMessageChannel(TransportMessageChannel):
+    endpoints = {}
+    endpoints_lock = threading.Lock()
+
+    @classmethod
+    def create_transport(cls, owner_node) -> SharedMemoryTransport:
+        """
+        create_transport
+
+        Creates the shared memory transport for the given node. The ring
+        size and send timeout are taken from the node's shm_ring_capacity
+        and shm_send_timeout_sec config values.
+
+        @param owner_node [NetworkNode] The node the transport is for
+
+        @return [SharedMemoryTransport] The created transport
+        """
+        return SharedMemoryTransport(
+            lambda data: owner_node.receive_message(cls.decode_message(data)),
+            owner_node.config["shm_ring_capacity"],
+            owner_node.config["shm_send_timeout_sec"]
+        )
@@ -0,0 +1,245 @@
+import struct
+import sys
+
+from multiprocessing import resource_tracker, shared_memory
+
+"""
+SharedMemoryRing
+
+Single producer single consumer ring buffer of length prefixed frames
+stored in a multiprocessing.shared_memory block. The block starts with
+a header holding the write position, the read position and the
+capacity of the data area. Positions only ever increase and are taken
+modulo the capacity when accessing the data area. Only the producer
+writes the write position and only the consumer writes the read
+position, so no lock is shared between the two processes.
+
+The block is not registered with the multiprocessing resource tracker.
+The creating side is responsible for calling unlink once the ring is
+no longer needed.
+"""
+
+RING_HEADER = struct.Struct("=QQQ")
+WRITE_POS_OFFSET = 0
+READ_POS_OFFSET = 8
+FRAME_HEADER = struct.Struct("=I")
+POSITION = struct.Struct("=Q")
+
+
+class SharedMemoryRing(object):
+    def __init__(self, name: str = None, capacity: int = None):
+        """
+        __init__
+
+        Creates a new SharedMemoryRing object. If no name is given, then
+        a new shared memory block is created. Otherwise the existing block
+        with the given name is attached to.
+
+        @param name [str] The name of the shared memory block to attach to. None to create a new block.
+        @param capacity [int] The size in bytes of the data area. Only used when creating a new block.
+
+        @return [SharedMemoryRing] The created SharedMemoryRing
+        """
+        if name is None:
+            if (capacity is None) or (capacity <= FRAME_HEADER.size):
+                raise Exception("ERROR: Shared memory ring capacity must be greater than {}. Given: {}".format(
+                    FRAME_HEADER.size,
+                    capacity
+                ))
+            self.shm = _open_shared_memory(None, True, RING_HEADER.size + capacity)
+            RING_HEADER.pack_into(self.shm.buf, 0, 0, 0, capacity)
+        else:
+            self.shm = _open_shared_memory(name, False, 0)
+
+        self.capacity = RING_HEADER.unpack_from(self.shm.buf, 0)[2]
+
+    def get_name(self) -> str:
+        """
+        get_name
+
+        Returns the name of the shared memory block backing the ring
+
+        @param None
+
+        @return [str] The name of the shared memory block
+        """
+        return self.shm.name
+
+    def can_fit(self, num_bytes: int) -> bool:
+        """
+        can_fit
+
+        Checks whether or not a frame with the given number of bytes
+        can ever fit in the ring
+
+        @param num_bytes [int] The size of the frame data
+
+        @return [bool] True if the frame fits in an empty ring. False otherwise.
+        """
+        return FRAME_HEADER.size + num_bytes <= self.capacity
+
+    def get_read_position(self) -> int:
+        """
+        get_read_position
+
+        Returns the position the consumer will read the next frame from
+
+        @param None
+
+        @return [int] The read position
+        """
+        return POSITION.unpack_from(self.shm.buf, READ_POS_OFFSET)[0]
+
+    def push(self, buffers: list) -> int:
+        """
+        push
+
+        Writes the given buffers to the ring as a single frame. Each buffer
+        is copied straight into the ring without joining them first. Must
+        only be called by the producer.
+
+        @param buffers [list] The bytes-like objects making up the frame data, in order
+
+        @return [int] The position the frame was written at. None if there is not enough free space.
+        """
+        write_pos = POSITION.unpack_from(self.shm.buf, WRITE_POS_OFFSET)[0]
+        read_pos = self.get_read_position()
+
+        data_size = sum(len(buffer) for buffer in buffers)
+        frame_size = FRAME_HEADER.size + data_size
+        if self.capacity - (write_pos - read_pos) < frame_size:
+            return None
+
+        self._write(write_pos, FRAME_HEADER.pack(data_size))
+        position = write_pos + FRAME_HEADER.size
+        for buffer in buffers:
+            self._write(position, buffer)
+            position += len(buffer)
+        POSITION.pack_into(self.shm.buf, WRITE_POS_OFFSET, write_pos + frame_size)
+        return write_pos
+
+    def pop(self) -> bytearray:
+        """
+        pop
+
+        Reads the next frame from the ring. Must only be called by the consumer.
+
+        @param None
+
+        @return [bytearray] The data of the frame. None if the ring is empty.
+        """
+        read_pos = self.get_read_position()
+        write_pos = POSITION.unpack_from(self.shm.buf, WRITE_POS_OFFSET)[0]
+        if read_pos == write_pos:
+            return None
+
+        data_size = FRAME_HEADER.unpack(self._read(read_pos, FRAME_HEADER.size))[0]
+        data = self._read(read_pos + FRAME_HEADER.size, data_size)
+        POSITION.pack_into(self.shm.buf, READ_POS_OFFSET, read_pos + FRAME_HEADER.size + data_size)
+        return data
+
+    def close(self) -> None:
+        """
+        close
+
+        Detaches from the shared memory block
+
+        @param None
+
+        @return None
+        """
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """
+        unlink
+
+        Destroys the shared memory block. Processes that are still attached
+        can keep using it until they close it.
+
+        @param None
+
+        @return None
+        """
+        _unlink_shared_memory(self.shm)
+
+    def _write(self, position: int, data: object) -> None:
+        """
+        _write
+
+        Copies the given data into the data area starting at the given
+        position, wrapping around the end of the data area if needed
+
+        @param position [int] The position to write at
+        @param data [object] The bytes-like object to write
+
+        @return None
+        """
+        data = memoryview(data).cast("B")
+        offset = position % self.capacity
+        first_part = min(len(data), self.capacity - offset)
+        start = RING_HEADER.size + offset
+        self.shm.buf[start:start + first_part] = data[:first_part]
+        if first_part < len(data):
+            self.shm.buf[RING_HEADER.size:RING_HEADER.size + len(data) - first_part] = data[first_part:]
+
+    def _read(self, position: int, num_bytes: int) -> bytearray:
+        """
+        _read
+
+        Copies the given number of bytes out of the data area starting at
+        the given position, wrapping around the end of the data area if needed
+
+        @param position [int] The position to read from
+        @param num_bytes [int] The number of bytes to read
+
+        @return [bytearray] The bytes read
+        """
+        offset = position % self.capacity
+        first_part = min(num_bytes, self.capacity - offset)
+        start = RING_HEADER.size + offset
+        if first_part == num_bytes:
+            return bytearray(self.shm.buf[start:start + num_bytes])
+        return bytearray(self.shm.buf[start:start + first_part]) + \
+            self.shm.buf[RING_HEADER.size:RING_HEADER.size + num_bytes - first_part]
+
+
+def _open_shared_memory(name: str, create: bool, size: int) -> shared_memory.SharedMemory:
+    """
+    _open_shared_memory
+
+    Creates or attaches to a shared memory block without leaving it
+    registered with the resource tracker. Otherwise the tracker of a
+    consumer process would destroy the block when that process exits.
+
+    @param name [str] The name of the block. None to generate a name.
+    @param create [bool] True to create a new block. False to attach to an existing one.
+    @param size [int] The size of the block to create
+
+    @return [shared_memory.SharedMemory] The shared memory block
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _unlink_shared_memory(shm: shared_memory.SharedMemory) -> None:
+    """
+    _unlink_shared_memory
+
+    Destroys a shared memory block opened with _open_shared_memory
+
+    @param shm [shared_memory.SharedMemory] The block to destroy
+
+    @return None
+    """
+    if sys.version_info >= (3, 13):
+        shm.unlink()
+        return
+
+    # SharedMemory.unlink would also unregister the already unregistered block
+    import _posixshmem
+    _posixshmem.shm_unlink(shm._name)
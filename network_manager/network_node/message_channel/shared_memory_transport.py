@@ -0,0 +1,302 @@
+import errno
+import os
+import select
+import tempfile
+import threading
+import time
+import logging
+
+from network_manager.network_node.message_channel.shared_memory_ring import SharedMemoryRing
+
+"""
+SharedMemoryTransport
+
+Sends and receives frames between processes on the same host through
+shared memory. Every directed link gets its own SharedMemoryRing, which
+is created and written by the sending transport and read by the
+receiving transport. Each transport listens on a named pipe (FIFO) so
+senders can wake it up instead of it polling the rings. Only POSIX
+platforms are supported.
+
+Every record written to the pipe is a single line, which keeps the
+writes atomic when several senders share the pipe:
+    "R<name>" - A new ring with the given name was created for this transport
+    "U<name>" - The ring with the given name will not be written to again
+    ""        - New frames are available
+The sender only writes a wakeup when the receiver has already read
+everything that was in the ring before the new frame, so a busy link
+passes frames without any system calls.
+"""
+
+READ_CHUNK_SIZE = 4096
+FULL_RING_RETRY_DELAY_SEC = 0.0001
+
+
+class SharedMemoryTransport(object):
+    def __init__(self, frame_handler: object, ring_capacity: int, send_timeout_sec: float):
+        """
+        __init__
+
+        Creates a new SharedMemoryTransport object
+
+        @param frame_handler [Method] The method to call with the data of each received frame
+        @param ring_capacity [int] The size in bytes of each ring created for sending
+        @param send_timeout_sec [float] How long to wait for space in a full ring before a frame is dropped
+
+        @return [SharedMemoryTransport] The created SharedMemoryTransport
+        """
+        self.logger = logging.getLogger('NetworkNode')
+
+        self.frame_handler = frame_handler
+        self.ring_capacity = ring_capacity
+        self.send_timeout_sec = send_timeout_sec
+
+        self.fifo_path = os.path.join(
+            tempfile.gettempdir(),
+            "swarm_shm_{}_{}.fifo".format(os.getpid(), id(self))
+        )
+        self.fifo_fd = None
+        self.reader_thread = None
+        self.running = False
+
+        self.inbound_rings = {}
+        self.record_buffer = b""
+
+        self.outbound_links = {}
+        self.outbound_lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        start
+
+        Starts listening for wakeups from senders. If the transport was
+        started before, then it listens on the same pipe as before so
+        remote nodes can still reach it, and any frames written while
+        it was stopped are delivered.
+
+        @param None
+
+        @return None
+        """
+        if self.running:
+            raise Exception("ERROR: Shared memory transport is already running. Must call stop before calling start.")
+
+        if os.path.exists(self.fifo_path):
+            os.unlink(self.fifo_path)
+        os.mkfifo(self.fifo_path)
+        # Opening for reading and writing keeps the pipe from reporting EOF when senders close it
+        self.fifo_fd = os.open(self.fifo_path, os.O_RDWR | os.O_NONBLOCK)
+
+        self.running = True
+
+        self.reader_thread = threading.Thread(target=self._reader_loop)
+        self.reader_thread.start()
+
+    def stop(self) -> None:
+        """
+        stop
+
+        Stops listening for wakeups and releases all outbound rings
+
+        @param None
+
+        @return None
+        """
+        if self.running:
+            self.running = False
+            os.write(self.fifo_fd, b"\n")
+            self.reader_thread.join()
+
+            os.close(self.fifo_fd)
+            self.fifo_fd = None
+            os.unlink(self.fifo_path)
+            self.record_buffer = b""
+
+        with self.outbound_lock:
+            for address, link in self.outbound_links.items():
+                with link["LOCK"]:
+                    self._write_record(address, link, "U" + link["RING"].get_name())
+                    if link["FIFO_FD"] is not None:
+                        os.close(link["FIFO_FD"])
+                    link["RING"].unlink()
+                    link["RING"].close()
+            self.outbound_links = {}
+
+    def get_address(self) -> str:
+        """
+        get_address
+
+        Returns the address senders use to reach the transport
+
+        @param None
+
+        @return [str] The path of the pipe the transport listens on
+        """
+        return self.fifo_path
+
+    def send_frame(self, address: str, buffers: list) -> bool:
+        """
+        send_frame
+
+        Writes the given buffers as a single frame to the ring for the given
+        address, creating the ring on first use. If the ring is full, then
+        waits up to the send timeout for the receiver to make space.
+
+        @param address [str] The address of the receiving transport
+        @param buffers [list] The bytes-like objects making up the frame data, in order
+
+        @return [bool] True if the frame was written. False if it was dropped.
+        """
+        with self.outbound_lock:
+            if address not in self.outbound_links:
+                self.outbound_links[address] = {
+                    "RING": SharedMemoryRing(capacity=self.ring_capacity),
+                    "FIFO_FD": None,
+                    "ANNOUNCED": False,
+                    "LOCK": threading.Lock()
+                }
+            link = self.outbound_links[address]
+
+        with link["LOCK"]:
+            ring = link["RING"]
+            frame_size = sum(len(buffer) for buffer in buffers)
+            if not ring.can_fit(frame_size):
+                self.logger.error("ERROR: Frame of {} bytes does not fit in shared memory ring of {} bytes.".format(
+                    frame_size,
+                    ring.capacity
+                ))
+                return False
+
+            deadline = time.monotonic() + self.send_timeout_sec
+            position = ring.push(buffers)
+            while position is None:
+                self._write_record(address, link, "")
+                if time.monotonic() >= deadline:
+                    self.logger.error("ERROR: Shared memory ring to {} stayed full for {} seconds.".format(
+                        address,
+                        self.send_timeout_sec
+                    ))
+                    return False
+                time.sleep(FULL_RING_RETRY_DELAY_SEC)
+                position = ring.push(buffers)
+
+            if (not link["ANNOUNCED"]) or (ring.get_read_position() >= position):
+                self._write_record(address, link, "")
+            return True
+
+    def _write_record(self, address: str, link: dict, record: str) -> None:
+        """
+        _write_record
+
+        Writes a record to the pipe of the receiving transport. Opens the
+        pipe and announces the ring of the link first if needed. If the
+        receiver is not running, then the record is skipped; the ring is
+        announced again once the receiver can be reached.
+
+        @param address [str] The address of the receiving transport
+        @param link [dict] The outbound link to the receiving transport
+        @param record [str] The record to write
+
+        @return None
+        """
+        for _ in range(2):
+            try:
+                if link["FIFO_FD"] is None:
+                    link["FIFO_FD"] = os.open(address, os.O_WRONLY | os.O_NONBLOCK)
+                if not link["ANNOUNCED"]:
+                    os.write(link["FIFO_FD"], "R{}\n".format(link["RING"].get_name()).encode())
+                    link["ANNOUNCED"] = True
+                os.write(link["FIFO_FD"], "{}\n".format(record).encode())
+                return
+            except BlockingIOError:
+                # The pipe is full, so the receiver already has a pending wakeup
+                return
+            except OSError as error:
+                if link["FIFO_FD"] is not None:
+                    os.close(link["FIFO_FD"])
+                    link["FIFO_FD"] = None
+                link["ANNOUNCED"] = False
+                if error.errno in (errno.ENOENT, errno.ENXIO):
+                    return
+
+    def _reader_loop(self) -> None:
+        """
+        _reader_loop
+
+        Delivers frames from all inbound rings, then waits on the pipe for
+        new records until the transport is stopped
+
+        @param None
+
+        @return None
+        """
+        while True:
+            self._drain_rings()
+
+            select.select([self.fifo_fd], [], [])
+            if not self.running:
+                break
+
+            try:
+                self.record_buffer += os.read(self.fifo_fd, READ_CHUNK_SIZE)
+            except BlockingIOError:
+                continue
+
+            *records, self.record_buffer = self.record_buffer.split(b"\n")
+            for record in records:
+                self._handle_record(record.decode())
+
+    def _handle_record(self, record: str) -> None:
+        """
+        _handle_record
+
+        Attaches to newly announced rings and releases rings that will
+        not be written to again
+
+        @param record [str] The record read from the pipe
+
+        @return None
+        """
+        if record.startswith("R"):
+            name = record[1:]
+            if name not in self.inbound_rings:
+                try:
+                    self.inbound_rings[name] = SharedMemoryRing(name=name)
+                except FileNotFoundError:
+                    self.logger.warning("WARNING: Announced shared memory ring {} no longer exists.".format(name))
+        elif record.startswith("U"):
+            ring = self.inbound_rings.pop(record[1:], None)
+            if ring is not None:
+                self._drain_ring(ring)
+                ring.close()
+
+    def _drain_rings(self) -> None:
+        """
+        _drain_rings
+
+        Delivers all frames currently in the inbound rings
+
+        @param None
+
+        @return None
+        """
+        for ring in list(self.inbound_rings.values()):
+            self._drain_ring(ring)
+
+    def _drain_ring(self, ring: SharedMemoryRing) -> None:
+        """
+        _drain_ring
+
+        Delivers all frames currently in the given ring to the frame handler
+
+        @param ring [SharedMemoryRing] The ring to read from
+
+        @return None
+        """
+        data = ring.pop()
+        while data is not None:
+            try:
+                self.frame_handler(data)
+            except Exception:
+                self.logger.exception("ERROR: Failed to handle frame received through shared memory.")
+            data = ring.pop()
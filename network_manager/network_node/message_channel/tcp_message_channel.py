@@ -0,0 +1,41 @@
+import threading
+
+from network_manager.network_node.message_channel.tcp_transport import TcpTransport
+from network_manager.network_node.message_channel.transport_message_channel import TransportMessageChannel
+
+"""
+TcpMessageChannel
+
+A message channel that sends messages between nodes over TCP. This
+allows nodes in different processes or on different hosts to form a
+network. Each node using this channel type listens on its own port
+and keeps persistent connections to the nodes it sends messages to.
+Messages are serialized as described in TransportMessageChannel, so
+this channel must only be used between trusted nodes.
+"""
+
+
+class TcpMessageChannel(TransportMessageChannel):
+    endpoints = {}
+    endpoints_lock = threading.Lock()
+
+    @classmethod
+    def create_transport(cls, owner_node) -> TcpTransport:
+        """
+        create_transport
+
+        Creates the TCP transport for the given node. The host and port
+        are taken from the node's tcp_listen_host and tcp_listen_port
+        config values.
+
+        @param owner_node [NetworkNode] The node the transport is for
+
+        @return [TcpTransport] The created transport
+        """
+        return TcpTransport(
+            lambda data: owner_node.receive_message(cls.decode_message(data)),
+            owner_node.config["tcp_listen_host"],
+            owner_node.config["tcp_listen_port"],
+            owner_node.config["tcp_reconnect_attempts"],
+            owner_node.config["tcp_reconnect_delay_sec"]
+        )
@@ -0,0 +1,302 @@
+import select
+import socket
+import struct
+import threading
+import time
+import logging
+
+"""
+TcpTransport
+
+Sends and receives length prefixed binary frames over TCP. Each
+frame is a 4 byte big endian length followed by that many bytes
+of data. The transport owns one listening socket for inbound
+connections and keeps one persistent outbound connection per
+remote address. Outbound connections that fail are re-established
+automatically before giving up on a frame.
+"""
+
+FRAME_HEADER = struct.Struct("!I")
+
+
+class TcpTransport(object):
+    def __init__(
+        self,
+        frame_handler: object,
+        host: str,
+        port: int,
+        reconnect_attempts: int,
+        reconnect_delay_sec: float
+    ):
+        """
+        __init__
+
+        Creates a new TcpTransport object
+
+        @param frame_handler [Method] The method to call with the data of each received frame
+        @param host [str] The host to listen on
+        @param port [int] The port to listen on. 0 to let the OS choose a free port.
+        @param reconnect_attempts [int] The number of times to try reconnecting before a frame is dropped
+        @param reconnect_delay_sec [float] The delay between reconnect attempts
+
+        @return [TcpTransport] The created TcpTransport
+        """
+        self.logger = logging.getLogger('NetworkNode')
+
+        self.frame_handler = frame_handler
+        self.host = host
+        self.port = port
+        self.reconnect_attempts = reconnect_attempts
+        self.reconnect_delay_sec = reconnect_delay_sec
+
+        self.server_socket = None
+        self.running = False
+
+        self.inbound_sockets = []
+        self.inbound_lock = threading.Lock()
+
+        self.outbound_connections = {}
+        self.outbound_lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        start
+
+        Starts listening for inbound connections. If the transport was
+        started before, then it listens on the same port as before so
+        remote nodes can still reach it.
+
+        @param None
+
+        @return None
+        """
+        if self.running:
+            raise Exception("ERROR: TCP transport is already running. Must call stop before calling start.")
+
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_socket.bind((self.host, self.port))
+        self.server_socket.listen()
+        self.port = self.server_socket.getsockname()[1]
+
+        self.running = True
+
+        thread = threading.Thread(target=self._accept_loop, args=(self.server_socket,))
+        thread.start()
+
+    def stop(self) -> None:
+        """
+        stop
+
+        Stops listening for connections and closes all open connections
+
+        @param None
+
+        @return None
+        """
+        self.running = False
+
+        if self.server_socket is not None:
+            self._close_socket(self.server_socket)
+            self.server_socket = None
+
+        with self.inbound_lock:
+            for inbound_socket in self.inbound_sockets:
+                self._close_socket(inbound_socket)
+            self.inbound_sockets = []
+
+        with self.outbound_lock:
+            for connection in self.outbound_connections.values():
+                with connection["LOCK"]:
+                    if connection["SOCKET"] is not None:
+                        self._close_socket(connection["SOCKET"])
+                        connection["SOCKET"] = None
+
+    def get_address(self) -> tuple:
+        """
+        get_address
+
+        Returns the address the transport is listening on
+
+        @param None
+
+        @return [tuple] The (host, port) address of the transport
+        """
+        return (self.host, self.port)
+
+    def send_frame(self, address: tuple, buffers: list) -> bool:
+        """
+        send_frame
+
+        Sends the given buffers as a single frame to the given address.
+        The buffers are written with scatter/gather sends, so they are
+        never joined into one copy. Reuses the persistent connection to
+        the address if one exists and reconnects if the connection has failed.
+
+        @param address [tuple] The (host, port) address to send the frame to
+        @param buffers [list] The bytes-like objects making up the frame data, in order
+
+        @return [bool] True if the frame was sent. False if all attempts to send it failed.
+        """
+        address = tuple(address)
+        with self.outbound_lock:
+            if address not in self.outbound_connections:
+                self.outbound_connections[address] = {"SOCKET": None, "LOCK": threading.Lock()}
+            connection = self.outbound_connections[address]
+
+        frame = [FRAME_HEADER.pack(sum(len(buffer) for buffer in buffers))] + list(buffers)
+        with connection["LOCK"]:
+            for attempt in range(self.reconnect_attempts + 1):
+                try:
+                    if (connection["SOCKET"] is not None) and self._peer_closed(connection["SOCKET"]):
+                        self._close_socket(connection["SOCKET"])
+                        connection["SOCKET"] = None
+                    if connection["SOCKET"] is None:
+                        connection["SOCKET"] = socket.create_connection(address)
+                        connection["SOCKET"].setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    self._send_buffers(connection["SOCKET"], frame)
+                    return True
+                except OSError:
+                    if connection["SOCKET"] is not None:
+                        self._close_socket(connection["SOCKET"])
+                        connection["SOCKET"] = None
+                    if attempt < self.reconnect_attempts:
+                        time.sleep(self.reconnect_delay_sec)
+
+        self.logger.error("ERROR: Unable to send frame to {} after {} reconnect attempts.".format(
+            address,
+            self.reconnect_attempts
+        ))
+        return False
+
+    def _accept_loop(self, server_socket: socket.socket) -> None:
+        """
+        _accept_loop
+
+        Accepts inbound connections until the listening socket is closed.
+        Starts a reader thread for each accepted connection.
+
+        @param server_socket [socket.socket] The listening socket
+
+        @return None
+        """
+        while self.running:
+            try:
+                inbound_socket, _ = server_socket.accept()
+            except OSError:
+                break
+
+            with self.inbound_lock:
+                if not self.running:
+                    self._close_socket(inbound_socket)
+                    break
+                self.inbound_sockets.append(inbound_socket)
+
+            thread = threading.Thread(target=self._reader_loop, args=(inbound_socket,))
+            thread.start()
+
+    def _reader_loop(self, inbound_socket: socket.socket) -> None:
+        """
+        _reader_loop
+
+        Reads frames from the given connection and passes them to the
+        frame handler until the connection is closed.
+
+        @param inbound_socket [socket.socket] The connection to read from
+
+        @return None
+        """
+        while True:
+            header = self._recv_exactly(inbound_socket, FRAME_HEADER.size)
+            if header is None:
+                break
+            data = self._recv_exactly(inbound_socket, FRAME_HEADER.unpack(header)[0])
+            if data is None:
+                break
+
+            try:
+                self.frame_handler(data)
+            except Exception:
+                self.logger.exception("ERROR: Failed to handle frame received over TCP.")
+
+        with self.inbound_lock:
+            if inbound_socket in self.inbound_sockets:
+                self.inbound_sockets.remove(inbound_socket)
+        self._close_socket(inbound_socket)
+
+    def _send_buffers(self, sock: socket.socket, buffers: list) -> None:
+        """
+        _send_buffers
+
+        Writes all of the given buffers to the given socket, resuming
+        after partial sends
+
+        @param sock [socket.socket] The socket to write to
+        @param buffers [list] The bytes-like objects to write, in order
+
+        @return None
+        """
+        views = [memoryview(buffer).cast("B") for buffer in buffers if len(buffer) > 0]
+        while len(views) > 0:
+            num_sent = sock.sendmsg(views)
+            while (len(views) > 0) and (num_sent >= len(views[0])):
+                num_sent -= len(views[0])
+                views.pop(0)
+            if num_sent > 0:
+                views[0] = views[0][num_sent:]
+
+    def _recv_exactly(self, sock: socket.socket, num_bytes: int) -> bytearray:
+        """
+        _recv_exactly
+
+        Reads exactly the given number of bytes from the given socket
+
+        @param sock [socket.socket] The socket to read from
+        @param num_bytes [int] The number of bytes to read
+
+        @return [bytearray] The bytes read. None if the connection was closed first.
+        """
+        buffer = bytearray(num_bytes)
+        view = memoryview(buffer)
+        num_read = 0
+        while num_read < num_bytes:
+            try:
+                chunk_size = sock.recv_into(view[num_read:], num_bytes - num_read)
+            except OSError:
+                return None
+            if chunk_size == 0:
+                return None
+            num_read += chunk_size
+        return buffer
+
+    def _peer_closed(self, sock: socket.socket) -> bool:
+        """
+        _peer_closed
+
+        Checks whether or not the remote end closed the given outbound
+        connection. Remote nodes never write to outbound connections, so
+        the connection being readable means it was closed.
+
+        @param sock [socket.socket] The outbound connection to check
+
+        @return [bool] True if the connection was closed by the remote end. False otherwise.
+        """
+        readable, _, _ = select.select([sock], [], [], 0)
+        return len(readable) > 0
+
+    def _close_socket(self, sock: socket.socket) -> None:
+        """
+        _close_socket
+
+        Shuts down and closes the given socket. Shutting the socket down
+        first wakes up any threads blocked reading from it.
+
+        @param sock [socket.socket] The socket to close
+
+        @return None
+        """
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
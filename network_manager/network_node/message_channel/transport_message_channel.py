@@ -0,0 +1,190 @@
+from abc import abstractmethod
+
+from network_manager.network_node.message_channel.message_channel import MessageChannel
+from network_manager.network_node.message_channel.message_channel_user import MessageChannelUser
+from network_manager.network_node.message_serializer.binary_message_serializer import BinaryMessageSerializer
+from network_manager.network_node.message_serializer.payload_compressor import PayloadCompressor
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+from network_manager.network_node.remote_network_node import RemoteNetworkNode
+
+"""
+TransportMessageChannel
+
+The abstract class for message channels that send serialized messages
+to nodes outside of the current process. Each node using one of these
+channel types owns an endpoint containing a transport object, which
+must provide start, stop, get_address and send_frame methods. Sub
+classes must define their own endpoints dict and endpoints_lock, and
+implement create_transport.
+
+Messages are serialized with the BinaryMessageSerializer. Payloads are
+pickled, so these channels must only be used between trusted nodes. If
+the source node sets the payload_compression config value, then each
+channel compresses payloads of at least payload_compression_threshold
+bytes and tracks the compression statistics of its link.
+"""
+
+
+class TransportMessageChannel(MessageChannel):
+    connects_processes = True
+    endpoints = None
+    endpoints_lock = None
+
+    def __init__(self, source_node: MessageChannelUser, target_node: MessageChannelUser):
+        """
+        __init__
+
+        Creates a new TransportMessageChannel object
+
+        @param source_node [MessageChannelUser] The MessageChannelUser sending the message
+        @param target_node [MessageChannelUser] The MessageChannelUser receiving the message
+
+        @return [TransportMessageChannel] The created TransportMessageChannel
+        """
+        if not isinstance(source_node, MessageChannelUser):
+            raise Exception("ERROR: Source node must implement the MessageChannelUser class")
+
+        if not isinstance(target_node, MessageChannelUser):
+            raise Exception("ERROR: target node must implement the MessageChannelUser class")
+
+        self.source_node = source_node
+        self.target_node = target_node
+
+        self.target_address = type(self).get_node_address(target_node)
+        if self.target_address is None:
+            raise Exception("ERROR: Unable to determine the {} address of node: {}".format(
+                type(self).__name__,
+                target_node.get_id()
+            ))
+
+        self.compressor = None
+        if source_node.config["payload_compression"] is not None:
+            self.compressor = PayloadCompressor(
+                source_node.config["payload_compression"],
+                source_node.config["payload_compression_threshold"]
+            )
+
+    def send_message(self, message: MessageWrapper) -> bool:
+        """
+        send_message
+
+        Send the given message accross the message channel
+
+        @param message [MessageWrapper] The message to send
+
+        @return [bool] True if the message was sent. False otherwise.
+        """
+        source_id = self.source_node.get_id()
+        if source_id not in type(self).endpoints:
+            raise Exception("ERROR: Node {} does not have a running {} endpoint.".format(source_id, type(self).__name__))
+
+        transport = type(self).endpoints[source_id]["TRANSPORT"]
+        return transport.send_frame(self.target_address, type(self).encode_message(message, self.compressor))
+
+    def get_compression_stats(self) -> dict:
+        """
+        get_compression_stats
+
+        Returns the compression statistics of the messages sent through the channel
+
+        @param None
+
+        @return [dict] The compression statistics. None if payloads are not compressed.
+        """
+        if self.compressor is None:
+            return None
+        return self.compressor.get_stats()
+
+    @classmethod
+    @abstractmethod
+    def create_transport(cls, owner_node) -> object:
+        """
+        create_transport
+
+        Creates the transport used by the given node to send and receive frames
+
+        @param owner_node [NetworkNode] The node the transport is for
+
+        @return [object] The created transport
+        """
+        pass
+
+    @classmethod
+    def setup_channel_endpoint(cls, owner_node) -> None:
+        """
+        setup_channel_endpoint
+
+        Creates the endpoint of the given node the first time it is
+        started and starts its transport
+
+        @param owner_node [NetworkNode] The node being started
+
+        @return None
+        """
+        node_id = owner_node.get_id()
+        with cls.endpoints_lock:
+            if node_id not in cls.endpoints:
+                cls.endpoints[node_id] = {"NODE": owner_node, "TRANSPORT": cls.create_transport(owner_node)}
+            cls.endpoints[node_id]["TRANSPORT"].start()
+
+    @classmethod
+    def teardown_channel_endpoint(cls, owner_node) -> None:
+        """
+        teardown_channel_endpoint
+
+        Stops the transport of the given node. The endpoint keeps its
+        address so the node can be started again on the same address.
+
+        @param owner_node [NetworkNode] The node being torn down
+
+        @return None
+        """
+        with cls.endpoints_lock:
+            if owner_node.get_id() in cls.endpoints:
+                cls.endpoints[owner_node.get_id()]["TRANSPORT"].stop()
+
+    @classmethod
+    def get_node_address(cls, node: MessageChannelUser) -> object:
+        """
+        get_node_address
+
+        Returns the address of the given node
+
+        @param node [MessageChannelUser] The node to get the address of
+
+        @return [object] The address of the node. None if the address is unknown.
+        """
+        if isinstance(node, RemoteNetworkNode):
+            return node.get_address()
+
+        node_id = node.get_id()
+        if node_id in cls.endpoints:
+            return cls.endpoints[node_id]["TRANSPORT"].get_address()
+        return None
+
+    @classmethod
+    def encode_message(cls, message: MessageWrapper, compressor: PayloadCompressor = None) -> list:
+        """
+        encode_message
+
+        Serializes the given message so it can be sent through the transport
+
+        @param message [MessageWrapper] The message to serialize
+        @param compressor [PayloadCompressor] The compressor used for large payloads. None to never compress.
+
+        @return [list] The buffers making up the serialized message
+        """
+        return BinaryMessageSerializer.encode_message(message, cls, compressor)
+
+    @classmethod
+    def decode_message(cls, frame: bytearray) -> MessageWrapper:
+        """
+        decode_message
+
+        Deserializes a message received through the transport
+
+        @param frame [bytearray] The serialized message
+
+        @return [MessageWrapper] The deserialized message
+        """
+        return BinaryMessageSerializer.decode_message(frame, cls)
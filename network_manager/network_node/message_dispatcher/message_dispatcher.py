@@ -0,0 +1,399 @@
+import threading
+import logging
+
+from collections import deque
+
+from network_manager.network_node.message_queue.message_queue import MessageQueue
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+
+"""
+MessageDispatcher
+
+Runs message handlers on a bounded pool of worker threads instead
+of creating a new thread for every received message. Workers are only
+started when messages are waiting and no worker is free, up to the pool
+size, and exit once they have been idle for the configured time, so an
+idle node holds no handler threads. Optionally, messages can be ordered
+by key. Messages whose payloads share the same value for one of the
+configured ordering keys are handled one at a time in the order they
+were dispatched, while messages with different keys are handled in parallel.
+
+Control messages (e.g. connection requests and responses to sync messages)
+are not ordered by key, but otherwise share the pool in dispatch order. If
+every pool worker is busy while control messages are waiting, then a
+reserved worker outside of the pool takes the waiting control messages in
+the order they were dispatched. Handlers that block until a control message
+arrives can then fill the whole pool without keeping the control message
+from being handled. Control message handlers must not block.
+
+The dispatcher can also be started without worker threads of its own.
+The owner is then responsible for calling run_next_work_item whenever
+work is added to the work queue, e.g. from a pool shared by many nodes.
+"""
+
+
+class MessageDispatcher(object):
+    def __init__(
+            self,
+            handler_method: object,
+            num_workers: int,
+            ordering_keys: list = None,
+            worker_idle_timeout_sec: float = 5
+            ):
+        """
+        __init__
+
+        Creates a new MessageDispatcher object
+
+        @param handler_method [Method] The method to call for each dispatched message
+        @param num_workers [int] The maximum number of worker threads used to handle messages
+        @param ordering_keys [list] The payload keys used to serialize related messages. None or empty to disable ordering.
+        @param worker_idle_timeout_sec [float] The number of seconds a worker waits for a message before it exits
+
+        @return [MessageDispatcher] The created MessageDispatcher
+        """
+        if num_workers <= 0:
+            raise Exception("ERROR: Message dispatcher must have at least one worker. Given: {}".format(num_workers))
+        if worker_idle_timeout_sec <= 0:
+            raise Exception("ERROR: Worker idle timeout must be positive. Given: {}".format(worker_idle_timeout_sec))
+
+        self.logger = logging.getLogger('NetworkNode')
+
+        self.handler_method = handler_method
+        self.num_workers = num_workers
+        self.ordering_keys = list(ordering_keys) if ordering_keys is not None else []
+        self.worker_idle_timeout_sec = worker_idle_timeout_sec
+
+        self.work_queue = MessageQueue()
+        self.pending_by_key = {}
+        self.pending_lock = threading.Lock()
+
+        self.workers_lock = threading.Lock()
+        self.num_running_workers = 0
+        self.num_idle_workers = 0
+        self.waiting_control_items = deque()
+        self.num_taken_control_items = 0
+        self.control_worker_running = False
+        self.use_worker_threads = False
+
+        self.stop_workers = None
+
+    def start(self, use_worker_threads: bool = True) -> None:
+        """
+        start
+
+        Starts handling dispatched messages. Worker threads are started
+        as messages are dispatched, beginning with any messages kept from
+        before the dispatcher was last stopped.
+
+        @param use_worker_threads [bool] True to start the dispatcher's own worker threads.
+            False if the owner will call run_next_work_item.
+
+        @return None
+        """
+        if self.stop_workers is not None:
+            raise Exception("ERROR: Message dispatcher is already running. Must call stop before calling start.")
+
+        with self.workers_lock:
+            self.stop_workers = threading.Event()
+            self.use_worker_threads = use_worker_threads
+        self.work_queue.open()
+        self._start_workers()
+
+    def stop(self) -> None:
+        """
+        stop
+
+        Stops the worker threads. Handlers that are currently running
+        are allowed to finish. Messages that have not been handled yet
+        are kept and will be handled once the dispatcher is started again.
+
+        @param None
+
+        @return None
+        """
+        with self.workers_lock:
+            if self.stop_workers is None:
+                return
+            self.stop_workers.set()
+            self.stop_workers = None
+        self.work_queue.close()
+
+    def dispatch(self, message: MessageWrapper, is_control_msg: bool = False) -> None:
+        """
+        dispatch
+
+        Schedules the given message to be handled by the worker pool. If the
+        message has an ordering key and another message with the same key is
+        queued or being handled, then this message is held until the earlier
+        message is done. Control messages are never held.
+
+        @param message [MessageWrapper] The message to handle
+        @param is_control_msg [bool] True if the message can be handled by the reserved worker. False otherwise.
+
+        @return None
+        """
+        if is_control_msg:
+            work_item = (None, message, True)
+            with self.workers_lock:
+                self.waiting_control_items.append(work_item)
+            self.work_queue.put(work_item)
+            self._start_workers()
+            return
+
+        key = self._get_ordering_key(message)
+        if key is not None:
+            with self.pending_lock:
+                if key in self.pending_by_key:
+                    self.pending_by_key[key].append(message)
+                    return
+                self.pending_by_key[key] = deque()
+
+        self.work_queue.put((key, message, False))
+        self._start_workers()
+
+    def run_next_work_item(self) -> bool:
+        """
+        run_next_work_item
+
+        Handles the next message in the work queue on the calling thread,
+        if the dispatcher is running and a message is available
+
+        @param None
+
+        @return [bool] True if a message was handled. False otherwise.
+        """
+        if self.stop_workers is None:
+            return False
+
+        work_item = self.work_queue.get(timeout=0)
+        if work_item is None:
+            return False
+
+        with self.workers_lock:
+            if not self._claim_work_item(work_item):
+                return False
+
+        self._handle_work_item(work_item)
+        return True
+
+    def set_work_listener(self, work_listener: object) -> None:
+        """
+        set_work_listener
+
+        Sets the method called once for each message added to the work
+        queue. The listener is also called once for each message that is
+        already in the work queue.
+
+        @param work_listener [Method] The method to call with no arguments. None to remove the listener.
+
+        @return None
+        """
+        self.work_queue.set_put_listener(work_listener)
+        if work_listener is not None:
+            for _ in range(self.work_queue.get_depth()):
+                work_listener()
+
+    def get_num_pending_messages(self) -> int:
+        """
+        get_num_pending_messages
+
+        Returns the number of messages waiting to be handled
+
+        @param None
+
+        @return [int] The number of messages waiting to be handled
+        """
+        with self.pending_lock:
+            num_held = sum(len(held_msgs) for held_msgs in self.pending_by_key.values())
+        with self.workers_lock:
+            num_queued = self.work_queue.get_depth() - self.num_taken_control_items
+        return num_queued + num_held
+
+    def get_num_workers(self) -> int:
+        """
+        get_num_workers
+
+        Returns the number of running worker threads, including the reserved worker
+
+        @param None
+
+        @return [int] The number of running worker threads
+        """
+        with self.workers_lock:
+            return self.num_running_workers + int(self.control_worker_running)
+
+    def _get_ordering_key(self, message: MessageWrapper) -> tuple:
+        """
+        _get_ordering_key
+
+        Returns the key used to order the given message. The key is
+        built from the first configured ordering key found in the payload.
+
+        @param message [MessageWrapper] The message to get the key for
+
+        @return [tuple] The ordering key. None if the message does not need to be ordered.
+        """
+        payload = message.get_message_payload()
+        if not isinstance(payload, dict):
+            return None
+
+        for ordering_key in self.ordering_keys:
+            if ordering_key in payload:
+                key = (ordering_key, payload[ordering_key])
+                try:
+                    hash(key)
+                except TypeError:
+                    return None
+                return key
+        return None
+
+    def _start_workers(self) -> None:
+        """
+        _start_workers
+
+        Starts a pool worker for each message that no free worker is waiting
+        for, up to the pool size. If every pool worker is busy while control
+        messages are waiting, then the reserved worker is started as well.
+
+        @param None
+
+        @return None
+        """
+        with self.workers_lock:
+            if (self.stop_workers is None) or (not self.use_worker_threads):
+                return
+
+            num_new_workers = min(
+                self.num_workers - self.num_running_workers,
+                self.work_queue.get_depth() - self.num_idle_workers
+            )
+            for _ in range(num_new_workers):
+                # A new worker is free until it takes a message, so it is counted as idle right away
+                self.num_running_workers += 1
+                self.num_idle_workers += 1
+                thread = threading.Thread(target=self._worker_loop, args=(self.stop_workers,))
+                thread.start()
+
+            pool_busy = (self.num_running_workers == self.num_workers) and (self.num_idle_workers == 0)
+            if pool_busy and (not self.control_worker_running) and (len(self.waiting_control_items) > 0):
+                self.control_worker_running = True
+                thread = threading.Thread(target=self._control_worker_loop, args=(self.stop_workers,))
+                thread.start()
+
+    def _worker_loop(self, stop_event: threading.Event) -> None:
+        """
+        _worker_loop
+
+        Handles messages from the work queue until the given stop event
+        is set or no message arrives within the idle timeout
+
+        @param stop_event [threading.Event] The event used to stop this worker
+
+        @return None
+        """
+        while True:
+            work_item = None
+            if not stop_event.is_set():
+                work_item = self.work_queue.get(timeout=self.worker_idle_timeout_sec)
+
+            with self.workers_lock:
+                # Checked while holding the lock, so a message dispatched at the same time starts a new worker instead
+                worker_exiting = (work_item is None) and (stop_event.is_set() or (self.work_queue.get_depth() == 0))
+                if worker_exiting or (work_item is not None):
+                    self.num_idle_workers -= 1
+                    if worker_exiting:
+                        self.num_running_workers -= 1
+                if (work_item is not None) and (not self._claim_work_item(work_item)):
+                    self.num_idle_workers += 1
+                    work_item = None
+
+            if worker_exiting:
+                if stop_event.is_set():
+                    # The dispatcher may have been started again while this worker was still counted as running
+                    self._start_workers()
+                return
+            if work_item is None:
+                continue
+
+            # Messages dispatched while this worker was still counted as idle may need a worker of their own,
+            # and control messages may need the reserved worker if this worker was the last free one
+            self._start_workers()
+            self._handle_work_item(work_item)
+            with self.workers_lock:
+                self.num_idle_workers += 1
+
+    def _control_worker_loop(self, stop_event: threading.Event) -> None:
+        """
+        _control_worker_loop
+
+        Handles the waiting control messages on the reserved worker until
+        there are none left or the given stop event is set
+
+        @param stop_event [threading.Event] The event used to stop this worker
+
+        @return None
+        """
+        while True:
+            with self.workers_lock:
+                if stop_event.is_set() or (len(self.waiting_control_items) == 0):
+                    self.control_worker_running = False
+                    break
+                work_item = self.waiting_control_items.popleft()
+                # The message is left in the work queue, where it is skipped by the pool
+                self.num_taken_control_items += 1
+
+            self._handle_work_item(work_item)
+
+        # The pool may have filled up again while this worker was still counted as running
+        self._start_workers()
+
+    def _claim_work_item(self, work_item: tuple) -> bool:
+        """
+        _claim_work_item
+
+        Claims the given work item, taken from the work queue, for the
+        calling worker. Control messages that the reserved worker has
+        already taken cannot be claimed. Must be called while holding
+        the workers lock.
+
+        @param work_item [tuple] The work item taken from the work queue
+
+        @return [bool] True if the work item should be handled. False if it was already taken.
+        """
+        if not work_item[2]:
+            return True
+
+        try:
+            self.waiting_control_items.remove(work_item)
+        except ValueError:
+            self.num_taken_control_items -= 1
+            return False
+        return True
+
+    def _handle_work_item(self, work_item: tuple) -> None:
+        """
+        _handle_work_item
+
+        Calls the handler method for the message in the given work item.
+        If the message is keyed, then the next held message with the same
+        key is released to the work queue.
+
+        @param work_item [tuple] The ordering key, the message to handle, and whether it is a control message
+
+        @return None
+        """
+        key, message, _ = work_item
+        try:
+            self.handler_method(message)
+        except Exception:
+            self.logger.exception("ERROR: Message handler raised an exception. Message type: {}".format(
+                message.get_message_type()
+            ))
+
+        if key is not None:
+            with self.pending_lock:
+                if len(self.pending_by_key[key]) > 0:
+                    self.work_queue.put((key, self.pending_by_key[key].popleft(), False))
+                else:
+                    self.pending_by_key.pop(key)
@@ -0,0 +1,19 @@
+from enum import Enum
+
+"""
+MessagePriority
+
+Enum for specifying the priority class of a message. Each message queue
+keeps one lane per priority class, and items in a lane with a higher
+priority are taken out of the queue before items in lanes with a lower
+priority.
+    - CONTROL: Latency critical messages (e.g. connection handshakes, teardowns and responses)
+    - NORMAL: Regular messages
+    - BULK: Large transfers that can wait (e.g. swarm memory transfers)
+"""
+
+
+class MessagePriority(Enum):
+    CONTROL = 1
+    NORMAL = 2
+    BULK = 3
@@ -0,0 +1,315 @@
+import threading
+
+from collections import deque
+
+from network_manager.network_node.message_queue.message_priority import MessagePriority
+from network_manager.network_node.message_queue.queue_full_policy import QueueFullPolicy
+
+"""
+MessageQueue
+
+Thread safe multi-level queue used by network nodes to store messages
+waiting to be sent or processed. The queue has one FIFO lane per
+MessagePriority, and items are taken from the lane with the highest
+priority that holds items. To keep a steady stream of high priority
+items from starving the lower lanes, a waiting lane is served anyway
+once starvation_limit items have been taken from other lanes while it
+was waiting. Adding and removing items are O(1) operations. The queue
+can optionally be bounded, in which case the QueueFullPolicy decides
+what happens when an item is added to a full queue. Tracks the depth
+and high water mark of the queue so the capacity can be sized
+appropriately. A put listener can be set to be notified whenever an
+item is added, which allows the queue to be consumed without a thread
+waiting on it, and a drop listener can be set to be notified whenever
+an item is dropped to make space.
+"""
+
+
+class MessageQueue(object):
+    def __init__(
+            self,
+            capacity: int = None,
+            full_policy: QueueFullPolicy = QueueFullPolicy.BLOCK,
+            starvation_limit: int = 8
+            ):
+        """
+        __init__
+
+        Creates a new MessageQueue object
+
+        @param capacity [int] The maximum number of items the queue can hold. None if the queue is unbounded.
+        @param full_policy [QueueFullPolicy] The policy to use when an item is added to a full queue
+        @param starvation_limit [int] The number of items taken from other lanes before a waiting lane is served
+
+        @return [MessageQueue] The created MessageQueue
+        """
+        if (capacity is not None) and (capacity <= 0):
+            raise Exception("ERROR: Message queue capacity must be a positive integer or None. Given: {}".format(capacity))
+
+        if not isinstance(full_policy, QueueFullPolicy):
+            raise Exception("ERROR: Unknown queue full policy: {}".format(full_policy))
+
+        if starvation_limit <= 0:
+            raise Exception("ERROR: Message queue starvation limit must be a positive integer. Given: {}".format(
+                starvation_limit
+            ))
+
+        self.capacity = capacity
+        self.full_policy = full_policy
+        self.starvation_limit = starvation_limit
+
+        self.lanes = [deque() for _ in MessagePriority]
+        self.lane_skips = [0 for _ in MessagePriority]
+        self.num_items = 0
+        self.queue_condition = threading.Condition()
+        self.closed = False
+
+        self.high_water_mark = 0
+        self.num_dropped = 0
+        self.num_rejected = 0
+
+        self.put_listener = None
+        self.drop_listener = None
+
+    def put(self, item: object, low_priority: bool = True, priority: MessagePriority = MessagePriority.NORMAL) -> bool:
+        """
+        put
+
+        Adds the given item to the end of the lane of the given priority.
+        If the queue is full, then the queue's full policy is applied.
+        Only items flagged as low priority can be dropped to make space.
+
+        @param item [object] The item to add to the queue
+        @param low_priority [bool] True if the item can be dropped to make space for newer items. False otherwise.
+        @param priority [MessagePriority] The priority class of the item
+
+        @return [bool] True if the item was added to the queue. False if the item was rejected.
+        """
+        item_dropped = False
+        item_added = False
+        with self.queue_condition:
+            if self._is_full():
+                if self.full_policy == QueueFullPolicy.BLOCK:
+                    while self._is_full() and (not self.closed):
+                        self.queue_condition.wait()
+                elif self.full_policy == QueueFullPolicy.DROP_OLDEST:
+                    item_dropped = self._drop_oldest_low_priority_item()
+
+            if self._is_full():
+                self.num_rejected += 1
+            else:
+                self.lanes[self._get_lane_index(priority)].append((item, low_priority))
+                self.num_items += 1
+                self.high_water_mark = max(self.high_water_mark, self.num_items)
+                self.queue_condition.notify_all()
+                item_added = True
+
+        # A dropped item is reported even if the new item is rejected, so whoever added it can release it
+        drop_listener = self.drop_listener
+        if item_dropped and (drop_listener is not None):
+            drop_listener()
+
+        put_listener = self.put_listener
+        if item_added and (put_listener is not None):
+            put_listener()
+        return item_added
+
+    def get(self, timeout: float = None) -> object:
+        """
+        get
+
+        Removes and returns the item at the front of the highest priority
+        lane that holds items, unless a lower lane has been starved. If the
+        queue is empty, then this method waits until an item is available,
+        the timeout is hit, or the queue is closed.
+
+        @param timeout [float] The maximum number of seconds to wait for an item. None to wait indefinitely.
+
+        @return [object] The item at the front of the queue. None if no item became available.
+        """
+        with self.queue_condition:
+            if not self.queue_condition.wait_for(lambda: (self.num_items > 0) or self.closed, timeout=timeout):
+                return None
+
+            if self.num_items == 0:
+                return None
+
+            item, _ = self.lanes[self._choose_lane()].popleft()
+            self.num_items -= 1
+            self.queue_condition.notify_all()
+            return item
+
+    def open(self) -> None:
+        """
+        open
+
+        Opens the queue so that calls to get will wait for new items.
+
+        @param None
+
+        @return None
+        """
+        with self.queue_condition:
+            self.closed = False
+
+    def close(self) -> None:
+        """
+        close
+
+        Closes the queue. Any threads waiting on the queue are
+        woken up and calls to get will no longer wait for new items.
+        Items already in the queue are kept.
+
+        @param None
+
+        @return None
+        """
+        with self.queue_condition:
+            self.closed = True
+            self.queue_condition.notify_all()
+
+    def set_put_listener(self, put_listener: object) -> None:
+        """
+        set_put_listener
+
+        Sets the method called after each item is added to the queue.
+        The listener is called without holding the queue condition.
+
+        @param put_listener [Method] The method to call with no arguments. None to remove the listener.
+
+        @return None
+        """
+        self.put_listener = put_listener
+
+    def set_drop_listener(self, drop_listener: object) -> None:
+        """
+        set_drop_listener
+
+        Sets the method called after an item is dropped to make space for
+        a new item. The listener is called without holding the queue condition.
+
+        @param drop_listener [Method] The method to call with no arguments. None to remove the listener.
+
+        @return None
+        """
+        self.drop_listener = drop_listener
+
+    def get_depth(self) -> int:
+        """
+        get_depth
+
+        Returns the number of items currently in the queue
+
+        @param None
+
+        @return [int] The number of items in the queue
+        """
+        return self.num_items
+
+    def get_high_water_mark(self) -> int:
+        """
+        get_high_water_mark
+
+        Returns the largest number of items that have been in the queue at once
+
+        @param None
+
+        @return [int] The high water mark of the queue
+        """
+        return self.high_water_mark
+
+    def get_stats(self) -> dict:
+        """
+        get_stats
+
+        Returns a dictionary containing the current statistics of the queue
+
+        @param None
+
+        @return [dict] The queue statistics
+        """
+        with self.queue_condition:
+            return {
+                "DEPTH": self.num_items,
+                "LANE_DEPTHS": {priority.name: len(self.lanes[i]) for i, priority in enumerate(MessagePriority)},
+                "CAPACITY": self.capacity,
+                "HIGH_WATER_MARK": self.high_water_mark,
+                "NUM_DROPPED": self.num_dropped,
+                "NUM_REJECTED": self.num_rejected
+            }
+
+    def __len__(self) -> int:
+        return self.num_items
+
+    def _is_full(self) -> bool:
+        """
+        _is_full
+
+        Checks whether or not the queue is at capacity. Must be called
+        while holding the queue condition.
+
+        @param None
+
+        @return [bool] True if the queue is at capacity. False otherwise.
+        """
+        return (self.capacity is not None) and (self.num_items >= self.capacity)
+
+    def _get_lane_index(self, priority: MessagePriority) -> int:
+        """
+        _get_lane_index
+
+        Returns the index of the lane holding items of the given priority
+
+        @param priority [MessagePriority] The priority class
+
+        @return [int] The index of the lane
+        """
+        return priority.value - MessagePriority.CONTROL.value
+
+    def _choose_lane(self) -> int:
+        """
+        _choose_lane
+
+        Chooses the lane to take the next item from. This is the highest
+        priority lane holding items, unless a lower lane holding items has
+        been passed over starvation_limit times. Must be called while
+        holding the queue condition, with at least one item in the queue.
+
+        @param None
+
+        @return [int] The index of the chosen lane
+        """
+        waiting_lanes = [i for i in range(len(self.lanes)) if len(self.lanes[i]) > 0]
+
+        chosen_lane = waiting_lanes[0]
+        for i in waiting_lanes[1:]:
+            if self.lane_skips[i] >= self.starvation_limit:
+                chosen_lane = i
+                break
+
+        for i in range(len(self.lanes)):
+            if (i == chosen_lane) or (i not in waiting_lanes):
+                self.lane_skips[i] = 0
+            else:
+                self.lane_skips[i] += 1
+        return chosen_lane
+
+    def _drop_oldest_low_priority_item(self) -> bool:
+        """
+        _drop_oldest_low_priority_item
+
+        Removes the oldest low priority item from the lowest priority lane
+        holding one. Must be called while holding the queue condition.
+
+        @param None
+
+        @return [bool] True if an item was dropped. False if the queue holds no low priority items.
+        """
+        for lane in reversed(self.lanes):
+            for i in range(len(lane)):
+                if lane[i][1]:
+                    del lane[i]
+                    self.num_items -= 1
+                    self.num_dropped += 1
+                    return True
+        return False
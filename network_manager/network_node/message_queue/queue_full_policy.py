@@ -0,0 +1,17 @@
+from enum import Enum
+
+"""
+QueueFullPolicy
+
+Enum for specifying how a MessageQueue should behave when
+a new item is added while the queue is at capacity.
+    - BLOCK: Block the caller until space is available in the queue
+    - DROP_OLDEST: Drop the oldest low priority item in the queue to make space for the new item
+    - REJECT: Reject the new item
+"""
+
+
+class QueueFullPolicy(Enum):
+    BLOCK = 1
+    DROP_OLDEST = 2
+    REJECT = 3
@@ -0,0 +1,412 @@
+import io
+import pickle
+import struct
+
+from network_manager.network_node.message_serializer.encoded_payload import EncodedPayload
+from network_manager.network_node.message_serializer.node_reference_pickler import NodeReferencePickler
+from network_manager.network_node.message_serializer.node_reference_pickler import OutOfBandBytes
+from network_manager.network_node.message_serializer.node_reference_pickler import OUT_OF_BAND_MIN_SIZE
+from network_manager.network_node.message_serializer.payload_compressor import PayloadCompressor
+from network_manager.network_node.message_tracking.seen_digest import SeenDigest
+from network_manager.network_node.message_tracking.trace_event import TraceEvent
+from network_manager.network_node.message_queue.message_priority import MessagePriority
+from network_manager.network_node.message_wrapper.message_batch_wrapper import MessageBatchWrapper
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+from network_manager.network_node.message_wrapper.remote_message_wrapper import RemoteMessageWrapper
+from network_manager.network_node.network_node_message_types import NetworkNodeMessageTypes
+
+"""
+BinaryMessageSerializer
+
+Converts MessageWrapper objects to and from the binary wire format used
+by the TransportMessageChannel types. A serialized message is made up of:
+    - A fixed size header holding the message ID, sender ID, target ID,
+      message type kind, flags (propagation, acknowledgement requested, seen
+      digest, hop limit, topic routing, compression and tracing), the
+      priority the message was sent with, the number of hops left, and the
+      sizes of the sections below
+    - The size of each out-of-band buffer
+    - The node IDs in the seen digest of the message, if it carries one
+    - The trace spans of the message, if it is traced
+    - The message type. Network node message types are stored as their
+      value in the header, so this section is only used for other types.
+    - The payload, pickled with protocol 5
+    - The out-of-band buffers of the payload (e.g. numpy arrays, and large
+      bytes values stored directly in the payload dict), which are never
+      copied into the pickled data
+
+If a PayloadCompressor is given, then the payload and its out-of-band
+buffers may be compressed together into a single payload section. The
+out-of-band buffer sizes still describe the uncompressed buffers, which
+are sliced from the payload once it is decompressed.
+
+Messages are encoded into a list of buffers so transports can write them
+without joining them first. Decoding slices the received frame without
+copying it, and leaves the payload encoded until it is first requested.
+A message batch stores the encoded messages it contains as its payload.
+"""
+
+HEADER = struct.Struct("!QQQQBBBHHQHHI")
+SIZE = struct.Struct("!Q")
+TRACE_SPAN = struct.Struct("!QQBd")
+
+PROPAGATION_FLAG = 0x01
+ACK_REQUESTED_FLAG = 0x02
+SEEN_DIGEST_FLAG = 0x04
+HOP_LIMIT_FLAG = 0x08
+TOPIC_ROUTED_FLAG = 0x10
+COMPRESSED_FLAG = 0x20
+TRACED_FLAG = 0x40
+
+TYPE_KIND_NETWORK_NODE = 1
+TYPE_KIND_STR = 2
+TYPE_KIND_PICKLED = 3
+
+
+class BinaryMessageSerializer(object):
+    @classmethod
+    def encode_message(cls, message: MessageWrapper, channel_type: type, compressor: PayloadCompressor = None) -> list:
+        """
+        encode_message
+
+        Serializes the given message
+
+        @param message [MessageWrapper] The message to serialize
+        @param channel_type [type] The TransportMessageChannel sub class the message will be sent through
+        @param compressor [PayloadCompressor] The compressor used for large payloads. None to never compress.
+
+        @return [list] The buffers making up the serialized message, in order
+        """
+        message_type = message.get_message_type()
+        type_kind, type_data = cls._encode_message_type(message_type)
+
+        if isinstance(message, MessageBatchWrapper):
+            payload_buffers = []
+            for batched_msg in message.get_messages():
+                batched_buffers = cls.encode_message(batched_msg, channel_type)
+                payload_buffers.append(SIZE.pack(sum(len(buffer) for buffer in batched_buffers)))
+                payload_buffers.extend(batched_buffers)
+            out_of_band_buffers = []
+        else:
+            payload_data, out_of_band_buffers = cls._encode_payload(message.get_raw_payload(), channel_type)
+            payload_buffers = [payload_data]
+
+        origin_id, seq_num = message.get_id()
+        flags, seen_node_ids, hops_left, trace_spans = cls._encode_flags(message)
+        num_buffers = len(out_of_band_buffers)
+        buffer_sizes = b"".join(SIZE.pack(len(buffer)) for buffer in out_of_band_buffers)
+        if compressor is not None:
+            compressed_data = compressor.compress(payload_buffers + out_of_band_buffers)
+            if compressed_data is not None:
+                flags |= COMPRESSED_FLAG
+                payload_buffers = [compressed_data]
+                out_of_band_buffers = []
+        priority_value = 0 if message.get_priority() is None else message.get_priority().value
+        header = HEADER.pack(
+            origin_id,
+            seq_num,
+            message.get_sender_id(),
+            message.get_target_node_id(),
+            type_kind,
+            flags,
+            priority_value,
+            message_type.value if type_kind == TYPE_KIND_NETWORK_NODE else len(type_data),
+            hops_left,
+            sum(len(buffer) for buffer in payload_buffers),
+            num_buffers,
+            len(seen_node_ids),
+            len(trace_spans)
+        )
+        seen_digest_data = b"".join(SIZE.pack(node_id) for node_id in seen_node_ids)
+        trace_data = cls._encode_trace_spans(trace_spans)
+
+        return [header + buffer_sizes + seen_digest_data + trace_data + type_data] + payload_buffers + out_of_band_buffers
+
+    @classmethod
+    def decode_message(cls, frame: memoryview, channel_type: type) -> MessageWrapper:
+        """
+        decode_message
+
+        Deserializes a message from the given frame. The payload is not
+        decoded until it is first requested.
+
+        @param frame [memoryview] The serialized message
+        @param channel_type [type] The TransportMessageChannel sub class the message was received through
+
+        @return [MessageWrapper] The deserialized message
+        """
+        frame = memoryview(frame)
+        (
+            origin_id,
+            seq_num,
+            sender_id,
+            target_node_id,
+            type_kind,
+            flags,
+            priority_value,
+            type_field,
+            hops_left,
+            payload_size,
+            num_buffers,
+            num_seen_node_ids,
+            num_trace_spans
+        ) = HEADER.unpack_from(frame, 0)
+        offset = HEADER.size
+
+        buffer_sizes, offset = cls._decode_sizes(frame, offset, num_buffers)
+        seen_node_ids, offset = cls._decode_sizes(frame, offset, num_seen_node_ids)
+        trace_spans, offset = cls._decode_trace_spans(frame, offset, num_trace_spans)
+        message_type, offset = cls._decode_message_type(frame, offset, type_kind, type_field)
+
+        payload_data = frame[offset:offset + payload_size]
+        offset += payload_size
+        if flags & COMPRESSED_FLAG:
+            # The out-of-band buffers follow the pickled payload in the decompressed data
+            frame = PayloadCompressor.decompress(payload_data)
+            offset = len(frame) - sum(buffer_sizes)
+            payload_data = frame[:offset]
+
+        msg_id = (origin_id, seq_num)
+        if message_type == NetworkNodeMessageTypes.MESSAGE_BATCH:
+            message = MessageBatchWrapper(msg_id, sender_id, target_node_id, cls._decode_batch(payload_data, channel_type))
+        else:
+            out_of_band_buffers = []
+            for buffer_size in buffer_sizes:
+                out_of_band_buffers.append(frame[offset:offset + buffer_size])
+                offset += buffer_size
+
+            message = RemoteMessageWrapper(
+                msg_id,
+                sender_id,
+                target_node_id,
+                message_type,
+                EncodedPayload(payload_data, out_of_band_buffers, channel_type),
+                bool(flags & PROPAGATION_FLAG)
+            )
+
+        cls._decode_flags(message, flags, seen_node_ids, hops_left, trace_spans)
+        if priority_value != 0:
+            message.set_priority(MessagePriority(priority_value))
+        return message
+
+    @classmethod
+    def _encode_message_type(cls, message_type: object) -> tuple:
+        """
+        _encode_message_type
+
+        Serializes the given message type. Network node message types are
+        stored in the header, so they need no data of their own.
+
+        @param message_type [object] The message type to serialize
+
+        @return [tuple] The type kind and the serialized message type
+        """
+        if isinstance(message_type, NetworkNodeMessageTypes):
+            return (TYPE_KIND_NETWORK_NODE, b"")
+        if isinstance(message_type, str):
+            return (TYPE_KIND_STR, message_type.encode())
+        return (TYPE_KIND_PICKLED, pickle.dumps(message_type, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @classmethod
+    def _encode_flags(cls, message: MessageWrapper) -> tuple:
+        """
+        _encode_flags
+
+        Builds the header flags of the given message, along with the
+        optional values that the flags mark as present
+
+        @param message [MessageWrapper] The message to build the flags of
+
+        @return [tuple] The flags, the seen digest node IDs, the number of hops left, and the trace spans
+        """
+        flags = PROPAGATION_FLAG if message.get_propagation_flag() else 0
+        if message.get_ack_requested():
+            flags |= ACK_REQUESTED_FLAG
+        seen_node_ids = []
+        if message.get_seen_digest() is not None:
+            flags |= SEEN_DIGEST_FLAG
+            seen_node_ids = message.get_seen_digest().get_node_ids()
+        hops_left = 0
+        if message.get_hops_left() is not None:
+            flags |= HOP_LIMIT_FLAG
+            hops_left = message.get_hops_left()
+        if message.is_topic_routed():
+            flags |= TOPIC_ROUTED_FLAG
+        trace_spans = []
+        if message.is_traced():
+            flags |= TRACED_FLAG
+            trace_spans = message.get_trace_spans()
+        return (flags, seen_node_ids, hops_left, trace_spans)
+
+    @classmethod
+    def _encode_trace_spans(cls, trace_spans: list) -> bytes:
+        """
+        _encode_trace_spans
+
+        Serializes the given trace spans
+
+        @param trace_spans [list] The trace spans to serialize
+
+        @return [bytes] The serialized trace spans
+        """
+        return b"".join(
+            TRACE_SPAN.pack(node_id, sender_id, trace_event.value, span_time)
+            for node_id, sender_id, trace_event, span_time in trace_spans
+        )
+
+    @classmethod
+    def _decode_sizes(cls, frame: memoryview, offset: int, num_sizes: int) -> tuple:
+        """
+        _decode_sizes
+
+        Deserializes the given number of size fields from the frame
+
+        @param frame [memoryview] The serialized message
+        @param offset [int] The offset of the first size field
+        @param num_sizes [int] The number of size fields to read
+
+        @return [tuple] The values read, and the offset following them
+        """
+        sizes = []
+        for _ in range(num_sizes):
+            sizes.append(SIZE.unpack_from(frame, offset)[0])
+            offset += SIZE.size
+        return (sizes, offset)
+
+    @classmethod
+    def _decode_trace_spans(cls, frame: memoryview, offset: int, num_trace_spans: int) -> tuple:
+        """
+        _decode_trace_spans
+
+        Deserializes the given number of trace spans from the frame
+
+        @param frame [memoryview] The serialized message
+        @param offset [int] The offset of the first trace span
+        @param num_trace_spans [int] The number of trace spans to read
+
+        @return [tuple] The trace spans, and the offset following them
+        """
+        trace_spans = []
+        for _ in range(num_trace_spans):
+            node_id, span_sender_id, trace_event_value, span_time = TRACE_SPAN.unpack_from(frame, offset)
+            trace_spans.append((node_id, span_sender_id, TraceEvent(trace_event_value), span_time))
+            offset += TRACE_SPAN.size
+        return (trace_spans, offset)
+
+    @classmethod
+    def _decode_message_type(cls, frame: memoryview, offset: int, type_kind: int, type_field: int) -> tuple:
+        """
+        _decode_message_type
+
+        Deserializes the message type from the frame
+
+        @param frame [memoryview] The serialized message
+        @param offset [int] The offset of the message type section
+        @param type_kind [int] The type kind stored in the header
+        @param type_field [int] The type field stored in the header. The type value or the size of the type section.
+
+        @return [tuple] The message type, and the offset following the message type section
+        """
+        if type_kind == TYPE_KIND_NETWORK_NODE:
+            return (NetworkNodeMessageTypes(type_field), offset)
+        if type_kind == TYPE_KIND_STR:
+            return (str(frame[offset:offset + type_field], "utf-8"), offset + type_field)
+        if type_kind == TYPE_KIND_PICKLED:
+            return (pickle.loads(frame[offset:offset + type_field]), offset + type_field)
+        raise Exception("ERROR: Unknown message type kind in serialized message: {}".format(type_kind))
+
+    @classmethod
+    def _decode_flags(
+            cls,
+            message: MessageWrapper,
+            flags: int,
+            seen_node_ids: list,
+            hops_left: int,
+            trace_spans: list
+            ) -> None:
+        """
+        _decode_flags
+
+        Sets the values marked by the given header flags on the decoded message
+
+        @param message [MessageWrapper] The decoded message
+        @param flags [int] The header flags
+        @param seen_node_ids [list] The node IDs in the seen digest section
+        @param hops_left [int] The number of hops left stored in the header
+        @param trace_spans [list] The trace spans in the trace section
+
+        @return None
+        """
+        message.set_ack_requested(bool(flags & ACK_REQUESTED_FLAG))
+        if flags & SEEN_DIGEST_FLAG:
+            message.set_seen_digest(SeenDigest(seen_node_ids))
+        if flags & HOP_LIMIT_FLAG:
+            message.set_hops_left(hops_left)
+        message.set_topic_routed(bool(flags & TOPIC_ROUTED_FLAG))
+        if flags & TRACED_FLAG:
+            message.set_trace_spans(trace_spans)
+
+    @classmethod
+    def _encode_payload(cls, payload: object, channel_type: type) -> tuple:
+        """
+        _encode_payload
+
+        Pickles the given payload. If the payload was received through the
+        same channel type, then its original data and buffers are reused.
+
+        @param payload [object] The payload to pickle. Either a dict or an EncodedPayload.
+        @param channel_type [type] The TransportMessageChannel sub class the payload will be sent through
+
+        @return [tuple] The pickled data and the list of out-of-band buffers
+        """
+        if isinstance(payload, EncodedPayload):
+            if payload.channel_type is channel_type:
+                return (payload.data, payload.buffers)
+            payload = payload.decode()
+
+        if isinstance(payload, dict) and \
+                any((type(value) is bytes) and (len(value) >= OUT_OF_BAND_MIN_SIZE) for value in payload.values()):
+            payload = {
+                key: OutOfBandBytes(value) if (type(value) is bytes) and (len(value) >= OUT_OF_BAND_MIN_SIZE) else value
+                for key, value in payload.items()
+            }
+
+        out_of_band_buffers = []
+
+        def buffer_callback(pickle_buffer: pickle.PickleBuffer) -> bool:
+            try:
+                out_of_band_buffers.append(pickle_buffer.raw())
+            except BufferError:
+                # Non contiguous buffers must be copied into the pickled data
+                return True
+            return False
+
+        data = io.BytesIO()
+        NodeReferencePickler(
+            data,
+            channel_type,
+            protocol=5,
+            buffer_callback=buffer_callback
+        ).dump(payload)
+        return (data.getbuffer(), out_of_band_buffers)
+
+    @classmethod
+    def _decode_batch(cls, payload_data: memoryview, channel_type: type) -> list:
+        """
+        _decode_batch
+
+        Deserializes the messages contained in a message batch
+
+        @param payload_data [memoryview] The payload of the message batch
+        @param channel_type [type] The TransportMessageChannel sub class the batch was received through
+
+        @return [list] The messages in the batch, in order
+        """
+        messages = []
+        offset = 0
+        while offset < len(payload_data):
+            message_size = SIZE.unpack_from(payload_data, offset)[0]
+            offset += SIZE.size
+            messages.append(cls.decode_message(payload_data[offset:offset + message_size], channel_type))
+            offset += message_size
+        return messages
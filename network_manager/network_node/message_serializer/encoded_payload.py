@@ -0,0 +1,94 @@
+import io
+import threading
+
+from network_manager.network_node.message_serializer.node_reference_pickler import NodeReferenceUnpickler
+
+"""
+EncodedPayload
+
+Message payload that has been received in its serialized form and has
+not been decoded yet. The payload is only decoded the first time it is
+requested, so nodes that only relay a message never pay for decoding
+it. Relayed messages keep the EncodedPayload, which lets the serializer
+send the original bytes and buffers again without re-encoding them.
+"""
+
+
+class EncodedPayload(object):
+    def __init__(self, data: memoryview, buffers: list, channel_type: type):
+        """
+        __init__
+
+        Creates a new EncodedPayload object
+
+        @param data [memoryview] The pickled payload
+        @param buffers [list] The out-of-band buffers of the pickled payload
+        @param channel_type [type] The TransportMessageChannel sub class the payload was received through
+
+        @return [EncodedPayload] The created EncodedPayload
+        """
+        self.data = data
+        self.buffers = buffers
+        self.channel_type = channel_type
+
+        self.decoded_payload = None
+        self.is_decoded = False
+        self.decode_lock = threading.Lock()
+
+    def decode(self) -> dict:
+        """
+        decode
+
+        Returns the decoded payload. The payload is decoded on the first call
+        and the result is reused for every later call.
+
+        @param None
+
+        @return [dict] The decoded payload
+        """
+        with self.decode_lock:
+            if not self.is_decoded:
+                self.decoded_payload = NodeReferenceUnpickler(
+                    io.BytesIO(self.data),
+                    self.channel_type,
+                    buffers=self.buffers
+                ).load()
+                self.is_decoded = True
+            return self.decoded_payload
+
+    def get_encoded_size(self) -> int:
+        """
+        get_encoded_size
+
+        Returns the total size of the serialized payload
+
+        @param None
+
+        @return [int] The number of bytes in the pickled data and the out-of-band buffers
+        """
+        return len(self.data) + sum(len(buffer) for buffer in self.buffers)
+
+    def __reduce__(self) -> tuple:
+        """
+        __reduce__
+
+        Pickles the payload in its decoded form, since the encoded form
+        refers to memory owned by the receiving transport
+
+        @param None
+
+        @return [tuple] The reduce value of the decoded payload
+        """
+        return (dict, (self.decode(),))
+
+    def __repr__(self) -> str:
+        """
+        __repr__
+
+        Describes the payload without decoding it
+
+        @param None
+
+        @return [str] The description of the payload
+        """
+        return "<EncodedPayload {} bytes>".format(self.get_encoded_size())
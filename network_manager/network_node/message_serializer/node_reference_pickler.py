@@ -0,0 +1,123 @@
+import io
+import pickle
+
+from network_manager.network_node.message_channel.message_channel_user import MessageChannelUser
+from network_manager.network_node.remote_network_node import RemoteNetworkNode
+
+"""
+NodeReferencePickler
+
+Pickler and Unpickler used to serialize message payloads sent to nodes
+in other processes. Any network node referenced in a payload (e.g. the
+node in a connection request) is sent as a reference containing its ID
+and address, and is loaded on the receiving side as either the local
+node with that ID or a RemoteNetworkNode. Large bytearray objects and
+OutOfBandBytes wrappers are passed to the buffer callback as out-of-band
+buffers, the same way pickle protocol 5 already handles numpy arrays.
+Pickle never lets bytes objects be overridden, so they must be wrapped
+in OutOfBandBytes to be sent out-of-band.
+
+Since pickle can execute arbitrary code when loading, payloads must
+only be loaded from trusted nodes.
+"""
+
+OUT_OF_BAND_MIN_SIZE = 1024
+
+
+class OutOfBandBytes(object):
+    def __init__(self, data: bytes):
+        """
+        __init__
+
+        Creates a new OutOfBandBytes object
+
+        @param data [bytes] The bytes to send as an out-of-band buffer
+
+        @return [OutOfBandBytes] The created OutOfBandBytes
+        """
+        self.data = data
+
+
+class NodeReferencePickler(pickle.Pickler):
+    def __init__(self, file: io.BytesIO, channel_type: type, **kwargs):
+        """
+        __init__
+
+        Creates a new NodeReferencePickler object
+
+        @param file [io.BytesIO] The file to write the pickled data to
+        @param channel_type [type] The TransportMessageChannel sub class used to look up node addresses
+        @param kwargs [dict] Additional arguments passed to pickle.Pickler
+
+        @return [NodeReferencePickler] The created NodeReferencePickler
+        """
+        super().__init__(file, **kwargs)
+        self.channel_type = channel_type
+
+    def persistent_id(self, obj: object) -> tuple:
+        """
+        persistent_id
+
+        Replaces network nodes with references containing their ID and address
+
+        @param obj [object] The object being pickled
+
+        @return [tuple] The reference to the node. None if the object is not a node.
+        """
+        if isinstance(obj, MessageChannelUser):
+            return ("NETWORK_NODE", obj.get_id(), self.channel_type.get_node_address(obj))
+        return None
+
+    def reducer_override(self, obj: object) -> tuple:
+        """
+        reducer_override
+
+        Pickles large bytearray objects and OutOfBandBytes wrappers through
+        a PickleBuffer so they are passed to the buffer callback instead of
+        being copied into the pickled data. Wrapped bytes are loaded as bytes.
+
+        @param obj [object] The object being pickled
+
+        @return [tuple] The reduce value for the object. NotImplemented to pickle the object normally.
+        """
+        if isinstance(obj, OutOfBandBytes):
+            return (bytes, (pickle.PickleBuffer(obj.data),))
+        if (type(obj) is bytearray) and (len(obj) >= OUT_OF_BAND_MIN_SIZE):
+            return (bytearray, (pickle.PickleBuffer(obj),))
+        return NotImplemented
+
+
+class NodeReferenceUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, channel_type: type, **kwargs):
+        """
+        __init__
+
+        Creates a new NodeReferenceUnpickler object
+
+        @param file [io.BytesIO] The file to read the pickled data from
+        @param channel_type [type] The TransportMessageChannel sub class used to look up local nodes
+        @param kwargs [dict] Additional arguments passed to pickle.Unpickler
+
+        @return [NodeReferenceUnpickler] The created NodeReferenceUnpickler
+        """
+        super().__init__(file, **kwargs)
+        self.channel_type = channel_type
+
+    def persistent_load(self, pid: tuple) -> MessageChannelUser:
+        """
+        persistent_load
+
+        Loads a node reference as the local node with the referenced ID
+        if one exists, otherwise as a RemoteNetworkNode.
+
+        @param pid [tuple] The node reference
+
+        @return [MessageChannelUser] The referenced node
+        """
+        ref_type, node_id, address = pid
+        if ref_type != "NETWORK_NODE":
+            raise pickle.UnpicklingError("ERROR: Unknown persistent reference type: {}".format(ref_type))
+
+        if node_id in self.channel_type.endpoints:
+            return self.channel_type.endpoints[node_id]["NODE"]
+        return RemoteNetworkNode(node_id, address)
@@ -0,0 +1,133 @@
+import threading
+import time
+import lzma
+import zlib
+
+"""
+PayloadCompressor
+
+Compresses the payload section of serialized messages sent through a
+TransportMessageChannel. Only payloads of at least the threshold size
+are compressed, since compressing small payloads costs more CPU time
+than it saves in transfer time. A payload that does not get smaller
+(e.g. data that is already compressed) is sent uncompressed.
+
+Only codecs from the standard library are supported, so any node can
+decompress a payload without knowing how the sender was configured. The
+codec used is stored in front of the compressed data. Each channel owns
+its own compressor, which tracks the compression statistics of its link.
+"""
+
+CODECS = {
+    "zlib": (1, zlib.compress, zlib.decompress),
+    "lzma": (2, lzma.compress, lzma.decompress)
+}
+
+CODEC_DECOMPRESSORS = {codec_id: decompress_method for codec_id, _, decompress_method in CODECS.values()}
+
+
+class PayloadCompressor(object):
+    def __init__(self, codec_name: str, threshold: int):
+        """
+        __init__
+
+        Creates a new PayloadCompressor object
+
+        @param codec_name [str] The name of the codec used to compress payloads. One of: zlib, lzma
+        @param threshold [int] The minimum size in bytes of the payloads to compress
+
+        @return [PayloadCompressor] The created PayloadCompressor
+        """
+        if codec_name not in CODECS:
+            raise Exception("ERROR: Unknown payload compression codec: {}. Known codecs: {}".format(
+                codec_name,
+                list(CODECS.keys())
+            ))
+
+        if threshold < 0:
+            raise Exception("ERROR: Payload compression threshold must not be negative. Given: {}".format(threshold))
+
+        self.codec_name = codec_name
+        self.codec_id, self.compress_method, _ = CODECS[codec_name]
+        self.threshold = threshold
+
+        self.stats_lock = threading.Lock()
+        self.num_compressed = 0
+        self.num_below_threshold = 0
+        self.num_incompressible = 0
+        self.original_size = 0
+        self.compressed_size = 0
+        self.compression_time = 0.0
+
+    def compress(self, buffers: list) -> bytes:
+        """
+        compress
+
+        Compresses the given payload buffers into a single buffer if they
+        are at least the threshold size and get smaller when compressed
+
+        @param buffers [list] The buffers making up the payload, in order
+
+        @return [bytes] The codec ID followed by the compressed payload. None if the payload is sent uncompressed.
+        """
+        payload_size = sum(len(buffer) for buffer in buffers)
+        if payload_size < self.threshold:
+            with self.stats_lock:
+                self.num_below_threshold += 1
+            return None
+
+        start_time = time.time()
+        compressed_data = self.compress_method(b"".join(buffers))
+        compression_time = time.time() - start_time
+
+        with self.stats_lock:
+            self.compression_time += compression_time
+            if len(compressed_data) + 1 >= payload_size:
+                self.num_incompressible += 1
+                return None
+
+            self.num_compressed += 1
+            self.original_size += payload_size
+            self.compressed_size += len(compressed_data) + 1
+        return bytes([self.codec_id]) + compressed_data
+
+    @classmethod
+    def decompress(cls, data: memoryview) -> memoryview:
+        """
+        decompress
+
+        Decompresses a payload compressed by a PayloadCompressor
+
+        @param data [memoryview] The codec ID followed by the compressed payload
+
+        @return [memoryview] The decompressed payload
+        """
+        codec_id = data[0]
+        if codec_id not in CODEC_DECOMPRESSORS:
+            raise Exception("ERROR: Unknown payload compression codec ID in serialized message: {}".format(codec_id))
+        return memoryview(CODEC_DECOMPRESSORS[codec_id](data[1:]))
+
+    def get_stats(self) -> dict:
+        """
+        get_stats
+
+        Returns a dictionary containing the compression statistics of the link.
+        The compression ratio is the original size of the compressed payloads
+        divided by their compressed size.
+
+        @param None
+
+        @return [dict] The compression statistics
+        """
+        with self.stats_lock:
+            return {
+                "CODEC": self.codec_name,
+                "THRESHOLD": self.threshold,
+                "NUM_COMPRESSED": self.num_compressed,
+                "NUM_BELOW_THRESHOLD": self.num_below_threshold,
+                "NUM_INCOMPRESSIBLE": self.num_incompressible,
+                "ORIGINAL_BYTES": self.original_size,
+                "COMPRESSED_BYTES": self.compressed_size,
+                "COMPRESSION_RATIO": self.original_size / self.compressed_size if self.compressed_size > 0 else None,
+                "COMPRESSION_TIME_SEC": self.compression_time
+            }
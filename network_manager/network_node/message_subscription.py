@@ -0,0 +1,100 @@
+import asyncio
+
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+
+"""
+MessageSubscription
+
+Async iterator over the messages of a given type received by a
+NetworkNode. Messages are handed from the node's handler threads to
+the event loop the subscription was created on, so any number of
+subscriptions can be awaited without blocking a thread each.
+"""
+
+SUBSCRIPTION_CLOSED = object()
+
+
+class MessageSubscription(object):
+    def __init__(self, network_node, message_type: str, loop: asyncio.AbstractEventLoop):
+        """
+        __init__
+
+        Creates a new MessageSubscription object and starts collecting
+        messages of the given type
+
+        @param network_node [NetworkNode] The node to receive messages from
+        @param message_type [str] The type of message to subscribe to
+        @param loop [asyncio.AbstractEventLoop] The event loop the messages are delivered on
+
+        @return [MessageSubscription] The created MessageSubscription
+        """
+        self.network_node = network_node
+        self.message_type = str(message_type)
+        self.loop = loop
+
+        self.message_queue = asyncio.Queue()
+        self.closed = False
+
+        self.network_node.assign_msg_handler(self.message_type, self._handle_message)
+
+    def close(self) -> None:
+        """
+        close
+
+        Stops collecting messages. Iteration ends once the messages
+        received before closing have been consumed.
+
+        @param None
+
+        @return None
+        """
+        if self.closed:
+            return
+
+        self.closed = True
+        self.network_node.unassign_msg_handler(self.message_type, self._handle_message)
+        self._schedule(SUBSCRIPTION_CLOSED)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> MessageWrapper:
+        message = await self.message_queue.get()
+        if message is SUBSCRIPTION_CLOSED:
+            raise StopAsyncIteration
+        return message
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _handle_message(self, message: MessageWrapper) -> None:
+        """
+        _handle_message
+
+        Message handler assigned to the node. Passes the message to the event loop.
+
+        @param message [MessageWrapper] The received message
+
+        @return None
+        """
+        if not self.closed:
+            self._schedule(message)
+
+    def _schedule(self, item: object) -> None:
+        """
+        _schedule
+
+        Adds the given item to the message queue from any thread
+
+        @param item [object] The message or closed marker to add
+
+        @return None
+        """
+        try:
+            self.loop.call_soon_threadsafe(self.message_queue.put_nowait, item)
+        except RuntimeError:
+            # The event loop was closed, so nobody is left to consume the item
+            pass
@@ -0,0 +1,83 @@
+import threading
+
+from collections import OrderedDict
+
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+
+"""
+MessageHistory
+
+Bounded record of the most recent messages handled by a node.
+Stores how many times each message was seen. Once the history
+is full, the least recently seen message is evicted so memory
+usage does not grow with the number of messages ever handled.
+"""
+
+
+class MessageHistory(object):
+    def __init__(self, max_size: int):
+        """
+        __init__
+
+        Creates a new MessageHistory object
+
+        @param max_size [int] The maximum number of messages to keep in the history
+
+        @return [MessageHistory] The created MessageHistory
+        """
+        if max_size <= 0:
+            raise Exception("ERROR: Message history size must be a positive integer. Given: {}".format(max_size))
+
+        self.max_size = max_size
+
+        self.entries = OrderedDict()
+        self.history_lock = threading.Lock()
+
+    def record(self, message: MessageWrapper) -> None:
+        """
+        record
+
+        Records that the given message was seen. If the history is
+        full, then the least recently seen message is evicted.
+
+        @param message [MessageWrapper] The message that was seen
+
+        @return None
+        """
+        msg_id = message.get_id()
+        with self.history_lock:
+            if msg_id not in self.entries:
+                self.entries[msg_id] = {"MSG": message, "NUM_TIMES": 0}
+            self.entries[msg_id]["NUM_TIMES"] += 1
+            self.entries.move_to_end(msg_id)
+
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def contains(self, msg_id: tuple) -> bool:
+        """
+        contains
+
+        Checks whether or not the message with the given ID is in the history
+
+        @param msg_id [tuple] The message ID to check for
+
+        @return [bool] True if the message is in the history. False otherwise.
+        """
+        with self.history_lock:
+            return msg_id in self.entries
+
+    def get_entries(self) -> dict:
+        """
+        get_entries
+
+        Returns a copy of the messages currently in the history.
+        The keys are the message IDs and the values are dicts
+        containing the message and the number of times it was seen.
+
+        @param None
+
+        @return [dict<tuple, dict>] The messages in the history
+        """
+        with self.history_lock:
+            return {msg_id: dict(entry) for msg_id, entry in self.entries.items()}
@@ -0,0 +1,164 @@
+import threading
+
+"""
+MessageIdTracker
+
+Tracks which message IDs have been seen without storing every
+message ID. Message IDs are tuples of the ID of the node that
+created the message and a sequence number that increases with
+every propagated message created by that node. For each origin
+node, the tracker stores a high water mark (every sequence number
+at or below it has been seen) and a small window of sequence
+numbers seen above the high water mark. Memory usage is therefore
+proportional to the number of known origin nodes, and the window
+of an origin drains whenever its messages arrive without gaps.
+
+The high water mark is never more than window_size sequence
+numbers behind the highest sequence number seen, so gaps left by
+messages that never reach this node (e.g. scoped messages or
+messages sent before this node joined) are forgotten. Messages
+that arrive after window_size newer messages from the same origin
+are then treated as already seen.
+
+Messages that can not be received more than once (e.g. directed
+messages, batch envelopes and link control messages) are given
+untracked IDs, whose sequence numbers have UNTRACKED_SEQ_FLAG set.
+These are never stored, since they would leave permanent gaps in
+the sequences seen by every other node.
+"""
+
+UNTRACKED_SEQ_FLAG = 1 << 63
+
+
+class MessageIdTracker(object):
+    def __init__(self, window_size: int):
+        """
+        __init__
+
+        Creates a new MessageIdTracker object
+
+        @param window_size [int] The maximum number of out of order sequence numbers to store per origin node
+
+        @return [MessageIdTracker] The created MessageIdTracker
+        """
+        if window_size <= 0:
+            raise Exception("ERROR: Message ID tracker window size must be a positive integer. Given: {}".format(window_size))
+
+        self.window_size = window_size
+
+        self.high_water_marks = {}
+        self.out_of_order_windows = {}
+        self.tracker_lock = threading.Lock()
+
+    def add(self, msg_id: tuple) -> bool:
+        """
+        add
+
+        Marks the given message ID as seen
+
+        @param msg_id [tuple] The message ID to mark as seen
+
+        @return [bool] True if the message ID had not been seen before or is untracked. False otherwise.
+        """
+        if not self.is_tracked(msg_id):
+            return True
+
+        origin_id, seq_num = msg_id
+        with self.tracker_lock:
+            if self._contains(origin_id, seq_num):
+                return False
+
+            if origin_id not in self.high_water_marks:
+                self.high_water_marks[origin_id] = 0
+                self.out_of_order_windows[origin_id] = set()
+
+            window = self.out_of_order_windows[origin_id]
+            window.add(seq_num)
+
+            if seq_num - self.high_water_marks[origin_id] > self.window_size:
+                self._advance_high_water_mark(origin_id, seq_num - self.window_size)
+
+            while (self.high_water_marks[origin_id] + 1) in window:
+                self.high_water_marks[origin_id] += 1
+                window.discard(self.high_water_marks[origin_id])
+
+            return True
+
+    def contains(self, msg_id: tuple) -> bool:
+        """
+        contains
+
+        Checks whether or not the given message ID has been seen
+
+        @param msg_id [tuple] The message ID to check for
+
+        @return [bool] True if the message ID has been seen. False otherwise, or if the message ID is untracked.
+        """
+        if not self.is_tracked(msg_id):
+            return False
+
+        origin_id, seq_num = msg_id
+        with self.tracker_lock:
+            return self._contains(origin_id, seq_num)
+
+    def get_num_tracked_origins(self) -> int:
+        """
+        get_num_tracked_origins
+
+        Returns the number of origin nodes being tracked
+
+        @param None
+
+        @return [int] The number of origin nodes being tracked
+        """
+        return len(self.high_water_marks)
+
+    @classmethod
+    def is_tracked(cls, msg_id: tuple) -> bool:
+        """
+        is_tracked
+
+        Checks whether or not the given message ID is tracked, i.e. it was
+        created for a message that can be received more than once
+
+        @param msg_id [tuple] The message ID to check
+
+        @return [bool] True if the message ID is tracked. False otherwise.
+        """
+        return not (msg_id[1] & UNTRACKED_SEQ_FLAG)
+
+    def _advance_high_water_mark(self, origin_id: int, high_water_mark: int) -> None:
+        """
+        _advance_high_water_mark
+
+        Moves the high water mark of the given origin node forward, treating
+        every gap below it as seen. Must be called while holding the tracker lock.
+
+        @param origin_id [int] The ID of the node that created the messages
+        @param high_water_mark [int] The new high water mark
+
+        @return None
+        """
+        window = self.out_of_order_windows[origin_id]
+        if high_water_mark - self.high_water_marks[origin_id] < len(window):
+            for seq_num in range(self.high_water_marks[origin_id] + 1, high_water_mark + 1):
+                window.discard(seq_num)
+        else:
+            window.difference_update([seq_num for seq_num in window if seq_num <= high_water_mark])
+        self.high_water_marks[origin_id] = high_water_mark
+
+    def _contains(self, origin_id: int, seq_num: int) -> bool:
+        """
+        _contains
+
+        Checks whether or not the given sequence number has been seen
+        for the given origin node. Must be called while holding the tracker lock.
+
+        @param origin_id [int] The ID of the node that created the message
+        @param seq_num [int] The sequence number of the message
+
+        @return [bool] True if the sequence number has been seen. False otherwise.
+        """
+        if origin_id not in self.high_water_marks:
+            return False
+        return (seq_num <= self.high_water_marks[origin_id]) or (seq_num in self.out_of_order_windows[origin_id])
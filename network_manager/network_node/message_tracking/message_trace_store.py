@@ -0,0 +1,116 @@
+import threading
+
+from collections import OrderedDict
+
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+
+"""
+MessageTraceStore
+
+Bounded record of the spans of the traced messages seen by a node. The
+spans of a message start with the spans carried in the header of the
+first copy the node received, which describe the path the message took
+to reach the node, followed by the spans the node recorded itself.
+Once the store is full, the least recently traced message is evicted.
+
+Spans are tuples of the ID of the node recording the span, the ID of
+the node the copy of the message came from, the TraceEvent, and the time
+of the event.
+"""
+
+
+class MessageTraceStore(object):
+    def __init__(self, max_size: int):
+        """
+        __init__
+
+        Creates a new MessageTraceStore object
+
+        @param max_size [int] The maximum number of messages to keep the spans of
+
+        @return [MessageTraceStore] The created MessageTraceStore
+        """
+        if max_size <= 0:
+            raise Exception("ERROR: Message trace store size must be a positive integer. Given: {}".format(max_size))
+
+        self.max_size = max_size
+
+        self.traces = OrderedDict()
+        self.store_lock = threading.Lock()
+
+    def start_trace(self, msg_id: tuple, span: tuple) -> None:
+        """
+        start_trace
+
+        Starts tracing the message with the given ID, which was created by this node
+
+        @param msg_id [tuple] The ID of the message
+        @param span [tuple] The ORIGIN span of the message
+
+        @return None
+        """
+        with self.store_lock:
+            self.traces[msg_id] = [span]
+            self._evict()
+
+    def record(self, message: MessageWrapper, span: tuple) -> None:
+        """
+        record
+
+        Records a span of the given traced message. The first time the
+        message is seen, its spans are started from the ones in its header.
+
+        @param message [MessageWrapper] The traced message
+        @param span [tuple] The span to record
+
+        @return None
+        """
+        msg_id = message.get_id()
+        with self.store_lock:
+            if msg_id not in self.traces:
+                self.traces[msg_id] = list(message.get_trace_spans())
+                self._evict()
+            self.traces[msg_id].append(span)
+
+    def get_spans(self, msg_id: tuple) -> list:
+        """
+        get_spans
+
+        Returns the spans of the message with the given ID
+
+        @param msg_id [tuple] The ID of the message
+
+        @return [list] A copy of the spans of the message. None if the message is not traced by this node.
+        """
+        if len(self.traces) == 0:
+            return None
+
+        with self.store_lock:
+            spans = self.traces.get(msg_id)
+            return None if spans is None else list(spans)
+
+    def get_traces(self) -> dict:
+        """
+        get_traces
+
+        Returns a copy of the spans of every message in the store
+
+        @param None
+
+        @return [dict<tuple, list>] The spans of each message, by message ID
+        """
+        with self.store_lock:
+            return {msg_id: list(spans) for msg_id, spans in self.traces.items()}
+
+    def _evict(self) -> None:
+        """
+        _evict
+
+        Evicts the least recently traced message if the store is full. Must be called while holding the store lock.
+
+        @param None
+
+        @return None
+        """
+        if len(self.traces) > self.max_size:
+            self.traces.popitem(last=False)
@@ -0,0 +1,77 @@
+"""
+SeenDigest
+
+Compact record of the nodes known to have a propagated message. The
+digest is carried in the header of every propagated message and grows
+at each hop: a node propagating a message adds itself and every node
+it sends the message to. Receivers skip any target already in the
+digest, since that target received (or is being sent) the message
+from another node.
+
+The digest is an exact set of node IDs capped at a maximum size, so it
+never claims a node has a message when it does not (unlike e.g. a Bloom
+filter, whose false positives would stop messages from reaching nodes).
+Once the digest is full, further IDs are not added, which only means
+fewer sends are skipped. Digests are immutable, so one digest can be
+shared by every copy of a message.
+"""
+
+
+class SeenDigest(object):
+    def __init__(self, node_ids: frozenset = frozenset()):
+        """
+        __init__
+
+        Creates a new SeenDigest object
+
+        @param node_ids [frozenset] The IDs of the nodes known to have the message
+
+        @return [SeenDigest] The created SeenDigest
+        """
+        self.node_ids = frozenset(node_ids)
+
+    def extend(self, node_ids: list, max_size: int) -> "SeenDigest":
+        """
+        extend
+
+        Returns a new digest that also contains the given node IDs. IDs
+        that do not fit within the maximum size are left out.
+
+        @param node_ids [list] The IDs of the nodes to add
+        @param max_size [int] The maximum number of node IDs in the new digest
+
+        @return [SeenDigest] The extended digest
+        """
+        new_node_ids = set(self.node_ids)
+        for node_id in node_ids:
+            if len(new_node_ids) >= max_size:
+                break
+            new_node_ids.add(node_id)
+        return SeenDigest(new_node_ids)
+
+    def contains(self, node_id: int) -> bool:
+        """
+        contains
+
+        Checks whether or not the given node is known to have the message
+
+        @param node_id [int] The ID of the node to check for
+
+        @return [bool] True if the node is in the digest. False otherwise.
+        """
+        return node_id in self.node_ids
+
+    def get_node_ids(self) -> frozenset:
+        """
+        get_node_ids
+
+        Returns the IDs of the nodes known to have the message
+
+        @param None
+
+        @return [frozenset] The node IDs in the digest
+        """
+        return self.node_ids
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
@@ -0,0 +1,281 @@
+import json
+
+from network_manager.network_node.message_tracking.trace_event import TraceEvent
+
+"""
+TraceCollector
+
+Combines the spans of traced messages recorded by many nodes, so the
+way each message propagated through the network can be inspected. The
+same span can be carried by many copies of a message and recorded by
+many nodes, so spans are deduplicated as they are collected.
+
+For each message, the collector can list its timeline (every span in
+time order) and reconstruct its propagation tree. The parent of a node
+in the tree is the node that sent the first copy of the message the
+node took out of its inbox, which is the copy the node handled and
+propagated. Every other copy the node received was a duplicate.
+
+The traces can be exported in the Chrome trace event format, which can
+be opened in chrome://tracing or Perfetto. Each node is shown as a
+process, with the time each copy spent in the node's inbox and the time
+spent running the message's handlers as slices, and every hop of the
+propagation tree as a flow arrow.
+"""
+
+
+class TraceCollector(object):
+    def __init__(self):
+        """
+        __init__
+
+        Creates a new TraceCollector object
+
+        @param None
+
+        @return [TraceCollector] The created TraceCollector
+        """
+        self.traces = {}
+
+    def collect(self, network_nodes: list) -> None:
+        """
+        collect
+
+        Adds the traces recorded by the given nodes to the collector
+
+        @param network_nodes [list] The nodes to collect the traces of
+
+        @return None
+        """
+        for network_node in network_nodes:
+            self.add_traces(network_node.get_message_traces())
+
+    def add_traces(self, traces: dict) -> None:
+        """
+        add_traces
+
+        Adds the given traces to the collector
+
+        @param traces [dict<tuple, list>] The spans of each traced message, by message ID
+
+        @return None
+        """
+        for msg_id, spans in traces.items():
+            self.traces.setdefault(msg_id, set()).update(spans)
+
+    def get_message_ids(self) -> list:
+        """
+        get_message_ids
+
+        Returns the IDs of the traced messages in the collector
+
+        @param None
+
+        @return [list] The IDs of the traced messages
+        """
+        return list(self.traces.keys())
+
+    def get_timeline(self, msg_id: tuple) -> list:
+        """
+        get_timeline
+
+        Returns every span of the given message in time order. Spans recorded
+        at the same time are ordered by their event.
+
+        @param msg_id [tuple] The ID of the message
+
+        @return [list] The spans, as dicts with the NODE_ID, SENDER_ID, EVENT and TIME. Empty if the message is not traced.
+        """
+        spans = sorted(self.traces.get(msg_id, ()), key=lambda span: (span[3], span[2].value))
+        return [
+            {"NODE_ID": node_id, "SENDER_ID": sender_id, "EVENT": trace_event, "TIME": span_time}
+            for node_id, sender_id, trace_event, span_time in spans
+        ]
+
+    def get_propagation_tree(self, msg_id: tuple) -> dict:
+        """
+        get_propagation_tree
+
+        Reconstructs the propagation tree of the given message
+
+        @param msg_id [tuple] The ID of the message
+
+        @return [dict] The tree. Keys:
+            ORIGIN [int] The ID of the node that created the message. None if its span was not collected.
+            PARENTS [dict<int, int>] The node each node got the message from, by node ID
+            CHILDREN [dict<int, list>] The nodes each node passed the message to, by node ID
+            DEPTHS [dict<int, int>] The number of hops from the origin to each node reached from it, by node ID
+            ARRIVAL_TIMES [dict<int, float>] The time each node took the message out of its inbox, by node ID
+            NUM_DUPLICATES [int] The number of copies of the message that nodes received as duplicates
+        """
+        origin_id = None
+        parents = {}
+        arrival_times = {}
+        num_copies = 0
+        for span in self.get_timeline(msg_id):
+            if span["EVENT"] == TraceEvent.ORIGIN:
+                origin_id = span["NODE_ID"]
+                arrival_times.setdefault(origin_id, span["TIME"])
+            elif span["EVENT"] == TraceEvent.DEQUEUE:
+                num_copies += 1
+                if span["NODE_ID"] not in arrival_times:
+                    arrival_times[span["NODE_ID"]] = span["TIME"]
+                    parents[span["NODE_ID"]] = span["SENDER_ID"]
+
+        children = {}
+        for node_id, parent_id in parents.items():
+            children.setdefault(parent_id, []).append(node_id)
+
+        depths = {}
+        if origin_id is not None:
+            depths[origin_id] = 0
+            nodes_to_visit = [origin_id]
+            while len(nodes_to_visit) > 0:
+                node_id = nodes_to_visit.pop()
+                for child_id in children.get(node_id, ()):
+                    if child_id not in depths:
+                        depths[child_id] = depths[node_id] + 1
+                        nodes_to_visit.append(child_id)
+
+        return {
+            "ORIGIN": origin_id,
+            "PARENTS": parents,
+            "CHILDREN": children,
+            "DEPTHS": depths,
+            "ARRIVAL_TIMES": arrival_times,
+            "NUM_DUPLICATES": num_copies - len(parents)
+        }
+
+    def export_chrome_trace(self, file_path: str = None) -> dict:
+        """
+        export_chrome_trace
+
+        Exports the collected traces in the Chrome trace event format
+
+        @param file_path [str] The path to write the JSON trace to. None to only return it.
+
+        @return [dict] The trace, in the Chrome trace event format
+        """
+        trace_events = []
+        node_ids = set()
+        num_flows = 0
+        for msg_id in self.traces.keys():
+            msg_label = "{}:{}".format(*msg_id)
+            timeline = self.get_timeline(msg_id)
+            node_ids.update(span["NODE_ID"] for span in timeline)
+            trace_events.extend(self._create_span_events(msg_label, timeline))
+
+            flow_events = self._create_flow_events(msg_label, self.get_propagation_tree(msg_id), num_flows)
+            num_flows += len(flow_events) // 2
+            trace_events.extend(flow_events)
+
+        for node_id in sorted(node_ids):
+            trace_events.append({
+                "ph": "M", "name": "process_name", "pid": node_id, "args": {"name": "Node {}".format(node_id)}
+            })
+
+        chrome_trace = {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+        if file_path is not None:
+            with open(file_path, "w") as trace_file:
+                json.dump(chrome_trace, trace_file)
+        return chrome_trace
+
+    def _create_span_events(self, msg_label: str, timeline: list) -> list:
+        """
+        _create_span_events
+
+        Converts the timeline of a message into trace events. Each node's
+        sending of the message is an instant, while the time each copy spent
+        in an inbox and the time spent running the handlers are slices.
+
+        @param msg_label [str] The label of the message shown in the trace
+        @param timeline [list] The spans of the message, in time order
+
+        @return [list] The trace events
+        """
+        trace_events = []
+        enqueued_spans = {}
+        handler_start_spans = {}
+        for span in timeline:
+            node_id = span["NODE_ID"]
+            args = {"MSG_ID": msg_label, "SENDER_ID": span["SENDER_ID"]}
+
+            if span["EVENT"] == TraceEvent.ORIGIN:
+                trace_events.append(self._create_trace_event("i", "send " + msg_label, node_id, span["TIME"], args))
+            elif span["EVENT"] == TraceEvent.ENQUEUE:
+                enqueued_spans.setdefault((node_id, span["SENDER_ID"]), []).append(span)
+            elif span["EVENT"] == TraceEvent.DEQUEUE:
+                copies = enqueued_spans.get((node_id, span["SENDER_ID"]))
+                if copies:
+                    enqueue_time = copies.pop(0)["TIME"]
+                    trace_events.append(self._create_trace_event(
+                        "X", "queued " + msg_label, node_id, enqueue_time, args, span["TIME"] - enqueue_time
+                    ))
+            elif span["EVENT"] == TraceEvent.HANDLER_START:
+                handler_start_spans[node_id] = span
+            elif (span["EVENT"] == TraceEvent.HANDLER_END) and (node_id in handler_start_spans):
+                start_time = handler_start_spans.pop(node_id)["TIME"]
+                trace_events.append(self._create_trace_event(
+                    "X", "handle " + msg_label, node_id, start_time, args, span["TIME"] - start_time
+                ))
+        return trace_events
+
+    def _create_flow_events(self, msg_label: str, tree: dict, num_earlier_flows: int) -> list:
+        """
+        _create_flow_events
+
+        Creates a flow arrow for every hop of the propagation tree of a message
+
+        @param msg_label [str] The label of the message shown in the trace
+        @param tree [dict] The propagation tree of the message
+        @param num_earlier_flows [int] The number of flows already created, which are numbered from 1
+
+        @return [list] The trace events, as a start and an end event for each hop
+        """
+        trace_events = []
+        flow_id = num_earlier_flows
+        for node_id, parent_id in tree["PARENTS"].items():
+            if parent_id not in tree["ARRIVAL_TIMES"]:
+                continue
+
+            flow_id += 1
+            flow_name = "hop " + msg_label
+            flow_args = {"MSG_ID": msg_label}
+            flow_start = self._create_trace_event("s", flow_name, parent_id, tree["ARRIVAL_TIMES"][parent_id], flow_args)
+            flow_end = self._create_trace_event("f", flow_name, node_id, tree["ARRIVAL_TIMES"][node_id], flow_args)
+            flow_start["id"] = flow_end["id"] = flow_id
+            flow_end["bp"] = "e"
+            trace_events.extend([flow_start, flow_end])
+        return trace_events
+
+    def _create_trace_event(
+            self,
+            phase: str,
+            name: str,
+            node_id: int,
+            event_time: float,
+            args: dict,
+            duration: float = None
+            ) -> dict:
+        """
+        _create_trace_event
+
+        Creates an event in the Chrome trace event format. Times are converted to microseconds.
+
+        @param phase [str] The phase of the event (e.g. X for a complete event)
+        @param name [str] The name of the event
+        @param node_id [int] The ID of the node the event happened at
+        @param event_time [float] The time of the event in seconds
+        @param args [dict] The arguments shown with the event
+        @param duration [float] The duration of the event in seconds. None if the event has no duration.
+
+        @return [dict] The trace event
+        """
+        trace_event = {
+            "ph": phase, "name": name, "cat": "propagation", "pid": node_id, "tid": 0, "ts": event_time * 1e6, "args": args
+        }
+        if duration is not None:
+            trace_event["dur"] = duration * 1e6
+        if phase == "i":
+            trace_event["s"] = "p"
+        return trace_event
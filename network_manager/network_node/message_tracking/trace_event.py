@@ -0,0 +1,22 @@
+from enum import Enum
+
+"""
+TraceEvent
+
+Enum for specifying the events recorded in the spans of a traced message.
+Each span records one event at one node, along with the node the copy
+of the message came from and the time of the event.
+    - ORIGIN: The message was created by the node
+    - ENQUEUE: The message was added to the node's inbox
+    - DEQUEUE: The message was taken out of the node's inbox
+    - HANDLER_START: The node started running the handlers of the message
+    - HANDLER_END: The node finished running the handlers of the message
+"""
+
+
+class TraceEvent(Enum):
+    ORIGIN = 1
+    ENQUEUE = 2
+    DEQUEUE = 3
+    HANDLER_START = 4
+    HANDLER_END = 5
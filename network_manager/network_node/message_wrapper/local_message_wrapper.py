@@ -14,7 +14,7 @@ class LocalMessageWrapper(MessageWrapper):
 
     Creates a new LocalMessageWrapper object
 
-    @param msg_id [int] The ID of the message being sent
+    @param msg_id [tuple] The ID of the message being sent
     @param sender_id [int] The ID of the object sending the message
     @param target_node_id [int] The ID of the object to receive the message
     @param message_type [str] The type of message being sent
@@ -25,7 +25,7 @@ class LocalMessageWrapper(MessageWrapper):
     """
     def __init__(
         self,
-        msg_id: int,
+        msg_id: tuple,
         sender_id: int,
         target_node_id: int,
         message_type: str,
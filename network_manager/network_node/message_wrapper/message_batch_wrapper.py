@@ -0,0 +1,46 @@
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+from network_manager.network_node.network_node_message_types import NetworkNodeMessageTypes
+
+"""
+MessageBatchWrapper
+
+Envelope used to send multiple messages to the same target
+through a single MessageChannel send. The receiving node
+unpacks the batch and handles each message individually.
+"""
+
+
+class MessageBatchWrapper(MessageWrapper):
+    def __init__(self, msg_id: tuple, sender_id: int, target_node_id: int, messages: list):
+        """
+        __init__
+
+        Creates a new MessageBatchWrapper object
+
+        @param msg_id [tuple] The ID of the batch
+        @param sender_id [int] The ID of the object sending the batch
+        @param target_node_id [int] The ID of the object to receive the batch
+        @param messages [list] The MessageWrapper objects contained in the batch
+
+        @return [MessageBatchWrapper] The new MessageBatchWrapper object
+        """
+        super().__init__(
+            msg_id,
+            sender_id,
+            target_node_id,
+            NetworkNodeMessageTypes.MESSAGE_BATCH,
+            {"MESSAGES": messages},
+            False
+        )
+
+    def get_messages(self) -> list:
+        """
+        get_messages
+
+        Returns the messages contained in the batch in the order they were added
+
+        @param None
+
+        @return [list] The messages in the batch
+        """
+        return self.message_payload["MESSAGES"]
@@ -1,5 +1,9 @@
 from abc import ABC
 
+from network_manager.network_node.message_serializer.encoded_payload import EncodedPayload
+from network_manager.network_node.message_tracking.seen_digest import SeenDigest
+from network_manager.network_node.message_queue.message_priority import MessagePriority
+
 """
 MessageWrapper
 
@@ -11,7 +15,7 @@ to send through MessageChannel objects
 class MessageWrapper(ABC):
     def __init__(
         self,
-        msg_id: int,
+        msg_id: tuple,
         sender_id: int,
         target_node_id: int,
         message_type: str,
@@ -23,7 +27,7 @@ class MessageWrapper(ABC):
 
         Creates a new MessageWrapper object
 
-        @param msg_id [int] The ID of the message to send
+        @param msg_id [tuple] The ID of the message to send
         @param sender_id [int] The ID of the object sending the message
         @param target_node_id [int] The ID of the object to receive the message
         @param message_type [MessageTypes] The type of message to create
@@ -39,6 +43,12 @@ class MessageWrapper(ABC):
         self.message_type = message_type
         self.message_payload = message_payload
         self.propagation_flag = propagation_flag
+        self.ack_requested = False
+        self.seen_digest = None
+        self.hops_left = None
+        self.topic_routed = False
+        self.priority = None
+        self.trace_spans = None
 
     def get_target_node_id(self) -> int:
         """
@@ -68,12 +78,29 @@ class MessageWrapper(ABC):
         """
         get_message_payload
 
-        Returns the message payload
+        Returns the message payload. If the payload is still encoded,
+        then it is decoded first.
 
         @param None
 
         @return [dict] The message payload
         """
+        if isinstance(self.message_payload, EncodedPayload):
+            return self.message_payload.decode()
+        return self.message_payload
+
+    def get_raw_payload(self) -> object:
+        """
+        get_raw_payload
+
+        Returns the message payload without decoding it. Used when
+        forwarding a message so relaying nodes do not decode payloads
+        they never read.
+
+        @param None
+
+        @return [object] The message payload. Either a dict or an EncodedPayload.
+        """
         return self.message_payload
 
     def get_sender_id(self) -> int:
@@ -88,7 +115,7 @@ class MessageWrapper(ABC):
         """
         return self.sender_id
 
-    def get_id(self) -> int:
+    def get_id(self) -> tuple:
         """
         get_id
 
@@ -96,7 +123,7 @@ class MessageWrapper(ABC):
 
         @param None
 
-        @return [int] The ID of the message
+        @return [tuple] The ID of the message
         """
         return self.id
 
@@ -112,5 +139,161 @@ class MessageWrapper(ABC):
         """
         return self.propagation_flag
 
+    def get_ack_requested(self) -> bool:
+        """
+        get_ack_requested
+
+        Returns whether or not the sender requested a termination acknowledgement for the message
+
+        @param None
+
+        @return [bool] True if an acknowledgement was requested. False otherwise.
+        """
+        return self.ack_requested
+
+    def set_ack_requested(self, ack_requested: bool) -> None:
+        """
+        set_ack_requested
+
+        Sets whether or not the receiver must send a termination acknowledgement for the message
+
+        @param ack_requested [bool] True if an acknowledgement is requested. False otherwise.
+
+        @return None
+        """
+        self.ack_requested = ack_requested
+
+    def get_seen_digest(self) -> SeenDigest:
+        """
+        get_seen_digest
+
+        Returns the digest of the nodes known to have this message
+
+        @param None
+
+        @return [SeenDigest] The seen digest. None if the message does not carry one.
+        """
+        return self.seen_digest
+
+    def set_seen_digest(self, seen_digest: SeenDigest) -> None:
+        """
+        set_seen_digest
+
+        Sets the digest of the nodes known to have this message
+
+        @param seen_digest [SeenDigest] The seen digest. None to remove the digest.
+
+        @return None
+        """
+        self.seen_digest = seen_digest
+
+    def get_hops_left(self) -> int:
+        """
+        get_hops_left
+
+        Returns the number of hops the message may still be propagated
+
+        @param None
+
+        @return [int] The number of hops left. None if the propagation is not hop limited.
+        """
+        return self.hops_left
+
+    def set_hops_left(self, hops_left: int) -> None:
+        """
+        set_hops_left
+
+        Sets the number of hops the message may still be propagated
+
+        @param hops_left [int] The number of hops left. None if the propagation is not hop limited.
+
+        @return None
+        """
+        self.hops_left = hops_left
+
+    def is_topic_routed(self) -> bool:
+        """
+        is_topic_routed
+
+        Returns whether or not the message is only propagated toward the subscribers of its type
+
+        @param None
+
+        @return [bool] True if the message is a published message. False otherwise.
+        """
+        return self.topic_routed
+
+    def set_topic_routed(self, topic_routed: bool) -> None:
+        """
+        set_topic_routed
+
+        Sets whether or not the message is only propagated toward the subscribers of its type
+
+        @param topic_routed [bool] True if the message is a published message. False otherwise.
+
+        @return None
+        """
+        self.topic_routed = topic_routed
+
+    def get_priority(self) -> MessagePriority:
+        """
+        get_priority
+
+        Returns the priority class the message was sent with
+
+        @param None
+
+        @return [MessagePriority] The priority class of the message. None if the message type's priority is used.
+        """
+        return self.priority
+
+    def set_priority(self, priority: MessagePriority) -> None:
+        """
+        set_priority
+
+        Sets the priority class of the message, overriding the priority of its message type
+
+        @param priority [MessagePriority] The priority class of the message. None to use the message type's priority.
+
+        @return None
+        """
+        self.priority = priority
+
+    def is_traced(self) -> bool:
+        """
+        is_traced
+
+        Returns whether or not the message was sampled for tracing
+
+        @param None
+
+        @return [bool] True if the message is traced. False otherwise.
+        """
+        return self.trace_spans is not None
+
+    def get_trace_spans(self) -> list:
+        """
+        get_trace_spans
+
+        Returns the spans recorded for the message on its way to the receiver
+
+        @param None
+
+        @return [list] The spans of the message, as described in MessageTraceStore. None if the message is not traced.
+        """
+        return self.trace_spans
+
+    def set_trace_spans(self, trace_spans: list) -> None:
+        """
+        set_trace_spans
+
+        Sets the spans recorded for the message on its way to the receiver
+
+        @param trace_spans [list] The spans of the message. None if the message is not traced.
+
+        @return None
+        """
+        self.trace_spans = trace_spans
+
     def set_sender_id(self, new_sender_id):
         self.sender_id = new_sender_id
@@ -0,0 +1,36 @@
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+
+"""
+RemoteMessageWrapper
+
+Class for messages received from a node in another process through a
+TransportMessageChannel. The payload of these messages is usually an
+EncodedPayload that is only decoded when first requested.
+"""
+
+
+class RemoteMessageWrapper(MessageWrapper):
+    """
+    init
+
+    Creates a new RemoteMessageWrapper object
+
+    @param msg_id [tuple] The ID of the message that was received
+    @param sender_id [int] The ID of the object that sent the message
+    @param target_node_id [int] The ID of the object to receive the message
+    @param message_type [str] The type of message that was received
+    @param message_payload [object] The payload of the message. Either a dict or an EncodedPayload.
+    @param propagation_flag [bool] True if the message should be propagated. False if the message should not be propageted.
+
+    @return None
+    """
+    def __init__(
+        self,
+        msg_id: tuple,
+        sender_id: int,
+        target_node_id: int,
+        message_type: str,
+        message_payload: object,
+        propagation_flag: bool
+    ) -> None:
+        super().__init__(msg_id, sender_id, target_node_id, message_type, message_payload, propagation_flag)
@@ -1,21 +1,47 @@
 import threading
+import itertools
 import time
 import os
 import yaml
 import logging
 
-from random import randint
+from collections import OrderedDict
+
+from network_manager.network_node.message_channel.message_channel import MessageChannel
 from network_manager.network_node.message_channel.local_message_channel import LocalMessageChannel
+from network_manager.network_node.message_channel.modeled_message_channel import ModeledMessageChannel
+from network_manager.network_node.message_channel.shared_memory_message_channel import SharedMemoryMessageChannel
+from network_manager.network_node.message_channel.tcp_message_channel import TcpMessageChannel
 
 from network_manager.network_node.message_channel.message_channel_user import MessageChannelUser
+from network_manager.network_node.message_queue.message_queue import MessageQueue
+from network_manager.network_node.message_queue.queue_full_policy import QueueFullPolicy
+from network_manager.network_node.message_queue.message_priority import MessagePriority
+from network_manager.network_node.message_dispatcher.message_dispatcher import MessageDispatcher
+from network_manager.network_node.flow_control.link_sender import LinkSender
+from network_manager.network_node.message_tracking.message_id_tracker import MessageIdTracker, UNTRACKED_SEQ_FLAG
+from network_manager.network_node.message_tracking.message_history import MessageHistory
+from network_manager.network_node.message_tracking.seen_digest import SeenDigest
+from network_manager.network_node.message_tracking.message_trace_store import MessageTraceStore
+from network_manager.network_node.message_tracking.trace_event import TraceEvent
+
+from network_manager.network_node.node_runtime.reactor_node_runtime import ReactorNodeRuntime
+from network_manager.network_node.node_runtime.simulated_node_runtime import SimulatedNodeRuntime
+from network_manager.network_node.node_runtime.threaded_node_runtime import ThreadedNodeRuntime
 
 from network_manager.network_node.message_wrapper.local_message_wrapper import LocalMessageWrapper
 from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+from network_manager.network_node.message_wrapper.message_batch_wrapper import MessageBatchWrapper
 from network_manager.network_node.propagation_strategy.naive_propagation import NaivePropagation
 from network_manager.network_node.propagation_strategy.smart_propagation import SmartPropagation
 from network_manager.network_node.network_node_idle_listener_interface import NetworkNodeIdleListenerInterface
 from network_manager.network_node.network_node_message_types import NetworkNodeMessageTypes
+from network_manager.network_node.remote_network_node import RemoteNetworkNode
+from network_manager.network_node.termination_detection.termination_detector import TerminationDetector
 from network_manager.network_node.propagation_strategy.fully_connected_swarm_propagation import FullyConnectedSwarmPropagation
+from network_manager.network_node.propagation_strategy.gossip_propagation import GossipPropagation
+from network_manager.network_node.propagation_strategy.tree_propagation import TreePropagation
+from network_manager.network_node.topic_routing.subscription_table import SubscriptionTable
 
 
 """
@@ -38,36 +64,39 @@ class NetworkNode(MessageChannelUser):
 
         @return [NetworkNode] The new network node
         """
-        self.id = id(self)
-
         self.logger = logging.getLogger('NetworkNode')
 
         self.msg_channels = {}
         self.connection_pending_list = {}
+        self.connection_requesters = {}
         self.torndown_nodes = []
 
-        self.sent_messages = {}
-        self.rcvd_messages = {}
+        self.link_senders = {}
+        self.link_senders_lock = threading.Lock()
+        self.credit_windows = {}
+        self.credits_to_grant = {}
+        self.credit_lock = threading.Lock()
 
-        self.msg_inbox = []
-        self.msg_outbox = []
+        self.link_model_overrides = {}
 
-        self.run_node = threading.Event()
-        self.msg_inbox_has_values = threading.Event()
-        self.msg_outbox_has_values = threading.Event()
+        self.scoped_msg_hops = OrderedDict()
+        self.scoped_msg_lock = threading.Lock()
+
+        self.msg_sequence_counter = itertools.count(1)
+        self.untracked_msg_sequence_counter = itertools.count(1)
 
+        self.run_node = threading.Event()
         self.run_node.set()
-        self.msg_inbox_has_values.set()
-        self.msg_outbox_has_values.set()
 
         self.can_add_to_inbox = True
         self.can_add_to_outbox = True
 
+        self.num_sent_msgs = 0
         self.num_ignored_msgs = 0
+        self.num_seen_digest_skips = 0
+        self.num_seen_digest_ids_sent = 0
 
-        self.idle_listeners = []
-
-        self.num_processes = 0
+        self.topic_routing = False
 
         self.msg_handler_dict = {}
         self.assign_msg_handler(
@@ -79,6 +108,10 @@ class NetworkNode(MessageChannelUser):
             self.network_node_handle_accept_connection_request_message
         )
         self.assign_msg_handler(str(NetworkNodeMessageTypes.BOT_TEARDOWN), self.network_node_handle_bot_teardown_message)
+        self.assign_msg_handler(
+            str(NetworkNodeMessageTypes.SUBSCRIPTION_UPDATE),
+            self.network_node_handle_subscription_update_message
+        )
 
         self.config = yaml.load(
             open(os.path.join(os.path.dirname(__file__), "./default_node_config.yml")),
@@ -101,31 +134,89 @@ class NetworkNode(MessageChannelUser):
         propagation_strategies = {
             "NaivePropagation": NaivePropagation,
             "SmartPropagation": SmartPropagation,
-            "FullyConnectedSwarmPropagation": FullyConnectedSwarmPropagation
+            "FullyConnectedSwarmPropagation": FullyConnectedSwarmPropagation,
+            "GossipPropagation": GossipPropagation,
+            "TreePropagation": TreePropagation
         }
 
         message_channels = {
-            "LocalMessageChannel": LocalMessageChannel
+            "LocalMessageChannel": LocalMessageChannel,
+            "TcpMessageChannel": TcpMessageChannel,
+            "SharedMemoryMessageChannel": SharedMemoryMessageChannel,
+            "ModeledMessageChannel": ModeledMessageChannel
         }
 
         message_wrappers = {
             "LocalMessageWrapper": LocalMessageWrapper
         }
 
-        self.propagation_strategy = propagation_strategies[self.config["propagation_strategy"]](self)
+        node_runtimes = {
+            "ThreadedNodeRuntime": ThreadedNodeRuntime,
+            "ReactorNodeRuntime": ReactorNodeRuntime,
+            "SimulatedNodeRuntime": SimulatedNodeRuntime
+        }
+
+        # The node runtime hands out the node's ID based on the channel type, so both are picked before anything using the ID
         self.message_channel_type = message_channels[self.config["message_channel"]]
+        self.node_runtime_type = node_runtimes[self.config["node_runtime"]]
+        self.id = self.node_runtime_type.create_node_id(self)
+
+        self.termination_detector = TerminationDetector(self.id, self._send_termination_ack)
+        self.subscription_table = SubscriptionTable(self.id)
+
+        self.propagation_strategy = propagation_strategies[self.config["propagation_strategy"]](self)
         self.message_wrapper_type = message_wrappers[self.config["message_wrapper"]]
 
+        queue_capacity = self.config["message_queue_capacity"]
+        queue_full_policy = QueueFullPolicy[self.config["message_queue_full_policy"]]
+        queue_starvation_limit = self.config["message_queue_starvation_limit"]
+        self.msg_inbox = MessageQueue(queue_capacity, queue_full_policy, queue_starvation_limit)
+        self.msg_outbox = MessageQueue(queue_capacity, queue_full_policy, queue_starvation_limit)
+        self.msg_inbox.set_drop_listener(self.termination_detector.end_work)
+        self.msg_outbox.set_drop_listener(self.termination_detector.end_work)
+
+        self.seen_digest_max_size = self.config["seen_digest_max_size"]
+
+        self.trace_sample_rate = self.config["trace_sample_rate"]
+        if not (0 <= self.trace_sample_rate <= 1):
+            raise Exception("ERROR: Trace sample rate must be between 0 and 1. Given: {}".format(self.trace_sample_rate))
+        self.trace_random = self.node_runtime_type.create_random(self) if self.trace_sample_rate > 0 else None
+        self.trace_store = MessageTraceStore(self.config["trace_store_size"])
+
+        self.msg_type_priorities = {
+            msg_type: MessagePriority[priority_name]
+            for msg_type, priority_name in self.config["message_type_priorities"].items()
+        }
+
+        self.topic_routing = self.config["topic_routing"]
+
+        self.msg_batch_max_size = self.config["message_batch_max_size"]
+        self.msg_batch_max_delay = self.config["message_batch_max_delay_sec"]
+
+        self.use_link_senders = self.config["link_senders"]
+        self.link_credit_window = self.config["link_credit_window"] if self.use_link_senders else None
+
+        self.sent_msg_tracker = MessageIdTracker(self.config["message_dedup_window_size"])
+        self.rcvd_msg_tracker = MessageIdTracker(self.config["message_dedup_window_size"])
+        self.sent_msg_history = MessageHistory(self.config["message_history_size"])
+        self.rcvd_msg_history = MessageHistory(self.config["message_history_size"])
+
+        self.msg_dispatcher = MessageDispatcher(
+            self._run_handlers,
+            self.config["message_handler_pool_size"],
+            self.config["message_handler_ordering_keys"],
+            self.config["message_handler_idle_timeout_sec"]
+        )
+
         self.start_network_node()
 
     def start_network_node(self) -> None:
         """
         start_network_node
 
-        Starts the threads needed by the node to perform its core function.
-        The threads created are:
-            - msg_sender_loop: Runs the loop for sending messages
-            - msg_receiver_loop: Runs the loop for receiving messages
+        Starts processing the node's messages using the node runtime type
+        selected in the config. Also sets up any resources needed by the
+        node's message channel type.
 
         @param None
 
@@ -134,29 +225,36 @@ class NetworkNode(MessageChannelUser):
         if not self.run_node.is_set():
             raise Exception("ERROR: Network node is already running. Must call teardown before calling setup.")
 
+        self.msg_inbox.open()
+        self.msg_outbox.open()
+        self.message_channel_type.setup_channel_endpoint(self)
         self.run_node.clear()
-        self.msg_inbox_has_values.clear()
-        self.msg_outbox_has_values.clear()
-
-        thread = threading.Thread(target=self._msg_sender_loop)
-        thread.start()
-        thread = threading.Thread(target=self._msg_receiver_loop)
-        thread.start()
+        self.termination_detector.set_running(True)
+        self.node_runtime_type.start_node(self)
+        with self.link_senders_lock:
+            for link_sender in self.link_senders.values():
+                link_sender.start()
 
     def teardown(self) -> None:
         """
         teardown
 
-        Teardown the network node. Stops all currently running threads
-        in the object.
+        Teardown the network node. Stops processing the node's messages
+        and releases the resources of its message channel type.
 
         @param None
 
         @return None
         """
         self.run_node.set()
-        self.msg_inbox_has_values.set()
-        self.msg_outbox_has_values.set()
+        self.termination_detector.set_running(False)
+        self.msg_inbox.close()
+        self.msg_outbox.close()
+        with self.link_senders_lock:
+            for link_sender in self.link_senders.values():
+                link_sender.stop()
+        self.node_runtime_type.stop_node(self)
+        self.message_channel_type.teardown_channel_endpoint(self)
         self.unassign_msg_handler(
             str(NetworkNodeMessageTypes.REQUEST_CONNECTION),
             self.network_node_handle_request_connection_message
@@ -166,6 +264,10 @@ class NetworkNode(MessageChannelUser):
             self.network_node_handle_accept_connection_request_message
         )
         self.unassign_msg_handler(str(NetworkNodeMessageTypes.BOT_TEARDOWN), self.network_node_handle_bot_teardown_message)
+        self.unassign_msg_handler(
+            str(NetworkNodeMessageTypes.SUBSCRIPTION_UPDATE),
+            self.network_node_handle_subscription_update_message
+        )
 
     def assign_msg_handler(self, msg_type: str, handler: object):
         """
@@ -173,7 +275,9 @@ class NetworkNode(MessageChannelUser):
 
         Assign the given handler method to the given message type.
         The handler method will be called whenever a message of
-        that type is received.
+        that type is received. If topic routing is enabled, the node
+        then subscribes to the message type and advertises it to the
+        network, so published messages of that type reach this node.
 
         @param msg_type [String] The message type associated with the handler
         @param handler [Method] The method to call when the given message type is received
@@ -184,10 +288,12 @@ class NetworkNode(MessageChannelUser):
             self.msg_handler_dict[msg_type] = []
         if handler not in self.msg_handler_dict[msg_type]:
             self.msg_handler_dict[msg_type].append(handler)
+        self._advertise_local_topics()
 
     def unassign_msg_handler(self, msg_type: str, handler: object):
         if (msg_type in self.msg_handler_dict) and (handler in self.msg_handler_dict[msg_type]):
             self.msg_handler_dict[msg_type].remove(handler)
+        self._advertise_local_topics()
 
     def get_id(self) -> int:
         """
@@ -201,7 +307,39 @@ class NetworkNode(MessageChannelUser):
         """
         return self.id
 
-    def connect_to_network_node(self, new_network_node: "NetworkNode") -> None:
+    def get_time(self) -> float:
+        """
+        get_time
+
+        Returns the current time as seen by the node. This is the wall
+        clock, unless the node runtime keeps its own clock (e.g. the
+        virtual clock of a simulation).
+
+        @param None
+
+        @return [float] The current time in seconds
+        """
+        return self.node_runtime_type.get_time()
+
+    def get_remote_reference(self) -> RemoteNetworkNode:
+        """
+        get_remote_reference
+
+        Returns a RemoteNetworkNode that nodes in other processes can use
+        to connect to this node. Only supported by message channel types
+        that can reach nodes outside of this process.
+
+        @param None
+
+        @return [RemoteNetworkNode] The reference to this node
+        """
+        if not hasattr(self.message_channel_type, "get_node_address"):
+            raise Exception("ERROR: Message channel type {} does not support remote nodes.".format(
+                self.message_channel_type.__name__
+            ))
+        return RemoteNetworkNode(self.get_id(), self.message_channel_type.get_node_address(self))
+
+    def connect_to_network_node(self, new_network_node: MessageChannelUser) -> None:
         """
         connect_to_network_node
 
@@ -210,12 +348,13 @@ class NetworkNode(MessageChannelUser):
         connection bidirectional, you must call this method
         with the nodes swapped as well.
 
-        @param new_network_node [NetworkNode] The NetworkNode to connect to
+        @param new_network_node [NetworkNode] The NetworkNode to connect to. Can be a RemoteNetworkNode
+            if the node is in another process and the message channel type supports it.
 
         @return None
         """
-        if not isinstance(new_network_node, NetworkNode):
-            raise Exception("ERROR: Can only connect to other NetworkNode objects.")
+        if not isinstance(new_network_node, (NetworkNode, RemoteNetworkNode)):
+            raise Exception("ERROR: Can only connect to other NetworkNode or RemoteNetworkNode objects.")
 
         node_id = new_network_node.get_id()
         if not self.is_connected_to(new_network_node.get_id()):
@@ -224,7 +363,42 @@ class NetworkNode(MessageChannelUser):
                 "MSGS_TO_SEND": []
             }
 
-            self.send_directed_message(new_network_node.get_id(), NetworkNodeMessageTypes.REQUEST_CONNECTION, {"NODE": self})
+            self.send_directed_message(
+                new_network_node.get_id(),
+                NetworkNodeMessageTypes.REQUEST_CONNECTION,
+                {"NODE": self, "CREDIT_WINDOW": self.link_credit_window}
+            )
+
+    def add_connections(self, network_nodes: list) -> None:
+        """
+        add_connections
+
+        Connects this NetworkNode to each of the given NetworkNodes in both
+        directions. Unlike connect_to_network_node, the channels on both ends
+        are installed right away instead of through the connection handshake,
+        so many connections can be made at once without waiting on the message
+        loops. Once every channel is installed, each end of each connection
+        sends the other its subscription table, if topic routing is enabled.
+        Only nodes in the same process can be connected this way.
+
+        @param network_nodes [list] The NetworkNodes to connect to
+
+        @return None
+        """
+        new_network_nodes = []
+        for network_node in network_nodes:
+            if not isinstance(network_node, NetworkNode):
+                raise Exception("ERROR: Can only add connections to other NetworkNode objects.")
+            if (network_node is not self) and (not self.is_connected_to(network_node.get_id())):
+                new_network_nodes.append(network_node)
+
+        for network_node in new_network_nodes:
+            self._install_channel(network_node)
+            network_node._install_channel(self)
+
+        for network_node in new_network_nodes:
+            self._send_subscription_table(network_node.get_id())
+            network_node._send_subscription_table(self.get_id())
 
     def disconnect_from_network_node(self, id_to_disconnect: int) -> None:
         """
@@ -246,6 +420,11 @@ class NetworkNode(MessageChannelUser):
             self.msg_channels.pop(id_to_disconnect)
         if id_to_disconnect in self.connection_pending_list:
             self.connection_pending_list.pop(id_to_disconnect)
+        self.connection_requesters.pop(id_to_disconnect, None)
+        self._remove_link_sender(id_to_disconnect)
+        self.termination_detector.forget_node(id_to_disconnect)
+        self.subscription_table.remove_node(id_to_disconnect)
+        self.propagation_strategy.node_disconnected(id_to_disconnect)
 
     def is_connected_to(self, network_node_id: int) -> bool:
         """
@@ -277,29 +456,90 @@ class NetworkNode(MessageChannelUser):
         """
         receive_message
 
-        Adds the given message to this node's message inbox
+        Adds the given message to this node's message inbox. If the
+        message is a MessageBatchWrapper, then each message in the
+        batch is added to the inbox individually.
 
         @param message [MessageWrapper] The message to add to the inbox
 
-        @return None
+        @return [bool] True if the message was added to the inbox. False if it was rejected.
+        """
+        self._record_link_receipt(message)
+
+        if not message.get_ack_requested():
+            return self._add_to_inbox(message)
+
+        # Keeps the node busy until the message is stored, so the node can not go idle in between
+        self.termination_detector.message_received(message.get_sender_id())
+        # The acknowledgement is now owed by this node, so a message received again (e.g. forwarded) is not acknowledged twice
+        message.set_ack_requested(False)
+        try:
+            return self._add_to_inbox(message)
+        finally:
+            self.termination_detector.end_work()
+
+    def _add_to_inbox(self, message: MessageWrapper) -> bool:
+        """
+        _add_to_inbox
+
+        Adds the given message to this node's message inbox. If the
+        message is a MessageBatchWrapper, then each message in the
+        batch is added to the inbox individually. Termination
+        acknowledgements and flow control credits are applied right
+        away instead.
+
+        @param message [MessageWrapper] The message to add to the inbox
+
+        @return [bool] True if the message was added to the inbox. False if it was rejected.
         """
+        if message.get_message_type() == NetworkNodeMessageTypes.TERMINATION_ACK:
+            self.termination_detector.acks_received(message.get_sender_id(), message.get_message_payload()["NUM_ACKS"])
+            return True
+
+        if message.get_message_type() == NetworkNodeMessageTypes.FLOW_CREDIT:
+            self._credits_received(message.get_sender_id(), message.get_message_payload()["NUM_CREDITS"])
+            return True
+
         if not self.can_add_to_inbox:
             return False
 
+        if isinstance(message, MessageBatchWrapper):
+            msgs_added = [self._add_to_inbox(batched_msg) for batched_msg in message.get_messages()]
+            return all(msgs_added)
+
         sender_id = message.get_sender_id()
         msg_type = message.get_message_type()
         exempt_msg_types = [NetworkNodeMessageTypes.REQUEST_CONNECTION]
         if (msg_type not in exempt_msg_types) and \
                 (sender_id not in self.msg_channels) and \
                 (sender_id not in self.connection_pending_list):
+            if sender_id in self.torndown_nodes:
+                # A teardown notice can overtake lower priority messages sent before it
+                self.logger.debug("Dropping message from torn down node: {}".format(sender_id))
+                return False
             raise Exception("ERROR: Received message from unknown node: {}. Known node list: {}".format(
                 str(sender_id),
                 self.get_connections()
             ))
-        self.msg_inbox.append(message)
-        self.msg_inbox_has_values.set()
 
-    def send_propagation_message(self, message_type: str, message_payload: dict) -> int:
+        if (msg_type == NetworkNodeMessageTypes.REQUEST_CONNECTION) and (sender_id not in self.msg_channels):
+            # Lets acknowledgements reach the requester before the request is handled
+            self.connection_requesters[sender_id] = message.get_message_payload()["NODE"]
+
+        if message.is_traced():
+            self._record_trace_span(message, TraceEvent.ENQUEUE)
+
+        self.termination_detector.begin_work()
+        msg_added = self.msg_inbox.put(
+            message,
+            low_priority=self._is_low_priority_message(message),
+            priority=self._get_message_priority(message)
+        )
+        if not msg_added:
+            self.termination_detector.end_work()
+        return msg_added
+
+    def send_propagation_message(self, message_type: str, message_payload: dict, priority: MessagePriority = None) -> tuple:
         """
         send_propagation_message
 
@@ -308,29 +548,68 @@ class NetworkNode(MessageChannelUser):
 
         @param message_type [str] The type of message to create
         @param message_payload [dict] The payload for the message
-        @param message_id [int] The ID to use for the message. If None is given, then a new ID is generated.
-        @param msg_ref [MessageWrapper] The message that this message is being created in response to receiving.
+        @param priority [MessagePriority] The priority class of the message. None to use the message type's priority.
 
-        @return [int] The ID of the new message
+        @return [tuple] The ID of the new message
         """
-        if not self.can_add_to_outbox:
-            return None
+        return self._start_propagation(message_type, message_payload, None, priority=priority)
 
-        targets = self.propagation_strategy.determine_prop_targets(None)
+    def send_scoped_propagation(
+            self,
+            message_type: str,
+            message_payload: dict,
+            max_hops: int,
+            priority: MessagePriority = None
+            ) -> tuple:
+        """
+        send_scoped_propagation
 
-        message_id = self._generate_message_id()
+        Creates a message to propagate to the nodes at most max_hops hops
+        away from this node and adds it to the message outbox. Since every
+        call creates a new message, an expanding ring search can be done
+        by calling this method again with a larger max_hops.
 
-        for target_node_id in targets:
-            self._create_message(target_node_id, message_id, message_type, message_payload, True)
+        @param message_type [str] The type of message to create
+        @param message_payload [dict] The payload for the message
+        @param max_hops [int] The maximum number of hops the message travels from this node
+        @param priority [MessagePriority] The priority class of the message. None to use the message type's priority.
 
-        for pending_id in self.connection_pending_list:
-            msg = self._create_message(pending_id, message_id, message_type, message_payload, True, add_to_send_queue=False)
+        @return [tuple] The ID of the new message
+        """
+        if max_hops <= 0:
+            raise Exception("ERROR: Scoped propagation must travel at least one hop. Given: {}".format(max_hops))
 
-            self.connection_pending_list[pending_id]["MSGS_TO_SEND"].append(msg)
+        return self._start_propagation(message_type, message_payload, max_hops - 1, priority=priority)
 
-        return message_id
+    def publish_message(self, message_type: str, message_payload: dict, priority: MessagePriority = None) -> tuple:
+        """
+        publish_message
+
+        Creates a message that is only propagated toward the nodes that
+        subscribe to its type (i.e. the nodes that assigned a handler to
+        it) and adds it to the message outbox. Nodes that are not on the
+        way to a subscriber never receive the message. If topic routing
+        is disabled, the message is propagated accross the entire network.
 
-    def send_directed_message(self, target_node_id: int, message_type: str, message_payload: dict, message_id=None) -> int:
+        @param message_type [str] The type of message to create
+        @param message_payload [dict] The payload for the message
+        @param priority [MessagePriority] The priority class of the message. None to use the message type's priority.
+
+        @return [tuple] The ID of the new message
+        """
+        if not self.topic_routing:
+            return self.send_propagation_message(message_type, message_payload, priority=priority)
+
+        return self._start_propagation(message_type, message_payload, None, topic_routed=True, priority=priority)
+
+    def send_directed_message(
+            self,
+            target_node_id: int,
+            message_type: str,
+            message_payload: dict,
+            message_id=None,
+            priority: MessagePriority = None
+            ) -> tuple:
         """
         send_directed_message
 
@@ -340,8 +619,10 @@ class NetworkNode(MessageChannelUser):
         @param target_node_id [int] The ID of the node to send the message to
         @param message_type [str] The type of message to create
         @param message_payload [dict] The payload for the message
+        @param message_id [tuple] The ID to use for the message. If None is given, then a new ID is generated.
+        @param priority [MessagePriority] The priority class of the message. None to use the message type's priority.
 
-        @return [int] The ID of the new message
+        @return [tuple] The ID of the new message
         """
         if not self.can_add_to_outbox:
             return None
@@ -352,10 +633,19 @@ class NetworkNode(MessageChannelUser):
                 target_node_id
             ))
 
-        message_id = self._generate_message_id()
+        if message_id is None:
+            message_id = self._generate_message_id()
+            self._sample_trace(message_id)
 
         if (target_node_id in self.msg_channels) or (message_type == NetworkNodeMessageTypes.REQUEST_CONNECTION):
-            return self._create_message(target_node_id, message_id, message_type, message_payload, False).get_id()
+            return self._create_message(
+                target_node_id,
+                message_id,
+                message_type,
+                message_payload,
+                False,
+                priority=priority
+            ).get_id()
         elif target_node_id in self.connection_pending_list:
             msg = self._create_message(
                 target_node_id,
@@ -363,7 +653,8 @@ class NetworkNode(MessageChannelUser):
                 message_type,
                 message_payload,
                 False,
-                add_to_send_queue=False
+                add_to_send_queue=False,
+                priority=priority
             )
 
             self.connection_pending_list[target_node_id]["MSGS_TO_SEND"].append(msg)
@@ -393,11 +684,14 @@ class NetworkNode(MessageChannelUser):
 
         Checks whether or not the node has received a message with the given ID
 
-        @param msg_id [int] The message ID to check for
+        @param msg_id [tuple] The message ID to check for
 
         @return [bool] True if the node has received a message with the given ID. False otherwise.
         """
-        return msg_id in self.rcvd_messages
+        # Untracked IDs are only remembered while their messages are in the message history
+        if not MessageIdTracker.is_tracked(msg_id):
+            return self.rcvd_msg_history.contains(msg_id)
+        return self.rcvd_msg_tracker.contains(msg_id)
 
     def sent_msg_with_id(self, msg_id: int) -> bool:
         """
@@ -405,11 +699,13 @@ class NetworkNode(MessageChannelUser):
 
         Checks whether or not the node has sent a message with the given ID
 
-        @param msg_id [int] The message ID to check for
+        @param msg_id [tuple] The message ID to check for
 
         @return [bool] True if the node has sent a message with the given ID. False otherwise.
         """
-        return msg_id in self.sent_messages
+        if not MessageIdTracker.is_tracked(msg_id):
+            return self.sent_msg_history.contains(msg_id)
+        return self.sent_msg_tracker.contains(msg_id)
 
     def interacted_with_msg_with_id(self, msg_id: int) -> bool:
         """
@@ -419,54 +715,80 @@ class NetworkNode(MessageChannelUser):
         given ID. Interacted means the node has either received or sent a
         message with the ID.
 
-        @param msg_id [int] The message ID to check for
+        @param msg_id [tuple] The message ID to check for
 
         @return [bool] True if the node has interacted with a message with the given ID. False otherwise.
         """
-        return ((msg_id in self.rcvd_messages) or (msg_id in self.sent_messages))
+        return self.received_msg_with_id(msg_id) or self.sent_msg_with_id(msg_id)
 
     def get_sent_messages(self) -> dict:
         """
         get_sent_messages
 
-        Returns a dictionary containing information about the messages
-        the node has sent. The keys of the dictionary are the IDs of
-        the messages the node has sent. The values of the dictionary
-        are tuples where the first value is the type of message and
-        the second value is the number of times that message was sent.
+        Returns a dictionary containing information about the most recent
+        messages the node has sent. The number of messages returned is
+        bounded by the message_history_size config value. The keys of the
+        dictionary are the IDs of the messages the node has sent. The values
+        of the dictionary are tuples where the first value is the type of
+        message and the second value is the number of times that message was sent.
 
         @param None
 
-        @return [dict<int, tuple>] Information about the messages sent by the node
+        @return [dict<tuple, tuple>] Information about the messages sent by the node
         """
         sent_msgs = {}
-        for _, msg_info in self.sent_messages.items():
-            msg_id = msg_info["SENT_MSG"].get_id()
-            msg_type = msg_info["SENT_MSG"].get_message_type()
-            sent_msgs[msg_id] = (msg_type, msg_info["NUM_TIMES_SENT"])
+        for msg_id, msg_info in self.sent_msg_history.get_entries().items():
+            sent_msgs[msg_id] = (msg_info["MSG"].get_message_type(), msg_info["NUM_TIMES"])
         return sent_msgs
 
     def get_received_messages(self) -> dict:
         """
         get_received_messages
 
-        Returns a dictionary containing information about the messages
-        the node has received. The keys of the dictionary are the IDs of
-        the messages the node has received. The values of the dictionary
-        are tuples where the first value is the type of message and
-        the second value is the number of times that message was received.
+        Returns a dictionary containing information about the most recent
+        messages the node has received. The number of messages returned is
+        bounded by the message_history_size config value. The keys of the
+        dictionary are the IDs of the messages the node has received. The
+        values of the dictionary are tuples where the first value is the type
+        of message, the second value is the number of times that message was
+        received, and the third value is the first copy of the message received.
 
         @param None
 
-        @return [dict<int, tuple>] Information about the messages received by the node
+        @return [dict<tuple, tuple>] Information about the messages received by the node
         """
         rcvd_msgs = {}
-        for _, msg_info in self.rcvd_messages.items():
-            msg_id = msg_info["MSG"].get_id()
-            msg_type = msg_info["MSG"].get_message_type()
-            rcvd_msgs[msg_id] = (msg_type, msg_info["NUM_TIMES_RCVD"], msg_info["MSG"])
+        for msg_id, msg_info in self.rcvd_msg_history.get_entries().items():
+            rcvd_msgs[msg_id] = (msg_info["MSG"].get_message_type(), msg_info["NUM_TIMES"], msg_info["MSG"])
         return rcvd_msgs
 
+    def get_message_traces(self) -> dict:
+        """
+        get_message_traces
+
+        Returns the spans of the most recent traced messages seen by the
+        node. The number of messages returned is bounded by the
+        trace_store_size config value. Use a TraceCollector to combine the
+        traces of many nodes.
+
+        @param None
+
+        @return [dict<tuple, list>] The spans of each traced message, by message ID
+        """
+        return self.trace_store.get_traces()
+
+    def get_num_sent_msgs(self) -> int:
+        """
+        get_num_sent_msgs
+
+        Returns the number of messages that the node has sent, not counting link control messages
+
+        @param None
+
+        @return [int] The number of sent messages
+        """
+        return self.num_sent_msgs
+
     def get_num_ignored_msgs(self) -> int:
         """
         get_num_ignored_msgs
@@ -479,6 +801,136 @@ class NetworkNode(MessageChannelUser):
         """
         return self.num_ignored_msgs
 
+    def get_propagation_stats(self) -> dict:
+        """
+        get_propagation_stats
+
+        Returns the statistics of the seen digests used by the node.
+        Each skipped send is a copy of a propagated message that was
+        not sent because the target was already known to have it.
+
+        @param None
+
+        @return [dict] The number of sends skipped and the number of node IDs sent in seen digests
+        """
+        return {
+            "NUM_SKIPPED_SENDS": self.num_seen_digest_skips,
+            "NUM_DIGEST_IDS_SENT": self.num_seen_digest_ids_sent
+        }
+
+    def get_message_queue_stats(self) -> dict:
+        """
+        get_message_queue_stats
+
+        Returns the statistics of the node's message inbox and outbox.
+        The statistics include the current depth and the high water
+        mark of each queue, which can be used to size the queue capacity.
+
+        @param None
+
+        @return [dict<str, dict>] The statistics of the message inbox and outbox
+        """
+        return {
+            "INBOX": self.msg_inbox.get_stats(),
+            "OUTBOX": self.msg_outbox.get_stats()
+        }
+
+    def get_compression_stats(self) -> dict:
+        """
+        get_compression_stats
+
+        Returns the payload compression statistics of the node's connections.
+        Only message channel types that serialize messages compress payloads.
+
+        @param None
+
+        @return [dict<int, dict>] The compression statistics of each connection, by the ID of the connected node.
+            Empty if payloads are not compressed.
+        """
+        compression_stats = {}
+        for node_id, channel in list(self.msg_channels.items()):
+            if hasattr(channel, "get_compression_stats") and (channel.get_compression_stats() is not None):
+                compression_stats[node_id] = channel.get_compression_stats()
+        return compression_stats
+
+    def get_link_model_config(self, target_id: int) -> dict:
+        """
+        get_link_model_config
+
+        Returns the link settings used by modeled channels from this node to the given node
+
+        @param target_id [int] The ID of the target node
+
+        @return [dict] The link settings, as described in LinkModel. None for an ideal link.
+        """
+        return self.link_model_overrides.get(target_id, self.config["link_model"])
+
+    def set_link_model(self, target_id: int, link_model_config: dict) -> None:
+        """
+        set_link_model
+
+        Overrides the link settings used by modeled channels from this node
+        to the given node. The channel to the node is updated right away
+        if there is one. Only used by the ModeledMessageChannel type.
+
+        @param target_id [int] The ID of the target node
+        @param link_model_config [dict] The link settings, as described in LinkModel. None for an ideal link.
+
+        @return None
+        """
+        self.link_model_overrides[target_id] = link_model_config
+        channel = self.msg_channels.get(target_id)
+        if hasattr(channel, "set_link_model"):
+            channel.set_link_model(link_model_config)
+
+    def get_link_model_stats(self) -> dict:
+        """
+        get_link_model_stats
+
+        Returns the link model statistics of the node's connections. Only
+        the ModeledMessageChannel type models its links.
+
+        @param None
+
+        @return [dict<int, dict>] The link model statistics of each connection, by the ID of the connected node.
+            Empty if links are not modeled.
+        """
+        link_model_stats = {}
+        for node_id, channel in list(self.msg_channels.items()):
+            if hasattr(channel, "get_link_model_stats"):
+                link_model_stats[node_id] = channel.get_link_model_stats()
+        return link_model_stats
+
+    def get_link_stats(self) -> dict:
+        """
+        get_link_stats
+
+        Returns the statistics of the node's link senders. A link is
+        congested when it has no flow control credits left and messages
+        are waiting to be sent over it.
+
+        @param None
+
+        @return [dict<int, dict>] The statistics of each link, by the ID of its target. Empty if link senders are not used.
+        """
+        with self.link_senders_lock:
+            link_senders = dict(self.link_senders)
+        return {target_id: link_sender.get_stats() for target_id, link_sender in link_senders.items()}
+
+    def get_congested_links(self) -> list:
+        """
+        get_congested_links
+
+        Returns the targets whose links are currently congested
+
+        @param None
+
+        @return [list] The IDs of the targets with congested links
+        """
+        with self.link_senders_lock:
+            link_senders = dict(self.link_senders)
+        return [target_id for target_id, link_sender in link_senders.items() if link_sender.is_congested()]
+
     def add_idle_listener(self, new_listener: NetworkNodeIdleListenerInterface) -> None:
         """
         add_idle_listener
@@ -492,19 +944,21 @@ class NetworkNode(MessageChannelUser):
         if not isinstance(new_listener, NetworkNodeIdleListenerInterface):
             raise Exception("ERROR: The listeners for the NetworkNode must implement \
                 the NetworkNodeIdleListenerInterface class.")
-        self.idle_listeners.append(new_listener)
+        self.termination_detector.add_idle_listener(new_listener)
 
     def is_idle(self) -> bool:
         """
         is_idle
 
-        Returns the idle status of the node
+        Returns the idle status of the node. A node is idle when it has
+        no work left and every message it sent that requested a termination
+        acknowledgement has been acknowledged.
 
         @param None
 
         @return [bool] True if the node is idle. False otherwise.
         """
-        return self.num_processes == 0
+        return self.termination_detector.is_idle()
 
     def set_message_inbox_status(self, new_status):
         self.can_add_to_inbox = new_status
@@ -513,14 +967,12 @@ class NetworkNode(MessageChannelUser):
         self.can_add_to_outbox = new_status
 
     def wait_until_idle(self, timeout_sec: int = 10):
-        start_time = time.time()
-        while (time.time() < start_time + timeout_sec):
-            if self.is_idle():
-                time.sleep(3)
-                if self.is_idle():
-                    return True
+        if self.termination_detector.wait_until_idle(timeout_sec):
+            return True
 
-        raise Exception("ERROR: Node was not idle before timeout was hit. # Processes: {}".format(self.num_processes))
+        raise Exception("ERROR: Node was not idle before timeout was hit. State: {}".format(
+            self.termination_detector.get_stats()
+        ))
 
     def network_node_handle_request_connection_message(self, message):
         new_network_node = message.get_message_payload()["NODE"]
@@ -528,24 +980,52 @@ class NetworkNode(MessageChannelUser):
         node_id = new_network_node.get_id()
         if node_id not in self.msg_channels:
             self.msg_channels[node_id] = self.message_channel_type(self, new_network_node)
+            self.connection_requesters.pop(node_id, None)
+            self._set_credit_window(node_id, message.get_message_payload().get("CREDIT_WINDOW"))
 
-            self.send_directed_message(new_network_node.get_id(), NetworkNodeMessageTypes.ACCEPT_CONNECTION_REQUEST, {})
+            self.send_directed_message(
+                new_network_node.get_id(),
+                NetworkNodeMessageTypes.ACCEPT_CONNECTION_REQUEST,
+                {"CREDIT_WINDOW": self.link_credit_window}
+            )
+            self._send_subscription_table(node_id)
 
     def network_node_handle_accept_connection_request_message(self, message):
         node_id = message.get_sender_id()
         self.msg_channels[node_id] = self.message_channel_type(self, self.connection_pending_list[node_id]["NODE"])
+        self._set_credit_window(node_id, message.get_message_payload().get("CREDIT_WINDOW"))
 
         for message in self.connection_pending_list[node_id]["MSGS_TO_SEND"]:
-            self.msg_outbox.append({"MESSAGE": message, "TARGET_ID": node_id})
-            self.msg_outbox_has_values.set()
+            self._put_in_outbox(
+                {"MESSAGE": message, "TARGET_ID": node_id},
+                low_priority=self._is_low_priority_message(message)
+            )
 
         self.connection_pending_list.pop(node_id)
+        self._send_subscription_table(node_id)
 
     def network_node_handle_bot_teardown_message(self, message):
         bot_to_remove = message.get_message_payload()["BOT_ID"]
         self.torndown_nodes.append(bot_to_remove)
         NetworkNode.disconnect_from_network_node(self, bot_to_remove)
 
+    def network_node_handle_subscription_update_message(self, message):
+        sender_id = message.get_sender_id()
+        advertisements = self.subscription_table.merge_advertisements(
+            sender_id,
+            message.get_message_payload()["ADVERTISEMENTS"]
+        )
+        if len(advertisements) == 0:
+            return
+
+        for node_id in list(self.msg_channels.keys()):
+            if node_id != sender_id:
+                self.send_directed_message(
+                    node_id,
+                    NetworkNodeMessageTypes.SUBSCRIPTION_UPDATE,
+                    {"ADVERTISEMENTS": advertisements}
+                )
+
     def _msg_sender_loop(self) -> None:
         """
         msg_sender_loop
@@ -554,66 +1034,189 @@ class NetworkNode(MessageChannelUser):
         will run so long as the run_node flag is not set. The loop
         first checks if a message is present in the outbox. If no
         message is present, then the loop waits for one to be available.
-        If a message is present, then the loop pops the first messsage
-        from the outbox and sends it according to the messages configuration.
+        If a message is present, then the loop sends it along with the
+        messages that follow it as described in _send_outbox_messages.
 
         @param None
 
         @return None
         """
         while (not self.run_node.is_set()):
-            self.msg_outbox_has_values.wait()
-            while (len(self.msg_outbox) > 0) and (not self.run_node.is_set()):
-                self._notify_process_state(True)
-                msg_to_send = self.msg_outbox.pop(0)
+            msg_to_send = self.msg_outbox.get()
+            if msg_to_send is None:
+                continue
+
+            self._send_outbox_messages(msg_to_send, self.msg_batch_max_delay)
+
+    def _send_outbox_messages(self, msg_to_send: dict, batch_max_delay: float) -> None:
+        """
+        _send_outbox_messages
 
-                message = msg_to_send["MESSAGE"]
+        Sends the given message popped from the outbox. Keeps popping
+        messages from the outbox until the batch size or batch delay
+        limit is hit. The popped messages are grouped by target and each
+        group is sent as a single batch. If link senders are used, then
+        the message is handed to the link sender of its target instead.
 
+        @param msg_to_send [dict] The first outbox item to send
+        @param batch_max_delay [float] The maximum number of seconds to wait for more messages to batch
+
+        @return None
+        """
+        if self.use_link_senders:
+            self._add_to_link_sender(msg_to_send)
+            return
+
+        batches = {}
+        num_popped_msgs = 1
+        batch_deadline = time.time() + batch_max_delay
+        try:
+            while True:
                 target = msg_to_send["TARGET_ID"]
+                if self._prepare_message_for_sending(msg_to_send["MESSAGE"], target):
+                    if target not in batches:
+                        batches[target] = []
+                    batches[target].append(msg_to_send["MESSAGE"])
+
+                if num_popped_msgs >= self.msg_batch_max_size:
+                    break
+
+                msg_to_send = self.msg_outbox.get(timeout=max(0, batch_deadline - time.time()))
+                if msg_to_send is None:
+                    break
+                num_popped_msgs += 1
+
+            for target, messages in batches.items():
+                self._send_message_batch(target, messages)
+        finally:
+            # The messages stay work of this node until they are handed to their targets
+            self.termination_detector.end_work(num_popped_msgs)
+
+    def _prepare_message_for_sending(self, message: MessageWrapper, target: int) -> bool:
+        """
+        _prepare_message_for_sending
 
-                msg_type = message.get_message_type()
-                exempt_msg_types = [NetworkNodeMessageTypes.REQUEST_CONNECTION]
+        Validates the target of the given message and records the message as sent.
 
-                if target in self.torndown_nodes:
-                    self.logger.warning("WARNING: {} tried to send message to torn down bot: {}".format(
-                        self.get_id(),
-                        target
-                    ))
-                elif (msg_type not in exempt_msg_types) and (target not in self.msg_channels):
-                    raise Exception(
-                        "ERROR: Tried to send message to unknown node: {}. Known node list: {}".format(
-                            str(target),
-                            self.msg_channels.keys()
-                        )
-                    )
-                else:
-                    msg_id = message.get_id()
+        @param message [MessageWrapper] The message to send
+        @param target [int] The ID of the node to send the message to
 
-                    if msg_id not in self.sent_messages:
-                        self.sent_messages[msg_id] = {"TIME_SENT": time.time(), "SENT_MSG": message, "NUM_TIMES_SENT": 0}
+        @return [bool] True if the message should be sent. False if the message should be skipped.
+        """
+        msg_type = message.get_message_type()
+        exempt_msg_types = [NetworkNodeMessageTypes.REQUEST_CONNECTION]
 
-                    self.sent_messages[msg_id]["NUM_TIMES_SENT"] += 1
+        if self._is_link_control_message(message):
+            return target not in self.torndown_nodes
 
-                    self.logger.debug(
-                        "Sent message. Sender: {}, target: {}, msg ID: {}, type: {}, payload: {}".format(
-                            self.get_id(),
-                            target,
-                            msg_id,
-                            msg_type,
-                            message.get_message_payload()
-                        )
-                    )
+        if target in self.torndown_nodes:
+            self.logger.warning("WARNING: {} tried to send message to torn down bot: {}".format(
+                self.get_id(),
+                target
+            ))
+            return False
+        elif (msg_type not in exempt_msg_types) and (target not in self.msg_channels):
+            raise Exception(
+                "ERROR: Tried to send message to unknown node: {}. Known node list: {}".format(
+                    str(target),
+                    self.msg_channels.keys()
+                )
+            )
+
+        msg_id = message.get_id()
+
+        self.sent_msg_tracker.add(msg_id)
+        self.sent_msg_history.record(message)
+        self.num_sent_msgs += 1
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Sent message. Sender: {}, target: {}, msg ID: {}, type: {}, payload: {}".format(
+                    self.get_id(),
+                    target,
+                    msg_id,
+                    msg_type,
+                    message.get_raw_payload()
+                )
+            )
+
+        return True
+
+    def _send_message_batch(self, target: int, messages: list) -> None:
+        """
+        _send_message_batch
 
-                    if target in self.msg_channels:
-                        self.msg_channels[target].send_message(message)
-                    else:
-                        temp_channel = self.message_channel_type(self, self.connection_pending_list[target]["NODE"])
-                        temp_channel.send_message(message)
+        Sends the given messages to the given target. If there is more than
+        one message, then the messages are wrapped in a single MessageBatchWrapper.
 
-                self._notify_process_state(False)
+        @param target [int] The ID of the node to send the messages to
+        @param messages [list] The messages to send
 
-            if len(self.msg_inbox) == 0:
-                self.msg_outbox_has_values.clear()
+        @return [bool] True if the messages were sent. False otherwise.
+        """
+        if len(messages) == 1:
+            message = messages[0]
+        else:
+            message = MessageBatchWrapper(self._generate_message_id(), self.get_id(), target, messages)
+
+        if target in self.msg_channels:
+            channel = self.msg_channels[target]
+        elif target in self.connection_pending_list:
+            channel = self.message_channel_type(self, self.connection_pending_list[target]["NODE"])
+        elif target in self.connection_requesters:
+            channel = self.message_channel_type(self, self.connection_requesters[target])
+        else:
+            # Only link control messages are sent without a channel check, so the target disconnected
+            return False
+
+        return self._send_with_termination_ack(target, channel, message, messages)
+
+    def _send_with_termination_ack(
+            self,
+            target: int,
+            channel: MessageChannel,
+            message: MessageWrapper,
+            messages: list
+            ) -> bool:
+        """
+        _send_with_termination_ack
+
+        Sends the given message through the given channel, keeping the
+        termination detector's acknowledgement count for the target. An
+        acknowledgement is requested if the channel does not deliver
+        synchronously or if this node is engaged, unless the messages are
+        only link control messages or this node's teardown notice. Once the
+        teardown notice is sent, the target is no longer waited on.
+
+        @param target [int] The ID of the node the message is sent to
+        @param channel [MessageChannel] The channel to send the message through
+        @param message [MessageWrapper] The message to send. Either the only message or the batch holding the messages.
+        @param messages [list] The messages being sent
+
+        @return [bool] True if the message was sent. False otherwise.
+        """
+        ack_requested = ((not channel.delivers_synchronously) or self.termination_detector.is_engaged()) and \
+            any(
+                (not self._is_link_control_message(batched_msg)) and (not self._is_own_teardown_notice(batched_msg))
+                for batched_msg in messages
+            )
+        message.set_ack_requested(ack_requested)
+        if ack_requested:
+            self.termination_detector.message_sent(target)
+
+        try:
+            msg_sent = channel.send_message(message)
+        except Exception:
+            if ack_requested:
+                self.termination_detector.acks_received(target, 1)
+            raise
+
+        if ack_requested and (msg_sent is False):
+            self.termination_detector.acks_received(target, 1)
+        if any(self._is_own_teardown_notice(batched_msg) for batched_msg in messages):
+            # The target forgets this node once it handles the notice, so acknowledgements it still owes are never sent
+            self.termination_detector.forget_node(target)
+        return msg_sent is not False
 
     def _msg_receiver_loop(self) -> None:
         """
@@ -624,27 +1227,41 @@ class NetworkNode(MessageChannelUser):
         first checks if a message is present in the inbox. If no
         message is present, then the loop waits for one to be available.
         If a message is present, then the loop pops the first messsage
-        from the inbox and calls the handler associated with the message
-        type. If the message is configured to be propagated, then the
-        loop will propagate the message.
+        from the inbox and processes it with _handle_received_message.
 
         @param None
 
         @return None
         """
         while not self.run_node.is_set():
-            self.msg_inbox_has_values.wait()
-            while (len(self.msg_inbox) > 0) and (not self.run_node.is_set()):
-                self._notify_process_state(True)
+            message = self.msg_inbox.get()
+            if message is None:
+                continue
 
-                message = self.msg_inbox.pop(0)
+            self._handle_received_message(message)
 
-                target_id = message.get_target_node_id()
-                msg_id = message.get_id()
-                message_type = str(message.get_message_type())
-                message_payload = message.get_message_payload()
-                should_propagate = message.get_propagation_flag()
+    def _handle_received_message(self, message: MessageWrapper) -> None:
+        """
+        _handle_received_message
+
+        Processes a message popped from the inbox. Dispatches the message
+        to the handlers associated with the message type. If the message
+        is configured to be propagated, then the message is propagated.
+        The message stops being work of this node once this method returns.
+
+        @param message [MessageWrapper] The received message
+
+        @return None
+        """
+        try:
+            target_id = message.get_target_node_id()
+            msg_id = message.get_id()
+            message_type = str(message.get_message_type())
+            message_payload = message.get_raw_payload()
+            should_propagate = message.get_propagation_flag()
 
+            # Formatting the payload is expensive, so it is skipped unless the message is actually logged
+            if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(
                     "Received message. Receiver: {}, target: {}, msg ID: {}, type: {}, payload: {}".format(
                         self.get_id(),
@@ -655,74 +1272,222 @@ class NetworkNode(MessageChannelUser):
                     )
                 )
 
-                if (self.interacted_with_msg_with_id(msg_id)):
-                    if msg_id not in self.rcvd_messages:
-                        self.rcvd_messages[msg_id] = {"MSG": message, "NUM_TIMES_RCVD": 0}
-                    self.rcvd_messages[msg_id]["NUM_TIMES_RCVD"] += 1
-                    self.num_ignored_msgs += 1
-                    if should_propagate:
-                        self.propagation_strategy.track_message_propagation(message)
-                else:
-                    self.rcvd_messages[msg_id] = {"MSG": message, "NUM_TIMES_RCVD": 1}
+            if message.is_traced():
+                self._record_trace_span(message, TraceEvent.DEQUEUE)
 
-                    if message_type in self.msg_handler_dict:
-                        thread = threading.Thread(target=self._run_handlers, args=(message,))
-                        thread.start()
-                    else:
-                        self.logger.warning("Warning: Received message type with no assigned handler: " + str(message_type))
+            already_sent = self.sent_msg_tracker.contains(msg_id)
+            is_new_msg = self.rcvd_msg_tracker.add(msg_id)
+            self.rcvd_msg_history.record(message)
 
-                    if should_propagate and self.can_add_to_outbox:
+            if (not is_new_msg) or already_sent:
+                self.num_ignored_msgs += 1
+                if should_propagate and (not message.is_topic_routed()):
+                    self.propagation_strategy.track_message_propagation(message)
+                    if message.get_hops_left() is not None:
+                        # Only propagated again if this copy has more hops left than the ones already propagated
                         self.__continue_propagation(message)
+            else:
+                if message_type in self.msg_handler_dict:
+                    # Ended by _run_handlers once the handlers are done
+                    self.termination_detector.begin_work()
+                    self.msg_dispatcher.dispatch(
+                        message,
+                        is_control_msg=self._get_message_priority(message) == MessagePriority.CONTROL
+                    )
+                elif message.is_topic_routed():
+                    # Published messages are expected to pass through nodes that do not subscribe to them
+                    self.logger.debug("Forwarding published message with no assigned handler: " + str(message_type))
+                else:
+                    self.logger.warning("Warning: Received message type with no assigned handler: " + str(message_type))
 
-                self._notify_process_state(False)
-
-            if len(self.msg_inbox) == 0:
-                self.msg_inbox_has_values.clear()
+                if should_propagate and self.can_add_to_outbox:
+                    self.__continue_propagation(message)
+        finally:
+            self.termination_detector.end_work()
 
-    def _generate_message_id(self):
+    def _generate_message_id(self, tracked: bool = False) -> tuple:
         """
         _generate_message_id
 
-        Generates a new message ID. Ensures that the message ID
-        generated has not been used before.
+        Generates a new message ID. The ID is made up of the ID of this
+        node and a sequence number that increases with every generated ID,
+        so IDs generated by different nodes can never collide. Tracked IDs
+        are numbered separately from untracked ones, so the nodes receiving
+        this node's propagated messages see their sequence without gaps.
 
-        @param None
+        @param tracked [bool] True if the ID is for a message that can be received more than once and must be deduplicated
 
-        @return [int] The generated message ID
+        @return [tuple] The generated message ID
         """
-        min_id = 0
-        max_id = 1000000
+        if tracked:
+            return (self.get_id(), next(self.msg_sequence_counter))
+        return (self.get_id(), next(self.untracked_msg_sequence_counter) | UNTRACKED_SEQ_FLAG)
 
-        message_id = randint(min_id, max_id)
-        while self.interacted_with_msg_with_id(message_id):
-            message_id = randint(min_id, max_id)
+    def _start_propagation(
+            self,
+            message_type: str,
+            message_payload: dict,
+            hops_left: int,
+            topic_routed: bool = False,
+            priority: MessagePriority = None
+            ) -> tuple:
+        """
+        _start_propagation
+
+        Creates a message to propagate and adds it to the message outbox
+
+        @param message_type [str] The type of message to create
+        @param message_payload [dict] The payload for the message
+        @param hops_left [int] The number of hops the receivers may still propagate the message. None for no limit.
+        @param topic_routed [bool] True if the message should only be propagated toward its type's subscribers
+        @param priority [MessagePriority] The priority class of the message. None to use the message type's priority.
+
+        @return [tuple] The ID of the new message
+        """
+        if not self.can_add_to_outbox:
+            return None
+
+        if topic_routed:
+            targets = self.subscription_table.get_route_targets(str(message_type))
+            pending_ids = []
+        else:
+            targets = list(self.propagation_strategy.determine_prop_targets(None))
+            pending_ids = list(self.connection_pending_list.keys())
+
+        message_id = self._generate_message_id(tracked=True)
+        self._sample_trace(message_id)
+        seen_digest = self._create_seen_digest(None, targets + pending_ids)
+        if hops_left is not None:
+            self._record_scoped_hops(message_id, hops_left)
+
+        for target_node_id in targets:
+            self._create_message(
+                target_node_id,
+                message_id,
+                message_type,
+                message_payload,
+                True,
+                seen_digest=seen_digest,
+                hops_left=hops_left,
+                topic_routed=topic_routed,
+                priority=priority
+            )
+
+        for pending_id in pending_ids:
+            msg = self._create_message(
+                pending_id,
+                message_id,
+                message_type,
+                message_payload,
+                True,
+                add_to_send_queue=False,
+                seen_digest=seen_digest,
+                hops_left=hops_left,
+                priority=priority
+            )
+
+            self.connection_pending_list[pending_id]["MSGS_TO_SEND"].append(msg)
+
+        # Stored messages could be resent past their hop limit or to nodes that did not subscribe to them,
+        # so scoped and published messages are not given to the strategy
+        if (hops_left is None) and (not topic_routed):
+            self.propagation_strategy.message_propagated(message_id, message_type, message_payload, None, targets)
 
         return message_id
 
+    def _record_scoped_hops(self, msg_id: tuple, hops_left: int) -> bool:
+        """
+        _record_scoped_hops
+
+        Records the number of hops left for a scoped message propagated by
+        this node. A copy of a scoped message may arrive through a longer
+        path first, so a later copy with more hops left must be propagated
+        again to reach every node within the scope.
+
+        @param msg_id [tuple] The ID of the scoped message
+        @param hops_left [int] The number of hops left for the copies sent by this node
+
+        @return [bool] True if the message was not propagated with as many hops left before. False otherwise.
+        """
+        with self.scoped_msg_lock:
+            prev_hops_left = self.scoped_msg_hops.get(msg_id)
+            if (prev_hops_left is not None) and (prev_hops_left >= hops_left):
+                return False
+
+            self.scoped_msg_hops[msg_id] = hops_left
+            self.scoped_msg_hops.move_to_end(msg_id)
+            if len(self.scoped_msg_hops) > self.config["message_history_size"]:
+                self.scoped_msg_hops.popitem(last=False)
+            return True
+
     def __continue_propagation(self, message):
         should_propagate = message.get_propagation_flag()
         if should_propagate and self.can_add_to_outbox:
             msg_id = message.get_id()
             message_type = str(message.get_message_type())
-            message_payload = message.get_message_payload()
+            message_payload = message.get_raw_payload()
+
+            hops_left = message.get_hops_left()
+            if hops_left is not None:
+                if (hops_left <= 0) or (not self._record_scoped_hops(msg_id, hops_left - 1)):
+                    return
+                hops_left -= 1
+
+            topic_routed = message.is_topic_routed()
+            if topic_routed:
+                all_targets = [
+                    node_id for node_id in self.subscription_table.get_route_targets(message_type)
+                    if node_id != message.get_sender_id()
+                ]
+                pending_ids = []
+            else:
+                all_targets = list(self.propagation_strategy.determine_prop_targets(message))
+                pending_ids = self.propagation_strategy.remove_seen_targets(
+                    message,
+                    [pending_id for pending_id in self.connection_pending_list if pending_id != message.get_sender_id()]
+                )
 
-            targets = self.propagation_strategy.determine_prop_targets(message)
+            targets = self.propagation_strategy.remove_seen_targets(message, all_targets)
+            self.num_seen_digest_skips += len(all_targets) - len(targets)
+            seen_digest = self._create_seen_digest(message, targets + pending_ids)
 
             for target_node_id in targets:
-                self._create_message(target_node_id, msg_id, message_type, message_payload, True)
+                self._create_message(
+                    target_node_id,
+                    msg_id,
+                    message_type,
+                    message_payload,
+                    True,
+                    seen_digest=seen_digest,
+                    hops_left=hops_left,
+                    topic_routed=topic_routed,
+                    priority=message.get_priority()
+                )
 
-            for pending_id in self.connection_pending_list:
+            for pending_id in pending_ids:
                 msg = self._create_message(
                     pending_id,
                     msg_id,
                     message_type,
                     message_payload,
                     True,
-                    add_to_send_queue=False
+                    add_to_send_queue=False,
+                    seen_digest=seen_digest,
+                    hops_left=hops_left,
+                    priority=message.get_priority()
                 )
 
                 self.connection_pending_list[pending_id]["MSGS_TO_SEND"].append(msg)
 
+            if (hops_left is None) and (not topic_routed):
+                self.propagation_strategy.message_propagated(
+                    msg_id,
+                    message_type,
+                    message_payload,
+                    message.get_sender_id(),
+                    targets
+                )
+
     def _create_message(
             self,
             target_node_id,
@@ -730,7 +1495,11 @@ class NetworkNode(MessageChannelUser):
             message_type,
             message_payload,
             propagate_message,
-            add_to_send_queue=True
+            add_to_send_queue=True,
+            seen_digest=None,
+            hops_left=None,
+            topic_routed=False,
+            priority=None
             ):
         """
         _create_message
@@ -738,10 +1507,14 @@ class NetworkNode(MessageChannelUser):
         Creates a new message and adds it to the message outbox to be sent.
 
         @param target_node_id [int] The ID of the node to send the message to
-        @param message_id [int] The ID of the message to send
+        @param message_id [tuple] The ID of the message to send
         @param message_type [str] The type of the message to send
         @param message_payload [dict] The payload of the message to send
         @param propagate_message [bool] Whether or not to propage the message
+        @param seen_digest [SeenDigest] The digest of the nodes known to have the message. None to send no digest.
+        @param hops_left [int] The number of hops the receiver may still propagate the message. None for no limit.
+        @param topic_routed [bool] True if the message should only be propagated toward its type's subscribers
+        @param priority [MessagePriority] The priority class of the message. None to use the message type's priority.
 
         @return [int] The message ID used for the message
         """
@@ -756,38 +1529,475 @@ class NetworkNode(MessageChannelUser):
             message_payload,
             propagate_message
         )
+        new_msg.set_seen_digest(seen_digest)
+        new_msg.set_hops_left(hops_left)
+        new_msg.set_topic_routed(topic_routed)
+        new_msg.set_priority(priority)
+        new_msg.set_trace_spans(self.trace_store.get_spans(message_id))
 
         if add_to_send_queue:
-            self.msg_outbox.append({"MESSAGE": new_msg, "TARGET_ID": target_node_id})
-            self.msg_outbox_has_values.set()
+            self._put_in_outbox(
+                {"MESSAGE": new_msg, "TARGET_ID": target_node_id},
+                low_priority=self._is_low_priority_message(new_msg)
+            )
 
         return new_msg
 
+    def _create_seen_digest(self, message: MessageWrapper, target_ids: list) -> SeenDigest:
+        """
+        _create_seen_digest
+
+        Creates the seen digest to send with a propagated message. The
+        digest of the received message is extended with this node and
+        the nodes the message is sent to.
+
+        @param message [MessageWrapper] The received message being propagated. None if this node created the message.
+        @param target_ids [list] The IDs of the nodes the message is sent to
+
+        @return [SeenDigest] The digest to send. None if seen digests are disabled.
+        """
+        if self.seen_digest_max_size <= 0:
+            return None
+
+        received_digest = None if message is None else message.get_seen_digest()
+        if received_digest is None:
+            received_digest = SeenDigest()
+
+        seen_digest = received_digest.extend([self.get_id()] + target_ids, self.seen_digest_max_size)
+        self.num_seen_digest_ids_sent += len(seen_digest) * len(target_ids)
+        return seen_digest
+
+    def _advertise_local_topics(self) -> None:
+        """
+        _advertise_local_topics
+
+        Updates the topics this node subscribes to from its assigned
+        handlers and, if they changed, advertises them to the connected
+        nodes. Does nothing if topic routing is disabled.
+
+        @param None
+
+        @return None
+        """
+        if not self.topic_routing:
+            return
+
+        network_node_msg_types = [str(msg_type) for msg_type in NetworkNodeMessageTypes]
+        topics = [
+            msg_type for msg_type, handlers in list(self.msg_handler_dict.items())
+            if (len(handlers) > 0) and (msg_type not in network_node_msg_types)
+        ]
+
+        advertisement = self.subscription_table.set_local_topics(topics)
+        if advertisement is None:
+            return
+
+        for node_id in list(self.msg_channels.keys()):
+            self.send_directed_message(
+                node_id,
+                NetworkNodeMessageTypes.SUBSCRIPTION_UPDATE,
+                {"ADVERTISEMENTS": [advertisement]}
+            )
+
+    def _install_channel(self, network_node) -> None:
+        """
+        _install_channel
+
+        Installs a channel to the given node without the connection handshake.
+        The credit window of the node's link senders is read from the node
+        itself, since it is in the same process.
+
+        @param network_node [NetworkNode] The node to install a channel to
+
+        @return None
+        """
+        node_id = network_node.get_id()
+        if node_id in self.msg_channels:
+            return
+
+        self.msg_channels[node_id] = self.message_channel_type(self, network_node)
+        self.connection_requesters.pop(node_id, None)
+        self._set_credit_window(node_id, network_node.link_credit_window)
+
+    def _send_subscription_table(self, node_id: int) -> None:
+        """
+        _send_subscription_table
+
+        Sends every known subscription to a newly connected node. Does
+        nothing if topic routing is disabled.
+
+        @param node_id [int] The ID of the newly connected node
+
+        @return None
+        """
+        if not self.topic_routing:
+            return
+
+        advertisements = self.subscription_table.get_advertisements(node_id)
+        if len(advertisements) > 0:
+            self.send_directed_message(
+                node_id,
+                NetworkNodeMessageTypes.SUBSCRIPTION_UPDATE,
+                {"ADVERTISEMENTS": advertisements}
+            )
+
+    def _put_in_outbox(self, item: dict, low_priority: bool, work_counted: bool = False) -> bool:
+        """
+        _put_in_outbox
+
+        Adds the given item to the message outbox and records it as work of this node
+
+        @param item [dict] The outbox item containing the message and the ID of its target
+        @param low_priority [bool] True if the item can be dropped to make space for newer items. False otherwise.
+        @param work_counted [bool] True if the work for the item was already recorded by the caller
+
+        @return [bool] True if the item was added to the outbox. False if it was rejected.
+        """
+        if not work_counted:
+            self.termination_detector.begin_work()
+
+        item_added = self.msg_outbox.put(
+            item,
+            low_priority=low_priority,
+            priority=self._get_message_priority(item["MESSAGE"])
+        )
+        if not item_added:
+            self.termination_detector.end_work()
+        return item_added
+
+    def _add_to_link_sender(self, msg_to_send: dict) -> None:
+        """
+        _add_to_link_sender
+
+        Hands the given message popped from the outbox to the link sender
+        of its target. The message stays work of this node until the link
+        sender sends it.
+
+        @param msg_to_send [dict] The outbox item to send
+
+        @return None
+        """
+        handed_over = False
+        try:
+            message = msg_to_send["MESSAGE"]
+            target = msg_to_send["TARGET_ID"]
+            if self._prepare_message_for_sending(message, target):
+                # Added while holding the lock, so the link sender can not be removed and cleared in between
+                with self.link_senders_lock:
+                    self._get_link_sender(target).add_message(
+                        message,
+                        self._get_message_priority(message),
+                        is_control_msg=self._is_link_control_message(message)
+                    )
+                handed_over = True
+        finally:
+            if not handed_over:
+                self.termination_detector.end_work()
+
+    def _get_link_sender(self, target: int) -> LinkSender:
+        """
+        _get_link_sender
+
+        Returns the link sender of the given target, creating it if needed.
+        Must be called while holding the link senders lock.
+
+        @param target [int] The ID of the node the link sends to
+
+        @return [LinkSender] The link sender of the target
+        """
+        if target not in self.link_senders:
+            link_sender = LinkSender(
+                target,
+                self._send_link_messages,
+                self.link_credit_window,
+                self.msg_batch_max_size,
+                self.config["message_queue_starvation_limit"]
+            )
+            if not self.run_node.is_set():
+                link_sender.start()
+            self.link_senders[target] = link_sender
+        return self.link_senders[target]
+
+    def _remove_link_sender(self, target: int) -> None:
+        """
+        _remove_link_sender
+
+        Stops and removes the link sender of the given target. Messages
+        still waiting to be sent over the link are dropped.
+
+        @param target [int] The ID of the node the link sends to
+
+        @return None
+        """
+        with self.link_senders_lock:
+            link_sender = self.link_senders.pop(target, None)
+        with self.credit_lock:
+            self.credit_windows.pop(target, None)
+            self.credits_to_grant.pop(target, None)
+
+        if link_sender is not None:
+            link_sender.stop()
+            num_dropped = link_sender.clear()
+            if num_dropped > 0:
+                self.termination_detector.end_work(num_dropped)
+
+    def _send_link_messages(self, target: int, messages: list) -> bool:
+        """
+        _send_link_messages
+
+        Sends the given messages taken from the link sender of the given
+        target, then ends the work recorded for them
+
+        @param target [int] The ID of the node to send the messages to
+        @param messages [list] The messages to send
+
+        @return [bool] True if the messages were sent. False otherwise.
+        """
+        try:
+            return self._send_message_batch(target, messages)
+        finally:
+            self.termination_detector.end_work(len(messages))
+
+    def _set_credit_window(self, node_id: int, credit_window: int) -> None:
+        """
+        _set_credit_window
+
+        Records the flow control credit window announced by the given node
+        when the connection was set up. Credits for the messages received
+        from the node are only returned if it announced a window.
+
+        @param node_id [int] The ID of the connected node
+        @param credit_window [int] The credit window of the node's link to this node. None if unlimited.
+
+        @return None
+        """
+        if credit_window is None:
+            return
+
+        with self.credit_lock:
+            self.credit_windows[node_id] = credit_window
+        self._grant_credits(node_id)
+
+    def _record_link_receipt(self, message: MessageWrapper) -> None:
+        """
+        _record_link_receipt
+
+        Records the messages taken off the link from the sender of the
+        given message, and returns the sender's credits once enough are owed
+
+        @param message [MessageWrapper] The received message
+
+        @return None
+        """
+        if isinstance(message, MessageBatchWrapper):
+            batched_msgs = message.get_messages()
+        else:
+            batched_msgs = [message]
+
+        num_credits = sum(1 for batched_msg in batched_msgs if not self._is_link_control_message(batched_msg))
+        if num_credits == 0:
+            return
+
+        sender_id = message.get_sender_id()
+        with self.credit_lock:
+            self.credits_to_grant[sender_id] = self.credits_to_grant.get(sender_id, 0) + num_credits
+        self._grant_credits(sender_id)
+
+    def _grant_credits(self, node_id: int) -> None:
+        """
+        _grant_credits
+
+        Returns the credits owed to the given node if they make up at least
+        half of its credit window, so credits are returned in batches
+        instead of once per message
+
+        @param node_id [int] The ID of the node to return credits to
+
+        @return None
+        """
+        with self.credit_lock:
+            credit_window = self.credit_windows.get(node_id)
+            num_credits = self.credits_to_grant.get(node_id, 0)
+            if (credit_window is None) or (num_credits < max(1, credit_window // 2)):
+                return
+            self.credits_to_grant[node_id] = 0
+
+        credit_msg = self.message_wrapper_type(
+            self._generate_message_id(),
+            self.get_id(),
+            node_id,
+            NetworkNodeMessageTypes.FLOW_CREDIT,
+            {"NUM_CREDITS": num_credits},
+            False
+        )
+        self._put_in_outbox({"MESSAGE": credit_msg, "TARGET_ID": node_id}, low_priority=False)
+
+    def _credits_received(self, sender_id: int, num_credits: int) -> None:
+        """
+        _credits_received
+
+        Returns the credits granted by the given node to the link sending to it
+
+        @param sender_id [int] The ID of the node that granted the credits
+        @param num_credits [int] The number of credits granted
+
+        @return None
+        """
+        with self.link_senders_lock:
+            link_sender = self.link_senders.get(sender_id)
+        if link_sender is not None:
+            link_sender.grant_credits(num_credits)
+
+    def _is_link_control_message(self, message: MessageWrapper) -> bool:
+        """
+        _is_link_control_message
+
+        Checks whether or not the given message only maintains the link it
+        is sent over. Such messages are not tracked as sent, do not request
+        termination acknowledgements and do not spend flow control credits.
+
+        @param message [MessageWrapper] The message to check
+
+        @return [bool] True if the message is a link control message. False otherwise.
+        """
+        return message.get_message_type() in [NetworkNodeMessageTypes.TERMINATION_ACK, NetworkNodeMessageTypes.FLOW_CREDIT]
+
+    def _is_own_teardown_notice(self, message: MessageWrapper) -> bool:
+        """
+        _is_own_teardown_notice
+
+        Checks whether or not the given message is the teardown notice of
+        this node. The receivers of the notice disconnect from this node
+        while handling it, so they can never acknowledge it or any other
+        message sent to them by this node.
+
+        @param message [MessageWrapper] The message to check
+
+        @return [bool] True if the message is this node's teardown notice. False otherwise.
+        """
+        return (message.get_message_type() == NetworkNodeMessageTypes.BOT_TEARDOWN) and (message.get_id()[0] == self.get_id())
+
+    def _send_termination_ack(self, target_id: int, num_acks: int) -> None:
+        """
+        _send_termination_ack
+
+        Sends a termination acknowledgement for the given number of messages to
+        the given node. Called by the termination detector, which already
+        recorded the work for sending the acknowledgement.
+
+        @param target_id [int] The ID of the node to acknowledge
+        @param num_acks [int] The number of messages being acknowledged
+
+        @return None
+        """
+        ack = self.message_wrapper_type(
+            self._generate_message_id(),
+            self.get_id(),
+            target_id,
+            NetworkNodeMessageTypes.TERMINATION_ACK,
+            {"NUM_ACKS": num_acks},
+            False
+        )
+        self._put_in_outbox({"MESSAGE": ack, "TARGET_ID": target_id}, low_priority=False, work_counted=True)
+
     def _notify_process_state(self, process_running: bool) -> None:
         """
         notify_process_state
 
-        Notifys the nodes idle listeners about the current statue of the node
-        when a process starts/stops running
+        Records the start or end of a process that keeps the node busy
+        outside of message handling (e.g. a running task). Idle listeners
+        are notified if the idle state of the node changes.
 
         @param notify_process_state [bool] True if a new process is running. False otherwise.
 
         @return None
         """
-        curr_state = self.is_idle()
-
         if process_running:
-            self.num_processes += 1
+            self.termination_detector.begin_work()
         else:
-            self.num_processes -= 1
+            self.termination_detector.end_work()
+
+    def _is_low_priority_message(self, message: MessageWrapper) -> bool:
+        """
+        _is_low_priority_message
 
-        new_state = self.is_idle()
+        Checks whether or not the given message can be dropped from a full
+        message queue. Messages used to maintain the network connections
+        are never dropped.
 
-        if curr_state != new_state:
-            for listener in self.idle_listeners:
-                listener.notify_idle_state(self.get_id(), new_state)
+        @param message [MessageWrapper] The message to check
+
+        @return [bool] True if the message can be dropped. False otherwise.
+        """
+        return not isinstance(message.get_message_type(), NetworkNodeMessageTypes)
+
+    def _get_message_priority(self, message: MessageWrapper) -> MessagePriority:
+        """
+        _get_message_priority
+
+        Returns the priority class of the given message. The priority set
+        on the message when it was sent is used if there is one. Otherwise
+        the priority configured for the message type is used. Network node
+        message types are control messages, except for lazy push message
+        IDs, which are bulk messages so they can not overtake the messages
+        they announce. All other types are normal messages unless configured
+        otherwise.
+
+        @param message [MessageWrapper] The message to get the priority of
+
+        @return [MessagePriority] The priority class of the message
+        """
+        if message.get_priority() is not None:
+            return message.get_priority()
+
+        message_type = message.get_message_type()
+        if str(message_type) in self.msg_type_priorities:
+            return self.msg_type_priorities[str(message_type)]
+        if message_type in [NetworkNodeMessageTypes.GOSSIP_DIGEST, NetworkNodeMessageTypes.TREE_IHAVE]:
+            return MessagePriority.BULK
+        if isinstance(message_type, NetworkNodeMessageTypes):
+            return MessagePriority.CONTROL
+        return MessagePriority.NORMAL
 
     def _run_handlers(self, message):
-        message_type = str(message.get_message_type())
-        for handler in self.msg_handler_dict[message_type]:
-            handler(message)
+        traced = message.is_traced()
+        if traced:
+            self._record_trace_span(message, TraceEvent.HANDLER_START)
+        try:
+            message_type = str(message.get_message_type())
+            for handler in self.msg_handler_dict[message_type]:
+                handler(message)
+        finally:
+            if traced:
+                self._record_trace_span(message, TraceEvent.HANDLER_END)
+            self.termination_detector.end_work()
+
+    def _sample_trace(self, message_id: tuple) -> None:
+        """
+        _sample_trace
+
+        Decides whether or not the new message with the given ID is traced,
+        based on the trace_sample_rate config value. Traced messages carry
+        their spans in their header, and every copy sent by this node or
+        the nodes that receive it is traced as well.
+
+        @param message_id [tuple] The ID of the new message
+
+        @return None
+        """
+        if (self.trace_random is not None) and (self.trace_random.random() < self.trace_sample_rate):
+            self.trace_store.start_trace(message_id, (self.get_id(), self.get_id(), TraceEvent.ORIGIN, self.get_time()))
+
+    def _record_trace_span(self, message: MessageWrapper, trace_event: TraceEvent) -> None:
+        """
+        _record_trace_span
+
+        Records a span of the given traced message at this node. Copies of
+        the message sent by this node afterwards carry the span.
+
+        @param message [MessageWrapper] The traced message
+        @param trace_event [TraceEvent] The event to record
+
+        @return None
+        """
+        self.trace_store.record(message, (self.get_id(), message.get_sender_id(), trace_event, self.get_time()))
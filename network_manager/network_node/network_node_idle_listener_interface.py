@@ -1,4 +1,4 @@
-import time
+import threading
 import logging
 
 
@@ -6,7 +6,9 @@ import logging
 NetworkNodeIdleListenerInterface
 
 Implements methods that can be used by listeners to
-track the state of network nodes.
+track the state of network nodes. Waiting for an idle
+network blocks on a condition which is signalled as soon
+as the last busy node becomes idle.
 """
 
 
@@ -22,6 +24,7 @@ class NetworkNodeIdleListenerInterface(object):
         @return [NetworkNodeIdleListenerInterface] The newly created NetworkNodeIdleListenerInterface object
         """
         self.num_busy_nodes = 0
+        self.idle_condition = threading.Condition()
         self.logger = logging.getLogger('NetworkNode')
 
     def notify_idle_state(self, node_id: str, node_idle: bool) -> None:
@@ -36,10 +39,14 @@ class NetworkNodeIdleListenerInterface(object):
 
         @return None
         """
-        if node_idle:
-            self.num_busy_nodes -= 1
-        else:
-            self.num_busy_nodes += 1
+        with self.idle_condition:
+            if node_idle:
+                self.num_busy_nodes -= 1
+            else:
+                self.num_busy_nodes += 1
+
+            if self.num_busy_nodes == 0:
+                self.idle_condition.notify_all()
 
     def network_is_idle(self) -> bool:
         """
@@ -57,9 +64,10 @@ class NetworkNodeIdleListenerInterface(object):
         """
         wait_for_idle_network
 
-        Waits for the network to be idle. The time to wait
-        is specified by the timeout paramer value. If the timeout
-        is hit before the network is idle, then an error is raised.
+        Waits for the network to be idle. Returns as soon as every
+        node is idle. The time to wait is specified by the timeout
+        paramer value. If the timeout is hit before the network is
+        idle, then an error is raised.
 
         @param timeout [Integer] The amount of seconds to wait for the network to become idle. Default is 10 seconds.
 
@@ -67,11 +75,8 @@ class NetworkNodeIdleListenerInterface(object):
 
         @raises [Exception] Raised if the network does not become idle before the timeout is hit.
         """
-        start_time = time.time()
-        while (time.time() < start_time + timeout_sec):
-            if self.network_is_idle():
-                time.sleep(3)
-                if self.network_is_idle():
-                    return True
+        with self.idle_condition:
+            if self.idle_condition.wait_for(self.network_is_idle, timeout=timeout_sec):
+                return True
 
         raise Exception("ERROR: Network was not idle before timeout was hit. # Busy Nodes: {}".format(self.num_busy_nodes))
@@ -5,3 +5,12 @@ class NetworkNodeMessageTypes(Enum):
     REQUEST_CONNECTION = 1
     ACCEPT_CONNECTION_REQUEST = 2
     BOT_TEARDOWN = 3
+    MESSAGE_BATCH = 4
+    TERMINATION_ACK = 5
+    GOSSIP_DIGEST = 6
+    GOSSIP_REQUEST = 7
+    TREE_IHAVE = 8
+    TREE_GRAFT = 9
+    TREE_PRUNE = 10
+    SUBSCRIPTION_UPDATE = 11
+    FLOW_CREDIT = 12
@@ -0,0 +1,133 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+"""
+CallbackScheduler
+
+Runs callbacks on a worker thread once their delay has passed. Callbacks
+due at the same time run in the order they were scheduled. Used by the
+node runtimes that run in real time to delay work (e.g. the delivery of
+messages over modeled links), so no thread is needed per delayed callback.
+
+Callbacks should return quickly, since every callback after them waits
+until they do.
+"""
+
+
+class CallbackScheduler(object):
+    def __init__(self):
+        """
+        __init__
+
+        Creates a new CallbackScheduler object
+
+        @param None
+
+        @return [CallbackScheduler] The created CallbackScheduler
+        """
+        self.logger = logging.getLogger('NetworkNode')
+
+        self.callbacks = []
+        self.callback_counter = itertools.count()
+        self.scheduler_condition = threading.Condition()
+
+        self.stop_worker = None
+
+    def start(self) -> None:
+        """
+        start
+
+        Starts the worker thread running the scheduled callbacks
+
+        @param None
+
+        @return None
+        """
+        with self.scheduler_condition:
+            if self.stop_worker is not None:
+                return
+            self.stop_worker = False
+
+        threading.Thread(target=self._worker_loop, daemon=True).start()
+
+    def stop(self) -> None:
+        """
+        stop
+
+        Stops the worker thread. Callbacks that are not due yet are dropped.
+
+        @param None
+
+        @return None
+        """
+        with self.scheduler_condition:
+            if self.stop_worker is not None:
+                self.stop_worker = True
+            self.callbacks = []
+            self.scheduler_condition.notify_all()
+
+    def schedule(self, delay_sec: float, callback: object, *args) -> None:
+        """
+        schedule
+
+        Schedules the given callback to be run once the given delay has passed
+
+        @param delay_sec [float] The time to wait before running the callback
+        @param callback [Method] The method to call
+        @param args [list] The arguments to call the method with
+
+        @return None
+        """
+        with self.scheduler_condition:
+            callback_num = next(self.callback_counter)
+            heapq.heappush(self.callbacks, (time.monotonic() + delay_sec, callback_num, callback, args))
+            # The worker only needs to wake up if the new callback is due before the one it is waiting for
+            if self.callbacks[0][1] == callback_num:
+                self.scheduler_condition.notify()
+
+    def get_num_pending(self) -> int:
+        """
+        get_num_pending
+
+        Returns the number of callbacks waiting to be run
+
+        @param None
+
+        @return [int] The number of pending callbacks
+        """
+        with self.scheduler_condition:
+            return len(self.callbacks)
+
+    def _worker_loop(self) -> None:
+        """
+        _worker_loop
+
+        Waits for the next callback to be due and runs it, until the scheduler is stopped
+
+        @param None
+
+        @return None
+        """
+        while True:
+            with self.scheduler_condition:
+                while not self.stop_worker:
+                    if len(self.callbacks) == 0:
+                        self.scheduler_condition.wait()
+                        continue
+
+                    wait_time = self.callbacks[0][0] - time.monotonic()
+                    if wait_time <= 0:
+                        break
+                    self.scheduler_condition.wait(wait_time)
+
+                if self.stop_worker:
+                    return
+                _, _, callback, args = heapq.heappop(self.callbacks)
+
+            try:
+                callback(*args)
+            except Exception:
+                self.logger.exception("ERROR: Scheduled callback failed")
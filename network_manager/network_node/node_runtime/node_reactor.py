@@ -0,0 +1,277 @@
+import functools
+import threading
+import logging
+
+from network_manager.network_node.message_queue.message_queue import MessageQueue
+from network_manager.network_node.message_queue.queue_full_policy import QueueFullPolicy
+
+"""
+NodeReactor
+
+Multiplexes the message processing of many network nodes onto a fixed
+set of threads. Each node is treated as a lightweight actor which is
+only scheduled while its inbox or outbox holds messages. A scheduled
+node is run by one reactor worker at a time, and each run processes a
+bounded number of messages before the node is rescheduled, so busy
+nodes can not starve the others.
+
+Message handlers may block (e.g. while waiting for a response), so they
+are not run on the reactor workers. Instead every message dispatched by
+a node is handed to a separate fixed pool of handler workers. The node's
+MessageDispatcher still decides the order messages are handled in.
+
+Reactor workers never wait for more messages to batch, so each outbox
+batch holds the messages that were queued when the node was run. Nodes
+with bounded queues must not use the BLOCK full policy, since a reactor
+worker blocked on a full queue would stop every node it could unblock.
+Nodes can not use link senders either, since each link sender runs its
+own thread.
+"""
+
+
+class NodeReactor(object):
+    def __init__(self, num_workers: int, num_handler_workers: int, max_msgs_per_step: int):
+        """
+        __init__
+
+        Creates a new NodeReactor object
+
+        @param num_workers [int] The number of threads used to process node inboxes and outboxes
+        @param num_handler_workers [int] The number of threads used to run message handlers
+        @param max_msgs_per_step [int] The maximum number of inbox messages processed each time a node is run
+
+        @return [NodeReactor] The created NodeReactor
+        """
+        if (num_workers <= 0) or (num_handler_workers <= 0):
+            raise Exception("ERROR: Node reactor must have at least one worker and one handler worker. Given: {}, {}".format(
+                num_workers,
+                num_handler_workers
+            ))
+
+        if max_msgs_per_step <= 0:
+            raise Exception("ERROR: Node reactor must process at least one message per step. Given: {}".format(
+                max_msgs_per_step
+            ))
+
+        self.logger = logging.getLogger('NetworkNode')
+
+        self.num_workers = num_workers
+        self.num_handler_workers = num_handler_workers
+        self.max_msgs_per_step = max_msgs_per_step
+
+        self.ready_nodes = MessageQueue()
+        self.handler_tasks = MessageQueue()
+
+        self.nodes = set()
+        self.scheduled_nodes = set()
+        self.schedule_lock = threading.Lock()
+
+        self.stop_workers = None
+
+    def start(self) -> None:
+        """
+        start
+
+        Starts the reactor and handler worker threads
+
+        @param None
+
+        @return None
+        """
+        if self.stop_workers is not None:
+            raise Exception("ERROR: Node reactor is already running. Must call stop before calling start.")
+
+        self.stop_workers = threading.Event()
+        self.ready_nodes.open()
+        self.handler_tasks.open()
+        for _ in range(self.num_workers):
+            thread = threading.Thread(target=self._worker_loop, args=(self.stop_workers,))
+            thread.start()
+        for _ in range(self.num_handler_workers):
+            thread = threading.Thread(target=self._handler_worker_loop, args=(self.stop_workers,))
+            thread.start()
+
+    def stop(self) -> None:
+        """
+        stop
+
+        Stops the worker threads. Work that is currently running is
+        allowed to finish.
+
+        @param None
+
+        @return None
+        """
+        if self.stop_workers is None:
+            return
+
+        self.stop_workers.set()
+        self.stop_workers = None
+        self.ready_nodes.close()
+        self.handler_tasks.close()
+
+    def add_node(self, network_node) -> None:
+        """
+        add_node
+
+        Starts processing the messages of the given node on the reactor.
+        Messages already queued by the node are processed right away.
+
+        @param network_node [NetworkNode] The node to add
+
+        @return None
+        """
+        for queue in [network_node.msg_inbox, network_node.msg_outbox]:
+            if (queue.capacity is not None) and (queue.full_policy == QueueFullPolicy.BLOCK):
+                raise Exception("ERROR: Nodes run on a node reactor can not use bounded queues with the BLOCK policy.")
+
+        if network_node.use_link_senders:
+            raise Exception("ERROR: Nodes run on a node reactor can not use link senders, since each one has its own thread.")
+
+        with self.schedule_lock:
+            self.nodes.add(network_node)
+
+        network_node.msg_dispatcher.start(use_worker_threads=False)
+        network_node.msg_dispatcher.set_work_listener(
+            functools.partial(self.handler_tasks.put, network_node.msg_dispatcher)
+        )
+
+        schedule_method = functools.partial(self.schedule_node, network_node)
+        network_node.msg_inbox.set_put_listener(schedule_method)
+        network_node.msg_outbox.set_put_listener(schedule_method)
+        schedule_method()
+
+    def remove_node(self, network_node) -> None:
+        """
+        remove_node
+
+        Stops processing the messages of the given node. Messages that
+        are still queued are kept.
+
+        @param network_node [NetworkNode] The node to remove
+
+        @return None
+        """
+        network_node.msg_inbox.set_put_listener(None)
+        network_node.msg_outbox.set_put_listener(None)
+        network_node.msg_dispatcher.set_work_listener(None)
+        network_node.msg_dispatcher.stop()
+
+        with self.schedule_lock:
+            self.nodes.discard(network_node)
+
+    def get_num_nodes(self) -> int:
+        """
+        get_num_nodes
+
+        Returns the number of nodes run on the reactor
+
+        @param None
+
+        @return [int] The number of nodes
+        """
+        return len(self.nodes)
+
+    def get_num_threads(self) -> int:
+        """
+        get_num_threads
+
+        Returns the number of threads owned by the reactor
+
+        @param None
+
+        @return [int] The number of reactor and handler worker threads
+        """
+        return self.num_workers + self.num_handler_workers
+
+    def schedule_node(self, network_node) -> None:
+        """
+        schedule_node
+
+        Schedules the given node to be run by a reactor worker. Does
+        nothing if the node is already scheduled or running.
+
+        @param network_node [NetworkNode] The node that has new work
+
+        @return None
+        """
+        with self.schedule_lock:
+            if network_node in self.scheduled_nodes:
+                return
+            self.scheduled_nodes.add(network_node)
+
+        self.ready_nodes.put(network_node)
+
+    def _run_node(self, network_node) -> None:
+        """
+        _run_node
+
+        Sends one batch of messages from the outbox of the given node and
+        handles up to max_msgs_per_step messages from its inbox. If the
+        node still has work afterwards, then it is scheduled again.
+
+        @param network_node [NetworkNode] The node to run
+
+        @return None
+        """
+        if not network_node.run_node.is_set():
+            try:
+                msg_to_send = network_node.msg_outbox.get(timeout=0)
+                if msg_to_send is not None:
+                    network_node._send_outbox_messages(msg_to_send, 0)
+
+                for _ in range(self.max_msgs_per_step):
+                    message = network_node.msg_inbox.get(timeout=0)
+                    if message is None:
+                        break
+                    network_node._handle_received_message(message)
+            except Exception:
+                self.logger.exception("ERROR: Node reactor failed to process messages of node: {}".format(
+                    network_node.get_id()
+                ))
+
+        # Checked while holding the schedule lock so a message queued during the
+        # check either is seen here or schedules the node once it is released
+        with self.schedule_lock:
+            has_work = (not network_node.run_node.is_set()) and \
+                ((len(network_node.msg_inbox) > 0) or (len(network_node.msg_outbox) > 0))
+            if not has_work:
+                self.scheduled_nodes.discard(network_node)
+
+        if has_work:
+            self.ready_nodes.put(network_node)
+
+    def _worker_loop(self, stop_event: threading.Event) -> None:
+        """
+        _worker_loop
+
+        Runs scheduled nodes until the given stop event is set
+
+        @param stop_event [threading.Event] The event used to stop this worker
+
+        @return None
+        """
+        while not stop_event.is_set():
+            network_node = self.ready_nodes.get()
+            if network_node is None:
+                continue
+
+            self._run_node(network_node)
+
+    def _handler_worker_loop(self, stop_event: threading.Event) -> None:
+        """
+        _handler_worker_loop
+
+        Handles messages dispatched by the nodes until the given stop
+        event is set
+
+        @param stop_event [threading.Event] The event used to stop this worker
+
+        @return None
+        """
+        while not stop_event.is_set():
+            msg_dispatcher = self.handler_tasks.get()
+            if msg_dispatcher is None:
+                continue
+
+            msg_dispatcher.run_next_work_item()
@@ -0,0 +1,124 @@
+import random
+import threading
+import time
+import uuid
+
+from abc import ABC, abstractmethod
+
+from network_manager.network_node.node_runtime.callback_scheduler import CallbackScheduler
+
+"""
+NodeRuntime
+
+The abstract class for defining node runtime classes. A node runtime
+decides which threads process the inbox, outbox and message handlers
+of the nodes using it. It also hands out the IDs, random number
+generators and clock of those nodes and runs delayed callbacks on that
+clock, so runtimes that do not run in real time (e.g. simulations) can
+make them reproducible.
+"""
+
+
+class NodeRuntime(ABC):
+    shared_callback_scheduler = None
+    shared_callback_scheduler_lock = threading.Lock()
+
+    @classmethod
+    @abstractmethod
+    def start_node(cls, owner_node) -> None:
+        """
+        start_node
+
+        Starts processing the messages of the given node. Called after the
+        node's message queues are opened and its run_node flag is cleared.
+
+        @param owner_node [NetworkNode] The node being started
+
+        @return None
+        """
+        pass
+
+    @classmethod
+    @abstractmethod
+    def stop_node(cls, owner_node) -> None:
+        """
+        stop_node
+
+        Stops processing the messages of the given node. Called after the
+        node's run_node flag is set and its message queues are closed.
+        Messages still queued are kept and processed once the node is
+        started again.
+
+        @param owner_node [NetworkNode] The node being torn down
+
+        @return None
+        """
+        pass
+
+    @classmethod
+    def create_node_id(cls, owner_node) -> int:
+        """
+        create_node_id
+
+        Returns the ID of the given node. Called while the node is being
+        created, once its config and message channel type are loaded. Uses
+        the ID of the node object by default. Object IDs are only unique
+        within a process, so nodes whose message channel type connects
+        processes are given a random 63 bit ID instead.
+
+        @param owner_node [NetworkNode] The node being created
+
+        @return [int] The ID of the node
+        """
+        if owner_node.message_channel_type.connects_processes:
+            return uuid.uuid4().int >> 65
+        return id(owner_node)
+
+    @classmethod
+    def create_random(cls, owner_node) -> random.Random:
+        """
+        create_random
+
+        Returns a random number generator for the given node to use
+
+        @param owner_node [NetworkNode] The node the generator is for
+
+        @return [random.Random] The random number generator
+        """
+        return random.Random()
+
+    @classmethod
+    def get_time(cls) -> float:
+        """
+        get_time
+
+        Returns the current time of the nodes using the runtime. Uses the
+        wall clock by default.
+
+        @param None
+
+        @return [float] The current time in seconds
+        """
+        return time.time()
+
+    @classmethod
+    def schedule_callback(cls, delay_sec: float, callback: object, *args) -> None:
+        """
+        schedule_callback
+
+        Runs the given callback once the given delay has passed on the
+        runtime's clock. By default, callbacks are run by a CallbackScheduler
+        shared by every runtime that runs in real time, which is started
+        the first time a callback is scheduled.
+
+        @param delay_sec [float] The time to wait before running the callback
+        @param callback [Method] The method to call
+        @param args [list] The arguments to call the method with
+
+        @return None
+        """
+        with NodeRuntime.shared_callback_scheduler_lock:
+            if NodeRuntime.shared_callback_scheduler is None:
+                NodeRuntime.shared_callback_scheduler = CallbackScheduler()
+                NodeRuntime.shared_callback_scheduler.start()
+        NodeRuntime.shared_callback_scheduler.schedule(delay_sec, callback, *args)
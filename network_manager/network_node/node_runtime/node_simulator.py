@@ -0,0 +1,279 @@
+import functools
+import heapq
+import itertools
+import logging
+import random
+
+"""
+NodeSimulator
+
+Deterministic discrete event simulator for network nodes. Every node
+added to the simulator is run on the thread that calls run, from a
+single event queue ordered by virtual time. Events at the same virtual
+time are run in the order they were scheduled, so a simulation with the
+same seed and the same inputs always runs the same way.
+
+Like the NodeReactor, the simulator treats each node as an actor that
+is only scheduled while its inbox or outbox holds messages, and each
+run of a node processes a bounded number of messages. Messages handed
+to a node's MessageDispatcher are handled by their own events. The
+virtual clock only moves forward when the next event is scheduled at a
+later time (e.g. by a delayed delivery or a timer), never while events
+are being run.
+
+The simulator is not thread safe. Nodes must be created, connected and
+given messages from the thread that calls run. Message handlers can not
+block waiting for other nodes (e.g. with send_sync_directed_message),
+since no other event runs until the handler returns.
+"""
+
+
+class NodeSimulator(object):
+    def __init__(self, seed: int = 0, max_msgs_per_step: int = 64):
+        """
+        __init__
+
+        Creates a new NodeSimulator object. The global random module is
+        seeded as well, since code shared with the threaded runtimes
+        (e.g. the network manager) draws from it.
+
+        @param seed [int] The seed of the simulator's random number generator
+        @param max_msgs_per_step [int] The maximum number of inbox messages processed each time a node is run
+
+        @return [NodeSimulator] The created NodeSimulator
+        """
+        if max_msgs_per_step <= 0:
+            raise Exception("ERROR: Node simulator must process at least one message per step. Given: {}".format(
+                max_msgs_per_step
+            ))
+
+        self.logger = logging.getLogger('NetworkNode')
+
+        self.seed = seed
+        self.random = random.Random(seed)
+        random.seed(seed)
+
+        self.max_msgs_per_step = max_msgs_per_step
+
+        self.current_time = 0.0
+        self.events = []
+        self.event_counter = itertools.count()
+        self.node_id_counter = itertools.count(1)
+        self.num_events_run = 0
+
+        self.nodes = set()
+        self.scheduled_nodes = set()
+
+    def create_node_id(self) -> int:
+        """
+        create_node_id
+
+        Returns the ID for the next node created in the simulation. IDs are
+        handed out in order, so they are the same in every run.
+
+        @param None
+
+        @return [int] The new node ID
+        """
+        return next(self.node_id_counter)
+
+    def create_random(self) -> random.Random:
+        """
+        create_random
+
+        Returns a new random number generator seeded from the simulator's own
+
+        @param None
+
+        @return [random.Random] The new random number generator
+        """
+        return random.Random(self.random.getrandbits(64))
+
+    def get_time(self) -> float:
+        """
+        get_time
+
+        Returns the current virtual time of the simulation
+
+        @param None
+
+        @return [float] The virtual time in seconds since the simulation started
+        """
+        return self.current_time
+
+    def get_num_events_run(self) -> int:
+        """
+        get_num_events_run
+
+        Returns the number of events run since the simulation started
+
+        @param None
+
+        @return [int] The number of events run
+        """
+        return self.num_events_run
+
+    def get_num_pending_events(self) -> int:
+        """
+        get_num_pending_events
+
+        Returns the number of events waiting to be run
+
+        @param None
+
+        @return [int] The number of pending events
+        """
+        return len(self.events)
+
+    def get_num_nodes(self) -> int:
+        """
+        get_num_nodes
+
+        Returns the number of nodes run by the simulator
+
+        @param None
+
+        @return [int] The number of nodes
+        """
+        return len(self.nodes)
+
+    def schedule(self, delay_sec: float, callback: object, *args) -> None:
+        """
+        schedule
+
+        Schedules the given callback to be run once the given amount of
+        virtual time has passed
+
+        @param delay_sec [float] The virtual time to wait before running the callback
+        @param callback [Method] The method to call
+        @param args [list] The arguments to call the method with
+
+        @return None
+        """
+        if delay_sec < 0:
+            raise Exception("ERROR: Can not schedule an event in the past. Given delay: {}".format(delay_sec))
+
+        heapq.heappush(self.events, (self.current_time + delay_sec, next(self.event_counter), callback, args))
+
+    def run(self, until_time: float = None, max_events: int = None) -> int:
+        """
+        run
+
+        Runs events in order until none are left, the next event is after
+        the given time, or the given number of events has been run. If a
+        time is given, then the virtual clock is moved forward to it.
+
+        @param until_time [float] The virtual time to run the simulation until. None to run until no events are left.
+        @param max_events [int] The maximum number of events to run. None for no limit.
+
+        @return [int] The number of events run
+        """
+        num_events_run = 0
+        while (len(self.events) > 0) and ((max_events is None) or (num_events_run < max_events)):
+            event_time, _, callback, args = self.events[0]
+            if (until_time is not None) and (event_time > until_time):
+                break
+
+            heapq.heappop(self.events)
+            self.current_time = event_time
+            try:
+                callback(*args)
+            except Exception:
+                self.logger.exception("ERROR: Simulated event failed at virtual time: {}".format(event_time))
+            num_events_run += 1
+
+        if (until_time is not None) and (until_time > self.current_time) and \
+                ((max_events is None) or (num_events_run < max_events)):
+            self.current_time = until_time
+
+        self.num_events_run += num_events_run
+        return num_events_run
+
+    def add_node(self, network_node) -> None:
+        """
+        add_node
+
+        Starts simulating the given node. Messages already queued by the
+        node are processed once the simulation runs.
+
+        @param network_node [NetworkNode] The node to add
+
+        @return None
+        """
+        if network_node.use_link_senders:
+            raise Exception("ERROR: Simulated nodes can not use link senders, since each one has its own thread.")
+
+        self.nodes.add(network_node)
+
+        network_node.msg_dispatcher.start(use_worker_threads=False)
+        network_node.msg_dispatcher.set_work_listener(
+            functools.partial(self.schedule, 0, network_node.msg_dispatcher.run_next_work_item)
+        )
+
+        schedule_method = functools.partial(self.schedule_node, network_node)
+        network_node.msg_inbox.set_put_listener(schedule_method)
+        network_node.msg_outbox.set_put_listener(schedule_method)
+        schedule_method()
+
+    def remove_node(self, network_node) -> None:
+        """
+        remove_node
+
+        Stops simulating the given node. Messages that are still queued are kept.
+
+        @param network_node [NetworkNode] The node to remove
+
+        @return None
+        """
+        network_node.msg_inbox.set_put_listener(None)
+        network_node.msg_outbox.set_put_listener(None)
+        network_node.msg_dispatcher.set_work_listener(None)
+        network_node.msg_dispatcher.stop()
+
+        self.nodes.discard(network_node)
+        self.scheduled_nodes.discard(network_node)
+
+    def schedule_node(self, network_node) -> None:
+        """
+        schedule_node
+
+        Schedules the given node to be run. Does nothing if the node is already scheduled.
+
+        @param network_node [NetworkNode] The node that has new work
+
+        @return None
+        """
+        if network_node in self.scheduled_nodes:
+            return
+
+        self.scheduled_nodes.add(network_node)
+        self.schedule(0, self._run_node, network_node)
+
+    def _run_node(self, network_node) -> None:
+        """
+        _run_node
+
+        Sends one batch of messages from the outbox of the given node and
+        handles up to max_msgs_per_step messages from its inbox. If the
+        node still has work afterwards, then it is scheduled again.
+
+        @param network_node [NetworkNode] The node to run
+
+        @return None
+        """
+        self.scheduled_nodes.discard(network_node)
+        if network_node.run_node.is_set():
+            return
+
+        msg_to_send = network_node.msg_outbox.get(timeout=0)
+        if msg_to_send is not None:
+            network_node._send_outbox_messages(msg_to_send, 0)
+
+        for _ in range(self.max_msgs_per_step):
+            message = network_node.msg_inbox.get(timeout=0)
+            if message is None:
+                break
+            network_node._handle_received_message(message)
+
+        if (len(network_node.msg_inbox) > 0) or (len(network_node.msg_outbox) > 0):
+            self.schedule_node(network_node)
@@ -0,0 +1,83 @@
+import threading
+
+from network_manager.network_node.node_runtime.node_reactor import NodeReactor
+from network_manager.network_node.node_runtime.node_runtime import NodeRuntime
+
+"""
+ReactorNodeRuntime
+
+Node runtime that runs every node in the process on a single shared
+NodeReactor, so the number of threads stays fixed no matter how many
+nodes are created. The reactor is created with the config of the first
+node started on it, and is stopped once the last node on it is torn
+down.
+"""
+
+
+class ReactorNodeRuntime(NodeRuntime):
+    shared_reactor = None
+    shared_reactor_lock = threading.Lock()
+
+    @classmethod
+    def start_node(cls, owner_node) -> None:
+        """
+        start_node
+
+        Adds the given node to the shared reactor, creating the reactor
+        from the node's reactor_* config values if it is not running
+
+        @param owner_node [NetworkNode] The node being started
+
+        @return None
+        """
+        with cls.shared_reactor_lock:
+            if cls.shared_reactor is None:
+                new_reactor = NodeReactor(
+                    owner_node.config["reactor_num_workers"],
+                    owner_node.config["reactor_num_handler_workers"],
+                    owner_node.config["reactor_max_msgs_per_step"]
+                )
+                new_reactor.start()
+                cls.shared_reactor = new_reactor
+
+            try:
+                cls.shared_reactor.add_node(owner_node)
+            except Exception:
+                if cls.shared_reactor.get_num_nodes() == 0:
+                    cls.shared_reactor.stop()
+                    cls.shared_reactor = None
+                raise
+
+    @classmethod
+    def stop_node(cls, owner_node) -> None:
+        """
+        stop_node
+
+        Removes the given node from the shared reactor. Stops the reactor
+        if no nodes are left on it.
+
+        @param owner_node [NetworkNode] The node being torn down
+
+        @return None
+        """
+        with cls.shared_reactor_lock:
+            if cls.shared_reactor is None:
+                return
+
+            cls.shared_reactor.remove_node(owner_node)
+            if cls.shared_reactor.get_num_nodes() == 0:
+                cls.shared_reactor.stop()
+                cls.shared_reactor = None
+
+    @classmethod
+    def get_shared_reactor(cls) -> NodeReactor:
+        """
+        get_shared_reactor
+
+        Returns the reactor shared by the nodes in this process
+
+        @param None
+
+        @return [NodeReactor] The shared reactor. None if no node is running on it.
+        """
+        return cls.shared_reactor
@@ -0,0 +1,141 @@
+import random
+import threading
+
+from network_manager.network_node.node_runtime.node_runtime import NodeRuntime
+from network_manager.network_node.node_runtime.node_simulator import NodeSimulator
+
+"""
+SimulatedNodeRuntime
+
+Node runtime that runs every node in the process on a single shared
+NodeSimulator, in virtual time instead of on threads. The simulator is
+created with the config of the first node created on it, and is dropped
+once the last node on it is torn down, so the next simulation starts
+from a fresh clock, seed and node ID counter.
+
+Nodes run on this runtime get their IDs, random number generators and
+clock from the simulator, so a simulation is reproducible. Nothing is
+processed until the simulator is run, e.g. with
+SimulatedNodeRuntime.get_simulator().run().
+"""
+
+
+class SimulatedNodeRuntime(NodeRuntime):
+    shared_simulator = None
+    shared_simulator_lock = threading.Lock()
+
+    @classmethod
+    def create_node_id(cls, owner_node) -> int:
+        """
+        create_node_id
+
+        Returns the next node ID handed out by the shared simulator,
+        creating the simulator from the node's simulation_* config values
+        if there is none
+
+        @param owner_node [NetworkNode] The node being created
+
+        @return [int] The ID of the node
+        """
+        with cls.shared_simulator_lock:
+            if cls.shared_simulator is None:
+                cls.shared_simulator = NodeSimulator(
+                    owner_node.config["simulation_seed"],
+                    owner_node.config["simulation_max_msgs_per_step"]
+                )
+            return cls.shared_simulator.create_node_id()
+
+    @classmethod
+    def create_random(cls, owner_node) -> random.Random:
+        """
+        create_random
+
+        Returns a random number generator for the given node, seeded from the shared simulator
+
+        @param owner_node [NetworkNode] The node the generator is for
+
+        @return [random.Random] The random number generator
+        """
+        return cls.shared_simulator.create_random()
+
+    @classmethod
+    def get_time(cls) -> float:
+        """
+        get_time
+
+        Returns the virtual time of the shared simulator
+
+        @param None
+
+        @return [float] The virtual time in seconds. 0 if there is no simulation.
+        """
+        return 0.0 if cls.shared_simulator is None else cls.shared_simulator.get_time()
+
+    @classmethod
+    def schedule_callback(cls, delay_sec: float, callback: object, *args) -> None:
+        """
+        schedule_callback
+
+        Schedules the given callback as an event of the shared simulator
+
+        @param delay_sec [float] The virtual time to wait before running the callback
+        @param callback [Method] The method to call
+        @param args [list] The arguments to call the method with
+
+        @return None
+        """
+        cls.shared_simulator.schedule(delay_sec, callback, *args)
+
+    @classmethod
+    def start_node(cls, owner_node) -> None:
+        """
+        start_node
+
+        Adds the given node to the shared simulator
+
+        @param owner_node [NetworkNode] The node being started
+
+        @return None
+        """
+        with cls.shared_simulator_lock:
+            if cls.shared_simulator is None:
+                raise Exception("ERROR: Simulation ended while node {} was torn down.".format(owner_node.get_id()))
+            try:
+                cls.shared_simulator.add_node(owner_node)
+            except Exception:
+                if cls.shared_simulator.get_num_nodes() == 0:
+                    cls.shared_simulator = None
+                raise
+
+    @classmethod
+    def stop_node(cls, owner_node) -> None:
+        """
+        stop_node
+
+        Removes the given node from the shared simulator. Drops the
+        simulator if no nodes are left on it.
+
+        @param owner_node [NetworkNode] The node being torn down
+
+        @return None
+        """
+        with cls.shared_simulator_lock:
+            if cls.shared_simulator is None:
+                return
+
+            cls.shared_simulator.remove_node(owner_node)
+            if cls.shared_simulator.get_num_nodes() == 0:
+                cls.shared_simulator = None
+
+    @classmethod
+    def get_simulator(cls) -> NodeSimulator:
+        """
+        get_simulator
+
+        Returns the simulator shared by the nodes in this process
+
+        @param None
+
+        @return [NodeSimulator] The shared simulator. None if no simulation is running.
+        """
+        return cls.shared_simulator
@@ -0,0 +1,50 @@
+import threading
+
+from network_manager.network_node.node_runtime.node_runtime import NodeRuntime
+
+"""
+ThreadedNodeRuntime
+
+Node runtime that gives every node its own threads:
+    - msg_sender_loop: Runs the loop for sending messages
+    - msg_receiver_loop: Runs the loop for receiving messages
+    - msg_dispatcher: Runs the worker pool for handling received messages, whose workers start on demand
+This keeps nodes fully independent of each other, but the number of
+threads grows with the number of nodes in the process.
+"""
+
+
+class ThreadedNodeRuntime(NodeRuntime):
+    @classmethod
+    def start_node(cls, owner_node) -> None:
+        """
+        start_node
+
+        Starts the sender and receiver threads and the message handler
+        worker pool of the given node
+
+        @param owner_node [NetworkNode] The node being started
+
+        @return None
+        """
+        owner_node.msg_dispatcher.start()
+
+        thread = threading.Thread(target=owner_node._msg_sender_loop)
+        thread.start()
+        thread = threading.Thread(target=owner_node._msg_receiver_loop)
+        thread.start()
+
+    @classmethod
+    def stop_node(cls, owner_node) -> None:
+        """
+        stop_node
+
+        Stops the message handler worker pool of the given node. The
+        sender and receiver threads exit on their own once the node's
+        message queues are closed.
+
+        @param owner_node [NetworkNode] The node being torn down
+
+        @return None
+        """
+        owner_node.msg_dispatcher.stop()
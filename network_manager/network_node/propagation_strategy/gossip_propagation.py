@@ -0,0 +1,251 @@
+import threading
+from collections import OrderedDict
+
+from network_manager.network_node.propagation_strategy.propagation_strategy import PropagationStrategy
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+from network_manager.network_node.message_tracking.message_id_tracker import MessageIdTracker
+from network_manager.network_node.network_node_message_types import NetworkNodeMessageTypes
+
+"""
+GossipPropagation
+
+Implementation of a gossip (probabilistic fan-out) propagation strategy.
+Instead of flooding every connected node, a node pushes a new message to
+gossip_fanout randomly chosen neighbors that are not known to have it.
+Each time the node receives the message again, it pushes the message to
+gossip_fanout more neighbors, for at most gossip_rounds pushes in total.
+
+Pushing to a random subset reaches the whole network with high
+probability, but may miss some nodes. If gossip_anti_entropy is enabled,
+then a push-pull phase repairs these stragglers: after pushing a message,
+the node sends a digest containing only the message ID to every other
+neighbor that is not known to have the message. A neighbor that has not
+seen the message pulls it by requesting it from the digest's sender.
+Digests are small and are batched with other outgoing messages, so far
+fewer copies of the full message are sent than with flooding, while
+every node of a connected network still receives the message.
+
+The last gossip_store_size propagated messages are stored so they can
+be sent to nodes that request them.
+"""
+
+
+class GossipPropagation(PropagationStrategy):
+    def __init__(self, owner_network_node):
+        """
+        init
+
+        Creates a new GossipPropagation object
+
+        @param owner_network_node [NetworkNode] The network node that owns this object
+
+        @return [GossipPropagation] The created GossipPropagation object
+        """
+        super().__init__(owner_network_node)
+
+        config = self.network_node.config
+        if config["gossip_fanout"] <= 0:
+            raise Exception("ERROR: Gossip fan-out must be a positive integer. Given: {}".format(config["gossip_fanout"]))
+        if config["gossip_rounds"] <= 0:
+            raise Exception("ERROR: Gossip rounds must be a positive integer. Given: {}".format(config["gossip_rounds"]))
+
+        self.fanout = config["gossip_fanout"]
+        self.max_rounds = config["gossip_rounds"]
+        self.anti_entropy = config["gossip_anti_entropy"]
+        self.store_size = config["gossip_store_size"]
+
+        self.random = self.network_node.node_runtime_type.create_random(self.network_node)
+
+        self.msg_store = OrderedDict()
+        self.store_lock = threading.Lock()
+        self.requested_msg_tracker = MessageIdTracker(config["message_dedup_window_size"])
+
+        self.network_node.assign_msg_handler(
+            str(NetworkNodeMessageTypes.GOSSIP_DIGEST),
+            self.gossip_propagation_handle_gossip_digest_message
+        )
+        self.network_node.assign_msg_handler(
+            str(NetworkNodeMessageTypes.GOSSIP_REQUEST),
+            self.gossip_propagation_handle_gossip_request_message
+        )
+
+    def determine_prop_targets(self, message: MessageWrapper) -> list:
+        """
+        determine_prop_targets
+
+        Determines the connected nodes that should receive
+        the given message. In this strategy, the message is
+        sent to gossip_fanout randomly chosen connected nodes,
+        excluding the node the message was received from.
+
+        @param message [MessageWrapper] The message to send
+
+        @return [list] The list of nodes to send the message to
+        """
+        sender_id = None if message is None else message.get_sender_id()
+        candidates = [node_id for node_id in self.network_node.get_message_channels().keys() if node_id != sender_id]
+        return self._choose_targets(candidates)
+
+    def track_message_propagation(self, message: MessageWrapper) -> None:
+        """
+        track_message_propagation
+
+        Called when a previously propagated message is received again.
+        Records that the sender has the message and, if the message has
+        rounds left, pushes it to gossip_fanout more neighbors that are
+        not known to have it.
+
+        @param message [MessageWrapper] The received message
+
+        @return [None]
+        """
+        msg_id = message.get_id()
+        with self.store_lock:
+            if msg_id not in self.msg_store:
+                return
+
+            stored_msg = self.msg_store[msg_id]
+            stored_msg["HOLDERS"].add(message.get_sender_id())
+            if stored_msg["NUM_ROUNDS"] >= self.max_rounds:
+                return
+
+            targets = self._choose_targets(self._get_unknown_neighbors(stored_msg))
+            stored_msg["NUM_ROUNDS"] += 1
+            stored_msg["HOLDERS"].update(targets)
+
+        for target_id in targets:
+            self.network_node._create_message(target_id, msg_id, stored_msg["TYPE"], stored_msg["PAYLOAD"], True)
+
+    def message_propagated(
+            self,
+            message_id: tuple,
+            message_type: str,
+            message_payload: object,
+            sender_id: int,
+            targets: list
+            ) -> None:
+        """
+        message_propagated
+
+        Called after a message was propagated to the targets returned by
+        determine_prop_targets. Stores the message and, if anti-entropy
+        is enabled, sends a digest of it to every other neighbor that is
+        not known to have it.
+
+        @param message_id [tuple] The ID of the propagated message
+        @param message_type [str] The type of the propagated message
+        @param message_payload [object] The payload of the propagated message
+        @param sender_id [int] The ID of the node the message was received from. None if this node created the message.
+        @param targets [list] The IDs of the nodes the message was sent to
+
+        @return [None]
+        """
+        holders = set(targets)
+        if sender_id is not None:
+            holders.add(sender_id)
+
+        with self.store_lock:
+            stored_msg = {
+                "TYPE": message_type,
+                "PAYLOAD": message_payload,
+                "HOLDERS": holders,
+                "NUM_ROUNDS": 1
+            }
+            self.msg_store[message_id] = stored_msg
+            while len(self.msg_store) > self.store_size:
+                self.msg_store.popitem(last=False)
+
+            digest_targets = []
+            if self.anti_entropy:
+                digest_targets = self._get_unknown_neighbors(stored_msg)
+                holders.update(digest_targets)
+
+        for target_id in digest_targets:
+            self.network_node.send_directed_message(
+                target_id,
+                NetworkNodeMessageTypes.GOSSIP_DIGEST,
+                {"MSG_IDS": [message_id]}
+            )
+
+    def gossip_propagation_handle_gossip_digest_message(self, message: MessageWrapper) -> None:
+        """
+        gossip_propagation_handle_gossip_digest_message
+
+        Requests the messages listed in the received digest that this
+        node has not seen yet from the digest's sender. Each message is
+        only requested once.
+
+        @param message [MessageWrapper] The received digest
+
+        @return [None]
+        """
+        sender_id = message.get_sender_id()
+        msg_ids_to_request = []
+        for msg_id in message.get_message_payload()["MSG_IDS"]:
+            with self.store_lock:
+                if msg_id in self.msg_store:
+                    self.msg_store[msg_id]["HOLDERS"].add(sender_id)
+                    continue
+
+            if (not self.network_node.interacted_with_msg_with_id(msg_id)) and self.requested_msg_tracker.add(msg_id):
+                msg_ids_to_request.append(msg_id)
+
+        if len(msg_ids_to_request) > 0:
+            self.network_node.send_directed_message(
+                sender_id,
+                NetworkNodeMessageTypes.GOSSIP_REQUEST,
+                {"MSG_IDS": msg_ids_to_request}
+            )
+
+    def gossip_propagation_handle_gossip_request_message(self, message: MessageWrapper) -> None:
+        """
+        gossip_propagation_handle_gossip_request_message
+
+        Sends the requested messages that are still stored by this node
+        to the node that requested them
+
+        @param message [MessageWrapper] The received request
+
+        @return [None]
+        """
+        sender_id = message.get_sender_id()
+        msgs_to_send = []
+        with self.store_lock:
+            for msg_id in message.get_message_payload()["MSG_IDS"]:
+                if msg_id in self.msg_store:
+                    stored_msg = self.msg_store[msg_id]
+                    stored_msg["HOLDERS"].add(sender_id)
+                    msgs_to_send.append((msg_id, stored_msg["TYPE"], stored_msg["PAYLOAD"]))
+
+        for msg_id, message_type, message_payload in msgs_to_send:
+            self.network_node._create_message(sender_id, msg_id, message_type, message_payload, True)
+
+    def _choose_targets(self, candidates: list) -> list:
+        """
+        _choose_targets
+
+        Randomly chooses up to gossip_fanout of the given nodes
+
+        @param candidates [list] The IDs of the nodes to choose from
+
+        @return [list] The IDs of the chosen nodes
+        """
+        if len(candidates) <= self.fanout:
+            return list(candidates)
+        return self.random.sample(candidates, self.fanout)
+
+    def _get_unknown_neighbors(self, stored_msg: dict) -> list:
+        """
+        _get_unknown_neighbors
+
+        Returns the connected nodes that are not known to have the given
+        stored message. Must be called while holding the store lock.
+
+        @param stored_msg [dict] The stored message
+
+        @return [list] The IDs of the connected nodes not known to have the message
+        """
+        return [
+            node_id for node_id in self.network_node.get_message_channels().keys()
+            if node_id not in stored_msg["HOLDERS"]
+        ]
@@ -37,6 +37,23 @@ class PropagationStrategy(ABC):
         """
         pass
 
+    def remove_seen_targets(self, message: MessageWrapper, targets: list) -> list:
+        """
+        remove_seen_targets
+
+        Removes the targets that are already known to have the given
+        message, according to the seen digest carried by the message
+
+        @param message [MessageWrapper] The message to send
+        @param targets [list] The targets returned by determine_prop_targets
+
+        @return [list] The targets that are not in the message's seen digest
+        """
+        seen_digest = None if message is None else message.get_seen_digest()
+        if seen_digest is None:
+            return list(targets)
+        return [node_id for node_id in targets if not seen_digest.contains(node_id)]
+
     @abstractmethod
     def track_message_propagation(self, message: MessageWrapper) -> None:
         """
@@ -49,3 +66,40 @@ class PropagationStrategy(ABC):
         @return [None]
         """
         pass
+
+    def message_propagated(
+            self,
+            message_id: tuple,
+            message_type: str,
+            message_payload: object,
+            sender_id: int,
+            targets: list
+            ) -> None:
+        """
+        message_propagated
+
+        Called after a message was propagated to the targets returned by
+        determine_prop_targets. Does nothing by default.
+
+        @param message_id [tuple] The ID of the propagated message
+        @param message_type [str] The type of the propagated message
+        @param message_payload [object] The payload of the propagated message
+        @param sender_id [int] The ID of the node the message was received from. None if this node created the message.
+        @param targets [list] The IDs of the nodes the message was sent to
+
+        @return [None]
+        """
+        pass
+
+    def node_disconnected(self, node_id: int) -> None:
+        """
+        node_disconnected
+
+        Called after the owner network node disconnected from the given
+        node. Does nothing by default.
+
+        @param node_id [int] The ID of the disconnected node
+
+        @return [None]
+        """
+        pass
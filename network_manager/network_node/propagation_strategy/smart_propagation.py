@@ -1,5 +1,4 @@
 import sys
-import time
 
 from network_manager.network_node.propagation_strategy.propagation_strategy import PropagationStrategy
 from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
@@ -97,7 +96,7 @@ class SmartPropagation(PropagationStrategy):
         @return [None]
         """
         message_id = message.get_id()
-        time_received = time.time()
+        time_received = self.network_node.get_time()
 
         if message not in self.message_tracker:
             self.message_tracker[message_id] = time_received
@@ -0,0 +1,256 @@
+import threading
+from collections import OrderedDict
+
+from network_manager.network_node.propagation_strategy.propagation_strategy import PropagationStrategy
+from network_manager.network_node.message_wrapper.message_wrapper import MessageWrapper
+from network_manager.network_node.message_tracking.message_id_tracker import MessageIdTracker
+from network_manager.network_node.network_node_message_types import NetworkNodeMessageTypes
+
+"""
+TreePropagation
+
+Implementation of a spanning tree broadcast strategy, based on the
+Plumtree protocol. Each connected node is either an eager peer (a tree
+edge) or a lazy peer. Propagated messages are only sent to eager peers,
+so once the tree is built a broadcast needs one transmission per node.
+
+The tree is built and maintained from the traffic itself:
+    - New connections start out as eager peers, so the first broadcasts
+      flood the network
+    - A node that receives a message it already has moves the sender to
+      its lazy peers and sends it a TREE_PRUNE, so the sender does the same
+    - If tree_lazy_push is enabled, then after propagating a message the
+      node sends a TREE_IHAVE containing only the message ID to its lazy
+      peers. A node that has not seen the message sends a TREE_GRAFT back,
+      which requests the message and turns the link into a tree edge again.
+
+When an eager peer is disconnected (e.g. by BOT_TEARDOWN), the tree is
+repaired locally: every remaining lazy peer of the node becomes eager
+again, and the next broadcasts prune the redundant edges. Messages lost
+while the tree is repaired are recovered through lazy push.
+
+The last tree_store_size propagated messages are stored so they can be
+sent to nodes that graft them.
+"""
+
+
+class TreePropagation(PropagationStrategy):
+    def __init__(self, owner_network_node):
+        """
+        init
+
+        Creates a new TreePropagation object
+
+        @param owner_network_node [NetworkNode] The network node that owns this object
+
+        @return [TreePropagation] The created TreePropagation object
+        """
+        super().__init__(owner_network_node)
+
+        config = self.network_node.config
+        self.lazy_push = config["tree_lazy_push"]
+        self.store_size = config["tree_store_size"]
+
+        self.lazy_peers = set()
+        self.msg_store = OrderedDict()
+        self.tree_lock = threading.Lock()
+        self.grafted_msg_tracker = MessageIdTracker(config["message_dedup_window_size"])
+
+        self.network_node.assign_msg_handler(
+            str(NetworkNodeMessageTypes.TREE_IHAVE),
+            self.tree_propagation_handle_tree_ihave_message
+        )
+        self.network_node.assign_msg_handler(
+            str(NetworkNodeMessageTypes.TREE_GRAFT),
+            self.tree_propagation_handle_tree_graft_message
+        )
+        self.network_node.assign_msg_handler(
+            str(NetworkNodeMessageTypes.TREE_PRUNE),
+            self.tree_propagation_handle_tree_prune_message
+        )
+
+    def determine_prop_targets(self, message: MessageWrapper) -> list:
+        """
+        determine_prop_targets
+
+        Determines the connected nodes that should receive
+        the given message. In this strategy, the message is
+        sent to all eager peers, excluding the node the message
+        was received from.
+
+        @param message [MessageWrapper] The message to send
+
+        @return [list] The list of nodes to send the message to
+        """
+        sender_id = None if message is None else message.get_sender_id()
+        with self.tree_lock:
+            return [node_id for node_id in self.get_eager_peers() if node_id != sender_id]
+
+    def track_message_propagation(self, message: MessageWrapper) -> None:
+        """
+        track_message_propagation
+
+        Called when a previously propagated message is received again.
+        The link to the sender is redundant, so the sender is moved to
+        the lazy peers and is told to do the same.
+
+        @param message [MessageWrapper] The received message
+
+        @return [None]
+        """
+        sender_id = message.get_sender_id()
+        with self.tree_lock:
+            if (sender_id in self.lazy_peers) or (sender_id not in self.network_node.get_message_channels()):
+                return
+            self.lazy_peers.add(sender_id)
+
+        self.network_node.send_directed_message(sender_id, NetworkNodeMessageTypes.TREE_PRUNE, {})
+
+    def message_propagated(
+            self,
+            message_id: tuple,
+            message_type: str,
+            message_payload: object,
+            sender_id: int,
+            targets: list
+            ) -> None:
+        """
+        message_propagated
+
+        Called after a message was propagated to the targets returned by
+        determine_prop_targets. Stores the message and, if lazy push is
+        enabled, sends its ID to the lazy peers.
+
+        @param message_id [tuple] The ID of the propagated message
+        @param message_type [str] The type of the propagated message
+        @param message_payload [object] The payload of the propagated message
+        @param sender_id [int] The ID of the node the message was received from. None if this node created the message.
+        @param targets [list] The IDs of the nodes the message was sent to
+
+        @return [None]
+        """
+        with self.tree_lock:
+            self.msg_store[message_id] = (message_type, message_payload)
+            while len(self.msg_store) > self.store_size:
+                self.msg_store.popitem(last=False)
+
+            ihave_targets = []
+            if self.lazy_push:
+                ihave_targets = [
+                    node_id for node_id in self.lazy_peers
+                    if (node_id != sender_id) and (node_id not in targets)
+                ]
+
+        for target_id in ihave_targets:
+            self.network_node.send_directed_message(
+                target_id,
+                NetworkNodeMessageTypes.TREE_IHAVE,
+                {"MSG_IDS": [message_id]}
+            )
+
+    def node_disconnected(self, node_id: int) -> None:
+        """
+        node_disconnected
+
+        Called after the owner network node disconnected from the given
+        node. If the node was an eager peer, then a tree edge was lost,
+        so every lazy peer becomes an eager peer again.
+
+        @param node_id [int] The ID of the disconnected node
+
+        @return [None]
+        """
+        with self.tree_lock:
+            if node_id in self.lazy_peers:
+                self.lazy_peers.discard(node_id)
+            else:
+                self.lazy_peers.clear()
+
+    def get_eager_peers(self) -> list:
+        """
+        get_eager_peers
+
+        Returns the connected nodes that are linked to this node by a tree edge
+
+        @param None
+
+        @return [list] The IDs of the eager peers
+        """
+        return [node_id for node_id in self.network_node.get_message_channels().keys() if node_id not in self.lazy_peers]
+
+    def get_lazy_peers(self) -> list:
+        """
+        get_lazy_peers
+
+        Returns the connected nodes that only receive message IDs from this node
+
+        @param None
+
+        @return [list] The IDs of the lazy peers
+        """
+        return list(self.lazy_peers)
+
+    def tree_propagation_handle_tree_ihave_message(self, message: MessageWrapper) -> None:
+        """
+        tree_propagation_handle_tree_ihave_message
+
+        Grafts the messages listed in the received TREE_IHAVE that this
+        node has not seen yet. Each message is only grafted once.
+
+        @param message [MessageWrapper] The received TREE_IHAVE
+
+        @return [None]
+        """
+        msg_ids_to_graft = [
+            msg_id for msg_id in message.get_message_payload()["MSG_IDS"]
+            if (not self.network_node.interacted_with_msg_with_id(msg_id)) and self.grafted_msg_tracker.add(msg_id)
+        ]
+        if len(msg_ids_to_graft) == 0:
+            return
+
+        sender_id = message.get_sender_id()
+        with self.tree_lock:
+            self.lazy_peers.discard(sender_id)
+
+        self.network_node.send_directed_message(
+            sender_id,
+            NetworkNodeMessageTypes.TREE_GRAFT,
+            {"MSG_IDS": msg_ids_to_graft}
+        )
+
+    def tree_propagation_handle_tree_graft_message(self, message: MessageWrapper) -> None:
+        """
+        tree_propagation_handle_tree_graft_message
+
+        Turns the link to the sender into a tree edge and sends it the
+        requested messages that are still stored by this node
+
+        @param message [MessageWrapper] The received TREE_GRAFT
+
+        @return [None]
+        """
+        sender_id = message.get_sender_id()
+        msgs_to_send = []
+        with self.tree_lock:
+            self.lazy_peers.discard(sender_id)
+            for msg_id in message.get_message_payload()["MSG_IDS"]:
+                if msg_id in self.msg_store:
+                    msgs_to_send.append((msg_id,) + self.msg_store[msg_id])
+
+        for msg_id, message_type, message_payload in msgs_to_send:
+            self.network_node._create_message(sender_id, msg_id, message_type, message_payload, True)
+
+    def tree_propagation_handle_tree_prune_message(self, message: MessageWrapper) -> None:
+        """
+        tree_propagation_handle_tree_prune_message
+
+        Moves the sender to the lazy peers of this node
+
+        @param message [MessageWrapper] The received TREE_PRUNE
+
+        @return [None]
+        """
+        sender_id = message.get_sender_id()
+        with self.tree_lock:
+            if sender_id in self.network_node.get_message_channels():
+                self.lazy_peers.add(sender_id)
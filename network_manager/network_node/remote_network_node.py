@@ -0,0 +1,63 @@
+from network_manager.network_node.message_channel.message_channel_user import MessageChannelUser
+
+"""
+RemoteNetworkNode
+
+Proxy for a network node that lives in another process or on
+another host. Holds the information needed to reach the remote
+node so it can be passed to connect_to_network_node and used
+as the target of message channels that send over the network.
+"""
+
+
+class RemoteNetworkNode(MessageChannelUser):
+    def __init__(self, node_id: int, address: tuple):
+        """
+        __init__
+
+        Creates a new RemoteNetworkNode object
+
+        @param node_id [int] The ID of the remote node
+        @param address [tuple] The (host, port) address the remote node is listening on
+
+        @return [RemoteNetworkNode] The created RemoteNetworkNode
+        """
+        self.id = node_id
+        self.address = address
+
+    def get_id(self) -> int:
+        """
+        get_id
+
+        Returns the ID of the remote node
+
+        @param None
+
+        @return [int] The ID of the remote node
+        """
+        return self.id
+
+    def get_address(self) -> tuple:
+        """
+        get_address
+
+        Returns the address the remote node is listening on
+
+        @param None
+
+        @return [tuple] The (host, port) address of the remote node
+        """
+        return self.address
+
+    def receive_message(self, message) -> None:
+        """
+        receive_message
+
+        Remote nodes cannot receive messages directly. Messages must
+        be sent to them through a message channel.
+
+        @param message [MessageWrapper] The message to receive
+
+        @return None
+        """
+        raise Exception("ERROR: Cannot deliver message directly to remote node: {}. Use a message channel.".format(self.id))
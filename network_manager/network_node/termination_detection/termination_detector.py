@@ -0,0 +1,308 @@
+import threading
+import logging
+
+"""
+TerminationDetector
+
+Tracks whether or not a network node is idle without polling, and
+implements the Dijkstra-Scholten termination detection protocol so a
+node that starts a computation only becomes idle once every node that
+took part in it has finished.
+
+Local work is counted explicitly: every message in the inbox or outbox,
+every message waiting for or running its handlers, and any process the
+node reports as running (e.g. a task). Work is always handed over before
+it is released (e.g. a message is added to the target's inbox before it
+is removed from the sender's outbox), so a node never appears idle while
+work it caused is still running in the same process.
+
+Work handed to another node through a message requesting an
+acknowledgement is tracked as follows:
+    - The sender adds the message to its deficit, the number of messages
+      it has not been acknowledged for yet
+    - If the receiver is idle, then it is engaged by the message and the
+      sender becomes its parent. The acknowledgement is held back until
+      the receiver has no local work and no deficit of its own.
+    - Otherwise the receiver acknowledges the message right away
+An engaged node requests acknowledgements for every message it sends,
+so the tree of engaged nodes always covers the whole computation and
+its root stays busy until the computation has terminated everywhere.
+
+A node is idle when it is not running, or when it has no local work and
+no deficit. Listeners are notified of every change while the detector's
+lock is held, so notifications from one node are always delivered in order.
+"""
+
+
+class TerminationDetector(object):
+    def __init__(self, node_id: int, ack_method: object):
+        """
+        __init__
+
+        Creates a new TerminationDetector object
+
+        @param node_id [int] The ID of the node being tracked
+        @param ack_method [Method] The method called with a target ID and a number of acknowledgements to send.
+            One unit of local work is already counted for each call and must be ended once the acknowledgement is sent.
+
+        @return [TerminationDetector] The created TerminationDetector
+        """
+        self.logger = logging.getLogger('NetworkNode')
+
+        self.node_id = node_id
+        self.ack_method = ack_method
+
+        self.activity_condition = threading.Condition()
+        self.num_local_work = 0
+        self.unacked_msgs = {}
+        self.parent_id = None
+        self.acks_to_send = {}
+        self.running = False
+        self.idle = True
+
+        self.idle_listeners = []
+
+    def add_idle_listener(self, new_listener: object) -> None:
+        """
+        add_idle_listener
+
+        Adds a listener to notify about changes of the idle state. If the
+        node is currently busy, then the listener is notified right away.
+
+        @param new_listener [NetworkNodeIdleListenerInterface] The listener to add
+
+        @return None
+        """
+        with self.activity_condition:
+            self.idle_listeners.append(new_listener)
+            if not self.idle:
+                new_listener.notify_idle_state(self.node_id, False)
+
+    def set_running(self, running: bool) -> None:
+        """
+        set_running
+
+        Sets whether or not the node is running. Nodes that are not
+        running are always idle.
+
+        @param running [bool] True if the node was started. False if it was torn down.
+
+        @return None
+        """
+        with self.activity_condition:
+            self.running = running
+            acks = self._update_state()
+        self._send_acks(acks)
+
+    def begin_work(self, num_work: int = 1) -> None:
+        """
+        begin_work
+
+        Records new local work for the node
+
+        @param num_work [int] The number of units of work started
+
+        @return None
+        """
+        with self.activity_condition:
+            self.num_local_work += num_work
+            acks = self._update_state()
+        self._send_acks(acks)
+
+    def end_work(self, num_work: int = 1) -> None:
+        """
+        end_work
+
+        Records that local work of the node has finished. Ending more
+        work than was started is logged as an error, and the count is
+        kept at zero so the node can still become idle.
+
+        @param num_work [int] The number of units of work finished
+
+        @return None
+        """
+        with self.activity_condition:
+            if num_work > self.num_local_work:
+                self.logger.error("ERROR: Node {} ended {} units of work with only {} started".format(
+                    self.node_id,
+                    num_work,
+                    self.num_local_work
+                ))
+                num_work = self.num_local_work
+            self.num_local_work -= num_work
+            acks = self._update_state()
+        self._send_acks(acks)
+
+    def is_engaged(self) -> bool:
+        """
+        is_engaged
+
+        Checks whether or not the node is working on behalf of a parent
+
+        @param None
+
+        @return [bool] True if the node has a parent. False otherwise.
+        """
+        return self.parent_id is not None
+
+    def message_sent(self, target_id: int) -> None:
+        """
+        message_sent
+
+        Adds a message requesting an acknowledgement to the deficit of the node
+
+        @param target_id [int] The ID of the node the message is sent to
+
+        @return None
+        """
+        with self.activity_condition:
+            self.unacked_msgs[target_id] = self.unacked_msgs.get(target_id, 0) + 1
+            acks = self._update_state()
+        self._send_acks(acks)
+
+    def acks_received(self, sender_id: int, num_acks: int) -> None:
+        """
+        acks_received
+
+        Removes acknowledged messages from the deficit of the node
+
+        @param sender_id [int] The ID of the node that sent the acknowledgements
+        @param num_acks [int] The number of messages acknowledged
+
+        @return None
+        """
+        with self.activity_condition:
+            if sender_id in self.unacked_msgs:
+                self.unacked_msgs[sender_id] -= num_acks
+                if self.unacked_msgs[sender_id] <= 0:
+                    self.unacked_msgs.pop(sender_id)
+            acks = self._update_state()
+        self._send_acks(acks)
+
+    def message_received(self, sender_id: int) -> None:
+        """
+        message_received
+
+        Handles the receipt of a message requesting an acknowledgement.
+        The node is engaged by the message if it is idle, otherwise the
+        message is acknowledged. One unit of local work is started for
+        the receipt, which must be ended once the message is stored.
+
+        @param sender_id [int] The ID of the node that sent the message
+
+        @return None
+        """
+        with self.activity_condition:
+            if self.running and (self.parent_id is None) and (self.num_local_work == 0) and (len(self.unacked_msgs) == 0):
+                self.parent_id = sender_id
+            else:
+                self.acks_to_send[sender_id] = self.acks_to_send.get(sender_id, 0) + 1
+            self.num_local_work += 1
+            acks = self._update_state()
+        self._send_acks(acks)
+
+    def forget_node(self, node_id: int) -> None:
+        """
+        forget_node
+
+        Stops waiting for acknowledgements from the given node and stops
+        owing acknowledgements to it. Used when the node is disconnected.
+
+        @param node_id [int] The ID of the node to forget
+
+        @return None
+        """
+        with self.activity_condition:
+            self.unacked_msgs.pop(node_id, None)
+            self.acks_to_send.pop(node_id, None)
+            if self.parent_id == node_id:
+                self.parent_id = None
+            acks = self._update_state()
+        self._send_acks(acks)
+
+    def is_idle(self) -> bool:
+        """
+        is_idle
+
+        Returns the idle state of the node
+
+        @param None
+
+        @return [bool] True if the node is idle. False otherwise.
+        """
+        return self.idle
+
+    def wait_until_idle(self, timeout_sec: float = None) -> bool:
+        """
+        wait_until_idle
+
+        Waits for the node to become idle
+
+        @param timeout_sec [float] The maximum number of seconds to wait. None to wait indefinitely.
+
+        @return [bool] True if the node became idle. False if the timeout was hit.
+        """
+        with self.activity_condition:
+            return self.activity_condition.wait_for(lambda: self.idle, timeout=timeout_sec)
+
+    def get_stats(self) -> dict:
+        """
+        get_stats
+
+        Returns a dictionary describing the current state of the detector
+
+        @param None
+
+        @return [dict] The local work count, deficit and parent of the node
+        """
+        with self.activity_condition:
+            return {
+                "NUM_LOCAL_WORK": self.num_local_work,
+                "DEFICIT": sum(self.unacked_msgs.values()),
+                "PARENT_ID": self.parent_id
+            }
+
+    def _update_state(self) -> list:
+        """
+        _update_state
+
+        Releases the parent of the node if the node has no work left,
+        collects the acknowledgements to send, and notifies listeners
+        if the idle state changed. Must be called while holding the
+        activity condition.
+
+        @param None
+
+        @return [list] The (target ID, number of acknowledgements) pairs to send
+        """
+        if (self.parent_id is not None) and (self.num_local_work == 0) and (len(self.unacked_msgs) == 0):
+            self.acks_to_send[self.parent_id] = self.acks_to_send.get(self.parent_id, 0) + 1
+            self.parent_id = None
+
+        acks = list(self.acks_to_send.items())
+        self.acks_to_send = {}
+        # Sending an acknowledgement is local work, which keeps the node busy until it is sent
+        self.num_local_work += len(acks)
+
+        new_idle = (not self.running) or ((self.num_local_work == 0) and (len(self.unacked_msgs) == 0))
+        if new_idle != self.idle:
+            self.idle = new_idle
+            for listener in self.idle_listeners:
+                listener.notify_idle_state(self.node_id, new_idle)
+            self.activity_condition.notify_all()
+
+        return acks
+
+    def _send_acks(self, acks: list) -> None:
+        """
+        _send_acks
+
+        Sends the given acknowledgements. Must be called without holding
+        the activity condition.
+
+        @param acks [list] The (target ID, number of acknowledgements) pairs to send
+
+        @return None
+        """
+        for target_id, num_acks in acks:
+            self.ack_method(target_id, num_acks)
@@ -0,0 +1,220 @@
+import threading
+
+"""
+SubscriptionTable
+
+Routing table for topic-based publish/subscribe. A topic is a message
+type that a node has assigned a handler to. Each node advertises the
+topics it subscribes to, and the table stores, for every known
+subscriber, its topics and the neighbors that lead to it. Published
+messages are then only forwarded toward the neighbors that lead to a
+subscriber of the message's topic.
+
+Advertisements are sent from neighbor to neighbor, like in a distance
+vector protocol. Each advertisement of a subscriber carries a version
+(increased by the subscriber every time its topics change) and the
+number of hops to the subscriber. A node adopts an advertisement with
+a newer version from the first neighbor that sends it, then passes it
+on to its other neighbors. A neighbor that later advertises the same
+version is kept as an alternative route if it is strictly closer to
+the subscriber than this node is. Following routes therefore always
+gets closer to the subscriber, so published messages can never loop
+on their way to it, even after the best route is lost.
+"""
+
+
+class SubscriptionTable(object):
+    def __init__(self, owner_id: int):
+        """
+        __init__
+
+        Creates a new SubscriptionTable object
+
+        @param owner_id [int] The ID of the node that owns the table
+
+        @return [SubscriptionTable] The created SubscriptionTable
+        """
+        self.owner_id = owner_id
+        self.local_topics = frozenset()
+        self.local_version = 0
+
+        self.subscribers = {}
+        self.table_lock = threading.Lock()
+
+    def set_local_topics(self, topics: list) -> dict:
+        """
+        set_local_topics
+
+        Sets the topics the owner node subscribes to
+
+        @param topics [list] The topics the owner node subscribes to
+
+        @return [dict] The advertisement to send to the neighbors. None if the topics did not change.
+        """
+        with self.table_lock:
+            topics = frozenset(topics)
+            if topics == self.local_topics:
+                return None
+
+            self.local_topics = topics
+            self.local_version += 1
+            return self._create_local_advertisement()
+
+    def get_advertisements(self, neighbor_id: int) -> list:
+        """
+        get_advertisements
+
+        Returns the advertisements of every known subscriber, including
+        the owner node, to send to the given neighbor. Subscribers that
+        are reached through the neighbor are left out, since the
+        neighbor is closer to them than this node.
+
+        @param neighbor_id [int] The ID of the neighbor to send the advertisements to
+
+        @return [list] The advertisements
+        """
+        with self.table_lock:
+            advertisements = []
+            if self.local_version > 0:
+                advertisements.append(self._create_local_advertisement())
+
+            for subscriber_id, subscriber in self.subscribers.items():
+                if (subscriber_id != neighbor_id) and (self._get_best_route(subscriber) != neighbor_id):
+                    advertisements.append(self._create_advertisement(subscriber_id, subscriber))
+            return advertisements
+
+    def merge_advertisements(self, neighbor_id: int, advertisements: list) -> list:
+        """
+        merge_advertisements
+
+        Updates the table with the advertisements received from the given neighbor
+
+        @param neighbor_id [int] The ID of the neighbor the advertisements were received from
+        @param advertisements [list] The received advertisements
+
+        @return [list] The advertisements that were adopted, to pass on to the other neighbors
+        """
+        adopted_advertisements = []
+        with self.table_lock:
+            for advertisement in advertisements:
+                subscriber_id = advertisement["SUBSCRIBER_ID"]
+                if subscriber_id == self.owner_id:
+                    continue
+
+                subscriber = self.subscribers.get(subscriber_id)
+                if (subscriber is None) or (advertisement["VERSION"] > subscriber["VERSION"]):
+                    subscriber = {
+                        "TOPICS": frozenset(advertisement["TOPICS"]),
+                        "VERSION": advertisement["VERSION"],
+                        "NUM_HOPS": advertisement["NUM_HOPS"] + 1,
+                        "ROUTES": {neighbor_id: advertisement["NUM_HOPS"]}
+                    }
+                    self.subscribers[subscriber_id] = subscriber
+                    adopted_advertisements.append(self._create_advertisement(subscriber_id, subscriber))
+                elif advertisement["VERSION"] == subscriber["VERSION"]:
+                    if advertisement["NUM_HOPS"] < subscriber["NUM_HOPS"]:
+                        subscriber["ROUTES"][neighbor_id] = advertisement["NUM_HOPS"]
+        return adopted_advertisements
+
+    def remove_node(self, node_id: int) -> None:
+        """
+        remove_node
+
+        Removes the given node as a subscriber and as a route to other
+        subscribers. Subscribers left without a route are forgotten.
+
+        @param node_id [int] The ID of the node to remove
+
+        @return None
+        """
+        with self.table_lock:
+            self.subscribers.pop(node_id, None)
+            for subscriber_id in list(self.subscribers.keys()):
+                routes = self.subscribers[subscriber_id]["ROUTES"]
+                routes.pop(node_id, None)
+                if len(routes) == 0:
+                    self.subscribers.pop(subscriber_id)
+
+    def get_route_targets(self, topic: str) -> list:
+        """
+        get_route_targets
+
+        Returns the neighbors to forward a message of the given topic to,
+        which is the best route to each known subscriber of the topic
+
+        @param topic [str] The topic of the message
+
+        @return [list] The IDs of the neighbors to forward the message to
+        """
+        with self.table_lock:
+            targets = set()
+            for subscriber in self.subscribers.values():
+                if topic in subscriber["TOPICS"]:
+                    targets.add(self._get_best_route(subscriber))
+            return list(targets)
+
+    def get_subscribers(self, topic: str) -> list:
+        """
+        get_subscribers
+
+        Returns the known subscribers of the given topic, excluding the owner node
+
+        @param topic [str] The topic to get the subscribers of
+
+        @return [list] The IDs of the subscribers
+        """
+        with self.table_lock:
+            return [
+                subscriber_id for subscriber_id, subscriber in self.subscribers.items()
+                if topic in subscriber["TOPICS"]
+            ]
+
+    def _get_best_route(self, subscriber: dict) -> int:
+        """
+        _get_best_route
+
+        Returns the route to the given subscriber with the fewest hops.
+        Must be called while holding the table lock.
+
+        @param subscriber [dict] The subscriber's entry in the table
+
+        @return [int] The ID of the neighbor to route through
+        """
+        return min(subscriber["ROUTES"].items(), key=lambda route: route[1])[0]
+
+    def _create_local_advertisement(self) -> dict:
+        """
+        _create_local_advertisement
+
+        Creates the advertisement of the owner node's topics. Must be
+        called while holding the table lock.
+
+        @param None
+
+        @return [dict] The advertisement
+        """
+        return {
+            "SUBSCRIBER_ID": self.owner_id,
+            "TOPICS": list(self.local_topics),
+            "VERSION": self.local_version,
+            "NUM_HOPS": 0
+        }
+
+    def _create_advertisement(self, subscriber_id: int, subscriber: dict) -> dict:
+        """
+        _create_advertisement
+
+        Creates the advertisement of the given subscriber to pass on to
+        neighbors. Must be called while holding the table lock.
+
+        @param subscriber_id [int] The ID of the subscriber
+        @param subscriber [dict] The subscriber's entry in the table
+
+        @return [dict] The advertisement
+        """
+        return {
+            "SUBSCRIBER_ID": subscriber_id,
+            "TOPICS": list(subscriber["TOPICS"]),
+            "VERSION": subscriber["VERSION"],
+            "NUM_HOPS": subscriber["NUM_HOPS"]
+        }
@@ -0,0 +1,436 @@
+import threading
+
+"""
+ConnectivityIndex
+
+Undirected view of the connections between the nodes of a network, kept
+up to date as nodes are connected and disconnected. Adding or removing a
+node or a connection only updates the adjacency sets, so changes are cheap
+no matter how large the network is.
+
+Queries about the structure of the network (articulation points, bridges,
+components, and the components a removal would split a component into)
+are answered from an analysis of the whole graph. The analysis is a single
+pass of Tarjan's depth first search, which runs the first time a query is
+made after the graph changed. Every query is then answered from the
+analysis until the graph changes again, so a batch of changes costs one
+pass and repeated queries are answered in constant time.
+
+The depth first search is iterative, so it is not limited by the
+recursion limit on large networks.
+"""
+
+
+class ConnectivityIndex(object):
+    def __init__(self):
+        """
+        __init__
+
+        Creates a new ConnectivityIndex object
+
+        @param None
+
+        @return [ConnectivityIndex] The created ConnectivityIndex
+        """
+        self.adjacency = {}
+        self.index_lock = threading.RLock()
+        self.analysis = None
+
+    def add_node(self, node_id: int) -> None:
+        """
+        add_node
+
+        Adds the given node to the index, without any connections
+
+        @param node_id [int] The ID of the node to add
+
+        @return None
+        """
+        with self.index_lock:
+            if node_id not in self.adjacency:
+                self.adjacency[node_id] = set()
+                self.analysis = None
+
+    def remove_node(self, node_id: int) -> None:
+        """
+        remove_node
+
+        Removes the given node and all of its connections from the index
+
+        @param node_id [int] The ID of the node to remove
+
+        @return None
+        """
+        with self.index_lock:
+            neighbors = self.adjacency.pop(node_id, None)
+            if neighbors is None:
+                return
+
+            for neighbor_id in neighbors:
+                self.adjacency[neighbor_id].discard(node_id)
+            self.analysis = None
+
+    def add_connection(self, node_id_1: int, node_id_2: int) -> None:
+        """
+        add_connection
+
+        Adds a connection between the given nodes. Nodes that are not in
+        the index yet are added to it.
+
+        @param node_id_1 [int] The ID of the node at one end of the connection
+        @param node_id_2 [int] The ID of the node at the other end of the connection
+
+        @return None
+        """
+        if node_id_1 == node_id_2:
+            return
+
+        with self.index_lock:
+            self.add_node(node_id_1)
+            self.add_node(node_id_2)
+            if node_id_2 not in self.adjacency[node_id_1]:
+                self.adjacency[node_id_1].add(node_id_2)
+                self.adjacency[node_id_2].add(node_id_1)
+                self.analysis = None
+
+    def remove_connection(self, node_id_1: int, node_id_2: int) -> None:
+        """
+        remove_connection
+
+        Removes the connection between the given nodes, if there is one
+
+        @param node_id_1 [int] The ID of the node at one end of the connection
+        @param node_id_2 [int] The ID of the node at the other end of the connection
+
+        @return None
+        """
+        with self.index_lock:
+            if node_id_2 in self.adjacency.get(node_id_1, ()):
+                self.adjacency[node_id_1].discard(node_id_2)
+                self.adjacency[node_id_2].discard(node_id_1)
+                self.analysis = None
+
+    def has_node(self, node_id: int) -> bool:
+        """
+        has_node
+
+        Checks whether or not the given node is in the index
+
+        @param node_id [int] The ID of the node to check
+
+        @return [bool] True if the node is in the index. False otherwise.
+        """
+        return node_id in self.adjacency
+
+    def get_neighbors(self, node_id: int) -> list:
+        """
+        get_neighbors
+
+        Returns the nodes the given node is connected to
+
+        @param node_id [int] The ID of the node to get the neighbors of
+
+        @return [list] The IDs of the neighbors. Empty if the node is not in the index.
+        """
+        with self.index_lock:
+            return list(self.adjacency.get(node_id, ()))
+
+    def is_removal_safe(self, node_id: int) -> bool:
+        """
+        is_removal_safe
+
+        Checks whether or not the given node can be removed without leaving
+        a node with no connections or splitting the node's component
+
+        @param node_id [int] The ID of the node to remove
+
+        @return [bool] True if the node can be removed safely. False otherwise.
+        """
+        analysis = self._get_analysis()
+        return (node_id not in analysis["ARTICULATION_POINTS"]) and (node_id not in analysis["ORPHANED_ON_REMOVAL"])
+
+    def get_orphaned_nodes(self, node_id: int) -> list:
+        """
+        get_orphaned_nodes
+
+        Returns the nodes that would be left without connections if the given node was removed
+
+        @param node_id [int] The ID of the node to remove
+
+        @return [list] The IDs of the nodes that would be orphaned
+        """
+        return list(self._get_analysis()["ORPHANED_ON_REMOVAL"].get(node_id, ()))
+
+    def is_articulation_point(self, node_id: int) -> bool:
+        """
+        is_articulation_point
+
+        Checks whether or not removing the given node would split its component
+
+        @param node_id [int] The ID of the node to check
+
+        @return [bool] True if the node is an articulation point. False otherwise.
+        """
+        return node_id in self._get_analysis()["ARTICULATION_POINTS"]
+
+    def get_articulation_points(self) -> list:
+        """
+        get_articulation_points
+
+        Returns every node whose removal would split its component
+
+        @param None
+
+        @return [list] The IDs of the articulation points
+        """
+        return list(self._get_analysis()["ARTICULATION_POINTS"])
+
+    def is_bridge(self, node_id_1: int, node_id_2: int) -> bool:
+        """
+        is_bridge
+
+        Checks whether or not removing the connection between the given
+        nodes would split their component
+
+        @param node_id_1 [int] The ID of the node at one end of the connection
+        @param node_id_2 [int] The ID of the node at the other end of the connection
+
+        @return [bool] True if the connection is a bridge. False otherwise.
+        """
+        return frozenset((node_id_1, node_id_2)) in self._get_analysis()["BRIDGES"]
+
+    def get_bridges(self) -> list:
+        """
+        get_bridges
+
+        Returns every connection whose removal would split its component
+
+        @param None
+
+        @return [list] The bridges, as tuples of the IDs of the nodes at both ends
+        """
+        return [tuple(bridge) for bridge in self._get_analysis()["BRIDGES"]]
+
+    def get_components(self) -> list:
+        """
+        get_components
+
+        Returns the connected components of the network
+
+        @param None
+
+        @return [list] The components, as sets of node IDs
+        """
+        analysis = self._get_analysis()
+        return [self._get_subtree(analysis, root_id) for root_id in analysis["COMPONENT_ROOTS"]]
+
+    def get_num_components(self) -> int:
+        """
+        get_num_components
+
+        Returns the number of connected components in the network
+
+        @param None
+
+        @return [int] The number of components
+        """
+        return len(self._get_analysis()["COMPONENT_ROOTS"])
+
+    def get_split_components(self, node_id: int) -> list:
+        """
+        get_split_components
+
+        Returns the components that the given node's component would be
+        split into if the node was removed. A single component is returned
+        if the removal does not split the network.
+
+        @param node_id [int] The ID of the node to remove
+
+        @return [list] The resulting components, as sets of node IDs. Empty if the node has no connections.
+        """
+        analysis = self._get_analysis()
+        if node_id not in analysis["DISCOVERY"]:
+            return []
+
+        component = self._get_subtree(analysis, analysis["ROOT_OF"][node_id])
+        component.discard(node_id)
+
+        split_components = []
+        for child_id in analysis["SPLIT_CHILDREN"].get(node_id, ()):
+            subtree = self._get_subtree(analysis, child_id)
+            component.difference_update(subtree)
+            split_components.append(subtree)
+
+        if len(component) > 0:
+            split_components.append(component)
+        return split_components
+
+    def _get_subtree(self, analysis: dict, node_id: int) -> set:
+        """
+        _get_subtree
+
+        Returns the nodes below the given node in the depth first search tree, including the node itself
+
+        @param analysis [dict] The analysis of the graph
+        @param node_id [int] The ID of the node at the top of the subtree
+
+        @return [set] The IDs of the nodes in the subtree
+        """
+        return set(analysis["ORDER"][analysis["DISCOVERY"][node_id]:analysis["SUBTREE_END"][node_id]])
+
+    def _get_analysis(self) -> dict:
+        """
+        _get_analysis
+
+        Returns the analysis of the current graph, running it if the graph
+        changed since the last analysis
+
+        @param None
+
+        @return [dict] The analysis of the graph
+        """
+        with self.index_lock:
+            if self.analysis is None:
+                self.analysis = self._analyze()
+            return self.analysis
+
+    def _analyze(self) -> dict:
+        """
+        _analyze
+
+        Finds the articulation points, bridges, and components of the graph
+        with Tarjan's depth first search. For every articulation point, the
+        children whose subtrees would be cut off by its removal are stored,
+        so the resulting components can be listed from the search order.
+        Must be called while holding the index lock.
+
+        @param None
+
+        @return [dict] The analysis of the graph
+        """
+        search = {
+            "DISCOVERY": {},
+            "LOW": {},
+            "PARENTS": {},
+            "ORDER": [],
+            "SUBTREE_END": {},
+            "ROOT_OF": {},
+            "SPLIT_CHILDREN": {},
+            "BRIDGES": set()
+        }
+        component_roots = []
+        for root_id in self.adjacency:
+            if root_id not in search["DISCOVERY"]:
+                component_roots.append(root_id)
+                self._search_component(search, root_id)
+
+        orphaned_on_removal = {}
+        for node_id, neighbors in self.adjacency.items():
+            if len(neighbors) == 1:
+                orphaned_on_removal.setdefault(next(iter(neighbors)), []).append(node_id)
+
+        return {
+            "DISCOVERY": search["DISCOVERY"],
+            "ORDER": search["ORDER"],
+            "SUBTREE_END": search["SUBTREE_END"],
+            "ROOT_OF": search["ROOT_OF"],
+            "COMPONENT_ROOTS": component_roots,
+            "SPLIT_CHILDREN": search["SPLIT_CHILDREN"],
+            "ARTICULATION_POINTS": self._get_articulation_points(search["SPLIT_CHILDREN"], search["ROOT_OF"]),
+            "BRIDGES": search["BRIDGES"],
+            "ORPHANED_ON_REMOVAL": orphaned_on_removal
+        }
+
+    def _search_component(self, search: dict, root_id: int) -> None:
+        """
+        _search_component
+
+        Runs an iterative depth first search of the component holding the
+        given node, adding its results to the given search state. Must be
+        called while holding the index lock.
+
+        @param search [dict] The state of the search, shared by every component
+        @param root_id [int] The ID of the node to start the search from
+
+        @return None
+        """
+        self._discover_node(search, root_id, root_id)
+        stack = [(root_id, iter(self.adjacency[root_id]))]
+        while len(stack) > 0:
+            node_id, neighbors = stack[-1]
+            found_child = False
+            for neighbor_id in neighbors:
+                if neighbor_id not in search["DISCOVERY"]:
+                    search["PARENTS"][neighbor_id] = node_id
+                    self._discover_node(search, neighbor_id, root_id)
+                    stack.append((neighbor_id, iter(self.adjacency[neighbor_id])))
+                    found_child = True
+                    break
+                elif neighbor_id != search["PARENTS"].get(node_id):
+                    search["LOW"][node_id] = min(search["LOW"][node_id], search["DISCOVERY"][neighbor_id])
+
+            if found_child:
+                continue
+
+            stack.pop()
+            search["SUBTREE_END"][node_id] = len(search["ORDER"])
+            if node_id != root_id:
+                self._update_low_link(search, node_id)
+
+    def _discover_node(self, search: dict, node_id: int, root_id: int) -> None:
+        """
+        _discover_node
+
+        Records the first visit of the given node in the search state
+
+        @param search [dict] The state of the search
+        @param node_id [int] The ID of the node being visited
+        @param root_id [int] The ID of the node the search of its component started from
+
+        @return None
+        """
+        search["DISCOVERY"][node_id] = search["LOW"][node_id] = len(search["ORDER"])
+        search["ORDER"].append(node_id)
+        search["ROOT_OF"][node_id] = root_id
+
+    def _update_low_link(self, search: dict, node_id: int) -> None:
+        """
+        _update_low_link
+
+        Passes the low link of the given node up to its parent once the
+        node's subtree is searched. The edge to the parent is a bridge if
+        the subtree cannot reach the parent or above without it, and the
+        subtree is cut off by removing the parent if it cannot reach above
+        the parent.
+
+        @param search [dict] The state of the search
+        @param node_id [int] The ID of the node whose subtree was searched. Must not be a search root.
+
+        @return None
+        """
+        low = search["LOW"]
+        discovery = search["DISCOVERY"]
+        parent_id = search["PARENTS"][node_id]
+        low[parent_id] = min(low[parent_id], low[node_id])
+        if low[node_id] > discovery[parent_id]:
+            search["BRIDGES"].add(frozenset((parent_id, node_id)))
+        if low[node_id] >= discovery[parent_id]:
+            search["SPLIT_CHILDREN"].setdefault(parent_id, []).append(node_id)
+
+    def _get_articulation_points(self, split_children: dict, root_of: dict) -> set:
+        """
+        _get_articulation_points
+
+        Returns the nodes whose removal would split their component. The
+        root of a search only splits its component if it has more than one
+        child in the search tree.
+
+        @param split_children [dict] The children cut off by removing each node, by node ID
+        @param root_of [dict] The ID of the search root of each node, by node ID
+
+        @return [set] The IDs of the articulation points
+        """
+        return set(
+            node_id for node_id, children in split_children.items()
+            if (node_id != root_of[node_id]) or (len(children) > 1)
+        )
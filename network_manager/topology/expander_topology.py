@@ -0,0 +1,103 @@
+from collections import Counter
+
+from network_manager.topology.topology_generator import TopologyGenerator
+
+"""
+ExpanderTopology
+
+Topology generator for bounded degree expander overlays, built as the
+union of half the degree random cycles through every node. Random
+unions of cycles are expanders with high probability, so the overlay
+has a diameter logarithmic in the number of nodes, and no node ever has
+more than the degree connections.
+
+A joining node is inserted into each cycle after a random node, and a
+leaving node is spliced out of each cycle by connecting its predecessor
+to its successor. Two cycles can share a connection, so the number of
+cycles using each connection is counted, and a connection is only
+dropped once no cycle uses it.
+"""
+
+
+class ExpanderTopology(TopologyGenerator):
+    def __init__(self, topology_config: dict = None):
+        """
+        __init__
+
+        Creates a new ExpanderTopology object
+
+        @param topology_config [dict] The generator settings. Supports the TopologyGenerator keys.
+
+        @return [ExpanderTopology] The created ExpanderTopology
+        """
+        super().__init__(topology_config)
+
+        self.num_cycles = self.degree // 2
+        self.successors = [{} for _ in range(self.num_cycles)]
+        self.predecessors = [{} for _ in range(self.num_cycles)]
+        self.connection_uses = Counter()
+
+    def _join(self, node_id: int) -> None:
+        """
+        _join
+
+        Inserts the given node into each cycle after a random node
+
+        @param node_id [int] The ID of the joining node
+
+        @return None
+        """
+        for successors, predecessors in zip(self.successors, self.predecessors):
+            node_id_1 = self._random_node()
+            if node_id_1 is None:
+                successors[node_id] = node_id
+                predecessors[node_id] = node_id
+                continue
+
+            node_id_2 = successors[node_id_1]
+            self._remove_use(node_id_1, node_id_2)
+            self._add_use(node_id_1, node_id)
+            self._add_use(node_id, node_id_2)
+
+            successors[node_id_1] = node_id
+            predecessors[node_id] = node_id_1
+            successors[node_id] = node_id_2
+            predecessors[node_id_2] = node_id
+
+    def _leave(self, node_id: int) -> None:
+        """
+        _leave
+
+        Splices the given node out of each cycle
+
+        @param node_id [int] The ID of the leaving node
+
+        @return None
+        """
+        for successors, predecessors in zip(self.successors, self.predecessors):
+            node_id_1 = predecessors.pop(node_id)
+            node_id_2 = successors.pop(node_id)
+            if node_id_1 == node_id:
+                continue
+
+            self._remove_use(node_id_1, node_id)
+            self._remove_use(node_id, node_id_2)
+            self._add_use(node_id_1, node_id_2)
+
+            successors[node_id_1] = node_id_2
+            predecessors[node_id_2] = node_id_1
+
+    def _add_use(self, node_id_1: int, node_id_2: int) -> None:
+        if node_id_1 != node_id_2:
+            self.connection_uses[frozenset((node_id_1, node_id_2))] += 1
+            self._connect(node_id_1, node_id_2)
+
+    def _remove_use(self, node_id_1: int, node_id_2: int) -> None:
+        connection = frozenset((node_id_1, node_id_2))
+        if (node_id_1 == node_id_2) or (connection not in self.connection_uses):
+            return
+
+        self.connection_uses[connection] -= 1
+        if self.connection_uses[connection] == 0:
+            self.connection_uses.pop(connection)
+            self._disconnect(node_id_1, node_id_2)
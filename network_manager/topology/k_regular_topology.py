@@ -0,0 +1,73 @@
+from network_manager.topology.topology_generator import TopologyGenerator
+
+"""
+KRegularTopology
+
+Topology generator for random k-regular overlays, where every node has
+the same number of connections. Until there are more nodes than the
+degree, every node is connected to every other node. After that, a
+joining node is placed by splitting random connections: the connection
+between two nodes is replaced by a connection from each of them to the
+joining node. The degree of the split nodes stays the same, and the
+joining node gets two connections per split, so the overlay stays
+k-regular as it grows (for an odd degree, one node gets an extra
+connection per join).
+
+A leaving node's neighbors are paired up and connected, which gives
+back the connection each of them lost.
+"""
+
+
+class KRegularTopology(TopologyGenerator):
+    def _join(self, node_id: int) -> None:
+        """
+        _join
+
+        Connects the given node by splitting random connections between placed nodes
+
+        @param node_id [int] The ID of the joining node
+
+        @return None
+        """
+        if len(self.nodes) <= self.degree:
+            for placed_node_id in self.nodes:
+                self._connect(node_id, placed_node_id)
+            return
+
+        neighbors = self.overlay.adjacency[node_id]
+        for _ in range(4 * self.degree):
+            if self._get_degree(node_id) + 2 > self.degree:
+                break
+
+            node_id_1 = self._random_node()
+            if (node_id_1 in neighbors) or (self._get_degree(node_id_1) == 0):
+                continue
+            node_id_2 = self.random.choice(list(self.overlay.adjacency[node_id_1]))
+            if node_id_2 in neighbors:
+                continue
+
+            self._disconnect(node_id_1, node_id_2)
+            self._connect(node_id, node_id_1)
+            self._connect(node_id, node_id_2)
+
+        # Fill up any missing connections (e.g. for an odd degree) with the lowest degree nodes
+        if self._get_degree(node_id) < self.degree:
+            candidates = [placed_node_id for placed_node_id in self.nodes if placed_node_id not in neighbors]
+            candidates.sort(key=self._get_degree)
+            for placed_node_id in candidates[:self.degree - self._get_degree(node_id)]:
+                self._connect(node_id, placed_node_id)
+
+    def _leave(self, node_id: int) -> None:
+        """
+        _leave
+
+        Pairs up the neighbors of the given node and connects each pair
+
+        @param node_id [int] The ID of the leaving node
+
+        @return None
+        """
+        neighbors = self.overlay.get_neighbors(node_id)
+        self.random.shuffle(neighbors)
+        for i in range(0, len(neighbors) - 1, 2):
+            self._connect(neighbors[i], neighbors[i + 1])
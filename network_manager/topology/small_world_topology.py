@@ -0,0 +1,112 @@
+from network_manager.topology.topology_generator import TopologyGenerator
+
+"""
+SmallWorldTopology
+
+Topology generator for Watts-Strogatz small-world overlays. The nodes
+are placed on a ring, and each node is connected to the nearest half
+degree nodes on each side of it (the lattice connections, so an odd
+degree is rounded down). Each lattice connection is rewired with the
+rewire probability to a random node instead, which gives the overlay
+shortcuts across the ring and a low diameter, while most connections
+stay local.
+
+A joining node is inserted at a random position on the ring. The
+lattice connections that now span more than half the degree across
+the insertion point are dropped, so the degree of the other nodes stays
+the same. A leaving node's lattice neighbors take back the connections
+across the gap it leaves.
+"""
+
+
+class SmallWorldTopology(TopologyGenerator):
+    def __init__(self, topology_config: dict = None):
+        """
+        __init__
+
+        Creates a new SmallWorldTopology object
+
+        @param topology_config [dict] The generator settings. Supports the TopologyGenerator keys, and:
+            REWIRE_PROBABILITY [float] The probability of rewiring each lattice connection. Default is 0.1.
+
+        @return [SmallWorldTopology] The created SmallWorldTopology
+        """
+        super().__init__(topology_config)
+        topology_config = {} if topology_config is None else topology_config
+
+        self.rewire_probability = topology_config.get("REWIRE_PROBABILITY", 0.1)
+        self.half_degree = self.degree // 2
+        self.ring = []
+        self.lattice_connections = set()
+
+    def _join(self, node_id: int) -> None:
+        """
+        _join
+
+        Inserts the given node at a random position on the ring and
+        connects it to its lattice neighbors, rewiring each connection
+        with the rewire probability
+
+        @param node_id [int] The ID of the joining node
+
+        @return None
+        """
+        num_nodes = len(self.ring)
+        position = self.random.randrange(num_nodes) if num_nodes > 0 else 0
+
+        # Lattice connections across the insertion point are one position longer once the node is inserted
+        if num_nodes > 2 * self.half_degree:
+            for i in range(self.half_degree):
+                self._disconnect_lattice(
+                    self.ring[(position - 1 - i) % num_nodes],
+                    self.ring[(position + self.half_degree - 1 - i) % num_nodes]
+                )
+
+        self.ring.insert(position, node_id)
+        num_nodes += 1
+
+        for offset in range(1, self.half_degree + 1):
+            for neighbor_id in (self.ring[(position - offset) % num_nodes], self.ring[(position + offset) % num_nodes]):
+                if (num_nodes > 2 * self.half_degree + 1) and (self.random.random() < self.rewire_probability):
+                    self._connect(node_id, self._random_node())
+                else:
+                    self._connect_lattice(node_id, neighbor_id)
+
+    def _leave(self, node_id: int) -> None:
+        """
+        _leave
+
+        Removes the given node from the ring and reconnects the lattice
+        neighbors that are now within half the degree of each other
+
+        @param node_id [int] The ID of the leaving node
+
+        @return None
+        """
+        position = self.ring.index(node_id)
+        self.ring.pop(position)
+        for neighbor_id in self.overlay.adjacency[node_id]:
+            self.lattice_connections.discard(frozenset((node_id, neighbor_id)))
+
+        num_nodes = len(self.ring)
+        if num_nodes <= 2 * self.half_degree + 1:
+            for i in range(num_nodes):
+                for j in range(i + 1, num_nodes):
+                    self._connect_lattice(self.ring[i], self.ring[j])
+            return
+
+        for i in range(self.half_degree):
+            self._connect_lattice(
+                self.ring[(position - 1 - i) % num_nodes],
+                self.ring[(position + self.half_degree - 1 - i) % num_nodes]
+            )
+
+    def _connect_lattice(self, node_id_1: int, node_id_2: int) -> None:
+        if self._connect(node_id_1, node_id_2):
+            self.lattice_connections.add(frozenset((node_id_1, node_id_2)))
+
+    def _disconnect_lattice(self, node_id_1: int, node_id_2: int) -> None:
+        connection = frozenset((node_id_1, node_id_2))
+        if connection in self.lattice_connections:
+            self.lattice_connections.discard(connection)
+            self._disconnect(node_id_1, node_id_2)
@@ -0,0 +1,400 @@
+import random
+
+from abc import ABC, abstractmethod
+from collections import deque
+
+from network_manager.topology.connectivity_index import ConnectivityIndex
+
+"""
+TopologyGenerator
+
+Abstract class used to define generated overlay topologies. A generator
+owns the overlay graph of the nodes it places and decides which
+connections to make and drop as nodes join and leave. Every change is
+recorded, so the owner network manager can apply the net changes of a
+join, leave, or rebalance to the actual nodes.
+
+After each join or leave, the generator can rebalance the overlay. Nodes
+above the maximum degree drop connections that the overlay does not
+depend on, and shortcuts are added between far apart nodes while the
+estimated diameter is above the maximum diameter. Finding the exact
+diameter takes a search from every node, so the diameter is estimated
+with double sweep searches instead, which give a lower bound that is
+usually exact or close to it on these overlays.
+"""
+
+
+class TopologyGenerator(ABC):
+    def __init__(self, topology_config: dict = None):
+        """
+        __init__
+
+        Creates a new TopologyGenerator object
+
+        @param topology_config [dict] The generator settings. Supported keys:
+            DEGREE [int] The target degree of each node. Default is 4.
+            MAX_DEGREE [int] The maximum degree kept by rebalancing. Default is twice the target degree.
+            MAX_DIAMETER [int] The maximum diameter kept by rebalancing. Default is None, for no limit.
+            SEED [int] The seed of the generator's random number generator. Default is None.
+
+        @return [TopologyGenerator] The created TopologyGenerator
+        """
+        topology_config = {} if topology_config is None else topology_config
+
+        self.degree = topology_config.get("DEGREE", 4)
+        self.max_degree = topology_config.get("MAX_DEGREE", 2 * self.degree)
+        self.max_diameter = topology_config.get("MAX_DIAMETER", None)
+        self.random = random.Random(topology_config.get("SEED", None))
+
+        if self.degree < 2:
+            raise Exception("ERROR: Topology degree must be at least 2. Given: {}".format(self.degree))
+        if self.max_degree < self.degree:
+            raise Exception("ERROR: Topology max degree must be at least the degree. Given: {}".format(self.max_degree))
+
+        self.overlay = ConnectivityIndex()
+        self.nodes = []
+        self.node_positions = {}
+        self.added_connections = set()
+        self.removed_connections = set()
+
+    def join(self, node_id: int) -> tuple:
+        """
+        join
+
+        Places the given node in the overlay
+
+        @param node_id [int] The ID of the joining node
+
+        @return [tuple] The connections to add and the connections to remove, as lists of node ID pairs
+        """
+        if not self.overlay.has_node(node_id):
+            self.overlay.add_node(node_id)
+            self._join(node_id)
+            self.node_positions[node_id] = len(self.nodes)
+            self.nodes.append(node_id)
+        return self._take_changes()
+
+    def leave(self, node_id: int) -> tuple:
+        """
+        leave
+
+        Removes the given node from the overlay and heals the gap it leaves.
+        Raises an error if the node is the only connection of the last other node.
+
+        @param node_id [int] The ID of the leaving node
+
+        @return [tuple] The connections to add and the connections to remove, as lists of node ID pairs
+        """
+        if not self.overlay.has_node(node_id):
+            return self._take_changes()
+
+        neighbors = self.overlay.get_neighbors(node_id)
+        if (len(self.overlay.adjacency) <= 2) and (len(neighbors) > 0):
+            raise Exception("ERROR: Removing node from network would leave an orphaned node: " + str(neighbors[0]))
+
+        self._leave(node_id)
+        for neighbor_id in self.overlay.get_neighbors(node_id):
+            self._disconnect(node_id, neighbor_id)
+        self.overlay.remove_node(node_id)
+
+        # Swap the last node into the leaving node's position, so nodes can be removed in constant time
+        position = self.node_positions.pop(node_id)
+        last_node_id = self.nodes.pop()
+        if last_node_id != node_id:
+            self.nodes[position] = last_node_id
+            self.node_positions[last_node_id] = position
+
+        self._reconnect(neighbors)
+        return self._take_changes()
+
+    def rebalance(self) -> tuple:
+        """
+        rebalance
+
+        Brings the overlay back within the maximum degree and, if one is
+        set, the maximum diameter
+
+        @param None
+
+        @return [tuple] The connections to add and the connections to remove, as lists of node ID pairs
+        """
+        for node_id in list(self.overlay.adjacency.keys()):
+            self._trim_degree(node_id)
+
+        if self.max_diameter is not None:
+            for _ in range(len(self.overlay.adjacency)):
+                path = self._estimate_diameter_path()
+                if len(path) - 1 <= self.max_diameter:
+                    break
+                if not self._add_shortcut(path):
+                    break
+
+        return self._take_changes()
+
+    def get_overlay(self) -> ConnectivityIndex:
+        """
+        get_overlay
+
+        Returns the overlay graph of the nodes placed by the generator
+
+        @param None
+
+        @return [ConnectivityIndex] The overlay graph
+        """
+        return self.overlay
+
+    def estimate_diameter(self) -> int:
+        """
+        estimate_diameter
+
+        Estimates the diameter of the overlay with double sweep breadth
+        first searches. The estimate is a lower bound on the diameter, and
+        is exact for trees.
+
+        @param None
+
+        @return [int] The estimated diameter
+        """
+        return max(0, len(self._estimate_diameter_path()) - 1)
+
+    @abstractmethod
+    def _join(self, node_id: int) -> None:
+        """
+        _join
+
+        Connects the given node, which has already been added to the overlay
+
+        @param node_id [int] The ID of the joining node
+
+        @return None
+        """
+        pass
+
+    def _leave(self, node_id: int) -> None:
+        """
+        _leave
+
+        Heals the gap left by the given node before its connections are
+        dropped. Does nothing by default, in which case the neighbors of
+        the node are only reconnected if they were split apart.
+
+        @param node_id [int] The ID of the leaving node
+
+        @return None
+        """
+        pass
+
+    def _connect(self, node_id_1: int, node_id_2: int) -> bool:
+        """
+        _connect
+
+        Connects the given nodes in the overlay and records the change
+
+        @param node_id_1 [int] The ID of the node at one end of the connection
+        @param node_id_2 [int] The ID of the node at the other end of the connection
+
+        @return [bool] True if the connection was added. False if it already existed.
+        """
+        if (node_id_1 == node_id_2) or (node_id_2 in self.overlay.adjacency[node_id_1]):
+            return False
+
+        self.overlay.add_connection(node_id_1, node_id_2)
+        connection = frozenset((node_id_1, node_id_2))
+        if connection in self.removed_connections:
+            self.removed_connections.discard(connection)
+        else:
+            self.added_connections.add(connection)
+        return True
+
+    def _disconnect(self, node_id_1: int, node_id_2: int) -> bool:
+        """
+        _disconnect
+
+        Disconnects the given nodes in the overlay and records the change
+
+        @param node_id_1 [int] The ID of the node at one end of the connection
+        @param node_id_2 [int] The ID of the node at the other end of the connection
+
+        @return [bool] True if the connection was removed. False if it did not exist.
+        """
+        if node_id_2 not in self.overlay.adjacency.get(node_id_1, ()):
+            return False
+
+        self.overlay.remove_connection(node_id_1, node_id_2)
+        connection = frozenset((node_id_1, node_id_2))
+        if connection in self.added_connections:
+            self.added_connections.discard(connection)
+        else:
+            self.removed_connections.add(connection)
+        return True
+
+    def _take_changes(self) -> tuple:
+        """
+        _take_changes
+
+        Returns the net changes recorded since the last call and clears them
+
+        @param None
+
+        @return [tuple] The connections to add and the connections to remove, as lists of node ID pairs
+        """
+        added_connections = [tuple(connection) for connection in self.added_connections]
+        removed_connections = [tuple(connection) for connection in self.removed_connections]
+        self.added_connections = set()
+        self.removed_connections = set()
+        return added_connections, removed_connections
+
+    def _get_degree(self, node_id: int) -> int:
+        return len(self.overlay.adjacency[node_id])
+
+    def _random_node(self) -> int:
+        """
+        _random_node
+
+        Returns a random node that was already placed in the overlay
+
+        @param None
+
+        @return [int] The ID of the node. None if no node was placed yet.
+        """
+        if len(self.nodes) == 0:
+            return None
+        return self.nodes[self.random.randrange(len(self.nodes))]
+
+    def _reconnect(self, node_ids: list) -> None:
+        """
+        _reconnect
+
+        Connects the groups that the given nodes ended up in, so that a
+        leaving node never splits the overlay. The groups are found with a
+        breadth first search from all of the nodes at once, where two
+        groups are merged as soon as their searches meet. The search stops
+        once a single group is left, so it stays local unless the overlay
+        was actually split. Each group is joined to the next through its
+        lowest degree node.
+
+        @param node_ids [list] The IDs of the nodes that must stay connected
+
+        @return None
+        """
+        group_of = {node_id: node_id for node_id in node_ids}
+        merged_into = {node_id: node_id for node_id in node_ids}
+
+        def find_group(group_id):
+            while merged_into[group_id] != group_id:
+                merged_into[group_id] = merged_into[merged_into[group_id]]
+                group_id = merged_into[group_id]
+            return group_id
+
+        num_groups = len(merged_into)
+        nodes_to_visit = deque(merged_into.keys())
+        while (len(nodes_to_visit) > 0) and (num_groups > 1):
+            node_id = nodes_to_visit.popleft()
+            for neighbor_id in self.overlay.adjacency[node_id]:
+                if neighbor_id not in group_of:
+                    group_of[neighbor_id] = group_of[node_id]
+                    nodes_to_visit.append(neighbor_id)
+                    continue
+
+                group_id_1 = find_group(group_of[node_id])
+                group_id_2 = find_group(group_of[neighbor_id])
+                if group_id_1 != group_id_2:
+                    merged_into[group_id_2] = group_id_1
+                    num_groups -= 1
+
+        groups = {}
+        for node_id in merged_into.keys():
+            groups.setdefault(find_group(node_id), []).append(node_id)
+
+        groups = list(groups.values())
+        for i in range(1, len(groups)):
+            self._connect(min(groups[i - 1], key=self._get_degree), min(groups[i], key=self._get_degree))
+
+    def _trim_degree(self, node_id: int) -> None:
+        """
+        _trim_degree
+
+        Drops connections of the given node while it is above the maximum
+        degree. Connections to the highest degree neighbors are dropped
+        first, as long as the neighbor keeps the target degree and the
+        connection is not a bridge.
+
+        @param node_id [int] The ID of the node to trim
+
+        @return None
+        """
+        if self._get_degree(node_id) <= self.max_degree:
+            return
+
+        for neighbor_id in sorted(self.overlay.get_neighbors(node_id), key=self._get_degree, reverse=True):
+            if self._get_degree(node_id) <= self.max_degree:
+                return
+            if (self._get_degree(neighbor_id) > self.degree) and (not self.overlay.is_bridge(node_id, neighbor_id)):
+                self._disconnect(node_id, neighbor_id)
+
+    def _estimate_diameter_path(self, num_sweeps: int = 4) -> list:
+        """
+        _estimate_diameter_path
+
+        Finds a longest shortest path in the overlay with double sweep
+        breadth first searches from random nodes. The longest path found
+        by any of the sweeps is returned.
+
+        @param num_sweeps [int] The number of double sweeps to run
+
+        @return [list] The IDs of the nodes on the path, in order. Empty if the overlay is empty.
+        """
+        longest_path = []
+        for _ in range(num_sweeps if len(self.nodes) > 0 else 0):
+            farthest_id, _ = self._breadth_first_search(self._random_node())
+            end_id, parents = self._breadth_first_search(farthest_id)
+
+            path = [end_id]
+            while parents[path[-1]] is not None:
+                path.append(parents[path[-1]])
+            if len(path) > len(longest_path):
+                longest_path = path
+        return longest_path
+
+    def _breadth_first_search(self, start_id: int) -> tuple:
+        """
+        _breadth_first_search
+
+        Runs a breadth first search of the overlay from the given node
+
+        @param start_id [int] The ID of the node to start from
+
+        @return [tuple] The ID of the last node reached and the parent of every reached node
+        """
+        parents = {start_id: None}
+        nodes_to_visit = deque([start_id])
+        node_id = start_id
+        while len(nodes_to_visit) > 0:
+            node_id = nodes_to_visit.popleft()
+            for neighbor_id in self.overlay.adjacency[node_id]:
+                if neighbor_id not in parents:
+                    parents[neighbor_id] = node_id
+                    nodes_to_visit.append(neighbor_id)
+        return node_id, parents
+
+    def _add_shortcut(self, path: list) -> bool:
+        """
+        _add_shortcut
+
+        Adds a shortcut between the two halves of the given path. At each
+        end, the node closest to the end of the path that is still below
+        the maximum degree is used.
+
+        @param path [list] The IDs of the nodes on the path, in order
+
+        @return [bool] True if a shortcut was added. False otherwise.
+        """
+        half_len = len(path) // 2
+        node_id_1 = next((node_id for node_id in path[:half_len] if self._get_degree(node_id) < self.max_degree), None)
+        node_id_2 = next(
+            (node_id for node_id in reversed(path[half_len:]) if self._get_degree(node_id) < self.max_degree),
+            None
+        )
+        if (node_id_1 is None) or (node_id_2 is None):
+            return False
+        return self._connect(node_id_1, node_id_2)
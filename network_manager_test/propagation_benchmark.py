@@ -0,0 +1,530 @@
+import argparse
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import random
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+from network_manager.network_connectivity_level import NetworkConnectivityLevel
+from network_manager.network_manager import NetworkManager
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.network_node_idle_listener_interface import NetworkNodeIdleListenerInterface
+from network_manager.network_node.node_runtime.simulated_node_runtime import SimulatedNodeRuntime
+
+"""
+PropagationBenchmark
+
+Benchmark suite for the propagation strategies. Every combination of
+the given strategies, topologies, node counts and message rates is run
+as its own configuration: a network of nodes is built with a
+NetworkManager, then broadcasts are sent from the nodes in turn at the
+given rate. Each configuration records:
+    LATENCY_*_SEC: Percentiles of the time from a broadcast being sent to each node handling it
+    DELIVERY_RATIO: The share of the expected deliveries that happened
+    DUPLICATE_RATIO: The share of received copies that were ignored as already seen
+    MSGS_PER_BROADCAST: The messages sent by every node, divided by the number of broadcasts
+    CPU_TIME_SEC: The CPU time used while the broadcasts were propagated
+
+Configurations run in parallel in a process pool. Nodes run on the
+SimulatedNodeRuntime by default, over ModeledMessageChannel links, so
+latencies are measured on the virtual clock and repeated runs with the
+same seed give the same results (apart from CPU time).
+
+The results are written as JSON and can be compared against a stored
+baseline. A metric regresses when it gets worse than the baseline by
+more than its threshold, relative to the baseline value (or by more than
+the threshold itself if the baseline value is 0).
+
+Usage:
+    python -m network_manager_test.propagation_benchmark --num-nodes 16 64 --output results.json
+    python -m network_manager_test.propagation_benchmark --baseline results.json --threshold LATENCY_P99_SEC=0.2
+"""
+
+DEFAULT_STRATEGIES = ["NaivePropagation", "SmartPropagation", "GossipPropagation", "TreePropagation"]
+DEFAULT_TOPOLOGIES = ["PARTIALLY_CONNECTED", "K_REGULAR", "SMALL_WORLD"]
+DEFAULT_LINK_MODEL = {"LATENCY_SEC": 0.005, "JITTER_SEC": 0.002, "LATENCY_DISTRIBUTION": "UNIFORM"}
+
+LATENCY_PERCENTILES = [50, 90, 99]
+
+# Whether a higher value of each metric is worse, for the metrics compared against the baseline
+METRIC_HIGHER_IS_WORSE = {
+    "LATENCY_P50_SEC": True,
+    "LATENCY_P90_SEC": True,
+    "LATENCY_P99_SEC": True,
+    "DELIVERY_RATIO": False,
+    "DUPLICATE_RATIO": True,
+    "MSGS_PER_BROADCAST": True,
+    "CPU_TIME_SEC": True
+}
+
+DEFAULT_THRESHOLDS = {
+    "LATENCY_P99_SEC": 0.1,
+    "DELIVERY_RATIO": 0.01,
+    "DUPLICATE_RATIO": 0.1,
+    "MSGS_PER_BROADCAST": 0.1,
+    "CPU_TIME_SEC": 0.5
+}
+
+BENCHMARK_MSG_TYPE = "BENCHMARK"
+
+
+class PropagationBenchmark(NetworkNodeIdleListenerInterface):
+    def __init__(self, configuration: dict):
+        """
+        __init__
+
+        Creates a new PropagationBenchmark object for a single configuration
+
+        @param configuration [dict] The configuration to run. Keys:
+            STRATEGY [str] The name of the propagation strategy
+            TOPOLOGY [str] The name of the NetworkConnectivityLevel used to connect the nodes
+            NUM_NODES [int] The number of nodes in the network
+            MESSAGE_RATE [float] The number of broadcasts sent per second
+            NUM_MESSAGES [int] The number of broadcasts to send
+            NODE_RUNTIME [str] The name of the node runtime
+            LINK_MODEL [dict] The settings of every link. None for ideal links.
+            SEED [int] The seed used for the topology and the simulation
+
+        @return [PropagationBenchmark] The created PropagationBenchmark
+        """
+        NetworkNodeIdleListenerInterface.__init__(self)
+
+        self.logger = logging.getLogger('NetworkNode')
+
+        self.configuration = configuration
+        self.network_manager = None
+        self.network_nodes = []
+
+        self.send_times = {}
+        self.receive_times = []
+
+    @classmethod
+    def get_configurations(
+            cls,
+            strategies: list,
+            topologies: list,
+            node_counts: list,
+            message_rates: list,
+            settings: dict
+            ) -> list:
+        """
+        get_configurations
+
+        Returns every combination of the given strategies, topologies, node counts and message rates
+
+        @param strategies [list] The names of the propagation strategies
+        @param topologies [list] The names of the topologies
+        @param node_counts [list] The numbers of nodes
+        @param message_rates [list] The numbers of broadcasts sent per second
+        @param settings [dict] The NUM_MESSAGES, NODE_RUNTIME, LINK_MODEL and SEED shared by every configuration
+
+        @return [list] The configurations, as dicts
+        """
+        configurations = []
+        for strategy, topology, num_nodes, message_rate in itertools.product(
+                strategies, topologies, node_counts, message_rates):
+            configuration = {
+                "STRATEGY": strategy,
+                "TOPOLOGY": topology,
+                "NUM_NODES": num_nodes,
+                "MESSAGE_RATE": message_rate
+            }
+            configuration.update(settings)
+            configurations.append(configuration)
+        return configurations
+
+    @classmethod
+    def get_configuration_key(cls, configuration: dict) -> str:
+        """
+        get_configuration_key
+
+        Returns the key used to match the results of a configuration with its baseline
+
+        @param configuration [dict] The configuration
+
+        @return [str] The key of the configuration
+        """
+        return "{}/{}/{}/{}".format(
+            configuration["STRATEGY"],
+            configuration["TOPOLOGY"],
+            configuration["NUM_NODES"],
+            configuration["MESSAGE_RATE"]
+        )
+
+    @classmethod
+    def run_configuration(cls, configuration: dict) -> dict:
+        """
+        run_configuration
+
+        Runs the given configuration and returns its results. Used as the
+        task of each configuration in the process pool.
+
+        @param configuration [dict] The configuration to run
+
+        @return [dict] The configuration and the metrics it recorded
+        """
+        return {"CONFIGURATION": configuration, "METRICS": cls(configuration).run()}
+
+    @classmethod
+    def run_configurations(cls, configurations: list, num_workers: int = None) -> list:
+        """
+        run_configurations
+
+        Runs the given configurations, in parallel in a process pool if more than one worker is used
+
+        @param configurations [list] The configurations to run
+        @param num_workers [int] The number of worker processes. None to use one per CPU.
+
+        @return [list] The results of the configurations, in the given order
+        """
+        if num_workers == 1:
+            return [cls.run_configuration(configuration) for configuration in configurations]
+
+        # Workers are spawned rather than forked, since forking a process with running node threads can deadlock
+        with ProcessPoolExecutor(max_workers=num_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            return list(executor.map(cls.run_configuration, configurations))
+
+    @classmethod
+    def compare_to_baseline(cls, results: list, baseline: list, thresholds: dict) -> list:
+        """
+        compare_to_baseline
+
+        Compares the given results to the results of a baseline run.
+        Configurations missing from the baseline are skipped.
+
+        @param results [list] The results of the current run
+        @param baseline [list] The results of the baseline run
+        @param thresholds [dict] The allowed relative change of each metric, by metric name
+
+        @return [list] The regressions, as dicts with the CONFIGURATION, METRIC, BASELINE, VALUE and THRESHOLD
+        """
+        baseline_metrics = {
+            cls.get_configuration_key(result["CONFIGURATION"]): result["METRICS"] for result in baseline
+        }
+
+        regressions = []
+        for result in results:
+            configuration_key = cls.get_configuration_key(result["CONFIGURATION"])
+            if configuration_key not in baseline_metrics:
+                continue
+
+            for metric, threshold in thresholds.items():
+                baseline_value = baseline_metrics[configuration_key].get(metric)
+                value = result["METRICS"].get(metric)
+                if (baseline_value is None) or (value is None):
+                    continue
+
+                change = (value - baseline_value) if METRIC_HIGHER_IS_WORSE[metric] else (baseline_value - value)
+                if change > threshold * (abs(baseline_value) if baseline_value != 0 else 1):
+                    regressions.append({
+                        "CONFIGURATION": configuration_key,
+                        "METRIC": metric,
+                        "BASELINE": baseline_value,
+                        "VALUE": value,
+                        "THRESHOLD": threshold
+                    })
+        return regressions
+
+    def run(self) -> dict:
+        """
+        run
+
+        Builds the network of the configuration, sends its broadcasts and
+        returns the recorded metrics. The nodes are torn down afterwards.
+
+        @param None
+
+        @return [dict] The recorded metrics
+        """
+        random.seed(self.configuration["SEED"])
+        try:
+            self._initialize_network()
+
+            start_snapshot = self._get_counters()
+            start_cpu_time = time.process_time()
+            start_wall_time = time.time()
+
+            self._run_traffic()
+
+            cpu_time = time.process_time() - start_cpu_time
+            wall_time = time.time() - start_wall_time
+            end_snapshot = self._get_counters()
+        finally:
+            for node in self.network_nodes:
+                node.teardown()
+
+        return self._get_metrics(end_snapshot["SENT"] - start_snapshot["SENT"],
+                                 end_snapshot["IGNORED"] - start_snapshot["IGNORED"],
+                                 cpu_time,
+                                 wall_time)
+
+    def _is_simulated(self) -> bool:
+        return self.configuration["NODE_RUNTIME"] == "SimulatedNodeRuntime"
+
+    def _initialize_network(self) -> None:
+        """
+        _initialize_network
+
+        Creates the nodes of the configuration and connects them with a
+        NetworkManager. Every node records when it handles a broadcast.
+
+        @param None
+
+        @return None
+        """
+        node_config = {
+            "propagation_strategy": self.configuration["STRATEGY"],
+            "node_runtime": self.configuration["NODE_RUNTIME"],
+            "message_channel": "ModeledMessageChannel",
+            "link_model": self.configuration["LINK_MODEL"],
+            "simulation_seed": self.configuration["SEED"]
+        }
+
+        self.network_nodes = []
+        for _ in range(self.configuration["NUM_NODES"]):
+            new_node = NetworkNode(additional_config_dict=node_config)
+            new_node.assign_msg_handler(BENCHMARK_MSG_TYPE, self._create_delivery_handler(new_node))
+            new_node.add_idle_listener(self)
+            self.network_nodes.append(new_node)
+
+        topology = NetworkConnectivityLevel[self.configuration["TOPOLOGY"]]
+        self.network_manager = NetworkManager(topology, {"SEED": self.configuration["SEED"]})
+        self.network_manager.add_network_nodes(self.network_nodes)
+
+        self._wait_until_idle()
+
+    def _create_delivery_handler(self, network_node: NetworkNode) -> object:
+        """
+        _create_delivery_handler
+
+        Creates the handler recording when the given node handles each broadcast. The
+        latencies are worked out afterwards, since a broadcast can be handled
+        before its send time is recorded when nodes run on their own threads.
+
+        @param network_node [NetworkNode] The node the handler is for
+
+        @return [Method] The handler
+        """
+        def handle_benchmark_message(message):
+            self.receive_times.append((message.get_id(), network_node.get_time()))
+        return handle_benchmark_message
+
+    def _send_broadcast(self, network_node: NetworkNode) -> None:
+        """
+        _send_broadcast
+
+        Sends a broadcast from the given node and records when it was sent
+
+        @param network_node [NetworkNode] The node sending the broadcast
+
+        @return None
+        """
+        send_time = network_node.get_time()
+        msg_id = network_node.send_propagation_message(BENCHMARK_MSG_TYPE, {})
+        self.send_times[msg_id] = send_time
+
+    def _run_traffic(self) -> None:
+        """
+        _run_traffic
+
+        Sends the broadcasts of the configuration from the nodes in turn,
+        at the configured rate, and waits until they are propagated
+
+        @param None
+
+        @return None
+        """
+        interval = 1.0 / self.configuration["MESSAGE_RATE"]
+        num_nodes = len(self.network_nodes)
+
+        if self._is_simulated():
+            simulator = SimulatedNodeRuntime.get_simulator()
+            for i in range(self.configuration["NUM_MESSAGES"]):
+                simulator.schedule(i * interval, self._send_broadcast, self.network_nodes[i % num_nodes])
+        else:
+            start_time = time.time()
+            for i in range(self.configuration["NUM_MESSAGES"]):
+                time.sleep(max(0, start_time + i * interval - time.time()))
+                self._send_broadcast(self.network_nodes[i % num_nodes])
+
+        self._wait_until_idle()
+
+    def _wait_until_idle(self) -> None:
+        """
+        _wait_until_idle
+
+        Waits until every node is idle. Simulations are run until no events are left.
+
+        @param None
+
+        @return None
+        """
+        if self._is_simulated():
+            SimulatedNodeRuntime.get_simulator().run()
+        else:
+            self.wait_for_idle_network(60)
+
+    def _get_counters(self) -> dict:
+        """
+        _get_counters
+
+        Returns the total number of messages sent and ignored by the nodes
+
+        @param None
+
+        @return [dict] The SENT and IGNORED message counts
+        """
+        return {
+            "SENT": sum(node.get_num_sent_msgs() for node in self.network_nodes),
+            "IGNORED": sum(node.get_num_ignored_msgs() for node in self.network_nodes)
+        }
+
+    def _get_metrics(self, num_sent_msgs: int, num_ignored_msgs: int, cpu_time: float, wall_time: float) -> dict:
+        """
+        _get_metrics
+
+        Summarizes the recorded latencies and message counts
+
+        @param num_sent_msgs [int] The number of messages sent while the broadcasts were propagated
+        @param num_ignored_msgs [int] The number of messages ignored while the broadcasts were propagated
+        @param cpu_time [float] The CPU time used while the broadcasts were propagated
+        @param wall_time [float] The wall time taken while the broadcasts were propagated
+
+        @return [dict] The metrics
+        """
+        num_broadcasts = len(self.send_times)
+        num_deliveries = len(self.receive_times)
+        num_expected_deliveries = num_broadcasts * (len(self.network_nodes) - 1)
+        latencies = sorted(receive_time - self.send_times[msg_id] for msg_id, receive_time in self.receive_times)
+
+        metrics = {
+            "NUM_BROADCASTS": num_broadcasts,
+            "NUM_DELIVERIES": num_deliveries,
+            "DELIVERY_RATIO": num_deliveries / num_expected_deliveries if num_expected_deliveries > 0 else None,
+            "DUPLICATE_RATIO": num_ignored_msgs / (num_ignored_msgs + num_deliveries) if num_deliveries > 0 else None,
+            "MSGS_PER_BROADCAST": num_sent_msgs / num_broadcasts if num_broadcasts > 0 else None,
+            "CPU_TIME_SEC": cpu_time,
+            "WALL_TIME_SEC": wall_time
+        }
+        for percentile in LATENCY_PERCENTILES:
+            metrics["LATENCY_P{}_SEC".format(percentile)] = self._get_percentile(latencies, percentile)
+        metrics["LATENCY_MAX_SEC"] = latencies[-1] if len(latencies) > 0 else None
+        return metrics
+
+    def _get_percentile(self, sorted_values: list, percentile: float) -> float:
+        """
+        _get_percentile
+
+        Returns the given nearest rank percentile of the given values
+
+        @param sorted_values [list] The values, sorted in ascending order
+        @param percentile [float] The percentile, from 0 to 100
+
+        @return [float] The percentile. None if there are no values.
+        """
+        if len(sorted_values) == 0:
+            return None
+        return sorted_values[max(0, math.ceil(percentile / 100 * len(sorted_values)) - 1)]
+
+
+def parse_thresholds(threshold_args: list) -> dict:
+    """
+    parse_thresholds
+
+    Parses METRIC=VALUE threshold arguments, on top of the default thresholds
+
+    @param threshold_args [list] The threshold arguments
+
+    @return [dict] The threshold of each metric, by metric name
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for threshold_arg in threshold_args:
+        metric, _, value = threshold_arg.partition("=")
+        if metric not in METRIC_HIGHER_IS_WORSE:
+            raise Exception("ERROR: Unknown benchmark metric: {}. Supported metrics: {}".format(
+                metric,
+                list(METRIC_HIGHER_IS_WORSE.keys())
+            ))
+        thresholds[metric] = float(value)
+    return thresholds
+
+
+def main(argv: list = None) -> int:
+    """
+    main
+
+    Runs the benchmark suite from the command line
+
+    @param argv [list] The command line arguments. None to use sys.argv.
+
+    @return [int] The exit code. 1 if any metric regressed against the baseline, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks the propagation strategies of network nodes.")
+    parser.add_argument("--strategies", nargs="+", default=DEFAULT_STRATEGIES)
+    parser.add_argument("--topologies", nargs="+", default=DEFAULT_TOPOLOGIES,
+                        choices=[level.name for level in NetworkConnectivityLevel])
+    parser.add_argument("--num-nodes", nargs="+", type=int, default=[16, 64])
+    parser.add_argument("--message-rates", nargs="+", type=float, default=[10.0, 100.0],
+                        help="Broadcasts sent per second")
+    parser.add_argument("--num-messages", type=int, default=20, help="Broadcasts sent by each configuration")
+    parser.add_argument("--node-runtime", default="SimulatedNodeRuntime")
+    parser.add_argument("--link-model", type=json.loads, default=DEFAULT_LINK_MODEL,
+                        help="JSON link settings, as described in LinkModel. null for ideal links.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes. Default is one per CPU.")
+    parser.add_argument("--output", help="Path to write the JSON results to. Printed if not given.")
+    parser.add_argument("--baseline", help="Path of the JSON results to compare against")
+    parser.add_argument("--threshold", action="append", default=[], metavar="METRIC=VALUE",
+                        help="Allowed relative regression of a metric. Can be given more than once.")
+    args = parser.parse_args(argv)
+
+    thresholds = parse_thresholds(args.threshold)
+    settings = {
+        "NUM_MESSAGES": args.num_messages,
+        "NODE_RUNTIME": args.node_runtime,
+        "LINK_MODEL": args.link_model,
+        "SEED": args.seed
+    }
+    configurations = PropagationBenchmark.get_configurations(
+        args.strategies,
+        args.topologies,
+        args.num_nodes,
+        args.message_rates,
+        settings
+    )
+
+    results = PropagationBenchmark.run_configurations(configurations, args.workers)
+
+    results_json = json.dumps({"RESULTS": results}, indent=4)
+    if args.output is None:
+        print(results_json)
+    else:
+        with open(args.output, "w") as results_file:
+            results_file.write(results_json)
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)["RESULTS"]
+
+    regressions = PropagationBenchmark.compare_to_baseline(results, baseline, thresholds)
+    for regression in regressions:
+        print("REGRESSION: {} {}: {} -> {} (threshold {})".format(
+            regression["CONFIGURATION"],
+            regression["METRIC"],
+            regression["BASELINE"],
+            regression["VALUE"],
+            regression["THRESHOLD"]
+        ), file=sys.stderr)
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
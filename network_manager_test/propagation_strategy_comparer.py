@@ -24,7 +24,8 @@ class PropagationStrategyComparer(NetworkNodeIdleListenerInterface):
         num_nodes: int,
         connectivity_percentage: int,
         num_messages: int,
-        propagation_strategy: PropagationStrategy
+        propagation_strategy: PropagationStrategy,
+        additional_config_dict: dict = None
     ):
         """
         __init__
@@ -38,6 +39,7 @@ class PropagationStrategyComparer(NetworkNodeIdleListenerInterface):
             100% = Every node is connected to every other node in the network
         @param num_messages [int] The number of messages to propagate throughout the network
         @param propagation_strategy [PropagationStrategy] The propagate strategy to use
+        @param additional_config_dict [dict] Additional config information for the nodes
 
         @return [PropagationStrategyComparer] The newly created PropagationStrategyComparer
         """
@@ -49,6 +51,7 @@ class PropagationStrategyComparer(NetworkNodeIdleListenerInterface):
         self.connectivity_percentage = connectivity_percentage
         self.num_messages = num_messages
         self.propagation_strategy = propagation_strategy
+        self.additional_config_dict = additional_config_dict
 
         self.network_nodes = []
 
@@ -120,7 +123,10 @@ class PropagationStrategyComparer(NetworkNodeIdleListenerInterface):
         self.network_nodes = []
 
         for _ in range(self.num_nodes):
-            new_node = NetworkNode(additional_config_dict={"propagation_strategy": self.propagation_strategy})
+            config = {"propagation_strategy": self.propagation_strategy}
+            if self.additional_config_dict is not None:
+                config.update(self.additional_config_dict)
+            new_node = NetworkNode(additional_config_dict=config)
             self.network_nodes.append(new_node)
             new_node.add_idle_listener(self)
 
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.async_network_node import AsyncNetworkNode
+
+
+class TestAsyncNetworkNode(NetworkNodeTestClass):
+    def test_subscription_will_receive_directed_messages(self):
+        test_network_node_1 = self.create_network_node(NetworkNode)
+        test_network_node_2 = self.create_network_node(NetworkNode)
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        self.wait_for_idle_network()
+
+        async def run_test():
+            async_node_1 = AsyncNetworkNode(test_network_node_1)
+            async_node_2 = AsyncNetworkNode(test_network_node_2)
+
+            received_values = []
+            async with async_node_2.subscribe("TEST") as subscription:
+                for i in range(10):
+                    await async_node_1.send_directed(async_node_2.get_id(), "TEST", {"VALUE": i})
+
+                async for message in subscription:
+                    received_values.append(message.get_message_payload()["VALUE"])
+                    if len(received_values) == 10:
+                        break
+
+            return received_values
+
+        self.assertEqual(list(range(10)), sorted(asyncio.run(asyncio.wait_for(run_test(), 10))))
+
+    def test_subscription_will_receive_propagated_messages(self):
+        test_network_node_1 = self.create_network_node(NetworkNode)
+        test_network_node_2 = self.create_network_node(NetworkNode)
+        test_network_node_3 = self.create_network_node(NetworkNode)
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+        test_network_node_2.connect_to_network_node(test_network_node_3)
+
+        self.wait_for_idle_network()
+
+        async def run_test():
+            async_node_1 = AsyncNetworkNode(test_network_node_1)
+            async_node_3 = AsyncNetworkNode(test_network_node_3)
+
+            async with async_node_3.subscribe("TEST") as subscription:
+                msg_id = await async_node_1.send_propagation("TEST", {})
+                message = await subscription.__anext__()
+
+            return (msg_id, message.get_id())
+
+        msg_id, received_msg_id = asyncio.run(asyncio.wait_for(run_test(), 10))
+        self.assertEqual(msg_id, received_msg_id)
+
+    def test_closing_a_subscription_will_end_iteration(self):
+        test_network_node = self.create_network_node(NetworkNode)
+
+        async def run_test():
+            subscription = AsyncNetworkNode(test_network_node).subscribe("TEST")
+            subscription.close()
+            return [message async for message in subscription]
+
+        self.assertEqual([], asyncio.run(asyncio.wait_for(run_test(), 10)))
+        self.assertEqual([], test_network_node.msg_handler_dict["TEST"])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,208 @@
+import logging
+import unittest
+
+import numpy as np
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.network_node_message_types import NetworkNodeMessageTypes
+from network_manager.network_node.message_channel.tcp_message_channel import TcpMessageChannel
+from network_manager.network_node.message_serializer.binary_message_serializer import BinaryMessageSerializer
+from network_manager.network_node.message_serializer.encoded_payload import EncodedPayload
+from network_manager.network_node.message_serializer.payload_compressor import PayloadCompressor
+from network_manager.network_node.message_wrapper.local_message_wrapper import LocalMessageWrapper
+from network_manager.network_node.message_wrapper.message_batch_wrapper import MessageBatchWrapper
+from network_manager.network_node.message_tracking.seen_digest import SeenDigest
+from network_manager.network_node.message_queue.message_priority import MessagePriority
+
+
+class TestBinaryMessageSerializer(NetworkNodeTestClass):
+    def encode_and_decode(self, message, compressor=None):
+        buffers = BinaryMessageSerializer.encode_message(message, TcpMessageChannel, compressor)
+        frame = bytearray(b"".join(bytes(buffer) for buffer in buffers))
+        return BinaryMessageSerializer.decode_message(frame, TcpMessageChannel)
+
+    def test_message_fields_will_survive_encoding(self):
+        test_message = LocalMessageWrapper((123, 4), 5, 6, "TEST", {"VALUE": [1, 2, 3]}, True)
+
+        decoded_message = self.encode_and_decode(test_message)
+
+        self.assertEqual((123, 4), decoded_message.get_id())
+        self.assertEqual(5, decoded_message.get_sender_id())
+        self.assertEqual(6, decoded_message.get_target_node_id())
+        self.assertEqual("TEST", decoded_message.get_message_type())
+        self.assertTrue(decoded_message.get_propagation_flag())
+        self.assertEqual({"VALUE": [1, 2, 3]}, decoded_message.get_message_payload())
+
+        test_message = LocalMessageWrapper((1, 1), 2, 3, NetworkNodeMessageTypes.BOT_TEARDOWN, {"BOT_ID": 2}, False)
+
+        decoded_message = self.encode_and_decode(test_message)
+
+        self.assertEqual(NetworkNodeMessageTypes.BOT_TEARDOWN, decoded_message.get_message_type())
+        self.assertFalse(decoded_message.get_propagation_flag())
+
+    def test_seen_digest_will_survive_encoding(self):
+        test_message = LocalMessageWrapper((1, 1), 2, 3, "TEST", {}, True)
+
+        self.assertIsNone(self.encode_and_decode(test_message).get_seen_digest())
+
+        test_message.set_seen_digest(SeenDigest([2, 3, 140000000000000]))
+
+        decoded_message = self.encode_and_decode(test_message)
+
+        self.assertEqual(frozenset([2, 3, 140000000000000]), decoded_message.get_seen_digest().get_node_ids())
+        self.assertEqual({}, decoded_message.get_message_payload())
+
+    def test_hops_left_will_survive_encoding(self):
+        test_message = LocalMessageWrapper((1, 1), 2, 3, "TEST", {}, True)
+
+        self.assertIsNone(self.encode_and_decode(test_message).get_hops_left())
+
+        test_message.set_hops_left(0)
+        self.assertEqual(0, self.encode_and_decode(test_message).get_hops_left())
+
+        test_message.set_hops_left(3)
+        self.assertEqual(3, self.encode_and_decode(test_message).get_hops_left())
+
+    def test_topic_routed_flag_will_survive_encoding(self):
+        test_message = LocalMessageWrapper((1, 1), 2, 3, "TEST", {}, True)
+
+        self.assertFalse(self.encode_and_decode(test_message).is_topic_routed())
+
+        test_message.set_topic_routed(True)
+        self.assertTrue(self.encode_and_decode(test_message).is_topic_routed())
+
+    def test_priority_will_survive_encoding(self):
+        test_message = LocalMessageWrapper((1, 1), 2, 3, "TEST", {}, True)
+
+        self.assertIsNone(self.encode_and_decode(test_message).get_priority())
+
+        test_message.set_priority(MessagePriority.BULK)
+        self.assertEqual(MessagePriority.BULK, self.encode_and_decode(test_message).get_priority())
+
+    def test_arrays_and_bytes_will_be_sent_as_out_of_band_buffers(self):
+        test_array = np.arange(10000, dtype=np.float64)
+        test_bytes = b"x" * 10000
+        test_message = LocalMessageWrapper((1, 1), 2, 3, "TEST", {"ARRAY": test_array, "BYTES": test_bytes}, False)
+
+        buffers = BinaryMessageSerializer.encode_message(test_message, TcpMessageChannel)
+
+        self.assertTrue(any(np.shares_memory(np.frombuffer(buffer, dtype=np.uint8), test_array) for buffer in buffers))
+        self.assertLess(len(buffers[1]), 1000)
+
+        decoded_payload = self.encode_and_decode(test_message).get_message_payload()
+
+        np.testing.assert_array_equal(test_array, decoded_payload["ARRAY"])
+        self.assertEqual(test_bytes, decoded_payload["BYTES"])
+
+    def test_payload_will_only_be_decoded_when_requested(self):
+        test_message = LocalMessageWrapper((1, 1), 2, 3, "TEST", {"ARRAY": np.ones(1000)}, True)
+
+        decoded_message = self.encode_and_decode(test_message)
+        encoded_payload = decoded_message.get_raw_payload()
+
+        self.assertIsInstance(encoded_payload, EncodedPayload)
+        self.assertFalse(encoded_payload.is_decoded)
+
+        relayed_message = LocalMessageWrapper((1, 1), 3, 4, "TEST", encoded_payload, True)
+        relayed_buffers = BinaryMessageSerializer.encode_message(relayed_message, TcpMessageChannel)
+
+        self.assertFalse(encoded_payload.is_decoded)
+        self.assertIs(encoded_payload.data, relayed_buffers[1])
+
+        np.testing.assert_array_equal(np.ones(1000), decoded_message.get_message_payload()["ARRAY"])
+        self.assertTrue(encoded_payload.is_decoded)
+
+    def test_message_batches_will_survive_encoding(self):
+        test_messages = [
+            LocalMessageWrapper((1, i), 2, 3, "TEST", {"VALUE": i}, False)
+            for i in range(5)
+        ]
+        test_batch = MessageBatchWrapper((1, 10), 2, 3, test_messages)
+
+        decoded_batch = self.encode_and_decode(test_batch)
+
+        self.assertIsInstance(decoded_batch, MessageBatchWrapper)
+        self.assertEqual((1, 10), decoded_batch.get_id())
+        self.assertEqual(
+            [{"VALUE": i} for i in range(5)],
+            [message.get_message_payload() for message in decoded_batch.get_messages()]
+        )
+
+    def test_numpy_payloads_can_be_sent_between_nodes(self):
+        additional_config_dict = {"message_channel": "TcpMessageChannel"}
+        test_network_node_1 = self.create_network_node(NetworkNode, additional_config_dict=additional_config_dict)
+        test_network_node_2 = self.create_network_node(NetworkNode, additional_config_dict=additional_config_dict)
+        test_network_node_3 = self.create_network_node(NetworkNode, additional_config_dict=additional_config_dict)
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+        test_network_node_2.connect_to_network_node(test_network_node_3)
+
+        test_array = np.random.rand(100, 100)
+        msg_id = test_network_node_1.send_propagation_message("TEST", {"ARRAY": test_array})
+
+        self.wait_for_idle_network()
+
+        received_message = test_network_node_3.get_received_messages()[msg_id][2]
+        np.testing.assert_array_equal(test_array, received_message.get_message_payload()["ARRAY"])
+
+    def test_large_payloads_will_be_compressed(self):
+        test_array = np.zeros(10000, dtype=np.float64)
+        test_message = LocalMessageWrapper((1, 1), 2, 3, "TEST", {"ARRAY": test_array, "VALUE": "x" * 5000}, False)
+
+        for codec_name in ["zlib", "lzma"]:
+            test_compressor = PayloadCompressor(codec_name, 1024)
+
+            buffers = BinaryMessageSerializer.encode_message(test_message, TcpMessageChannel, test_compressor)
+            self.assertLess(sum(len(buffer) for buffer in buffers), 10000)
+
+            decoded_payload = self.encode_and_decode(test_message, test_compressor).get_message_payload()
+            np.testing.assert_array_equal(test_array, decoded_payload["ARRAY"])
+            self.assertEqual("x" * 5000, decoded_payload["VALUE"])
+
+            compression_stats = test_compressor.get_stats()
+            self.assertEqual(2, compression_stats["NUM_COMPRESSED"])
+            self.assertGreater(compression_stats["COMPRESSION_RATIO"], 10)
+
+    def test_small_and_incompressible_payloads_will_not_be_compressed(self):
+        test_compressor = PayloadCompressor("zlib", 1024)
+
+        test_message = LocalMessageWrapper((1, 1), 2, 3, "TEST", {"VALUE": "x" * 100}, False)
+        self.assertEqual({"VALUE": "x" * 100}, self.encode_and_decode(test_message, test_compressor).get_message_payload())
+
+        test_bytes = np.random.bytes(10000)
+        test_message = LocalMessageWrapper((1, 2), 2, 3, "TEST", {"BYTES": test_bytes}, False)
+        self.assertEqual(test_bytes, self.encode_and_decode(test_message, test_compressor).get_message_payload()["BYTES"])
+
+        compression_stats = test_compressor.get_stats()
+        self.assertEqual(0, compression_stats["NUM_COMPRESSED"])
+        self.assertEqual(1, compression_stats["NUM_BELOW_THRESHOLD"])
+        self.assertEqual(1, compression_stats["NUM_INCOMPRESSIBLE"])
+        self.assertIsNone(compression_stats["COMPRESSION_RATIO"])
+
+    def test_nodes_will_report_the_compression_stats_of_their_connections(self):
+        additional_config_dict = {
+            "message_channel": "TcpMessageChannel",
+            "payload_compression": "zlib",
+            "payload_compression_threshold": 1024
+        }
+        test_network_node_1 = self.create_network_node(NetworkNode, additional_config_dict=additional_config_dict)
+        test_network_node_2 = self.create_network_node(NetworkNode, additional_config_dict=additional_config_dict)
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+        self.wait_for_idle_network()
+
+        msg_id = test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {"ARRAY": np.zeros(10000)})
+        self.wait_for_idle_network()
+
+        received_message = test_network_node_2.get_received_messages()[msg_id][2]
+        np.testing.assert_array_equal(np.zeros(10000), received_message.get_message_payload()["ARRAY"])
+
+        compression_stats = test_network_node_1.get_compression_stats()[test_network_node_2.get_id()]
+        self.assertEqual(1, compression_stats["NUM_COMPRESSED"])
+        self.assertEqual({}, self.create_network_node(NetworkNode).get_compression_stats())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
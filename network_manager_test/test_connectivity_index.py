@@ -0,0 +1,97 @@
+import logging
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_manager import NetworkManager
+from network_manager.network_connectivity_level import NetworkConnectivityLevel
+from network_manager.topology.connectivity_index import ConnectivityIndex
+
+
+class TestConnectivityIndex(NetworkNodeTestClass):
+    def create_connectivity_index(self, connections):
+        test_index = ConnectivityIndex()
+        for node_id_1, node_id_2 in connections:
+            test_index.add_connection(node_id_1, node_id_2)
+        return test_index
+
+    def test_articulation_points_and_bridges_will_be_found(self):
+        # Two triangles, 1-2-3 and 4-5-6, joined by the connection 3-4, with 7 hanging off of 6
+        test_index = self.create_connectivity_index([(1, 2), (2, 3), (3, 1), (3, 4), (4, 5), (5, 6), (6, 4), (6, 7)])
+
+        self.assertEqual({3, 4, 6}, set(test_index.get_articulation_points()))
+        self.assertEqual({frozenset((3, 4)), frozenset((6, 7))}, set(frozenset(b) for b in test_index.get_bridges()))
+        self.assertTrue(test_index.is_bridge(4, 3))
+        self.assertFalse(test_index.is_bridge(1, 2))
+
+        self.assertTrue(test_index.is_removal_safe(1))
+        self.assertFalse(test_index.is_removal_safe(3))
+        self.assertEqual([7], test_index.get_orphaned_nodes(6))
+
+        split_components = test_index.get_split_components(4)
+        self.assertEqual(2, len(split_components))
+        self.assertIn({1, 2, 3}, split_components)
+        self.assertIn({5, 6, 7}, split_components)
+
+        self.assertEqual([{2, 3, 4, 5, 6, 7}], test_index.get_split_components(1))
+
+    def test_index_will_be_updated_when_connections_change(self):
+        test_index = self.create_connectivity_index([(1, 2), (2, 3), (3, 4)])
+        self.assertEqual({2, 3}, set(test_index.get_articulation_points()))
+
+        # Closing the ring leaves no node or connection the network depends on
+        test_index.add_connection(4, 1)
+        self.assertEqual([], test_index.get_articulation_points())
+        self.assertEqual([], test_index.get_bridges())
+
+        test_index.remove_connection(2, 3)
+        self.assertEqual({1, 4}, set(test_index.get_articulation_points()))
+
+        test_index.remove_node(1)
+        self.assertEqual(2, test_index.get_num_components())
+        self.assertIn({3, 4}, test_index.get_components())
+        self.assertIn({2}, test_index.get_components())
+
+    def test_index_will_handle_long_chains(self):
+        num_nodes = 5000
+        test_index = self.create_connectivity_index([(i, i + 1) for i in range(num_nodes - 1)])
+
+        self.assertEqual(num_nodes - 2, len(test_index.get_articulation_points()))
+        self.assertEqual(num_nodes - 1, len(test_index.get_bridges()))
+
+    def test_network_manager_will_refuse_a_removal_that_splits_the_network(self):
+        test_network_manager = NetworkManager(NetworkConnectivityLevel.CENTRALIZED)
+        test_network_nodes = [self.create_network_node(NetworkNode) for _ in range(5)]
+        test_network_manager.add_network_nodes(test_network_nodes)
+
+        # Attach the leaves in pairs, so removing the central node would not orphan any node
+        test_network_nodes[1].add_connections([test_network_nodes[2]])
+        test_network_nodes[3].add_connections([test_network_nodes[4]])
+        test_network_manager.rebuild_connectivity_index()
+
+        self.wait_for_idle_network()
+
+        central_node_id = test_network_manager.get_central_network_node().get_id()
+        self.assertFalse(test_network_manager.is_removal_safe(central_node_id))
+        self.assertEqual(2, len(test_network_manager.get_removal_split(central_node_id)))
+
+        with self.assertRaises(Exception) as raised_error:
+            test_network_manager.remove_network_node(central_node_id)
+
+        self.assertIn("Removing node from network would split it into 2 components", str(raised_error.exception))
+
+        self.assertTrue(test_network_manager.is_removal_safe(test_network_nodes[1].get_id()))
+        test_network_manager.remove_network_node(test_network_nodes[1].get_id())
+        self.wait_for_idle_network()
+
+        self.assertFalse(test_network_manager.get_connectivity_index().has_node(test_network_nodes[1].get_id()))
+        self.assertFalse(test_network_nodes[2].is_connected_to(test_network_nodes[1].get_id()))
+        self.assertEqual(
+            [test_network_nodes[2].get_id()],
+            test_network_manager.get_connectivity_index().get_orphaned_nodes(central_node_id)
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
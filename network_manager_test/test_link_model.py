@@ -0,0 +1,114 @@
+import logging
+import time
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.link_model.link_model import LinkModel
+from network_manager.network_node.node_runtime.simulated_node_runtime import SimulatedNodeRuntime
+
+SIMULATION_CONFIG = {
+    "node_runtime": "SimulatedNodeRuntime",
+    "message_channel": "ModeledMessageChannel"
+}
+
+
+class TestLinkModel(NetworkNodeTestClass):
+    def tearDown(self) -> None:
+        # Simulated nodes are torn down on the test thread, since the simulator is not thread safe
+        if self.test_network_nodes and (self.test_network_nodes[0].config["node_runtime"] == "SimulatedNodeRuntime"):
+            for node in self.test_network_nodes:
+                node.teardown()
+            self.test_network_nodes = []
+        super().tearDown()
+
+    def test_messages_will_queue_behind_each_other_on_a_limited_link(self):
+        test_link_model = LinkModel({"LATENCY_SEC": 1.0, "BANDWIDTH_BYTES_PER_SEC": 100})
+
+        self.assertEqual(2.0, test_link_model.get_delivery_delay(0.0, 100))
+        self.assertEqual(3.0, test_link_model.get_delivery_delay(0.0, 100))
+        self.assertEqual(1.5, test_link_model.get_delivery_delay(5.0, 50))
+
+        lossy_link_model = LinkModel({"LOSS_RATE": 1.0})
+        self.assertIsNone(lossy_link_model.get_delivery_delay(0.0))
+        self.assertEqual(0.0, lossy_link_model.get_delivery_delay(0.0, can_be_lost=False))
+        self.assertEqual(1, lossy_link_model.get_stats()["NUM_LOST"])
+
+    def test_messages_will_stay_in_order_unless_reordering_is_allowed(self):
+        link_model_config = {"LATENCY_SEC": 1.0, "JITTER_SEC": 1.0, "LATENCY_DISTRIBUTION": "UNIFORM"}
+
+        ordered_link_model = LinkModel(link_model_config)
+        delays = [ordered_link_model.get_delivery_delay(0.0) for _ in range(100)]
+        self.assertEqual(sorted(delays), delays)
+        self.assertTrue(all(1.0 <= delay <= 2.0 for delay in delays))
+
+        reordering_link_model = LinkModel(dict(link_model_config, REORDERING=True))
+        delays = [reordering_link_model.get_delivery_delay(0.0) for _ in range(100)]
+        self.assertNotEqual(sorted(delays), delays)
+
+    def test_simulated_messages_will_arrive_after_their_link_latency(self):
+        config = dict(SIMULATION_CONFIG, link_model={"LATENCY_SEC": 0.5})
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(3)]
+        test_network_nodes[0].connect_to_network_node(test_network_nodes[1])
+        test_network_nodes[0].connect_to_network_node(test_network_nodes[2])
+
+        simulator = SimulatedNodeRuntime.get_simulator()
+        simulator.run()
+        test_network_nodes[0].set_link_model(test_network_nodes[2].get_id(), {"LATENCY_SEC": 2.0})
+
+        receive_times = {}
+        for node in test_network_nodes[1:]:
+            node.assign_msg_handler("TEST", lambda message, node=node: receive_times.update({node.get_id(): node.get_time()}))
+
+        send_time = simulator.get_time()
+        test_network_nodes[0].send_propagation_message("TEST", {"DATA": 1})
+        simulator.run()
+
+        self.assertEqual(send_time + 0.5, receive_times[test_network_nodes[1].get_id()])
+        self.assertEqual(send_time + 2.0, receive_times[test_network_nodes[2].get_id()])
+
+        link_model_stats = test_network_nodes[0].get_link_model_stats()
+        self.assertEqual(2.0, link_model_stats[test_network_nodes[2].get_id()]["AVERAGE_DELAY_SEC"])
+
+    def test_simulated_network_will_go_idle_when_messages_are_lost(self):
+        config = dict(SIMULATION_CONFIG, link_model={"LATENCY_SEC": 0.01, "LOSS_RATE": 0.3})
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(20)]
+        for i in range(1, len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[i - 1])
+
+        simulator = SimulatedNodeRuntime.get_simulator()
+        simulator.run()
+        for i in range(1, len(test_network_nodes)):
+            self.assertTrue(test_network_nodes[i].is_connected_to(test_network_nodes[i - 1].get_id()))
+
+        for _ in range(10):
+            test_network_nodes[0].send_propagation_message("TEST", {"DATA": 1})
+        simulator.run()
+
+        self.assertEqual(0, simulator.get_num_pending_events())
+        self.assertTrue(all(node.is_idle() for node in test_network_nodes))
+        self.assertGreater(sum(
+            stats["NUM_LOST"] for node in test_network_nodes for stats in node.get_link_model_stats().values()
+        ), 0)
+
+    def test_threaded_messages_will_arrive_after_their_link_latency(self):
+        config = {"message_channel": "ModeledMessageChannel", "link_model": {"LATENCY_SEC": 0.2}}
+        test_network_node_1 = self.create_network_node(NetworkNode, additional_config_dict=config)
+        test_network_node_2 = self.create_network_node(NetworkNode, additional_config_dict=config)
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+        self.wait_for_idle_network()
+
+        receive_times = []
+        test_network_node_2.assign_msg_handler("TEST", lambda message: receive_times.append(time.time()))
+
+        send_time = time.time()
+        test_network_node_1.send_propagation_message("TEST", {"DATA": 1})
+        self.wait_for_idle_network()
+
+        self.assertEqual(1, len(receive_times))
+        self.assertGreaterEqual(receive_times[0] - send_time, 0.2)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
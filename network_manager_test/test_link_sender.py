@@ -0,0 +1,117 @@
+import logging
+import threading
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.flow_control.link_sender import LinkSender
+from network_manager.network_node.message_queue.message_priority import MessagePriority
+
+LINK_SENDER_CONFIG = {"link_senders": True, "link_credit_window": 4}
+
+
+class TestLinkSender(NetworkNodeTestClass):
+    def test_link_will_stop_sending_once_its_credits_run_out(self):
+        sent_msgs = []
+        send_condition = threading.Condition()
+
+        def send_method(target_id, messages):
+            with send_condition:
+                sent_msgs.extend(messages)
+                send_condition.notify_all()
+
+        test_link_sender = LinkSender(1, send_method, credit_window=2)
+        for i in range(3):
+            test_link_sender.add_message(i, MessagePriority.NORMAL)
+        test_link_sender.start()
+
+        try:
+            with send_condition:
+                self.assertTrue(send_condition.wait_for(lambda: len(sent_msgs) >= 2, timeout=5))
+            self.assertEqual([0, 1], sent_msgs)
+            self.assertTrue(test_link_sender.is_congested())
+
+            # Control messages are sent even though the link has no credits left
+            test_link_sender.add_message("CONTROL", MessagePriority.CONTROL, is_control_msg=True)
+            with send_condition:
+                self.assertTrue(send_condition.wait_for(lambda: len(sent_msgs) >= 3, timeout=5))
+            self.assertEqual([0, 1, "CONTROL"], sent_msgs)
+
+            test_link_sender.grant_credits(1)
+            with send_condition:
+                self.assertTrue(send_condition.wait_for(lambda: len(sent_msgs) >= 4, timeout=5))
+            self.assertEqual([0, 1, "CONTROL", 2], sent_msgs)
+            self.assertFalse(test_link_sender.is_congested())
+            self.assertEqual(1, test_link_sender.get_stats()["NUM_CREDIT_STALLS"])
+        finally:
+            test_link_sender.stop()
+
+    def test_slow_link_will_not_delay_messages_to_other_targets(self):
+        test_network_nodes = [
+            self.create_network_node(NetworkNode, additional_config_dict=LINK_SENDER_CONFIG) for _ in range(3)
+        ]
+        test_network_nodes[0].connect_to_network_node(test_network_nodes[1])
+        test_network_nodes[0].connect_to_network_node(test_network_nodes[2])
+
+        self.wait_for_idle_network()
+
+        release_slow_link = threading.Event()
+        slow_channel = test_network_nodes[0].get_message_channels()[test_network_nodes[1].get_id()]
+        original_send_message = slow_channel.send_message
+
+        def slow_send_message(message):
+            release_slow_link.wait(timeout=10)
+            return original_send_message(message)
+
+        slow_channel.send_message = slow_send_message
+
+        received_event = threading.Event()
+        test_network_nodes[2].assign_msg_handler("TEST", lambda message: received_event.set())
+
+        test_network_nodes[0].send_directed_message(test_network_nodes[1].get_id(), "TEST", {})
+        test_network_nodes[0].send_directed_message(test_network_nodes[2].get_id(), "TEST", {})
+
+        try:
+            self.assertTrue(received_event.wait(timeout=5))
+        finally:
+            release_slow_link.set()
+
+        self.wait_for_idle_network()
+
+    def test_messages_beyond_the_credit_window_will_be_sent_once_credits_are_returned(self):
+        test_network_node_1 = self.create_network_node(NetworkNode, additional_config_dict=LINK_SENDER_CONFIG)
+        test_network_node_2 = self.create_network_node(NetworkNode)
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        handled_msgs = []
+        test_network_node_2.assign_msg_handler("TEST", lambda message: handled_msgs.append(message.get_message_payload()))
+
+        self.wait_for_idle_network()
+
+        for i in range(50):
+            test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {"NUM": i})
+
+        self.wait_for_idle_network()
+
+        self.assertEqual(50, len(handled_msgs))
+        link_stats = test_network_node_1.get_link_stats()[test_network_node_2.get_id()]
+        self.assertEqual(0, link_stats["DEPTH"])
+        self.assertLessEqual(link_stats["IN_FLIGHT"], 4)
+        self.assertEqual([], test_network_node_1.get_congested_links())
+
+    def test_link_senders_are_not_used_by_default(self):
+        test_network_node_1 = self.create_network_node(NetworkNode)
+        test_network_node_2 = self.create_network_node(NetworkNode)
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        self.wait_for_idle_network()
+
+        test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {})
+        self.wait_for_idle_network()
+
+        self.assertEqual({}, test_network_node_1.get_link_stats())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.message_dispatcher.message_dispatcher import MessageDispatcher
+from network_manager.network_node.message_wrapper.local_message_wrapper import LocalMessageWrapper
+
+
+class TestMessageDispatcher(NetworkNodeTestClass):
+    def setUp(self):
+        super().setUp()
+        self.test_dispatchers = []
+        self.handled_msgs = []
+        self.handled_msgs_lock = threading.Lock()
+        self.num_running_handlers = 0
+        self.max_running_handlers = 0
+
+    def tearDown(self):
+        super().tearDown()
+        for dispatcher in self.test_dispatchers:
+            dispatcher.stop()
+
+    def create_dispatcher(self, num_workers, ordering_keys=None, handler=None, worker_idle_timeout_sec=5):
+        new_dispatcher = MessageDispatcher(
+            handler if handler is not None else self.slow_handler,
+            num_workers,
+            ordering_keys,
+            worker_idle_timeout_sec
+        )
+        self.test_dispatchers.append(new_dispatcher)
+        new_dispatcher.start()
+        return new_dispatcher
+
+    def slow_handler(self, message):
+        with self.handled_msgs_lock:
+            self.num_running_handlers += 1
+            self.max_running_handlers = max(self.max_running_handlers, self.num_running_handlers)
+        time.sleep(0.05)
+        with self.handled_msgs_lock:
+            self.num_running_handlers -= 1
+            self.handled_msgs.append(message.get_id())
+
+    def create_message(self, msg_id, payload):
+        return LocalMessageWrapper(msg_id, 0, 0, "TEST", payload, False)
+
+    def wait_for_handled_msgs(self, num_msgs, timeout_sec=10):
+        start_time = time.time()
+        while (len(self.handled_msgs) < num_msgs) and (time.time() < start_time + timeout_sec):
+            time.sleep(0.01)
+
+    def test_number_of_running_handlers_will_not_exceed_the_pool_size(self):
+        test_dispatcher = self.create_dispatcher(2)
+
+        for i in range(10):
+            test_dispatcher.dispatch(self.create_message(i, {}))
+
+        self.wait_for_handled_msgs(10)
+
+        self.assertEqual(10, len(self.handled_msgs))
+        self.assertEqual(2, self.max_running_handlers)
+
+    def test_messages_with_the_same_ordering_key_will_be_handled_in_order(self):
+        test_dispatcher = self.create_dispatcher(4, ["PATH"])
+
+        for i in range(8):
+            test_dispatcher.dispatch(self.create_message(i, {"PATH": "TEST_PATH"}))
+
+        self.wait_for_handled_msgs(8)
+
+        self.assertEqual(list(range(8)), self.handled_msgs)
+        self.assertEqual(1, self.max_running_handlers)
+
+    def test_messages_with_different_ordering_keys_will_be_handled_in_parallel(self):
+        test_dispatcher = self.create_dispatcher(4, ["PATH"])
+
+        for i in range(4):
+            test_dispatcher.dispatch(self.create_message(i, {"PATH": "TEST_PATH_" + str(i)}))
+
+        self.wait_for_handled_msgs(4)
+
+        self.assertEqual(4, len(self.handled_msgs))
+        self.assertGreater(self.max_running_handlers, 1)
+
+    def test_workers_will_only_run_while_there_are_messages_to_handle(self):
+        test_dispatcher = self.create_dispatcher(4, worker_idle_timeout_sec=0.1)
+        self.assertEqual(0, test_dispatcher.get_num_workers())
+
+        for i in range(2):
+            test_dispatcher.dispatch(self.create_message(i, {}))
+        self.assertLessEqual(test_dispatcher.get_num_workers(), 2)
+
+        self.wait_for_handled_msgs(2)
+        self.assertEqual(2, self.max_running_handlers)
+        start_time = time.time()
+        while (test_dispatcher.get_num_workers() > 0) and (time.time() < start_time + 5):
+            time.sleep(0.01)
+        self.assertEqual(0, test_dispatcher.get_num_workers())
+
+        test_dispatcher.dispatch(self.create_message(2, {}))
+        self.wait_for_handled_msgs(3)
+        self.assertEqual([0, 1, 2], sorted(self.handled_msgs))
+
+    def test_control_messages_will_be_handled_while_the_pool_is_blocked(self):
+        pool_blocked = threading.Event()
+        control_msg_handled = threading.Event()
+
+        def blocking_handler(message):
+            if message.get_message_payload()["CONTROL"]:
+                control_msg_handled.set()
+            else:
+                # Blocks the only pool worker until the control message is handled
+                pool_blocked.set()
+                control_msg_handled.wait(timeout=5)
+            with self.handled_msgs_lock:
+                self.handled_msgs.append(message.get_id())
+
+        test_dispatcher = self.create_dispatcher(1, handler=blocking_handler)
+        test_dispatcher.dispatch(self.create_message(0, {"CONTROL": False}))
+        self.assertTrue(pool_blocked.wait(timeout=5))
+        test_dispatcher.dispatch(self.create_message(1, {"CONTROL": True}), is_control_msg=True)
+
+        self.wait_for_handled_msgs(2)
+        self.assertEqual([1, 0], self.handled_msgs)
+
+    def test_node_will_run_handlers_using_the_configured_pool(self):
+        test_network_node_1 = self.create_network_node(NetworkNode)
+        test_network_node_2 = self.create_network_node(
+            NetworkNode,
+            additional_config_dict={"message_handler_pool_size": 1, "message_handler_ordering_keys": ["PATH"]}
+        )
+        test_network_node_2.assign_msg_handler("TEST", self.slow_handler)
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+        for _ in range(3):
+            test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {"PATH": "TEST_PATH"})
+
+        self.wait_for_idle_network()
+        self.wait_for_handled_msgs(3)
+
+        self.assertEqual(3, len(self.handled_msgs))
+        self.assertEqual(1, self.max_running_handlers)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
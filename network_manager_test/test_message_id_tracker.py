@@ -0,0 +1,119 @@
+import logging
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.message_tracking.message_id_tracker import MessageIdTracker, UNTRACKED_SEQ_FLAG
+
+
+class TestMessageIdTracker(NetworkNodeTestClass):
+    def test_tracker_will_detect_duplicate_message_ids(self):
+        test_tracker = MessageIdTracker(10)
+
+        self.assertTrue(test_tracker.add((1, 1)))
+        self.assertTrue(test_tracker.add((2, 1)))
+        self.assertFalse(test_tracker.add((1, 1)))
+
+        self.assertTrue(test_tracker.contains((1, 1)))
+        self.assertTrue(test_tracker.contains((2, 1)))
+        self.assertFalse(test_tracker.contains((1, 2)))
+
+    def test_tracker_will_accept_out_of_order_message_ids_within_the_window(self):
+        test_tracker = MessageIdTracker(10)
+
+        self.assertTrue(test_tracker.add((1, 3)))
+        self.assertTrue(test_tracker.add((1, 1)))
+        self.assertFalse(test_tracker.contains((1, 2)))
+        self.assertTrue(test_tracker.add((1, 2)))
+
+        self.assertEqual(3, test_tracker.high_water_marks[1])
+        self.assertEqual(0, len(test_tracker.out_of_order_windows[1]))
+
+    def test_tracker_memory_is_bounded_by_the_window_size(self):
+        window_size = 5
+        test_tracker = MessageIdTracker(window_size)
+
+        for seq_num in range(2, 1000, 2):
+            test_tracker.add((1, seq_num))
+
+        self.assertLessEqual(len(test_tracker.out_of_order_windows[1]), window_size)
+        self.assertEqual(1, test_tracker.get_num_tracked_origins())
+        self.assertTrue(test_tracker.contains((1, 998)))
+
+    def test_tracker_will_forget_gaps_older_than_the_window(self):
+        window_size = 5
+        test_tracker = MessageIdTracker(window_size)
+
+        for seq_num in range(10, 20):
+            self.assertTrue(test_tracker.add((1, seq_num)))
+
+        self.assertEqual(19, test_tracker.high_water_marks[1])
+        self.assertEqual(0, len(test_tracker.out_of_order_windows[1]))
+        self.assertTrue(test_tracker.contains((1, 3)))
+
+    def test_tracker_will_not_store_untracked_message_ids(self):
+        test_tracker = MessageIdTracker(10)
+        untracked_msg_id = (1, 5 | UNTRACKED_SEQ_FLAG)
+
+        self.assertTrue(test_tracker.add(untracked_msg_id))
+        self.assertTrue(test_tracker.add(untracked_msg_id))
+        self.assertFalse(test_tracker.contains(untracked_msg_id))
+        self.assertEqual(0, test_tracker.get_num_tracked_origins())
+
+    def test_dedup_window_will_drain_under_mixed_traffic(self):
+        config = {"link_senders": True, "message_batch_max_delay_sec": 0.01}
+        test_network_node_1 = self.create_network_node(NetworkNode, additional_config_dict=config)
+        test_network_node_2 = self.create_network_node(NetworkNode, additional_config_dict=config)
+        test_network_node_3 = self.create_network_node(NetworkNode, additional_config_dict=config)
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+        test_network_node_1.connect_to_network_node(test_network_node_3)
+        self.wait_for_idle_network()
+
+        prop_msg_ids = []
+        directed_msg_ids = []
+        for _ in range(50):
+            prop_msg_ids.append(test_network_node_1.send_propagation_message("TEST", {}))
+            directed_msg_ids.append(test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {}))
+            test_network_node_1.send_directed_message(test_network_node_3.get_id(), "TEST", {})
+        self.wait_for_idle_network()
+
+        for node in [test_network_node_2, test_network_node_3]:
+            self.assertEqual(prop_msg_ids[-1][1], node.rcvd_msg_tracker.high_water_marks[test_network_node_1.get_id()])
+            self.assertEqual(0, len(node.rcvd_msg_tracker.out_of_order_windows[test_network_node_1.get_id()]))
+            self.assertTrue(all(node.received_msg_with_id(msg_id) for msg_id in prop_msg_ids))
+        self.assertTrue(all(test_network_node_2.received_msg_with_id(msg_id) for msg_id in directed_msg_ids))
+
+    def test_message_ids_generated_by_different_nodes_are_unique(self):
+        test_network_node_1 = self.create_network_node(NetworkNode)
+        test_network_node_2 = self.create_network_node(NetworkNode)
+
+        msg_ids = set()
+        for _ in range(100):
+            msg_ids.add(test_network_node_1._generate_message_id())
+            msg_ids.add(test_network_node_2._generate_message_id())
+
+        self.assertEqual(200, len(msg_ids))
+
+    def test_message_history_will_be_bounded_by_the_configured_size(self):
+        test_network_node_1 = self.create_network_node(NetworkNode, additional_config_dict={"message_history_size": 5})
+        test_network_node_2 = self.create_network_node(NetworkNode, additional_config_dict={"message_history_size": 5})
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        msg_ids = []
+        for _ in range(20):
+            msg_ids.append(test_network_node_1.send_propagation_message("TEST", {}))
+
+        self.wait_for_idle_network()
+
+        for msg_id in msg_ids:
+            self.assertTrue(test_network_node_2.received_msg_with_id(msg_id))
+
+        self.assertEqual(5, len(test_network_node_1.get_sent_messages()))
+        self.assertEqual(5, len(test_network_node_2.get_received_messages()))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
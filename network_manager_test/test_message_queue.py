@@ -0,0 +1,158 @@
+import logging
+import threading
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.message_queue.message_queue import MessageQueue
+from network_manager.network_node.message_queue.queue_full_policy import QueueFullPolicy
+from network_manager.network_node.message_queue.message_priority import MessagePriority
+from network_manager.network_node.message_wrapper.local_message_wrapper import LocalMessageWrapper
+from network_manager.network_node.network_node_message_types import NetworkNodeMessageTypes
+
+
+class TestMessageQueue(NetworkNodeTestClass):
+    def test_items_are_returned_in_the_order_they_were_added(self):
+        test_queue = MessageQueue()
+
+        for i in range(5):
+            self.assertTrue(test_queue.put(i))
+
+        self.assertEqual([0, 1, 2, 3, 4], [test_queue.get(timeout=1) for _ in range(5)])
+        self.assertEqual(0, test_queue.get_depth())
+        self.assertEqual(5, test_queue.get_high_water_mark())
+
+    def test_full_queue_with_reject_policy_will_reject_new_items(self):
+        test_queue = MessageQueue(2, QueueFullPolicy.REJECT)
+
+        self.assertTrue(test_queue.put(1))
+        self.assertTrue(test_queue.put(2))
+        self.assertFalse(test_queue.put(3))
+
+        self.assertEqual(1, test_queue.get_stats()["NUM_REJECTED"])
+        self.assertEqual([1, 2], [test_queue.get(timeout=1) for _ in range(2)])
+
+    def test_full_queue_with_drop_oldest_policy_will_drop_the_oldest_low_priority_item(self):
+        test_queue = MessageQueue(3, QueueFullPolicy.DROP_OLDEST)
+
+        self.assertTrue(test_queue.put("CONTROL", low_priority=False))
+        self.assertTrue(test_queue.put("BULK_1"))
+        self.assertTrue(test_queue.put("BULK_2"))
+        self.assertTrue(test_queue.put("BULK_3"))
+
+        self.assertEqual(1, test_queue.get_stats()["NUM_DROPPED"])
+        self.assertEqual(["CONTROL", "BULK_2", "BULK_3"], [test_queue.get(timeout=1) for _ in range(3)])
+
+    def test_drop_listener_will_be_called_once_for_each_dropped_item(self):
+        test_queue = MessageQueue(2, QueueFullPolicy.DROP_OLDEST)
+        dropped_items = []
+        test_queue.set_drop_listener(lambda: dropped_items.append(1))
+
+        self.assertTrue(test_queue.put("CONTROL_1", low_priority=False))
+        self.assertTrue(test_queue.put("CONTROL_2", low_priority=False))
+        self.assertFalse(test_queue.put("BULK_1"))
+        self.assertEqual(0, len(dropped_items))
+        self.assertEqual(1, test_queue.get_stats()["NUM_REJECTED"])
+
+        self.assertEqual("CONTROL_1", test_queue.get(timeout=1))
+        self.assertTrue(test_queue.put("BULK_2"))
+        self.assertTrue(test_queue.put("BULK_3"))
+        self.assertTrue(test_queue.put("BULK_4"))
+        self.assertEqual(test_queue.get_stats()["NUM_DROPPED"], len(dropped_items))
+        self.assertEqual(["CONTROL_2", "BULK_4"], [test_queue.get(timeout=1) for _ in range(2)])
+
+    def test_full_queue_with_block_policy_will_block_until_space_is_available(self):
+        test_queue = MessageQueue(1, QueueFullPolicy.BLOCK)
+        test_queue.put(1)
+
+        put_thread = threading.Thread(target=test_queue.put, args=(2,))
+        put_thread.start()
+        put_thread.join(timeout=0.5)
+        self.assertTrue(put_thread.is_alive())
+
+        self.assertEqual(1, test_queue.get(timeout=1))
+        put_thread.join(timeout=1)
+        self.assertFalse(put_thread.is_alive())
+        self.assertEqual(2, test_queue.get(timeout=1))
+
+    def test_closing_the_queue_will_wake_up_waiting_readers(self):
+        test_queue = MessageQueue()
+        results = []
+
+        get_thread = threading.Thread(target=lambda: results.append(test_queue.get()))
+        get_thread.start()
+        test_queue.close()
+        get_thread.join(timeout=1)
+
+        self.assertFalse(get_thread.is_alive())
+        self.assertEqual([None], results)
+
+    def test_higher_priority_items_will_overtake_lower_priority_items(self):
+        test_queue = MessageQueue()
+
+        test_queue.put("BULK", priority=MessagePriority.BULK)
+        test_queue.put("NORMAL")
+        test_queue.put("CONTROL", priority=MessagePriority.CONTROL)
+
+        self.assertEqual({"CONTROL": 1, "NORMAL": 1, "BULK": 1}, test_queue.get_stats()["LANE_DEPTHS"])
+        self.assertEqual(["CONTROL", "NORMAL", "BULK"], [test_queue.get(timeout=1) for _ in range(3)])
+
+    def test_lower_priority_items_will_not_be_starved(self):
+        test_queue = MessageQueue(starvation_limit=2)
+
+        test_queue.put("BULK", priority=MessagePriority.BULK)
+        for i in range(4):
+            test_queue.put(i, priority=MessagePriority.CONTROL)
+
+        self.assertEqual([0, 1, "BULK", 2, 3], [test_queue.get(timeout=1) for _ in range(5)])
+
+    def test_full_queue_with_drop_oldest_policy_will_drop_from_the_lowest_priority_lane_first(self):
+        test_queue = MessageQueue(2, QueueFullPolicy.DROP_OLDEST)
+
+        test_queue.put("NORMAL")
+        test_queue.put("BULK", priority=MessagePriority.BULK)
+        test_queue.put("CONTROL", priority=MessagePriority.CONTROL)
+
+        self.assertEqual(["CONTROL", "NORMAL"], [test_queue.get(timeout=1) for _ in range(2)])
+
+    def test_message_priority_will_come_from_the_send_override_then_the_message_type(self):
+        test_network_node = self.create_network_node(
+            NetworkNode,
+            additional_config_dict={"message_type_priorities": {"BULK_TEST": "BULK"}}
+        )
+
+        def create_message(message_type):
+            return LocalMessageWrapper((1, 1), 2, 3, message_type, {}, False)
+
+        self.assertEqual(MessagePriority.NORMAL, test_network_node._get_message_priority(create_message("TEST")))
+        self.assertEqual(MessagePriority.BULK, test_network_node._get_message_priority(create_message("BULK_TEST")))
+        self.assertEqual(
+            MessagePriority.CONTROL,
+            test_network_node._get_message_priority(create_message(NetworkNodeMessageTypes.BOT_TEARDOWN))
+        )
+
+        test_message = create_message("BULK_TEST")
+        test_message.set_priority(MessagePriority.CONTROL)
+        self.assertEqual(MessagePriority.CONTROL, test_network_node._get_message_priority(test_message))
+
+    def test_node_will_expose_queue_statistics(self):
+        test_network_node_1 = self.create_network_node(
+            NetworkNode,
+            additional_config_dict={"message_queue_capacity": 100, "message_queue_full_policy": "DROP_OLDEST"}
+        )
+        test_network_node_2 = self.create_network_node(NetworkNode)
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+        test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {})
+
+        self.wait_for_idle_network()
+
+        queue_stats = test_network_node_1.get_message_queue_stats()
+        self.assertEqual(100, queue_stats["OUTBOX"]["CAPACITY"])
+        self.assertEqual(0, queue_stats["OUTBOX"]["DEPTH"])
+        self.assertGreaterEqual(queue_stats["OUTBOX"]["HIGH_WATER_MARK"], 1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
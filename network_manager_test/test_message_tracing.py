@@ -0,0 +1,125 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.message_channel.modeled_message_channel import ModeledMessageChannel
+from network_manager.network_node.message_serializer.binary_message_serializer import BinaryMessageSerializer
+from network_manager.network_node.message_tracking.trace_collector import TraceCollector
+from network_manager.network_node.message_tracking.trace_event import TraceEvent
+from network_manager.network_node.node_runtime.simulated_node_runtime import SimulatedNodeRuntime
+
+TRACING_CONFIG = {
+    "node_runtime": "SimulatedNodeRuntime",
+    "message_channel": "ModeledMessageChannel",
+    "link_model": {"LATENCY_SEC": 0.1},
+    "trace_sample_rate": 1.0
+}
+
+
+class TestMessageTracing(NetworkNodeTestClass):
+    def tearDown(self) -> None:
+        # Simulated nodes are torn down on the test thread, since the simulator is not thread safe
+        for node in self.test_network_nodes:
+            node.teardown()
+        self.test_network_nodes = []
+        super().tearDown()
+
+    def create_tree_network(self, config: dict) -> list:
+        # Node i is connected to node (i - 1) // 2, so there is only one path between any two nodes
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(7)]
+        for i in range(1, len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[(i - 1) // 2])
+        SimulatedNodeRuntime.get_simulator().run()
+        return test_network_nodes
+
+    def test_propagation_tree_will_match_the_topology(self):
+        test_network_nodes = self.create_tree_network(TRACING_CONFIG)
+        for node in test_network_nodes:
+            node.assign_msg_handler("TEST", lambda message: None)
+
+        msg_id = test_network_nodes[0].send_propagation_message("TEST", {"DATA": 1})
+        SimulatedNodeRuntime.get_simulator().run()
+
+        trace_collector = TraceCollector()
+        trace_collector.collect(test_network_nodes)
+        self.assertIn(msg_id, trace_collector.get_message_ids())
+
+        node_ids = [node.get_id() for node in test_network_nodes]
+        propagation_tree = trace_collector.get_propagation_tree(msg_id)
+        self.assertEqual(node_ids[0], propagation_tree["ORIGIN"])
+        self.assertEqual(
+            {node_ids[i]: node_ids[(i - 1) // 2] for i in range(1, len(node_ids))},
+            propagation_tree["PARENTS"]
+        )
+        self.assertEqual(
+            {node_ids[i]: (i + 1).bit_length() - 1 for i in range(len(node_ids))},
+            propagation_tree["DEPTHS"]
+        )
+        self.assertEqual(0, propagation_tree["NUM_DUPLICATES"])
+
+        timeline = trace_collector.get_timeline(msg_id)
+        self.assertEqual(sorted(span["TIME"] for span in timeline), [span["TIME"] for span in timeline])
+        for node_id in node_ids[1:]:
+            node_events = [span["EVENT"] for span in timeline if span["NODE_ID"] == node_id]
+            self.assertEqual(
+                [TraceEvent.ENQUEUE, TraceEvent.DEQUEUE, TraceEvent.HANDLER_START, TraceEvent.HANDLER_END],
+                node_events
+            )
+
+        # Each hop takes the link latency
+        arrival_times = propagation_tree["ARRIVAL_TIMES"]
+        self.assertAlmostEqual(0.2, arrival_times[node_ids[3]] - arrival_times[node_ids[0]])
+
+    def test_traces_will_be_exported_in_the_chrome_format(self):
+        test_network_nodes = self.create_tree_network(TRACING_CONFIG)
+        test_network_nodes[0].send_propagation_message("TEST", {"DATA": 1})
+        SimulatedNodeRuntime.get_simulator().run()
+
+        trace_collector = TraceCollector()
+        trace_collector.collect(test_network_nodes)
+        with tempfile.TemporaryDirectory() as trace_dir:
+            trace_path = os.path.join(trace_dir, "trace.json")
+            chrome_trace = trace_collector.export_chrome_trace(trace_path)
+            with open(trace_path) as trace_file:
+                self.assertEqual(chrome_trace, json.load(trace_file))
+
+        phases = [trace_event["ph"] for trace_event in chrome_trace["traceEvents"]]
+        self.assertIn("X", phases)
+        self.assertIn("i", phases)
+        self.assertEqual(phases.count("s"), phases.count("f"))
+        self.assertGreaterEqual(phases.count("s"), len(test_network_nodes) - 1)
+        self.assertEqual(len(test_network_nodes), phases.count("M"))
+
+    def test_messages_will_not_be_traced_unless_sampled(self):
+        test_network_nodes = self.create_tree_network(dict(TRACING_CONFIG, trace_sample_rate=0.0))
+        test_network_nodes[0].send_propagation_message("TEST", {"DATA": 1})
+        SimulatedNodeRuntime.get_simulator().run()
+
+        self.assertTrue(all(len(node.get_message_traces()) == 0 for node in test_network_nodes))
+
+        with self.assertRaises(Exception):
+            self.create_network_node(NetworkNode, additional_config_dict=dict(TRACING_CONFIG, trace_sample_rate=2.0))
+
+    def test_trace_spans_will_survive_serialization(self):
+        test_network_nodes = self.create_tree_network(TRACING_CONFIG)
+        rcvd_msgs = []
+        test_network_nodes[1].assign_msg_handler("TEST", rcvd_msgs.append)
+        test_network_nodes[0].send_propagation_message("TEST", {"DATA": 1})
+        SimulatedNodeRuntime.get_simulator().run()
+
+        self.assertEqual(1, len(rcvd_msgs))
+        self.assertTrue(rcvd_msgs[0].is_traced())
+
+        encoded_message = b"".join(BinaryMessageSerializer.encode_message(rcvd_msgs[0], ModeledMessageChannel))
+        decoded_message = BinaryMessageSerializer.decode_message(memoryview(encoded_message), ModeledMessageChannel)
+        self.assertTrue(decoded_message.is_traced())
+        self.assertEqual(rcvd_msgs[0].get_trace_spans(), decoded_message.get_trace_spans())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
@@ -5,6 +5,8 @@ from network_manager_test.network_node_test_class import NetworkNodeTestClass
 from network_manager_test.propagation_strategy_comparer import PropagationStrategyComparer
 from network_manager.network_node.network_node import NetworkNode
 
+NO_SEEN_DIGEST_CONFIG = {"seen_digest_max_size": 0}
+
 
 class TestNetworkInformationPropagation(NetworkNodeTestClass):
     def test_all_nodes_in_the_network_receive_a_sent_message_when_naive_propagation_is_used_in_double_layer_network(self):
@@ -125,7 +127,13 @@ class TestNetworkInformationPropagation(NetworkNodeTestClass):
         connectivity_percentage = 100
         num_messages = 1
 
-        comparer = PropagationStrategyComparer(num_nodes, connectivity_percentage, num_messages, "NaivePropagation")
+        comparer = PropagationStrategyComparer(
+            num_nodes,
+            connectivity_percentage,
+            num_messages,
+            "NaivePropagation",
+            NO_SEEN_DIGEST_CONFIG
+        )
         nodes, test_output = comparer.simulate_prop_strat(False)
 
         self.assertEqual(num_nodes, len(test_output.keys()))
@@ -167,7 +175,13 @@ class TestNetworkInformationPropagation(NetworkNodeTestClass):
         connectivity_percentage = 100
         num_messages = 1
 
-        comparer = PropagationStrategyComparer(num_nodes, connectivity_percentage, num_messages, "SmartPropagation")
+        comparer = PropagationStrategyComparer(
+            num_nodes,
+            connectivity_percentage,
+            num_messages,
+            "SmartPropagation",
+            NO_SEEN_DIGEST_CONFIG
+        )
         nodes, test_output = comparer.simulate_prop_strat(False)
 
         self.assertEqual(num_nodes, len(test_output.keys()))
@@ -198,6 +212,174 @@ class TestNetworkInformationPropagation(NetworkNodeTestClass):
         self.assertEqual(expected_total_rcvd_msgs, total_rcvd_msgs)
         self.assertEqual(expected_total_sent_msgs, total_sent_msgs)
 
+    def test_gossip_propagation_ignores_fewer_msgs_than_naive_propagation_in_dense_network(self):
+        num_nodes = 15
+        connectivity_percentage = 100
+        num_messages = 5
+
+        total_ignored_msgs = {}
+        for propagation_strategy in ["NaivePropagation", "GossipPropagation"]:
+            comparer = PropagationStrategyComparer(
+                num_nodes,
+                connectivity_percentage,
+                num_messages,
+                propagation_strategy,
+                NO_SEEN_DIGEST_CONFIG
+            )
+            nodes, test_output = comparer.simulate_prop_strat(False)
+
+            # The comparer checks that every node interacted with every message
+            self.assertEqual(num_nodes, len(test_output.keys()))
+            total_ignored_msgs[propagation_strategy] = sum(
+                node_info["NUM_IGNORED_MSGS"] for node_info in test_output.values()
+            )
+
+        self.assertLess(total_ignored_msgs["GossipPropagation"] * 2, total_ignored_msgs["NaivePropagation"])
+
+    def test_all_nodes_receive_a_sent_message_when_gossip_propagation_only_pushes_to_one_node(self):
+        config = {"propagation_strategy": "GossipPropagation", "gossip_fanout": 1}
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(8)]
+
+        for i in range(len(test_network_nodes)):
+            for j in range(i + 1, len(test_network_nodes)):
+                test_network_nodes[i].connect_to_network_node(test_network_nodes[j])
+
+        self.wait_for_idle_network()
+
+        msg_id = test_network_nodes[0].send_propagation_message("TEST", {})
+
+        self.wait_for_idle_network()
+
+        for node in test_network_nodes[1:]:
+            self.assertTrue(node.received_msg_with_id(msg_id))
+
+    def test_gossip_propagation_without_anti_entropy_only_pushes_to_fanout_nodes(self):
+        config = {"propagation_strategy": "GossipPropagation", "gossip_fanout": 2, "gossip_anti_entropy": False}
+        test_network_node_1 = self.create_network_node(NetworkNode, additional_config_dict=config)
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(5)]
+
+        for node in test_network_nodes:
+            test_network_node_1.connect_to_network_node(node)
+
+        self.wait_for_idle_network()
+
+        msg_id = test_network_node_1.send_propagation_message("TEST", {})
+
+        self.wait_for_idle_network()
+
+        self.assertEqual(2, len([node for node in test_network_nodes if node.received_msg_with_id(msg_id)]))
+
+    def test_error_will_be_raised_when_gossip_fanout_is_not_positive(self):
+        with self.assertRaises(Exception) as raised_error:
+            self.create_network_node(
+                NetworkNode,
+                additional_config_dict={"propagation_strategy": "GossipPropagation", "gossip_fanout": 0}
+            )
+
+        self.assertIn("Gossip fan-out must be a positive integer", str(raised_error.exception))
+
+    def test_tree_propagation_will_not_send_duplicate_msgs_once_the_tree_is_built(self):
+        config = {"propagation_strategy": "TreePropagation", "seen_digest_max_size": 0}
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(8)]
+
+        for i in range(len(test_network_nodes)):
+            for j in range(i + 1, len(test_network_nodes)):
+                test_network_nodes[i].connect_to_network_node(test_network_nodes[j])
+
+        self.wait_for_idle_network()
+
+        # The first broadcast floods the network and prunes the redundant links
+        test_network_nodes[0].send_propagation_message("TEST", {})
+        self.wait_for_idle_network()
+
+        num_ignored_msgs_before = sum(node.get_num_ignored_msgs() for node in test_network_nodes)
+
+        msg_ids = [test_network_nodes[0].send_propagation_message("TEST", {}) for _ in range(5)]
+        self.wait_for_idle_network()
+
+        for msg_id in msg_ids:
+            for node in test_network_nodes[1:]:
+                self.assertTrue(node.received_msg_with_id(msg_id))
+
+        num_ignored_msgs = sum(node.get_num_ignored_msgs() for node in test_network_nodes) - num_ignored_msgs_before
+        self.assertLessEqual(num_ignored_msgs, len(test_network_nodes))
+
+        num_tree_edges = sum(len(node.propagation_strategy.get_eager_peers()) for node in test_network_nodes) / 2
+        self.assertLess(num_tree_edges, len(test_network_nodes) * (len(test_network_nodes) - 1) / 2)
+
+    def test_tree_propagation_will_repair_the_tree_when_a_node_is_removed(self):
+        config = {"propagation_strategy": "TreePropagation"}
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(6)]
+
+        for i in range(len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[(i + 1) % len(test_network_nodes)])
+
+        self.wait_for_idle_network()
+
+        test_network_nodes[0].send_propagation_message("TEST", {})
+        self.wait_for_idle_network()
+
+        removed_node = test_network_nodes.pop(1)
+        removed_node.teardown()
+        for node in test_network_nodes:
+            node.disconnect_from_network_node(removed_node.get_id())
+
+        msg_id = test_network_nodes[0].send_propagation_message("TEST", {})
+        self.wait_for_idle_network()
+
+        for node in test_network_nodes[1:]:
+            self.assertTrue(node.received_msg_with_id(msg_id))
+
+    def test_scoped_propagation_only_reaches_nodes_within_the_hop_limit(self):
+        test_network_nodes = [self.create_network_node(NetworkNode) for _ in range(5)]
+
+        for i in range(1, len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[i - 1])
+
+        self.wait_for_idle_network()
+
+        msg_id = test_network_nodes[0].send_scoped_propagation("TEST", {}, 2)
+        self.wait_for_idle_network()
+
+        self.assertTrue(test_network_nodes[1].received_msg_with_id(msg_id))
+        self.assertTrue(test_network_nodes[2].received_msg_with_id(msg_id))
+        self.assertFalse(test_network_nodes[3].received_msg_with_id(msg_id))
+        self.assertFalse(test_network_nodes[4].received_msg_with_id(msg_id))
+
+        # Expanding the ring sends a new message that travels further
+        msg_id = test_network_nodes[0].send_scoped_propagation("TEST", {}, 4)
+        self.wait_for_idle_network()
+
+        for node in test_network_nodes[1:]:
+            self.assertTrue(node.received_msg_with_id(msg_id))
+
+    def test_scoped_propagation_reaches_nodes_within_the_hop_limit_through_the_shortest_path(self):
+        config = {"propagation_strategy": "NaivePropagation"}
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(6)]
+
+        # Node 4 is 2 hops away through node 3, but 4 hops away through nodes 1, 2 and 3
+        for i in range(1, 5):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[i - 1])
+        test_network_nodes[3].connect_to_network_node(test_network_nodes[0])
+        test_network_nodes[5].connect_to_network_node(test_network_nodes[4])
+
+        self.wait_for_idle_network()
+
+        msg_id = test_network_nodes[0].send_scoped_propagation("TEST", {}, 2)
+        self.wait_for_idle_network()
+
+        for node in test_network_nodes[1:5]:
+            self.assertTrue(node.received_msg_with_id(msg_id))
+        self.assertFalse(test_network_nodes[5].received_msg_with_id(msg_id))
+
+    def test_error_will_be_raised_when_scoped_propagation_hop_limit_is_not_positive(self):
+        test_network_node = self.create_network_node(NetworkNode)
+
+        with self.assertRaises(Exception) as raised_error:
+            test_network_node.send_scoped_propagation("TEST", {}, 0)
+
+        self.assertIn("Scoped propagation must travel at least one hop", str(raised_error.exception))
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
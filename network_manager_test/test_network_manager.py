@@ -154,6 +154,52 @@ class TestNetworkManager(NetworkNodeTestClass):
 
         self.assertIn("Removing node from network would leave an orphaned node", str(raised_error.exception))
 
+    def test_nodes_added_in_bulk_will_be_connected_without_a_handshake(self):
+        test_network_manager = self.create_network_manager(NetworkConnectivityLevel.FULLY_CONNECTED)
+
+        test_network_node_1 = self.create_network_node(NetworkNode)
+        test_network_manager.add_network_node(test_network_node_1)
+        self.wait_for_idle_network()
+
+        new_network_nodes = [self.create_network_node(NetworkNode) for _ in range(5)]
+        test_network_manager.add_network_nodes(new_network_nodes)
+
+        # The channels are installed on both ends before any message is handled
+        all_network_nodes = [test_network_node_1] + new_network_nodes
+        for node in all_network_nodes:
+            self.assertEqual(5, len(node.get_message_channels()))
+
+        self.wait_for_idle_network()
+
+        for node in all_network_nodes:
+            self.assertEqual({}, node.get_sent_messages())
+
+        msg_id = new_network_nodes[0].send_propagation_message("TEST", {})
+        self.wait_for_idle_network()
+
+        for node in all_network_nodes:
+            if node is not new_network_nodes[0]:
+                self.assertTrue(node.received_msg_with_id(msg_id))
+
+    def test_nodes_added_in_bulk_will_follow_the_given_topology(self):
+        test_network_manager = self.create_network_manager(NetworkConnectivityLevel.FULLY_CONNECTED)
+
+        new_network_nodes = [self.create_network_node(NetworkNode) for _ in range(6)]
+        test_network_manager.add_network_nodes(new_network_nodes, NetworkConnectivityLevel.CENTRALIZED)
+
+        central_network_node = test_network_manager.get_central_network_node()
+        self.assertIs(new_network_nodes[0], central_network_node)
+        self.assertEqual(5, len(central_network_node.get_connections()))
+        for node in new_network_nodes[1:]:
+            self.assertEqual([central_network_node.get_id()], node.get_connections())
+
+        new_network_nodes = [self.create_network_node(NetworkNode) for _ in range(6)]
+        test_network_manager.add_network_nodes(new_network_nodes, NetworkConnectivityLevel.PARTIALLY_CONNECTED)
+
+        self.assertEqual(12, len(test_network_manager.get_network_nodes()))
+        for node in new_network_nodes:
+            self.assertGreaterEqual(len(node.get_connections()), 1)
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
@@ -3,6 +3,7 @@ import unittest
 
 from network_manager_test.network_node_test_class import NetworkNodeTestClass
 from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.message_wrapper.message_batch_wrapper import MessageBatchWrapper
 
 
 class TestNetworkMessaging(NetworkNodeTestClass):
@@ -57,6 +58,72 @@ class TestNetworkMessaging(NetworkNodeTestClass):
 
         self.assertIn("Tried to send a message to an unknown nod", str(raised_error.exception))
 
+    def test_messages_sent_to_the_same_target_will_be_batched(self):
+        test_network_node_1 = self.create_network_node(
+            NetworkNode,
+            additional_config_dict={"message_batch_max_size": 10, "message_batch_max_delay_sec": 0.5}
+        )
+        test_network_node_2 = self.create_network_node(NetworkNode)
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        self.wait_for_idle_network()
+
+        sent_batches = []
+        channel = test_network_node_1.get_message_channels()[test_network_node_2.get_id()]
+        original_send_message = channel.send_message
+
+        def track_send_message(message):
+            sent_batches.append(message)
+            original_send_message(message)
+
+        channel.send_message = track_send_message
+
+        msg_ids = []
+        for _ in range(10):
+            msg_ids.append(test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {}))
+
+        self.wait_for_idle_network()
+
+        for msg_id in msg_ids:
+            self.assertTrue(test_network_node_2.received_msg_with_id(msg_id))
+
+        self.assertLess(len(sent_batches), len(msg_ids))
+        self.assertTrue(any(isinstance(message, MessageBatchWrapper) for message in sent_batches))
+
+    def test_received_message_batch_will_be_unpacked_into_the_inbox(self):
+        test_network_node_1 = self.create_network_node(NetworkNode)
+        test_network_node_2 = self.create_network_node(NetworkNode)
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        self.wait_for_idle_network()
+
+        messages = [
+            test_network_node_1._create_message(
+                test_network_node_2.get_id(),
+                test_network_node_1._generate_message_id(),
+                "TEST",
+                {},
+                False,
+                add_to_send_queue=False
+            ) for _ in range(3)
+        ]
+        batch = MessageBatchWrapper(
+            test_network_node_1._generate_message_id(),
+            test_network_node_1.get_id(),
+            test_network_node_2.get_id(),
+            messages
+        )
+
+        self.assertTrue(test_network_node_2.receive_message(batch))
+
+        self.wait_for_idle_network()
+
+        for message in messages:
+            self.assertTrue(test_network_node_2.received_msg_with_id(message.get_id()))
+        self.assertFalse(test_network_node_2.received_msg_with_id(batch.get_id()))
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
@@ -0,0 +1,102 @@
+import logging
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.node_runtime.simulated_node_runtime import SimulatedNodeRuntime
+
+SIMULATION_CONFIG = {
+    "node_runtime": "SimulatedNodeRuntime",
+    "simulation_seed": 7
+}
+
+
+class TestNodeSimulator(NetworkNodeTestClass):
+    def tearDown(self) -> None:
+        # Simulated nodes are torn down on the test thread, since the simulator is not thread safe
+        for node in self.test_network_nodes:
+            node.teardown()
+        self.test_network_nodes = []
+
+    def run_gossip_simulation(self, num_nodes):
+        config = dict(SIMULATION_CONFIG, propagation_strategy="GossipPropagation")
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(num_nodes)]
+        for i in range(1, len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[(i - 1) // 2])
+
+        simulator = SimulatedNodeRuntime.get_simulator()
+        simulator.run()
+
+        handled_msgs = []
+        for node in test_network_nodes:
+            node.assign_msg_handler("TEST", lambda message, node=node: handled_msgs.append(node.get_id()))
+
+        test_network_nodes[0].send_propagation_message("TEST", {"DATA": 1})
+        simulator.run()
+
+        self.tearDown()
+        return handled_msgs
+
+    def test_simulations_with_the_same_seed_will_run_the_same_way(self):
+        handled_msgs_1 = self.run_gossip_simulation(50)
+        self.assertIsNone(SimulatedNodeRuntime.get_simulator())
+        handled_msgs_2 = self.run_gossip_simulation(50)
+
+        self.assertGreater(len(handled_msgs_1), 0)
+        self.assertEqual(handled_msgs_1, handled_msgs_2)
+
+    def test_propagated_message_will_reach_every_node(self):
+        test_network_nodes = []
+        for _ in range(1000):
+            test_network_nodes.append(self.create_network_node(NetworkNode, additional_config_dict=SIMULATION_CONFIG))
+
+        self.assertEqual(list(range(1, 1001)), [node.get_id() for node in test_network_nodes])
+
+        for i in range(1, len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[(i - 1) // 2])
+
+        simulator = SimulatedNodeRuntime.get_simulator()
+        simulator.run()
+
+        handled_msgs = []
+        for node in test_network_nodes:
+            node.assign_msg_handler("TEST", lambda message: handled_msgs.append(message.get_id()))
+
+        msg_id = test_network_nodes[0].send_propagation_message("TEST", {"DATA": 1})
+        simulator.run()
+
+        self.assertEqual(len(test_network_nodes) - 1, len(handled_msgs))
+        self.assertTrue(all(node.received_msg_with_id(msg_id) for node in test_network_nodes[1:]))
+        self.assertEqual(0, simulator.get_num_pending_events())
+
+    def test_virtual_clock_will_only_advance_through_scheduled_events(self):
+        test_network_node = self.create_network_node(NetworkNode, additional_config_dict=SIMULATION_CONFIG)
+        simulator = SimulatedNodeRuntime.get_simulator()
+        simulator.run()
+
+        event_times = []
+        simulator.schedule(5.0, lambda: event_times.append(test_network_node.get_time()))
+        simulator.schedule(1.0, lambda: event_times.append(test_network_node.get_time()))
+        self.assertEqual(0.0, test_network_node.get_time())
+
+        simulator.run(until_time=2.0)
+        self.assertEqual([1.0], event_times)
+        self.assertEqual(2.0, simulator.get_time())
+
+        simulator.run()
+        self.assertEqual([1.0, 5.0], event_times)
+        self.assertEqual(5.0, test_network_node.get_time())
+
+        with self.assertRaises(Exception):
+            simulator.schedule(-1.0, lambda: None)
+
+    def test_error_will_be_raised_when_simulated_node_uses_link_senders(self):
+        with self.assertRaises(Exception) as raised_error:
+            NetworkNode(additional_config_dict=dict(SIMULATION_CONFIG, link_senders=True))
+
+        self.assertIn("Simulated nodes can not use link senders", str(raised_error.exception))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
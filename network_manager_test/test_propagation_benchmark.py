@@ -0,0 +1,91 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from network_manager_test.propagation_benchmark import PropagationBenchmark, main
+
+BENCHMARK_SETTINGS = {
+    "NUM_MESSAGES": 5,
+    "NODE_RUNTIME": "SimulatedNodeRuntime",
+    "LINK_MODEL": {"LATENCY_SEC": 0.01, "JITTER_SEC": 0.005, "LATENCY_DISTRIBUTION": "UNIFORM"},
+    "SEED": 3
+}
+
+# CPU and wall time are the only metrics that change between runs of the same configuration
+TIMING_METRICS = ["CPU_TIME_SEC", "WALL_TIME_SEC"]
+
+
+class TestPropagationBenchmark(unittest.TestCase):
+    def get_reproducible_metrics(self, results):
+        return [
+            {metric: value for metric, value in result["METRICS"].items() if metric not in TIMING_METRICS}
+            for result in results
+        ]
+
+    def test_benchmark_results_will_be_reproducible(self):
+        configurations = PropagationBenchmark.get_configurations(
+            ["SmartPropagation", "GossipPropagation"],
+            ["K_REGULAR"],
+            [16],
+            [100.0],
+            BENCHMARK_SETTINGS
+        )
+        self.assertEqual(2, len(configurations))
+
+        pool_results = PropagationBenchmark.run_configurations(configurations, 2)
+        serial_results = PropagationBenchmark.run_configurations(configurations, 1)
+
+        self.assertEqual(self.get_reproducible_metrics(pool_results), self.get_reproducible_metrics(serial_results))
+        for result in pool_results:
+            self.assertEqual(1.0, result["METRICS"]["DELIVERY_RATIO"])
+            self.assertGreaterEqual(result["METRICS"]["LATENCY_P99_SEC"], result["METRICS"]["LATENCY_P50_SEC"])
+            self.assertGreater(result["METRICS"]["LATENCY_P50_SEC"], 0)
+            self.assertGreater(result["METRICS"]["MSGS_PER_BROADCAST"], 15)
+
+    def test_regressions_will_be_reported_against_the_baseline(self):
+        configuration = PropagationBenchmark.get_configurations(["NaivePropagation"], ["K_REGULAR"], [8], [10.0], {})[0]
+        baseline = [{"CONFIGURATION": configuration, "METRICS": {"MSGS_PER_BROADCAST": 10.0, "DELIVERY_RATIO": 1.0}}]
+        results = [{"CONFIGURATION": configuration, "METRICS": {"MSGS_PER_BROADCAST": 10.5, "DELIVERY_RATIO": 0.9}}]
+
+        regressions = PropagationBenchmark.compare_to_baseline(
+            results,
+            baseline,
+            {"MSGS_PER_BROADCAST": 0.1, "DELIVERY_RATIO": 0.01}
+        )
+
+        self.assertEqual(["DELIVERY_RATIO"], [regression["METRIC"] for regression in regressions])
+        self.assertEqual("NaivePropagation/K_REGULAR/8/10.0", regressions[0]["CONFIGURATION"])
+
+    def test_command_line_will_fail_when_a_metric_regresses(self):
+        with tempfile.TemporaryDirectory() as results_dir:
+            results_path = os.path.join(results_dir, "results.json")
+            args = [
+                "--strategies", "NaivePropagation",
+                "--topologies", "SMALL_WORLD",
+                "--num-nodes", "8",
+                "--message-rates", "50",
+                "--num-messages", "3",
+                "--workers", "1",
+                "--output", results_path
+            ]
+            self.assertEqual(0, main(args))
+
+            with open(results_path) as results_file:
+                results = json.load(results_file)["RESULTS"]
+            self.assertEqual(1, len(results))
+
+            self.assertEqual(0, main(args + ["--baseline", results_path, "--threshold", "CPU_TIME_SEC=1000"]))
+
+            results[0]["METRICS"]["MSGS_PER_BROADCAST"] /= 2
+            baseline_path = os.path.join(results_dir, "baseline.json")
+            with open(baseline_path, "w") as baseline_file:
+                json.dump({"RESULTS": results}, baseline_file)
+
+            self.assertEqual(1, main(args + ["--baseline", baseline_path, "--threshold", "CPU_TIME_SEC=1000"]))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,104 @@
+import logging
+import threading
+import time
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.node_runtime.reactor_node_runtime import ReactorNodeRuntime
+
+REACTOR_CONFIG = {
+    "node_runtime": "ReactorNodeRuntime",
+    "reactor_num_workers": 2,
+    "reactor_num_handler_workers": 4
+}
+
+
+class TestReactorNodeRuntime(NetworkNodeTestClass):
+    def wait_for_condition(self, condition, timeout_sec=10):
+        start_time = time.time()
+        while (not condition()) and (time.time() < start_time + timeout_sec):
+            time.sleep(0.01)
+
+    def test_many_nodes_will_share_a_fixed_number_of_threads(self):
+        num_threads_before = threading.active_count()
+
+        test_network_nodes = []
+        for _ in range(100):
+            test_network_nodes.append(self.create_network_node(NetworkNode, additional_config_dict=REACTOR_CONFIG))
+
+        reactor = ReactorNodeRuntime.get_shared_reactor()
+        self.assertEqual(100, reactor.get_num_nodes())
+        self.assertLessEqual(threading.active_count() - num_threads_before, reactor.get_num_threads())
+
+    def test_propagated_message_will_reach_every_node(self):
+        test_network_nodes = []
+        for _ in range(50):
+            test_network_nodes.append(self.create_network_node(NetworkNode, additional_config_dict=REACTOR_CONFIG))
+
+        for i in range(1, len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[i - 1])
+
+        handled_msgs = []
+        for node in test_network_nodes:
+            node.assign_msg_handler("TEST", lambda message: handled_msgs.append(message.get_id()))
+
+        self.wait_for_idle_network()
+
+        msg_id = test_network_nodes[0].send_propagation_message("TEST", {"DATA": 1})
+
+        self.wait_for_condition(lambda: len(handled_msgs) == len(test_network_nodes) - 1)
+
+        self.assertEqual(len(test_network_nodes) - 1, len(handled_msgs))
+        for node in test_network_nodes[1:]:
+            self.assertTrue(node.received_msg_with_id(msg_id))
+
+    def test_messages_queued_while_node_is_torn_down_will_be_handled_after_restart(self):
+        test_network_node_1 = self.create_network_node(NetworkNode, additional_config_dict=REACTOR_CONFIG)
+        test_network_node_2 = self.create_network_node(NetworkNode, additional_config_dict=REACTOR_CONFIG)
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        handled_msgs = []
+        test_network_node_2.assign_msg_handler("TEST", lambda message: handled_msgs.append(message.get_id()))
+
+        self.wait_for_idle_network()
+
+        test_network_node_2.teardown()
+        msg_id = test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {})
+
+        self.wait_for_condition(lambda: test_network_node_1.sent_msg_with_id(msg_id))
+        self.assertEqual([], handled_msgs)
+
+        test_network_node_2.start_network_node()
+        self.wait_for_condition(lambda: len(handled_msgs) == 1)
+
+        self.assertEqual([msg_id], handled_msgs)
+
+    def test_reactor_will_stop_once_all_of_its_nodes_are_torn_down(self):
+        test_network_node_1 = self.create_network_node(NetworkNode, additional_config_dict=REACTOR_CONFIG)
+        test_network_node_2 = self.create_network_node(NetworkNode, additional_config_dict=REACTOR_CONFIG)
+
+        self.assertIsNotNone(ReactorNodeRuntime.get_shared_reactor())
+
+        test_network_node_1.teardown()
+        test_network_node_2.teardown()
+
+        self.wait_for_condition(lambda: ReactorNodeRuntime.get_shared_reactor() is None)
+
+        self.assertIsNone(ReactorNodeRuntime.get_shared_reactor())
+
+    def test_error_will_be_raised_when_reactor_node_uses_bounded_blocking_queues(self):
+        config = dict(REACTOR_CONFIG)
+        config["message_queue_capacity"] = 10
+        config["message_queue_full_policy"] = "BLOCK"
+
+        with self.assertRaises(Exception) as raised_error:
+            self.create_network_node(NetworkNode, additional_config_dict=config)
+
+        self.assertIn("can not use bounded queues with the BLOCK policy", str(raised_error.exception))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,75 @@
+import logging
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.message_tracking.seen_digest import SeenDigest
+
+
+class TestSeenDigest(NetworkNodeTestClass):
+    def test_extended_digest_will_contain_old_and_new_node_ids(self):
+        test_digest = SeenDigest([1, 2])
+
+        extended_digest = test_digest.extend([3, 4], 10)
+
+        self.assertEqual(frozenset([1, 2, 3, 4]), extended_digest.get_node_ids())
+        self.assertEqual(frozenset([1, 2]), test_digest.get_node_ids())
+        self.assertTrue(extended_digest.contains(3))
+        self.assertFalse(test_digest.contains(3))
+
+    def test_extended_digest_will_not_grow_past_its_max_size(self):
+        test_digest = SeenDigest([1, 2])
+
+        extended_digest = test_digest.extend([3, 4, 5], 3)
+
+        self.assertEqual(3, len(extended_digest))
+        self.assertTrue(extended_digest.contains(1))
+        self.assertTrue(extended_digest.contains(2))
+
+    def test_nodes_will_skip_targets_that_already_received_the_message(self):
+        config = {"propagation_strategy": "NaivePropagation"}
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(6)]
+
+        for i in range(len(test_network_nodes)):
+            for j in range(i + 1, len(test_network_nodes)):
+                test_network_nodes[i].connect_to_network_node(test_network_nodes[j])
+
+        self.wait_for_idle_network()
+        num_ignored_msgs_before = sum(node.get_num_ignored_msgs() for node in test_network_nodes)
+
+        msg_id = test_network_nodes[0].send_propagation_message("TEST", {})
+        self.wait_for_idle_network()
+
+        for node in test_network_nodes[1:]:
+            self.assertTrue(node.received_msg_with_id(msg_id))
+
+        # The source sends the message to every node, so no other node has to send it again
+        num_ignored_msgs = sum(node.get_num_ignored_msgs() for node in test_network_nodes) - num_ignored_msgs_before
+        self.assertEqual(0, num_ignored_msgs)
+
+        num_receivers = len(test_network_nodes) - 1
+        self.assertEqual(
+            num_receivers * num_receivers,
+            sum(node.get_propagation_stats()["NUM_SKIPPED_SENDS"] for node in test_network_nodes)
+        )
+
+    def test_all_nodes_receive_a_sent_message_when_the_digest_is_full(self):
+        config = {"propagation_strategy": "SmartPropagation", "seen_digest_max_size": 2}
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(8)]
+
+        for i in range(len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[(i + 1) % len(test_network_nodes)])
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[(i + 3) % len(test_network_nodes)])
+
+        self.wait_for_idle_network()
+
+        msg_id = test_network_nodes[0].send_propagation_message("TEST", {})
+        self.wait_for_idle_network()
+
+        for node in test_network_nodes[1:]:
+            self.assertTrue(node.received_msg_with_id(msg_id))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,146 @@
+import logging
+import multiprocessing
+import threading
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.message_channel.shared_memory_message_channel import SharedMemoryMessageChannel
+from network_manager.network_node.message_channel.shared_memory_ring import SharedMemoryRing
+
+
+def run_remote_echo_node(connection):
+    """
+    run_remote_echo_node
+
+    Runs a shared memory network node in a separate process. The node
+    responds to every PING message with a PONG message. The ID and
+    address of the node are sent to the parent process through the
+    given connection.
+
+    @param connection [multiprocessing.connection.Connection] The connection to the parent process
+
+    @return None
+    """
+    echo_node = NetworkNode(additional_config_dict={"message_channel": "SharedMemoryMessageChannel"})
+    echo_node.assign_msg_handler(
+        "PING",
+        lambda message: echo_node.send_directed_message(message.get_sender_id(), "PONG", {})
+    )
+    connection.send(echo_node.get_remote_reference())
+    connection.recv()
+    echo_node.teardown()
+
+
+class TestSharedMemoryMessageChannel(NetworkNodeTestClass):
+    def create_shm_network_node(self, additional_config_dict={}):
+        config = {"message_channel": "SharedMemoryMessageChannel"}
+        config.update(additional_config_dict)
+        return self.create_network_node(NetworkNode, additional_config_dict=config)
+
+    def test_ring_will_return_frames_in_order_across_the_wrap_around(self):
+        test_ring = SharedMemoryRing(capacity=64)
+        try:
+            for i in range(50):
+                data = bytes([i]) * (i % 20)
+                self.assertIsNotNone(test_ring.push([data]))
+                self.assertEqual(data, test_ring.pop())
+            self.assertIsNone(test_ring.pop())
+
+            self.assertIsNotNone(test_ring.push([b"x" * 20, b"x" * 20]))
+            self.assertIsNone(test_ring.push([b"y" * 40]))
+            self.assertFalse(test_ring.can_fit(61))
+        finally:
+            test_ring.unlink()
+            test_ring.close()
+
+    def test_nodes_can_connect_and_send_messages_over_shared_memory(self):
+        test_network_node_1 = self.create_shm_network_node()
+        test_network_node_2 = self.create_shm_network_node()
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        self.wait_for_idle_network()
+
+        self.assertTrue(test_network_node_1.is_connected_to(test_network_node_2.get_id()))
+        self.assertTrue(test_network_node_2.is_connected_to(test_network_node_1.get_id()))
+        self.assertIsInstance(
+            test_network_node_1.get_message_channels()[test_network_node_2.get_id()],
+            SharedMemoryMessageChannel
+        )
+
+        msg_id = test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {"VALUE": [1, 2, 3]})
+
+        self.wait_for_idle_network()
+
+        self.assertTrue(test_network_node_2.received_msg_with_id(msg_id))
+        self.assertEqual({"VALUE": [1, 2, 3]}, test_network_node_2.get_received_messages()[msg_id][2].get_message_payload())
+
+    def test_messages_will_not_be_lost_when_the_ring_fills_up(self):
+        test_network_node_1 = self.create_shm_network_node({"shm_ring_capacity": 4096})
+        test_network_node_2 = self.create_shm_network_node({"shm_ring_capacity": 4096})
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        msg_ids = []
+        for i in range(200):
+            msg_ids.append(test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {"VALUE": i}))
+
+        self.wait_for_idle_network()
+
+        for msg_id in msg_ids:
+            self.assertTrue(test_network_node_2.received_msg_with_id(msg_id))
+
+    def test_node_will_receive_messages_after_restarting(self):
+        test_network_node_1 = self.create_shm_network_node()
+        test_network_node_2 = self.create_shm_network_node()
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        self.wait_for_idle_network()
+
+        test_network_node_2.teardown()
+        test_network_node_2.start_network_node()
+
+        msg_id = test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {})
+
+        self.wait_for_idle_network()
+
+        self.assertTrue(test_network_node_2.received_msg_with_id(msg_id))
+
+    def test_shm_node_ids_will_not_be_object_addresses(self):
+        test_network_nodes = [self.create_shm_network_node() for _ in range(10)]
+
+        self.assertEqual(len(test_network_nodes), len(set(node.get_id() for node in test_network_nodes)))
+        for node in test_network_nodes:
+            self.assertNotEqual(id(node), node.get_id())
+            self.assertLess(node.get_id(), 1 << 63)
+
+    def test_nodes_in_separate_processes_can_communicate_over_shared_memory(self):
+        test_network_node = self.create_shm_network_node()
+        pong_received = threading.Event()
+        test_network_node.assign_msg_handler("PONG", lambda message: pong_received.set())
+
+        parent_connection, child_connection = multiprocessing.Pipe()
+        remote_process = multiprocessing.get_context("spawn").Process(
+            target=run_remote_echo_node,
+            args=(child_connection,)
+        )
+        remote_process.start()
+
+        try:
+            remote_node = parent_connection.recv()
+            self.assertNotEqual(test_network_node.get_id(), remote_node.get_id())
+            test_network_node.connect_to_network_node(remote_node)
+            test_network_node.send_directed_message(remote_node.get_id(), "PING", {})
+
+            self.assertTrue(pong_received.wait(timeout=10))
+            self.assertTrue(test_network_node.is_connected_to(remote_node.get_id()))
+        finally:
+            parent_connection.send("STOP")
+            remote_process.join(timeout=10)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
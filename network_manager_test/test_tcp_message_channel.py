@@ -0,0 +1,128 @@
+import logging
+import multiprocessing
+import threading
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.message_channel.tcp_message_channel import TcpMessageChannel
+
+
+def run_remote_echo_node(connection):
+    """
+    run_remote_echo_node
+
+    Runs a TCP network node in a separate process. The node responds
+    to every PING message with a PONG message. The ID and address of
+    the node are sent to the parent process through the given connection.
+
+    @param connection [multiprocessing.connection.Connection] The connection to the parent process
+
+    @return None
+    """
+    echo_node = NetworkNode(additional_config_dict={"message_channel": "TcpMessageChannel"})
+    echo_node.assign_msg_handler(
+        "PING",
+        lambda message: echo_node.send_directed_message(message.get_sender_id(), "PONG", {})
+    )
+    connection.send(echo_node.get_remote_reference())
+    connection.recv()
+    echo_node.teardown()
+
+
+class TestTcpMessageChannel(NetworkNodeTestClass):
+    def create_tcp_network_node(self):
+        return self.create_network_node(NetworkNode, additional_config_dict={"message_channel": "TcpMessageChannel"})
+
+    def test_nodes_can_connect_and_send_messages_over_tcp(self):
+        test_network_node_1 = self.create_tcp_network_node()
+        test_network_node_2 = self.create_tcp_network_node()
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        self.wait_for_idle_network()
+
+        self.assertTrue(test_network_node_1.is_connected_to(test_network_node_2.get_id()))
+        self.assertTrue(test_network_node_2.is_connected_to(test_network_node_1.get_id()))
+        self.assertIsInstance(
+            test_network_node_1.get_message_channels()[test_network_node_2.get_id()],
+            TcpMessageChannel
+        )
+
+        msg_id = test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {"VALUE": [1, 2, 3]})
+
+        self.wait_for_idle_network()
+
+        self.assertTrue(test_network_node_2.received_msg_with_id(msg_id))
+        self.assertEqual({"VALUE": [1, 2, 3]}, test_network_node_2.get_received_messages()[msg_id][2].get_message_payload())
+
+    def test_propagated_messages_will_reach_all_nodes_over_tcp(self):
+        test_network_node_1 = self.create_tcp_network_node()
+        test_network_node_2 = self.create_tcp_network_node()
+        test_network_node_3 = self.create_tcp_network_node()
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+        test_network_node_2.connect_to_network_node(test_network_node_3)
+
+        msg_id = test_network_node_1.send_propagation_message("TEST", {})
+
+        self.wait_for_idle_network()
+
+        self.assertTrue(test_network_node_2.received_msg_with_id(msg_id))
+        self.assertTrue(test_network_node_3.received_msg_with_id(msg_id))
+
+    def test_node_will_reconnect_after_connection_is_lost(self):
+        test_network_node_1 = self.create_tcp_network_node()
+        test_network_node_2 = self.create_tcp_network_node()
+
+        test_network_node_1.connect_to_network_node(test_network_node_2)
+
+        self.wait_for_idle_network()
+
+        test_network_node_2.teardown()
+        test_network_node_2.start_network_node()
+
+        msg_id = test_network_node_1.send_directed_message(test_network_node_2.get_id(), "TEST", {})
+
+        self.wait_for_idle_network()
+
+        self.assertTrue(test_network_node_2.received_msg_with_id(msg_id))
+
+    def test_tcp_node_ids_will_not_be_object_addresses(self):
+        test_network_nodes = [self.create_tcp_network_node() for _ in range(10)]
+        local_network_node = self.create_network_node(NetworkNode)
+
+        node_ids = set(node.get_id() for node in test_network_nodes)
+        self.assertEqual(len(test_network_nodes), len(node_ids))
+        for node in test_network_nodes:
+            self.assertNotEqual(id(node), node.get_id())
+            self.assertLess(node.get_id(), 1 << 63)
+        self.assertEqual(id(local_network_node), local_network_node.get_id())
+
+    def test_nodes_in_separate_processes_can_communicate_over_tcp(self):
+        test_network_node = self.create_tcp_network_node()
+        pong_received = threading.Event()
+        test_network_node.assign_msg_handler("PONG", lambda message: pong_received.set())
+
+        parent_connection, child_connection = multiprocessing.Pipe()
+        remote_process = multiprocessing.get_context("spawn").Process(
+            target=run_remote_echo_node,
+            args=(child_connection,)
+        )
+        remote_process.start()
+
+        try:
+            remote_node = parent_connection.recv()
+            test_network_node.connect_to_network_node(remote_node)
+            test_network_node.send_directed_message(remote_node.get_id(), "PING", {})
+
+            self.assertTrue(pong_received.wait(timeout=10))
+            self.assertTrue(test_network_node.is_connected_to(remote_node.get_id()))
+        finally:
+            parent_connection.send("STOP")
+            remote_process.join(timeout=10)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,200 @@
+import logging
+import threading
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.network_node_message_types import NetworkNodeMessageTypes
+from network_manager.network_node.termination_detection.termination_detector import TerminationDetector
+
+
+class TestTerminationDetector(NetworkNodeTestClass):
+    def create_detector(self, node_id=1):
+        sent_acks = []
+        detector = TerminationDetector(node_id, lambda target_id, num_acks: sent_acks.append((target_id, num_acks)))
+        detector.set_running(True)
+        return detector, sent_acks
+
+    def test_node_with_local_work_will_not_be_idle(self):
+        detector, _ = self.create_detector()
+        self.assertTrue(detector.is_idle())
+
+        detector.begin_work(2)
+        self.assertFalse(detector.is_idle())
+
+        detector.end_work()
+        self.assertFalse(detector.is_idle())
+
+        detector.end_work()
+        self.assertTrue(detector.is_idle())
+
+    def test_node_will_not_be_idle_until_its_sent_messages_are_acknowledged(self):
+        detector, _ = self.create_detector()
+
+        detector.message_sent(2)
+        detector.message_sent(2)
+        self.assertFalse(detector.is_idle())
+
+        detector.acks_received(2, 1)
+        self.assertFalse(detector.is_idle())
+
+        detector.acks_received(2, 1)
+        self.assertTrue(detector.is_idle())
+
+    def test_engaged_node_will_acknowledge_its_parent_once_it_has_finished(self):
+        detector, sent_acks = self.create_detector()
+
+        detector.message_received(2)
+        self.assertTrue(detector.is_engaged())
+
+        # Work handed on to another node keeps the parent waiting
+        detector.message_sent(3)
+        detector.end_work()
+        self.assertEqual([], sent_acks)
+
+        detector.acks_received(3, 1)
+        self.assertEqual([(2, 1)], sent_acks)
+        self.assertFalse(detector.is_engaged())
+
+        # The acknowledgement is local work until it has been sent
+        self.assertFalse(detector.is_idle())
+        detector.end_work()
+        self.assertTrue(detector.is_idle())
+
+    def test_busy_node_will_acknowledge_received_messages_right_away(self):
+        detector, sent_acks = self.create_detector()
+
+        detector.begin_work()
+        detector.message_received(2)
+
+        self.assertFalse(detector.is_engaged())
+        self.assertEqual([(2, 1)], sent_acks)
+
+    def test_forgotten_node_will_not_keep_the_node_busy(self):
+        detector, _ = self.create_detector()
+
+        detector.message_sent(2)
+        self.assertFalse(detector.is_idle())
+
+        detector.forget_node(2)
+        self.assertTrue(detector.is_idle())
+
+    def test_ending_more_work_than_was_started_will_be_logged(self):
+        detector, _ = self.create_detector()
+        detector.begin_work()
+
+        with self.assertLogs('NetworkNode', level=logging.ERROR):
+            detector.end_work(2)
+
+        self.assertEqual(0, detector.get_stats()["NUM_LOCAL_WORK"])
+        self.assertTrue(detector.is_idle())
+
+        detector.begin_work()
+        self.assertFalse(detector.is_idle())
+
+    def test_idle_listener_will_be_notified_of_state_changes(self):
+        detector, _ = self.create_detector()
+        detector.begin_work()
+
+        idle_states = []
+
+        class TestListener(object):
+            def notify_idle_state(self, node_id, is_idle):
+                idle_states.append((node_id, is_idle))
+
+        detector.add_idle_listener(TestListener())
+        detector.end_work()
+
+        self.assertEqual([(1, False), (1, True)], idle_states)
+
+    def test_wait_until_idle_will_return_once_the_work_has_finished(self):
+        detector, _ = self.create_detector()
+        detector.begin_work()
+
+        timer = threading.Timer(0.1, detector.end_work)
+        timer.start()
+
+        self.assertTrue(detector.wait_until_idle(timeout_sec=5))
+        self.assertTrue(detector.is_idle())
+
+    def test_network_will_not_be_idle_before_propagated_message_was_handled_over_tcp(self):
+        config = {"message_channel": "TcpMessageChannel"}
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(4)]
+
+        for i in range(1, len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[i - 1])
+
+        handled_msgs = []
+        for node in test_network_nodes:
+            node.assign_msg_handler("TEST", lambda message: handled_msgs.append(message.get_id()))
+
+        self.wait_for_idle_network()
+
+        test_network_nodes[0].send_propagation_message("TEST", {})
+        self.wait_for_idle_network()
+
+        self.assertEqual(len(test_network_nodes) - 1, len(handled_msgs))
+        for node in test_network_nodes:
+            self.assertEqual(0, node.termination_detector.get_stats()["DEFICIT"])
+
+    def create_tcp_mesh(self, use_link_senders):
+        config = {
+            "message_channel": "TcpMessageChannel",
+            "link_senders": use_link_senders,
+            "message_queue_capacity": 16,
+            "message_queue_full_policy": "DROP_OLDEST"
+        }
+        test_network_nodes = [self.create_network_node(NetworkNode, additional_config_dict=config) for _ in range(6)]
+        for i in range(1, len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[i - 1])
+            if i > 1:
+                test_network_nodes[i].connect_to_network_node(test_network_nodes[i - 2])
+        for node in test_network_nodes:
+            node.assign_msg_handler("TEST", lambda message: None)
+        self.wait_for_idle_network()
+        return test_network_nodes
+
+    def send_test_messages(self, node):
+        for i in range(200):
+            node.send_propagation_message("TEST", {"INDEX": i})
+
+    def leave_network(self, node, leave_errors):
+        # Leaving nodes announce their teardown the way swarm bots do, and must still become idle
+        node.send_propagation_message(NetworkNodeMessageTypes.BOT_TEARDOWN, {"BOT_ID": node.get_id()})
+        node.set_message_outbox_status(False)
+        try:
+            node.wait_until_idle(timeout_sec=5)
+        except Exception as e:
+            leave_errors.append(e)
+        node.teardown()
+
+    def assert_work_stays_balanced_when_nodes_leave(self, use_link_senders):
+        test_network_nodes = self.create_tcp_mesh(use_link_senders)
+        leaving_nodes = [test_network_nodes[0], test_network_nodes[-1]]
+        leave_errors = []
+
+        threads = [threading.Thread(target=self.send_test_messages, args=(node,)) for node in test_network_nodes[:3]]
+        threads += [threading.Thread(target=self.leave_network, args=(node, leave_errors)) for node in leaving_nodes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], leave_errors)
+        for node in leaving_nodes:
+            self.test_network_nodes.remove(node)
+
+        self.wait_for_idle_network()
+        for node in test_network_nodes[1:-1]:
+            self.assertEqual({"NUM_LOCAL_WORK": 0, "DEFICIT": 0, "PARENT_ID": None}, node.termination_detector.get_stats())
+
+    def test_work_will_stay_balanced_when_nodes_leave_while_messages_are_in_flight(self):
+        self.assert_work_stays_balanced_when_nodes_leave(use_link_senders=False)
+
+    def test_work_will_stay_balanced_when_nodes_leave_while_messages_are_in_flight_through_link_senders(self):
+        self.assert_work_stays_balanced_when_nodes_leave(use_link_senders=True)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,138 @@
+import logging
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_node.topic_routing.subscription_table import SubscriptionTable
+
+TOPIC_ROUTING_CONFIG = {"topic_routing": True, "propagation_strategy": "NaivePropagation"}
+
+
+class TestTopicRouting(NetworkNodeTestClass):
+    def create_tree_network(self):
+        # 0 is the root, 1 and 2 are its children, 3 and 4 are children of 1, and 5 and 6 are children of 2
+        test_network_nodes = [
+            self.create_network_node(NetworkNode, additional_config_dict=TOPIC_ROUTING_CONFIG) for _ in range(7)
+        ]
+        for i in range(1, len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[(i - 1) // 2])
+
+        return test_network_nodes
+
+    def test_newer_advertisements_will_replace_older_ones(self):
+        test_table = SubscriptionTable(1)
+
+        adopted = test_table.merge_advertisements(2, [{"SUBSCRIBER_ID": 3, "TOPICS": ["A"], "VERSION": 1, "NUM_HOPS": 0}])
+        self.assertEqual([{"SUBSCRIBER_ID": 3, "TOPICS": ["A"], "VERSION": 1, "NUM_HOPS": 1}], adopted)
+        self.assertEqual([2], test_table.get_route_targets("A"))
+
+        adopted = test_table.merge_advertisements(4, [{"SUBSCRIBER_ID": 3, "TOPICS": ["B"], "VERSION": 2, "NUM_HOPS": 1}])
+        self.assertEqual(1, len(adopted))
+        self.assertEqual([], test_table.get_route_targets("A"))
+        self.assertEqual([4], test_table.get_route_targets("B"))
+
+        adopted = test_table.merge_advertisements(2, [{"SUBSCRIBER_ID": 3, "TOPICS": ["A"], "VERSION": 1, "NUM_HOPS": 0}])
+        self.assertEqual([], adopted)
+        self.assertEqual([4], test_table.get_route_targets("B"))
+
+    def test_only_closer_neighbors_will_be_kept_as_alternative_routes(self):
+        test_table = SubscriptionTable(1)
+
+        test_table.merge_advertisements(2, [{"SUBSCRIBER_ID": 5, "TOPICS": ["A"], "VERSION": 1, "NUM_HOPS": 2}])
+        test_table.merge_advertisements(3, [{"SUBSCRIBER_ID": 5, "TOPICS": ["A"], "VERSION": 1, "NUM_HOPS": 1}])
+        test_table.merge_advertisements(4, [{"SUBSCRIBER_ID": 5, "TOPICS": ["A"], "VERSION": 1, "NUM_HOPS": 3}])
+        self.assertEqual([3], test_table.get_route_targets("A"))
+
+        test_table.remove_node(3)
+        self.assertEqual([2], test_table.get_route_targets("A"))
+
+        # Node 4 is further from the subscriber than this node, so it may route through this node
+        test_table.remove_node(2)
+        self.assertEqual([], test_table.get_route_targets("A"))
+        self.assertEqual([], test_table.get_subscribers("A"))
+
+    def test_published_message_will_only_reach_nodes_on_the_way_to_subscribers(self):
+        test_network_nodes = self.create_tree_network()
+
+        handled_msgs = []
+        test_network_nodes[4].assign_msg_handler("TEST", lambda message: handled_msgs.append(message.get_id()))
+
+        self.wait_for_idle_network()
+
+        msg_id = test_network_nodes[3].publish_message("TEST", {})
+        self.wait_for_idle_network()
+
+        self.assertEqual([msg_id], handled_msgs)
+        self.assertTrue(test_network_nodes[1].received_msg_with_id(msg_id))
+        for i in [0, 2, 5, 6]:
+            self.assertFalse(test_network_nodes[i].received_msg_with_id(msg_id))
+
+    def test_published_message_will_reach_every_subscriber(self):
+        test_network_nodes = self.create_tree_network()
+
+        handled_msgs = []
+        for i in [0, 4, 6]:
+            test_network_nodes[i].assign_msg_handler("TEST", lambda message: handled_msgs.append(message.get_id()))
+
+        self.wait_for_idle_network()
+
+        msg_id = test_network_nodes[3].publish_message("TEST", {})
+        self.wait_for_idle_network()
+
+        self.assertEqual([msg_id] * 3, handled_msgs)
+        self.assertFalse(test_network_nodes[5].received_msg_with_id(msg_id))
+
+    def test_nodes_connected_after_subscribing_will_learn_the_subscriptions(self):
+        test_network_nodes = [
+            self.create_network_node(NetworkNode, additional_config_dict=TOPIC_ROUTING_CONFIG) for _ in range(4)
+        ]
+        test_network_nodes[0].connect_to_network_node(test_network_nodes[1])
+
+        handled_msgs = []
+        test_network_nodes[0].assign_msg_handler("TEST", lambda message: handled_msgs.append(message.get_id()))
+        self.wait_for_idle_network()
+
+        test_network_nodes[2].connect_to_network_node(test_network_nodes[1])
+        test_network_nodes[3].connect_to_network_node(test_network_nodes[2])
+        self.wait_for_idle_network()
+
+        msg_id = test_network_nodes[3].publish_message("TEST", {})
+        self.wait_for_idle_network()
+
+        self.assertEqual([msg_id], handled_msgs)
+
+    def test_unassigning_the_handler_will_unsubscribe_the_node(self):
+        test_network_nodes = self.create_tree_network()
+
+        def handler(message):
+            pass
+
+        test_network_nodes[4].assign_msg_handler("TEST", handler)
+        self.wait_for_idle_network()
+
+        test_network_nodes[4].unassign_msg_handler("TEST", handler)
+        self.wait_for_idle_network()
+
+        msg_id = test_network_nodes[3].publish_message("TEST", {})
+        self.wait_for_idle_network()
+
+        for node in test_network_nodes:
+            self.assertFalse(node.received_msg_with_id(msg_id))
+
+    def test_published_message_will_be_propagated_everywhere_when_topic_routing_is_disabled(self):
+        test_network_nodes = [self.create_network_node(NetworkNode) for _ in range(3)]
+        for i in range(1, len(test_network_nodes)):
+            test_network_nodes[i].connect_to_network_node(test_network_nodes[i - 1])
+
+        self.wait_for_idle_network()
+
+        msg_id = test_network_nodes[0].publish_message("TEST", {})
+        self.wait_for_idle_network()
+
+        for node in test_network_nodes[1:]:
+            self.assertTrue(node.received_msg_with_id(msg_id))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,140 @@
+import logging
+import unittest
+
+from collections import deque
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.network_node import NetworkNode
+from network_manager.network_manager import NetworkManager
+from network_manager.network_connectivity_level import NetworkConnectivityLevel
+from network_manager.topology.k_regular_topology import KRegularTopology
+from network_manager.topology.small_world_topology import SmallWorldTopology
+from network_manager.topology.expander_topology import ExpanderTopology
+
+
+class TestTopologyGenerator(NetworkNodeTestClass):
+    def get_diameter(self, overlay):
+        diameter = 0
+        for start_id in overlay.adjacency:
+            distances = {start_id: 0}
+            nodes_to_visit = deque([start_id])
+            while len(nodes_to_visit) > 0:
+                node_id = nodes_to_visit.popleft()
+                for neighbor_id in overlay.adjacency[node_id]:
+                    if neighbor_id not in distances:
+                        distances[neighbor_id] = distances[node_id] + 1
+                        nodes_to_visit.append(neighbor_id)
+            diameter = max(diameter, max(distances.values()))
+        return diameter
+
+    def get_degrees(self, overlay):
+        return [len(neighbors) for neighbors in overlay.adjacency.values()]
+
+    def test_k_regular_topology_will_keep_every_node_at_the_degree(self):
+        test_generator = KRegularTopology({"DEGREE": 4, "SEED": 1})
+        for node_id in range(200):
+            test_generator.join(node_id)
+
+        self.assertEqual([4] * 200, self.get_degrees(test_generator.get_overlay()))
+
+        for node_id in range(0, 200, 4):
+            test_generator.leave(node_id)
+
+        self.assertEqual(1, test_generator.get_overlay().get_num_components())
+        self.assertLessEqual(max(self.get_degrees(test_generator.get_overlay())), 4)
+
+    def test_expander_topology_will_stay_connected_within_the_degree_as_nodes_leave(self):
+        test_generator = ExpanderTopology({"DEGREE": 6, "SEED": 1})
+        for node_id in range(300):
+            test_generator.join(node_id)
+
+        overlay = test_generator.get_overlay()
+        self.assertLessEqual(max(self.get_degrees(overlay)), 6)
+        self.assertLessEqual(self.get_diameter(overlay), 8)
+
+        for node_id in range(0, 300, 2):
+            test_generator.leave(node_id)
+
+        self.assertEqual(150, len(overlay.adjacency))
+        self.assertEqual(1, overlay.get_num_components())
+        self.assertLessEqual(max(self.get_degrees(overlay)), 6)
+
+    def test_rebalancing_will_add_shortcuts_until_the_diameter_is_within_the_target(self):
+        # Without rewiring, a small world overlay with a degree of two is a ring
+        test_generator = SmallWorldTopology({"DEGREE": 2, "REWIRE_PROBABILITY": 0, "MAX_DIAMETER": 10, "SEED": 1})
+        for node_id in range(100):
+            test_generator.join(node_id)
+
+        self.assertEqual([2] * 100, self.get_degrees(test_generator.get_overlay()))
+        self.assertEqual(50, self.get_diameter(test_generator.get_overlay()))
+
+        connections_to_add, connections_to_remove = test_generator.rebalance()
+
+        self.assertGreater(len(connections_to_add), 0)
+        self.assertEqual([], connections_to_remove)
+        # The diameter is only estimated during rebalancing, and the estimate can fall short of the actual diameter
+        self.assertLessEqual(self.get_diameter(test_generator.get_overlay()), 11)
+        self.assertLessEqual(max(self.get_degrees(test_generator.get_overlay())), 4)
+
+    def test_leaving_node_will_raise_an_error_if_it_would_orphan_the_last_node(self):
+        test_generator = ExpanderTopology({"SEED": 1})
+        test_generator.join(1)
+        test_generator.join(2)
+
+        with self.assertRaises(Exception) as raised_error:
+            test_generator.leave(1)
+
+        self.assertIn("Removing node from network would leave an orphaned node", str(raised_error.exception))
+
+    def test_network_manager_will_connect_nodes_according_to_the_generated_topology(self):
+        test_network_manager = NetworkManager(NetworkConnectivityLevel.K_REGULAR, {"DEGREE": 4, "SEED": 1})
+
+        test_network_nodes = [self.create_network_node(NetworkNode) for _ in range(12)]
+        test_network_manager.add_network_nodes(test_network_nodes[:10])
+        for node in test_network_nodes[10:]:
+            test_network_manager.add_network_node(node)
+
+        self.wait_for_idle_network()
+
+        overlay = test_network_manager.get_topology_generator().get_overlay()
+        for node in test_network_nodes:
+            self.assertEqual(set(overlay.get_neighbors(node.get_id())), set(node.get_connections()))
+            self.assertEqual(4, len(node.get_connections()))
+
+        removed_node = test_network_nodes.pop(0)
+        test_network_manager.remove_network_node(removed_node.get_id())
+        self.wait_for_idle_network()
+
+        self.assertEqual([], removed_node.get_connections())
+        for node in test_network_nodes:
+            self.assertEqual(set(overlay.get_neighbors(node.get_id())), set(node.get_connections()))
+
+        msg_id = test_network_nodes[0].send_propagation_message("TEST", {})
+        self.wait_for_idle_network()
+
+        for node in test_network_nodes[1:]:
+            self.assertTrue(node.received_msg_with_id(msg_id))
+
+    def test_network_manager_will_make_new_connections_before_dropping_old_ones(self):
+        test_network_manager = NetworkManager(NetworkConnectivityLevel.K_REGULAR, {"DEGREE": 2, "SEED": 1})
+        test_network_nodes = [self.create_network_node(NetworkNode) for _ in range(6)]
+        test_network_manager.add_network_nodes(test_network_nodes)
+        self.wait_for_idle_network()
+
+        connectivity_index = test_network_manager.connectivity_index
+        add_connection = connectivity_index.add_connection
+        remove_connection = connectivity_index.remove_connection
+        changes = []
+        connectivity_index.add_connection = lambda *node_ids: (changes.append("ADD"), add_connection(*node_ids))
+        connectivity_index.remove_connection = lambda *node_ids: (changes.append("REMOVE"), remove_connection(*node_ids))
+
+        test_network_manager.remove_network_node(test_network_nodes[0].get_id())
+
+        self.assertIn("ADD", changes)
+        self.assertIn("REMOVE", changes)
+        self.assertEqual(sorted(changes), changes)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import functools
+
+from network_manager.network_node.async_network_node import AsyncNetworkNode
+from swarm.swarm_bot import SwarmBot
+
+"""
+AsyncSwarmBot
+
+asyncio front end for a SwarmBot. Requests that the SwarmBot answers by
+blocking a thread on a condition (send_sync_directed_message and remote
+swarm memory reads) are awaited here instead, so a single event loop can
+keep thousands of them in flight at once.
+"""
+
+DEFAULT_REQUEST_TIMEOUT_SEC = 10
+
+
+class AsyncSwarmBot(AsyncNetworkNode):
+    def __init__(self, swarm_bot: SwarmBot, request_timeout_sec: float = DEFAULT_REQUEST_TIMEOUT_SEC):
+        """
+        __init__
+
+        Creates a new AsyncSwarmBot object
+
+        @param swarm_bot [SwarmBot] The bot to wrap
+        @param request_timeout_sec [float] How long to wait for the response to a request
+
+        @return [AsyncSwarmBot] The created AsyncSwarmBot
+        """
+        if not isinstance(swarm_bot, SwarmBot):
+            raise Exception("ERROR: AsyncSwarmBot can only wrap SwarmBot objects.")
+
+        super().__init__(swarm_bot)
+        self.request_timeout_sec = request_timeout_sec
+
+    async def request(self, target_bot_id: int, message_type: str, message_payload: dict):
+        """
+        request
+
+        Sends a message to the given bot and waits for its response
+
+        @param target_bot_id [int] The ID of the bot to send the message to
+        @param message_type [str] The type of message to send
+        @param message_payload [dict] The payload of the message
+
+        @return [MessageWrapper] The response message. None if the target bot was torn down.
+        """
+        response_future = asyncio.get_running_loop().create_future()
+
+        msg_id = await self._call_node_method(
+            self.network_node.send_request_message,
+            target_bot_id,
+            message_type,
+            message_payload,
+            self._create_future_callback(response_future)
+        )
+        if msg_id is None:
+            return None
+
+        try:
+            return await asyncio.wait_for(response_future, self.request_timeout_sec)
+        except asyncio.TimeoutError:
+            self.network_node.remove_response_callback(msg_id)
+            if target_bot_id in self.network_node.torndown_nodes:
+                return None
+            raise Exception("ERROR: Did not receive message response within time limit. Message ID: {}".format(msg_id))
+
+    async def read_from_swarm_memory(self, path_to_read: str) -> object:
+        """
+        read_from_swarm_memory
+
+        Reads the value at the given path of the swarm memory. Values held
+        by other bots are requested concurrently.
+
+        @param path_to_read [str] The path to read
+
+        @return [object] The value at the path. None if the path does not exist.
+        """
+        return await self.network_node.swarm_memory_interface.read_async(path_to_read, self.request)
+
+    async def write_to_swarm_memory(self, path_to_write: str, value: object) -> None:
+        """
+        write_to_swarm_memory
+
+        Writes the given value to the given path of the swarm memory. Writing
+        can wait on other bots while syncing holders, so the write runs in
+        the event loop's default executor.
+
+        @param path_to_write [str] The path to write to
+        @param value [object] The value to write
+
+        @return None
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(self.network_node.write_to_swarm_memory, path_to_write, value)
+        )
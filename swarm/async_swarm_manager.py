@@ -0,0 +1,60 @@
+import asyncio
+
+from swarm.async_swarm_bot import AsyncSwarmBot
+from swarm.swarm_manager import SwarmManager
+
+"""
+AsyncSwarmManager
+
+asyncio front end for a SwarmManager. Task bundles are awaited instead
+of blocking a thread until their output arrives, so many bundles can be
+in flight at once.
+"""
+
+
+class AsyncSwarmManager(AsyncSwarmBot):
+    def __init__(self, swarm_manager: SwarmManager, request_timeout_sec: float = 10):
+        """
+        __init__
+
+        Creates a new AsyncSwarmManager object
+
+        @param swarm_manager [SwarmManager] The manager to wrap
+        @param request_timeout_sec [float] How long to wait for responses and task bundle outputs
+
+        @return [AsyncSwarmManager] The created AsyncSwarmManager
+        """
+        if not isinstance(swarm_manager, SwarmManager):
+            raise Exception("ERROR: AsyncSwarmManager can only wrap SwarmManager objects.")
+
+        super().__init__(swarm_manager, request_timeout_sec=request_timeout_sec)
+
+    async def receive_task_bundle(self, new_task_bundle) -> dict:
+        """
+        receive_task_bundle
+
+        Sends the given task bundle to the swarm and waits for its output
+
+        @param new_task_bundle [SwarmTaskBundle] The task bundle to execute
+
+        @return [dict] The output of the task bundle. None if the swarm does not have enough bots.
+        """
+        loop = asyncio.get_running_loop()
+        output_future = loop.create_future()
+
+        bundle_submitted = await loop.run_in_executor(
+            None,
+            self.network_node.submit_task_bundle,
+            new_task_bundle,
+            self._create_future_callback(output_future)
+        )
+        if not bundle_submitted:
+            return None
+
+        try:
+            return await asyncio.wait_for(output_future, self.request_timeout_sec)
+        except asyncio.TimeoutError:
+            self.network_node.remove_task_output_callback(new_task_bundle.get_id())
+            raise Exception("ERROR: Task was not completed within time limit. Bundle ID: {}".format(
+                new_task_bundle.get_id()
+            ))
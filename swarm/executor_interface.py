@@ -8,8 +8,8 @@ class ExecutorInterface(object):
     def send_propagation_message(self, message_type, message_payload):
         return self.swarm_bot.send_propagation_message(message_type, message_payload)
 
-    def send_directed_message(self, target_node_id, message_type, message_payload):
-        return self.swarm_bot.send_directed_message(target_node_id, message_type, message_payload)
+    def send_directed_message(self, target_node_id, message_type, message_payload, priority=None):
+        return self.swarm_bot.send_directed_message(target_node_id, message_type, message_payload, priority=priority)
 
     def send_sync_directed_message(self, target_bot_id, message_type, message_payload):
         return self.swarm_bot.send_sync_directed_message(target_bot_id, message_type, message_payload)
@@ -7,6 +7,7 @@ from swarm.message_types import MessageTypes
 from swarm.swarm_task.task_scheduling_algorithms import simple_task_sort
 from swarm.swarm_memory.swarm_memory_interface import SwarmMemoryInterface
 from network_manager.network_node.network_node_message_types import NetworkNodeMessageTypes
+from network_manager.network_node.message_wrapper.message_batch_wrapper import MessageBatchWrapper
 from swarm.swarm_task.task_executor_pool import TaskExecutorPool
 from swarm.swarm_task.swarm_task_bundle import SwarmTaskBundle
 from swarm.machine_learning.federated_learning.tasks.federated_learning_model_training_task import FederatedLearningModelTrainingTask
@@ -25,7 +26,9 @@ class SwarmBot(NetworkNode):
         )
 
         self.response_locks = {}
+        self.response_callbacks = {}
         self.msg_intermediaries = {}
+        self.msg_intermediaries_lock = threading.Lock()
 
         task_scheduling_algorithms = {
             "SimpleTaskSort": simple_task_sort
@@ -138,8 +141,11 @@ class SwarmBot(NetworkNode):
             self.swarm_bot_handle_msg_response_message
         )
 
-        self.wait_until_idle()
-        NetworkNode.teardown(self)
+        try:
+            self.wait_until_idle()
+        finally:
+            # The node's threads must be stopped even if it never became idle
+            NetworkNode.teardown(self)
 
     def receive_task_bundle(self, new_task_bundle, listener_bot_id=None):
         tasks = new_task_bundle.get_tasks()
@@ -172,12 +178,16 @@ class SwarmBot(NetworkNode):
     def get_task_execution_history(self):
         return self.task_executor_pool.get_task_execution_history()
 
-    def receive_message(self, message):
-        payload = message.get_message_payload()
+    def sync_swarm_memory_with(self, bot_id):
+        self.swarm_memory_interface.sync_with(bot_id)
 
+    def _add_to_inbox(self, message):
         target_bot_id = self.get_id()
-        if "TARGET_BOT_ID" in payload:
-            target_bot_id = message.get_message_payload()["TARGET_BOT_ID"]
+        # Only directed messages carry a target bot, so propagated, batched and link control messages are not decoded here
+        if self._can_carry_target_bot_id(message):
+            payload = message.get_message_payload()
+            if "TARGET_BOT_ID" in payload:
+                target_bot_id = payload["TARGET_BOT_ID"]
 
         final_message = message
         if target_bot_id != self.get_id():
@@ -198,20 +208,31 @@ class SwarmBot(NetworkNode):
                 {"ORIGINAL_MESSAGE": message},
                 False
             )
+            # Forwarding keeps the priority the original message was sent with
+            final_message.set_priority(self._get_message_priority(message))
 
-        return NetworkNode.receive_message(self, final_message)
+        return NetworkNode._add_to_inbox(self, final_message)
+
+    def _can_carry_target_bot_id(self, message):
+        return (not message.get_propagation_flag()) and \
+            (not isinstance(message, MessageBatchWrapper)) and \
+            (not self._is_link_control_message(message))
 
     def connect_to_network_node(self, new_network_node):
         self.save_msg_intermediary(new_network_node.get_id(), new_network_node.get_id(), 1)
         NetworkNode.connect_to_network_node(self, new_network_node)
 
+    def _install_channel(self, network_node):
+        NetworkNode._install_channel(self, network_node)
+        self.save_msg_intermediary(network_node.get_id(), network_node.get_id(), 1)
+
     def get_msg_intermediaries(self):
         return self.msg_intermediaries
 
-    def send_propagation_message(self, message_type, message_payload):
-        return NetworkNode.send_propagation_message(self, message_type, message_payload)
+    def send_propagation_message(self, message_type, message_payload, priority=None):
+        return NetworkNode.send_propagation_message(self, message_type, message_payload, priority=priority)
 
-    def send_directed_message(self, target_bot_id, message_type, message_payload):
+    def send_directed_message(self, target_bot_id, message_type, message_payload, message_id=None, priority=None):
         message_payload["TARGET_BOT_ID"] = target_bot_id
         message_payload["ORIGINAL_SENDER_ID"] = self.get_id()
 
@@ -237,20 +258,29 @@ class SwarmBot(NetworkNode):
                 target_bot_id
             ))
 
-        return NetworkNode.send_directed_message(self, first_intermediary_id, message_type, message_payload)
+        return NetworkNode.send_directed_message(
+            self,
+            first_intermediary_id,
+            message_type,
+            message_payload,
+            message_id=message_id,
+            priority=priority
+        )
 
     def send_sync_directed_message(self, target_bot_id, message_type, message_payload):
-        msg_id = self.send_directed_message(target_bot_id, message_type, message_payload)
-        if msg_id is None:
-            return None
-
+        msg_id = self._generate_message_id()
         self.response_locks[msg_id] = {
             "LOCK": threading.Condition(),
             "RESPONSE": None,
             "TARGET_BOT_ID": target_bot_id
         }
 
+        # The lock is held while sending so the response can not be notified before waiting on it
         with self.response_locks[msg_id]["LOCK"]:
+            if self.send_directed_message(target_bot_id, message_type, message_payload, message_id=msg_id) is None:
+                self.response_locks.pop(msg_id, None)
+                return None
+
             check = self.response_locks[msg_id]["LOCK"].wait(timeout=10)
             if check:
                 return self.response_locks.pop(msg_id)["RESPONSE"]
@@ -260,6 +290,21 @@ class SwarmBot(NetworkNode):
                 else:
                     raise Exception("ERROR: Did not receive message response within time limit. Message ID: {}".format(msg_id))
 
+    def send_request_message(self, target_bot_id, message_type, message_payload, response_callback):
+        msg_id = self._generate_message_id()
+        self.response_callbacks[msg_id] = {
+            "CALLBACK": response_callback,
+            "TARGET_BOT_ID": target_bot_id
+        }
+
+        if self.send_directed_message(target_bot_id, message_type, message_payload, message_id=msg_id) is None:
+            self.response_callbacks.pop(msg_id, None)
+            return None
+        return msg_id
+
+    def remove_response_callback(self, msg_id):
+        return self.response_callbacks.pop(msg_id, None) is not None
+
     def respond_to_message(self, message, message_payload):
         message_payload["ORIGINAL_MESSAGE_ID"] = message.get_id()
         target_bot_id = message.get_message_payload()["ORIGINAL_SENDER_ID"]
@@ -269,22 +314,39 @@ class SwarmBot(NetworkNode):
         if target_bot_id == self.get_id():
             return False
 
-        potential_intermediary_id = intermediary_id
-        if target_bot_id != potential_intermediary_id:
-            num_jumps += 1
-            while potential_intermediary_id not in self.msg_channels:
-                if (potential_intermediary_id not in self.msg_intermediaries):
-                    if (target_bot_id not in self.msg_intermediaries):
-                        self.send_propagation_message(MessageTypes.REQUEST_PATH_TO_BOT, {"BOT_ID": target_bot_id})
-                    return False
-                potential_intermediary_id = self.msg_intermediaries[potential_intermediary_id]["INTERMEDIARY_ID"]
+        # Handlers run in parallel, so a longer path must not be saved over a shorter one found at the same time
+        with self.msg_intermediaries_lock:
+            potential_intermediary_id = intermediary_id
+            if target_bot_id != potential_intermediary_id:
                 num_jumps += 1
+                while potential_intermediary_id not in self.msg_channels:
+                    if (potential_intermediary_id not in self.msg_intermediaries):
+                        potential_intermediary_id = None
+                        break
+                    if self.msg_intermediaries[potential_intermediary_id]["INTERMEDIARY_ID"] == potential_intermediary_id:
+                        # A bot that connected directly before its channel was installed is already its own intermediary
+                        break
+                    potential_intermediary_id = self.msg_intermediaries[potential_intermediary_id]["INTERMEDIARY_ID"]
+                    num_jumps += 1
+
+            needs_path = (potential_intermediary_id is None) and (target_bot_id not in self.msg_intermediaries)
+            if (potential_intermediary_id is not None) and (
+                (target_bot_id not in self.msg_intermediaries) or
+                (num_jumps < self.msg_intermediaries[target_bot_id]["NUM_JUMPS"])
+            ):
+                self.msg_intermediaries[target_bot_id] = {
+                    "INTERMEDIARY_ID": potential_intermediary_id,
+                    "NUM_JUMPS": num_jumps
+                }
 
-        if (target_bot_id not in self.msg_intermediaries) or (num_jumps < self.msg_intermediaries[target_bot_id]["NUM_JUMPS"]):
-            self.msg_intermediaries[target_bot_id] = {
-                "INTERMEDIARY_ID": potential_intermediary_id,
-                "NUM_JUMPS": num_jumps
-            }
+        if potential_intermediary_id is None:
+            if needs_path:
+                self.send_scoped_propagation(
+                    MessageTypes.REQUEST_PATH_TO_BOT,
+                    {"BOT_ID": target_bot_id},
+                    self.config["path_request_max_hops"]
+                )
+            return False
 
     def get_num_jumps_to(self, target_bot_id):
         if target_bot_id in self.msg_intermediaries:
@@ -332,10 +394,12 @@ class SwarmBot(NetworkNode):
             MessageTypes.NEW_SWARM_BOT_ID,
             {"MSG_INTERMEDIARY": self.get_id(), "NEW_BOT_ID": new_id, "NUM_JUMPS": 1}
         )
+        with self.msg_intermediaries_lock:
+            intermediary_list = dict(self.msg_intermediaries)
         self.send_directed_message(
             new_id,
             MessageTypes.SYNC_INTERMEDIARIES,
-            {"INTERMEDIARY_LIST": self.msg_intermediaries}
+            {"INTERMEDIARY_LIST": intermediary_list}
         )
 
     def swarm_bot_handle_sync_intermediaries_message(self, message):
@@ -357,25 +421,38 @@ class SwarmBot(NetworkNode):
     def swarm_bot_handle_bot_teardown_message(self, message):
         bot_to_remove = message.get_message_payload()["BOT_ID"]
 
-        if bot_to_remove in self.msg_intermediaries:
-            self.msg_intermediaries.pop(bot_to_remove)
+        with self.msg_intermediaries_lock:
+            if bot_to_remove in self.msg_intermediaries:
+                self.msg_intermediaries.pop(bot_to_remove)
 
-        needs_new_path = []
-        for target_bot_id, intermediary_info in self.msg_intermediaries.items():
-            if intermediary_info["INTERMEDIARY_ID"] == bot_to_remove:
-                needs_new_path.append(target_bot_id)
-        for bot_id in needs_new_path:
-            self.msg_intermediaries.pop(bot_id)
+            needs_new_path = []
+            for target_bot_id, intermediary_info in self.msg_intermediaries.items():
+                if intermediary_info["INTERMEDIARY_ID"] == bot_to_remove:
+                    needs_new_path.append(target_bot_id)
+            for bot_id in needs_new_path:
+                self.msg_intermediaries.pop(bot_id)
 
         for bot_id in needs_new_path:
-            self.send_propagation_message(MessageTypes.REQUEST_PATH_TO_BOT, {"BOT_ID": bot_id})
+            self.send_scoped_propagation(
+                MessageTypes.REQUEST_PATH_TO_BOT,
+                {"BOT_ID": bot_id},
+                self.config["path_request_max_hops"]
+            )
 
+        self._release_responses_from(bot_to_remove)
+
+    def _release_responses_from(self, bot_to_remove):
         for msg_id in self.response_locks:
             if self.response_locks[msg_id]["TARGET_BOT_ID"] == bot_to_remove:
                 self.response_locks[msg_id]["RESPONSE"] = None
                 with self.response_locks[msg_id]["LOCK"]:
                     self.response_locks[msg_id]["LOCK"].notify_all()
 
+        for msg_id, callback_info in list(self.response_callbacks.items()):
+            if callback_info["TARGET_BOT_ID"] == bot_to_remove:
+                if self.response_callbacks.pop(msg_id, None) is not None:
+                    callback_info["CALLBACK"](None)
+
     def swarm_bot_handle_request_path_to_bot(self, message):
         bot_id = message.get_message_payload()["BOT_ID"]
         if bot_id in self.msg_channels:
@@ -388,7 +465,10 @@ class SwarmBot(NetworkNode):
     def swarm_bot_handle_msg_response_message(self, message):
         message_payload = message.get_message_payload()
         original_message_id = message_payload["ORIGINAL_MESSAGE_ID"]
-        if original_message_id not in self.response_locks:
+        callback_info = self.response_callbacks.pop(original_message_id, None)
+        if callback_info is not None:
+            callback_info["CALLBACK"](message)
+        elif original_message_id not in self.response_locks:
             self.logger.warning("WARNING: Received message response for message that was never sent: {}".format(
                 message.get_message_payload()
             ))
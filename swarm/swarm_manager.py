@@ -1,6 +1,8 @@
 import threading
 import random
 
+from collections import deque
+
 from network_manager.network_manager import NetworkManager
 from network_manager.network_connectivity_level import NetworkConnectivityLevel
 from network_manager.network_node.network_node import NetworkNode
@@ -17,17 +19,18 @@ states of the bots in the swarm.
 
 
 class SwarmManager(NetworkManager, SwarmBot):
-    def __init__(self, network_connectivity_level: NetworkConnectivityLevel):
+    def __init__(self, network_connectivity_level: NetworkConnectivityLevel, topology_config: dict = None):
         """
         __init__
 
         Creates a new SwarmManager object
 
         @param network_connectivity_level [NetworkConnectivityLevel] The connectivity level to use for the swarm
+        @param topology_config [dict] The settings of the topology generator, for generated connectivity levels
 
         @return [SwarmManager] The newly created SwarmManager
         """
-        NetworkManager.__init__(self, network_connectivity_level)
+        NetworkManager.__init__(self, network_connectivity_level, topology_config)
         SwarmBot.__init__(self)
 
         self.set_task_executor_status(False)
@@ -36,6 +39,7 @@ class SwarmManager(NetworkManager, SwarmBot):
 
         self.task_tracker = {}
         self.task_locks = {}
+        self.task_output_callbacks = {}
 
         self.assign_msg_handler(
             str(SwarmTaskMessageTypes.TASK_OUTPUT),
@@ -61,14 +65,38 @@ class SwarmManager(NetworkManager, SwarmBot):
         """
         NetworkManager.add_network_node(self, new_node)
         new_node.connect_to_network_node(self)
+        self.connectivity_index.add_connection(new_node.get_id(), self.get_id())
+
+    def add_network_nodes(self, new_nodes: list, topology: NetworkConnectivityLevel = None) -> None:
+        """
+        add_network_nodes
+
+        Overrides the NetworkManager add_network_nodes method.
+        Adds the given bots to the swarm and connects each of them to
+        the manager. The routes of every bot in the swarm are then
+        synced once, and each new bot is sent the swarm memory
+        references once, instead of after every connection.
+
+        @param new_nodes [list] The bots to add to the swarm
+        @param topology [NetworkConnectivityLevel] The connectivity level used to connect the new bots.
+            None to use the connectivity level of the manager.
+
+        @return None
+        """
+        new_nodes = [new_node for new_node in new_nodes if new_node.get_id() not in self.network_nodes]
+        NetworkManager.add_network_nodes(self, new_nodes, topology)
+        self.add_connections(new_nodes)
+        for new_node in new_nodes:
+            self.connectivity_index.add_connection(new_node.get_id(), self.get_id())
+
+        self._sync_routes()
+        for new_node in new_nodes:
+            self.sync_swarm_memory_with(new_node.get_id())
 
     def receive_task_bundle(self, new_task_bundle):
         if new_task_bundle.get_req_num_bots() > len(self.network_nodes):
             return None
 
-        receiver_bot_id = random.choice(list(self.network_nodes.keys()))
-        self.network_nodes[receiver_bot_id].receive_task_bundle(new_task_bundle, listener_bot_id=self.get_id())
-
         bundle_id = new_task_bundle.get_id()
 
         self.task_locks[bundle_id] = {
@@ -76,19 +104,106 @@ class SwarmManager(NetworkManager, SwarmBot):
             "TASK_OUTPUT": None
         }
 
+        # The lock is held from before the bundle is sent, so the output cannot arrive before the wait starts
         with self.task_locks[bundle_id]["LOCK"]:
+            receiver_bot_id = random.choice(list(self.network_nodes.keys()))
+            self.network_nodes[receiver_bot_id].receive_task_bundle(new_task_bundle, listener_bot_id=self.get_id())
             check = self.task_locks[bundle_id]["LOCK"].wait(timeout=10)
             if check:
                 return self.task_locks.pop(bundle_id)["TASK_OUTPUT"]
             else:
                 raise Exception("ERROR: Task was not completed within time limit. Bundle ID: {}".format(bundle_id))
 
+    def submit_task_bundle(self, new_task_bundle, output_callback) -> bool:
+        """
+        submit_task_bundle
+
+        Sends the given task bundle to a random bot in the swarm without
+        waiting for it to complete. The given callback is called with the
+        output of the bundle once the bundle is complete.
+
+        @param new_task_bundle [SwarmTaskBundle] The task bundle to execute
+        @param output_callback [Method] The method to call with the task output
+
+        @return [bool] True if the bundle was sent. False if the swarm does not have enough bots.
+        """
+        if new_task_bundle.get_req_num_bots() > len(self.network_nodes):
+            return False
+
+        self.task_output_callbacks[new_task_bundle.get_id()] = output_callback
+
+        receiver_bot_id = random.choice(list(self.network_nodes.keys()))
+        self.network_nodes[receiver_bot_id].receive_task_bundle(new_task_bundle, listener_bot_id=self.get_id())
+        return True
+
+    def remove_task_output_callback(self, bundle_id) -> bool:
+        """
+        remove_task_output_callback
+
+        Stops waiting for the output of the task bundle with the given ID
+
+        @param bundle_id [int] The ID of the task bundle
+
+        @return [bool] True if a callback was removed. False otherwise.
+        """
+        return self.task_output_callbacks.pop(bundle_id, None) is not None
+
     def swarm_manager_handle_task_output_message(self, message):
         msg_payload = message.get_message_payload()
         task_output = msg_payload["TASK_OUTPUT"]
         bundle_id = msg_payload["TASK_BUNDLE_ID"]
 
+        output_callback = self.task_output_callbacks.pop(bundle_id, None)
+        if output_callback is not None:
+            output_callback(task_output)
+            return
+
         self.task_locks[bundle_id]["TASK_OUTPUT"] = task_output
 
         with self.task_locks[bundle_id]["LOCK"]:
             self.task_locks[bundle_id]["LOCK"].notify_all()
+
+    def _sync_routes(self) -> None:
+        """
+        _sync_routes
+
+        Saves the shortest route from every bot in the swarm, including the
+        manager, to every node it can reach through the bots in the swarm.
+        Routes are found with a breadth first search from each bot, which
+        stops as soon as every bot in the swarm has been reached.
+
+        @param None
+
+        @return None
+        """
+        swarm_bots = dict(self.network_nodes)
+        swarm_bots[self.get_id()] = self
+
+        for bot_id, bot in swarm_bots.items():
+            if not isinstance(bot, SwarmBot):
+                continue
+
+            # The first hop and the number of jumps of the shortest route to each reached node
+            routes = {bot_id: (None, 0)}
+            num_bots_reached = 1
+            nodes_to_visit = deque([bot_id])
+            while (len(nodes_to_visit) > 0) and (num_bots_reached < len(swarm_bots)):
+                node_id = nodes_to_visit.popleft()
+                if node_id not in swarm_bots:
+                    continue
+
+                first_hop_id, num_jumps = routes[node_id]
+                for neighbor_id in list(swarm_bots[node_id].get_message_channels().keys()):
+                    if neighbor_id in routes:
+                        continue
+                    routes[neighbor_id] = (neighbor_id if first_hop_id is None else first_hop_id, num_jumps + 1)
+                    nodes_to_visit.append(neighbor_id)
+                    if neighbor_id in swarm_bots:
+                        num_bots_reached += 1
+
+            routes.pop(bot_id)
+            for target_id, (first_hop_id, num_jumps) in routes.items():
+                if target_id == first_hop_id:
+                    bot.save_msg_intermediary(target_id, first_hop_id, 1)
+                else:
+                    bot.save_msg_intermediary(target_id, first_hop_id, num_jumps - 1)
@@ -1,3 +1,4 @@
+import asyncio
 import time
 import functools
 
@@ -195,6 +196,27 @@ class LocalSwarmMemoryEntry(object):
             else:
                 return response.get_message_payload()["INNER_VALUE"]
 
+    async def read_async(self, request_method):
+        if self.saved_locally:
+            await self.sync_with_other_holders_async(request_method)
+            return self.inner_value
+        else:
+            response = None
+            while (response is None) and (len(self.holders) > 0):
+                holder_ids = [holder.get_holder_id() for holder in self.holders]
+                id_to_ask = self.executor_interface.get_id_with_shortest_path_from_list(holder_ids)
+                response = await request_method(
+                    id_to_ask,
+                    SwarmMemoryMessageTypes.REQUEST_READ,
+                    {"PATH": self.path}
+                )
+                if response is None:
+                    self.remove_holder_id(id_to_ask)
+            if response is None:
+                return None
+            else:
+                return response.get_message_payload()["INNER_VALUE"]
+
     def get_holders(self):
         return self.holders
 
@@ -289,6 +311,24 @@ class LocalSwarmMemoryEntry(object):
                         for block in blockchain:
                             self.add_change_block(block)
 
+    async def sync_with_other_holders_async(self, request_method):
+        if self.saved_locally:
+            bot_ids = [
+                holder.get_holder_id() for holder in self.holders
+                if holder.get_holder_id() != self.executor_interface.get_id()
+            ]
+            responses = await asyncio.gather(*[
+                request_method(bot_id, SwarmMemoryMessageTypes.REQUEST_BLOCKCHAIN_TRANSFER, {"PATH": self.path})
+                for bot_id in bot_ids
+            ])
+            for bot_id, response in zip(bot_ids, responses):
+                if response is None:
+                    self.remove_holder_id(bot_id)
+                else:
+                    blockchain = response.get_message_payload()["BLOCKCHAIN"]
+                    for block in blockchain:
+                        self.add_change_block(block)
+
     def get_inner_value(self):
         return self.inner_value
 
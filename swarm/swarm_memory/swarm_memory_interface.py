@@ -1,8 +1,10 @@
+import asyncio
 import random
 import collections
 import time
 
 from network_manager.network_node.network_node_message_types import NetworkNodeMessageTypes
+from network_manager.network_node.message_queue.message_priority import MessagePriority
 from swarm.swarm_memory.local_swarm_memory_entry import LocalSwarmMemoryEntry
 from swarm.swarm_memory.swarm_memory_message_types import SwarmMemoryMessageTypes
 
@@ -56,10 +58,12 @@ class SwarmMemoryInterface(object):
         all_paths = self._flatten(self.swarm_memory_contents)
         for path in all_paths:
             if self._has_path_saved_locally(path):
+                # Sent in the same lane as the teardown notice that follows, so the notice can not overtake it
                 self.executor_interface.send_directed_message(
                     random.choice(self.executor_interface.get_known_bot_ids()),
                     SwarmMemoryMessageTypes.REQUEST_NEW_HOLDER,
-                    {"PATH": path, "BLOCKCHAIN": self._get_obj_at_path(path).get_change_blocks()}
+                    {"PATH": path, "BLOCKCHAIN": self._get_obj_at_path(path).get_change_blocks()},
+                    priority=MessagePriority.CONTROL
                 )
             self._get_obj_at_path(path).teardown()
 
@@ -113,6 +117,12 @@ class SwarmMemoryInterface(object):
 
         return self._unwrap(self._get_obj_at_path(path_to_read))
 
+    async def read_async(self, path_to_read, request_method):
+        if not self.path_exists_in_memory(path_to_read):
+            return None
+
+        return await self._unwrap_async(self._get_obj_at_path(path_to_read), request_method)
+
     def delete(self, path_to_delete):
         self.deleted_items[path_to_delete] = time.time()
 
@@ -144,14 +154,16 @@ class SwarmMemoryInterface(object):
                 local_contents[path] = self._get_obj_at_path(path).get_inner_value()
         return local_contents
 
-    def swarm_memory_interface_handle_request_connection_message(self, message):
-        new_id = message.get_sender_id()
+    def sync_with(self, bot_id):
         self.executor_interface.send_directed_message(
-            new_id,
+            bot_id,
             SwarmMemoryMessageTypes.SYNC_SWARM_MEMORY,
             {"SWARM_MEMORY_REF": self._get_data_to_holder_id_map(self.swarm_memory_contents)}
         )
 
+    def swarm_memory_interface_handle_request_connection_message(self, message):
+        self.sync_with(message.get_sender_id())
+
     def swarm_memory_interface_handle_sync_swarm_memory_message(self, message):
         message_payload = message.get_message_payload()
         swarm_memory_ref = message_payload["SWARM_MEMORY_REF"]
@@ -323,6 +335,18 @@ class SwarmMemoryInterface(object):
                 self._add_access(value_to_unwrap.get_path(), self.executor_interface.get_id())
             return value_to_unwrap.read()
 
+    async def _unwrap_async(self, value_to_unwrap, request_method):
+        if isinstance(value_to_unwrap, dict):
+            keys = list(value_to_unwrap.keys())
+            values = await asyncio.gather(*[
+                self._unwrap_async(value_to_unwrap[key], request_method) for key in keys
+            ])
+            return dict(zip(keys, values))
+        else:
+            if value_to_unwrap.is_saved_locally():
+                self._add_access(value_to_unwrap.get_path(), self.executor_interface.get_id())
+            return await value_to_unwrap.read_async(request_method)
+
     def _set_save_path_locally(self, path, new_save_state):
         if not self.path_exists_in_memory(path):
             return False
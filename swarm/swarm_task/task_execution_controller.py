@@ -28,12 +28,21 @@ class TaskExecutionController(object):
         self.task = None
 
         self.is_idle = True
+        self.is_tearing_down = False
+        self.idle_lock = threading.Lock()
 
         self.task_executor_pool.notify_idle(self)
 
     def execute_task(self, new_task, bundle_id, index_in_bundle, listener_id, req_num_bots):
-        if self.is_idle:
-            self.is_idle = False
+        with self.idle_lock:
+            was_idle = self.is_idle
+            if was_idle:
+                self.is_idle = False
+                self.is_tearing_down = False
+
+        if was_idle:
+            # Keeps the bot busy until the task is torn down
+            self.executor_interface._notify_process_state(True)
 
             self.task = new_task
             self.bundle_id = bundle_id
@@ -65,7 +74,12 @@ class TaskExecutionController(object):
                 self.task_execution_controller_handle_task_output_message
             )
 
-            self.start_task_execution_process()
+            try:
+                self.start_task_execution_process()
+            except Exception:
+                # A task that failed to run is torn down, so it does not keep the bot busy forever
+                self.transition_state(TaskStates.TEARDOWN)
+                raise
 
     def get_completion_status(self):
         return self.curr_state == TaskStates.TEARDOWN
@@ -174,6 +188,12 @@ class TaskExecutionController(object):
         self.transition_state(TaskStates.TEARDOWN)
 
     def teardown_execution_group(self):
+        # Handlers run in parallel, so more than one of them can end the task
+        with self.idle_lock:
+            if self.is_idle or self.is_tearing_down:
+                return
+            self.is_tearing_down = True
+
         if self.task_completed:
             if (self.req_num_bots > 1) and (self.index_in_bundle == 0):
                 self.executor_interface.send_propagation_message(
@@ -199,6 +219,7 @@ class TaskExecutionController(object):
 
         self.is_idle = True
         print("DONE")
+        self.executor_interface._notify_process_state(False)
         self.task_executor_pool.notify_idle(self)
 
     def add_execution_group_member(self, owner_id, task_type, task_id):
@@ -86,10 +86,8 @@ class TaskExecutorPool(object):
 
     def notify_idle(self, task_executor):
         task = task_executor.get_task()
-        if (task is not None):
-            if (task_executor.get_completion_status()):
-                self.task_execution_history.append(task)
-            self.executor_interface._notify_process_state(False)
+        if (task is not None) and (task_executor.get_completion_status()):
+            self.task_execution_history.append(task)
         with self.idle_executors_lock:
             self.idle_executors.append(task_executor)
         self.run_task_scheduler()
@@ -145,7 +143,6 @@ class TaskExecutorPool(object):
         listener_id = task_info["LISTENER_ID"]
 
         self.executor_interface.delete_from_swarm_memory("TASK_QUEUE/" + str(task.get_id()))
-        self.executor_interface._notify_process_state(True)
         task_executor.execute_task(task, bundle_id, index_in_bundle, listener_id, req_num_bots)
 
     def task_executor_pool_handle_execution_group_creation_message(self, message):
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import unittest
+
+from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from swarm.swarm_bot import SwarmBot
+from swarm.async_swarm_bot import AsyncSwarmBot
+
+
+class TestAsyncSwarmBot(NetworkNodeTestClass):
+    def create_echo_bot(self):
+        echo_bot = self.create_network_node(SwarmBot)
+        echo_bot.assign_msg_handler(
+            "ECHO",
+            lambda message: echo_bot.respond_to_message(message, {"VALUE": message.get_message_payload()["VALUE"]})
+        )
+        return echo_bot
+
+    def test_many_requests_can_be_awaited_concurrently(self):
+        test_swarm_bot_1 = self.create_network_node(SwarmBot)
+        test_swarm_bot_2 = self.create_network_node(SwarmBot)
+        test_swarm_bot_3 = self.create_echo_bot()
+
+        test_swarm_bot_1.connect_to_network_node(test_swarm_bot_2)
+        test_swarm_bot_2.connect_to_network_node(test_swarm_bot_3)
+
+        self.wait_for_idle_network()
+
+        async def run_test():
+            async_bot = AsyncSwarmBot(test_swarm_bot_1)
+            responses = await asyncio.gather(*[
+                async_bot.request(test_swarm_bot_3.get_id(), "ECHO", {"VALUE": i})
+                for i in range(500)
+            ])
+            return [response.get_message_payload()["VALUE"] for response in responses]
+
+        self.assertEqual(list(range(500)), asyncio.run(run_test()))
+        self.assertEqual({}, test_swarm_bot_1.response_callbacks)
+
+    def test_error_raised_when_request_does_not_receive_response_within_the_time_limit(self):
+        test_swarm_bot_1 = self.create_network_node(SwarmBot)
+        test_swarm_bot_2 = self.create_network_node(SwarmBot)
+
+        test_swarm_bot_1.connect_to_network_node(test_swarm_bot_2)
+
+        self.wait_for_idle_network()
+
+        async def run_test():
+            async_bot = AsyncSwarmBot(test_swarm_bot_1, request_timeout_sec=1)
+            await async_bot.request(test_swarm_bot_2.get_id(), "TEST", {})
+
+        with self.assertRaises(Exception) as raised_error:
+            asyncio.run(run_test())
+
+        self.assertIn("Did not receive message response within time limit", str(raised_error.exception))
+        self.assertEqual({}, test_swarm_bot_1.response_callbacks)
+
+    def test_swarm_memory_can_be_read_from_non_directly_connected_bot(self):
+        test_swarm_bot_1 = self.create_network_node(SwarmBot)
+        test_swarm_bot_2 = self.create_network_node(SwarmBot)
+        test_swarm_bot_3 = self.create_network_node(SwarmBot)
+
+        test_swarm_bot_1.connect_to_network_node(test_swarm_bot_2)
+        test_swarm_bot_2.connect_to_network_node(test_swarm_bot_3)
+
+        test_swarm_bot_1.write_to_swarm_memory("TEST/VALUE_1", "TEST_VAL_1")
+        test_swarm_bot_1.write_to_swarm_memory("TEST/VALUE_2", "TEST_VAL_2")
+
+        self.wait_for_idle_network()
+
+        async def run_test():
+            async_bot = AsyncSwarmBot(test_swarm_bot_3)
+            return await asyncio.gather(
+                async_bot.read_from_swarm_memory("TEST/VALUE_1"),
+                async_bot.read_from_swarm_memory("TEST")
+            )
+
+        value, subtree = asyncio.run(run_test())
+        self.assertEqual("TEST_VAL_1", value)
+        self.assertEqual({"VALUE_1": "TEST_VAL_1", "VALUE_2": "TEST_VAL_2"}, subtree)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()
@@ -2,6 +2,7 @@ import logging
 import unittest
 
 from network_manager_test.network_node_test_class import NetworkNodeTestClass
+from network_manager.network_node.message_serializer.encoded_payload import EncodedPayload
 from swarm.swarm_bot import SwarmBot
 
 
@@ -59,6 +60,53 @@ class TestSwarmBotMessaging(NetworkNodeTestClass):
 
         self.assertIn("Did not receive message response within time limit", str(raised_error.exception))
 
+    def test_handler_can_send_sync_message_while_holding_the_only_handler_worker(self):
+        config = {"message_handler_pool_size": 1}
+        test_swarm_bot_1 = self.create_network_node(SwarmBot, additional_config_dict=config)
+        test_swarm_bot_2 = self.create_network_node(SwarmBot, additional_config_dict=config)
+
+        test_swarm_bot_1.connect_to_network_node(test_swarm_bot_2)
+        self.wait_for_idle_network()
+
+        rcvd_responses = []
+        test_swarm_bot_1.assign_msg_handler(
+            "REQUEST",
+            lambda message: test_swarm_bot_1.respond_to_message(message, {"VALUE": 1})
+        )
+        test_swarm_bot_2.assign_msg_handler(
+            "TEST",
+            lambda message: rcvd_responses.append(
+                test_swarm_bot_2.send_sync_directed_message(test_swarm_bot_1.get_id(), "REQUEST", {})
+            )
+        )
+
+        test_swarm_bot_1.send_directed_message(test_swarm_bot_2.get_id(), "TEST", {})
+        self.wait_for_idle_network()
+
+        self.assertEqual(1, len(rcvd_responses))
+        self.assertEqual(1, rcvd_responses[0].get_message_payload()["VALUE"])
+
+    def test_swarm_bot_will_relay_propagated_messages_without_decoding_them(self):
+        config = {"message_channel": "TcpMessageChannel"}
+        test_swarm_bot_1 = self.create_network_node(SwarmBot, additional_config_dict=config)
+        test_swarm_bot_2 = self.create_network_node(SwarmBot, additional_config_dict=config)
+        test_swarm_bot_3 = self.create_network_node(SwarmBot, additional_config_dict=config)
+
+        test_swarm_bot_1.connect_to_network_node(test_swarm_bot_2)
+        test_swarm_bot_2.connect_to_network_node(test_swarm_bot_3)
+        self.wait_for_idle_network()
+
+        rcvd_payloads = []
+        test_swarm_bot_3.assign_msg_handler("TEST", lambda message: rcvd_payloads.append(message.get_message_payload()))
+
+        msg_id = test_swarm_bot_1.send_propagation_message("TEST", {"VALUE": 1})
+        self.wait_for_idle_network()
+
+        self.assertEqual([{"VALUE": 1}], rcvd_payloads)
+        relayed_payload = test_swarm_bot_2.get_received_messages()[msg_id][2].get_raw_payload()
+        self.assertIsInstance(relayed_payload, EncodedPayload)
+        self.assertFalse(relayed_payload.is_decoded)
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import unittest
 import time
@@ -6,6 +7,7 @@ from network_manager_test.network_node_test_class import NetworkNodeTestClass
 from swarm.swarm_task.swarm_task import SwarmTask
 from swarm.swarm_bot import SwarmBot
 from swarm.swarm_manager import SwarmManager
+from swarm.async_swarm_manager import AsyncSwarmManager
 from network_manager.network_connectivity_level import NetworkConnectivityLevel
 from swarm.swarm_task.swarm_task_bundle import SwarmTaskBundle
 
@@ -92,6 +94,58 @@ class TestSwarmManager(NetworkNodeTestClass):
         self.assertEqual([1, 1, 1], task_output["SimpleTask"])
         self.assertTrue(test_task_bundle.is_complete())
 
+    def test_async_swarm_manager_can_await_multiple_task_bundles_concurrently(self):
+        test_swarm_manager = self.create_swarm_manager(NetworkConnectivityLevel.FULLY_CONNECTED)
+
+        test_swarm_bot_1 = self.create_network_node(SwarmBot)
+        test_swarm_bot_2 = self.create_network_node(SwarmBot)
+
+        test_swarm_manager.add_network_node(test_swarm_bot_1)
+        test_swarm_manager.add_network_node(test_swarm_bot_2)
+
+        test_task_bundles = []
+        for _ in range(2):
+            test_task_bundle = SwarmTaskBundle()
+            test_task_bundle.add_task(SimpleTask, 1, [])
+            test_task_bundles.append(test_task_bundle)
+
+        async def run_test():
+            async_swarm_manager = AsyncSwarmManager(test_swarm_manager)
+            return await asyncio.gather(*[
+                async_swarm_manager.receive_task_bundle(test_task_bundle)
+                for test_task_bundle in test_task_bundles
+            ])
+
+        task_outputs = asyncio.run(run_test())
+
+        for task_output in task_outputs:
+            self.assertEqual(1, task_output["SimpleTask"][0])
+        for test_task_bundle in test_task_bundles:
+            self.assertTrue(test_task_bundle.is_complete())
+
+    def test_bots_added_in_bulk_will_know_routes_to_every_bot_in_the_swarm(self):
+        test_swarm_manager = self.create_swarm_manager(NetworkConnectivityLevel.PARTIALLY_CONNECTED)
+
+        test_swarm_bot = self.create_network_node(SwarmBot)
+        test_swarm_manager.add_network_node(test_swarm_bot)
+        self.wait_for_idle_network()
+        test_swarm_bot.write_to_swarm_memory("TEST/PATH", 1)
+        self.wait_for_idle_network()
+
+        new_swarm_bots = [self.create_network_node(SwarmBot) for _ in range(8)]
+        test_swarm_manager.add_network_nodes(new_swarm_bots)
+        test_swarm_manager.wait_until_idle()
+        self.wait_for_idle_network()
+
+        all_swarm_bots = [test_swarm_bot] + new_swarm_bots
+        for bot in all_swarm_bots:
+            for other_bot in all_swarm_bots:
+                if other_bot is not bot:
+                    self.assertIsNotNone(bot.get_num_jumps_to(other_bot.get_id()))
+            self.assertEqual(1, bot.get_num_jumps_to(test_swarm_manager.get_id()))
+
+        self.assertEqual(1, new_swarm_bots[-1].read_from_swarm_memory("TEST/PATH"))
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)